@@ -5,8 +5,19 @@ GUI Components Package
 
 from .chat_component import ChatComponent
 from .testing_component import TestingComponent
+from .stream_renderer import StreamRenderer
+from .chat_history import ChatHistory, TranscriptReader
+from .results_grid import ResultsGrid
+from .live_dashboard import LiveDashboard
+from .tasks_panel import TasksPanel
 
 __all__ = [
     'ChatComponent',
-    'TestingComponent'
+    'TestingComponent',
+    'StreamRenderer',
+    'ChatHistory',
+    'TranscriptReader',
+    'ResultsGrid',
+    'LiveDashboard',
+    'TasksPanel'
 ]
@@ -5,10 +5,11 @@ Chat Component for Ollama GUI
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-import threading
 from datetime import datetime
 
 from ..config import CHAT_TAGS, SYSTEM_PROMPT_MODES, CHAT_CONFIG
+from .stream_renderer import StreamRenderer
+from .chat_history import ChatHistory
 
 
 class ChatComponent:
@@ -48,6 +49,12 @@ class ChatComponent:
         for tag, config in CHAT_TAGS.items():
             self.chat_display.tag_configure(tag, **config)
         
+        # Model wiadomości: ograniczone okno w widgecie, starsze wczytywane przy przewijaniu
+        self.history = ChatHistory(self.chat_display)
+        
+        # Renderowanie streamingu: tokeny łączone w jedną aktualizację na klatkę
+        self.stream_renderer = StreamRenderer(self.chat_display, CHAT_CONFIG['render_fps'])
+        
         # Panel trybu systemowego
         self.setup_system_prompt_panel(chat_frame)
         
@@ -134,9 +141,10 @@ class ChatComponent:
         # Dodaj wiadomość użytkownika do czatu
         self.add_to_chat(f"[Ty]: {message}", "user")
         
-        # Wyślij do modelu w osobnym wątku
-        def send_in_thread():
-            model = self.parent.selected_model.get()
+        model = self.parent.selected_model.get()
+        
+        # Wyślij do modelu w tle (kolejne wiadomości czekają na zakończenie poprzedniej odpowiedzi)
+        def send_in_thread(task):
             self.parent.root.after(0, lambda: self.add_to_chat(f"[{model}]: ", "model"))
             self.parent.root.after(0, lambda: self.parent.progress_var.set("Generowanie odpowiedzi..."))
             self.parent.root.after(0, lambda: self.parent.progress_bar.start())
@@ -156,10 +164,17 @@ class ChatComponent:
                 # Uzyskaj odpowiedź z promptem systemowym
                 system_prompt = self.get_current_system_prompt()
                 
+                def check_cancelled(token):
+                    # Wyjątek w callbacku przerywa strumień i zamyka połączenie z Ollama
+                    task.check()
+                
                 if self.enable_streaming.get():
-                    # Tryb streaming - tokeny na bieżąco
+                    # Tryb streaming - tokeny buforowane i wyświetlane raz na klatkę
+                    self.parent.root.after(0, self.stream_renderer.start)
+                    
                     def token_callback(token):
-                        self.parent.root.after(0, lambda t=token: self.append_to_last_message(t))
+                        check_cancelled(token)
+                        self.stream_renderer.push(token)
                     
                     from src.api import ask_ollama_stream
                     result = ask_ollama_stream(
@@ -172,10 +187,11 @@ class ChatComponent:
                         system_prompt=system_prompt
                     )
                     
-                    if result and 'response' in result:
-                        # Streaming już dodał tekst, więc tylko dodaj nową linię
-                        self.parent.root.after(0, lambda: self.finalize_stream_message())
-                    else:
+                    # Wyświetl resztę bufora i zakończ pętlę odświeżania
+                    self.parent.root.after(0, self.finalize_stream_message)
+                    if task.cancelled:
+                        self.parent.root.after(0, lambda: self.add_to_chat("🛑 Generowanie zatrzymane", "system"))
+                    elif not (result and 'response' in result):
                         self.parent.root.after(0, lambda: self.add_to_chat("❌ Błąd podczas generowania odpowiedzi", "error"))
                 else:
                     # Tryb normalny - cała odpowiedź naraz
@@ -186,64 +202,51 @@ class ChatComponent:
                         "Czat GUI", 
                         self.current_chat_file, 
                         temperature=0.7,
-                        system_prompt=system_prompt
+                        system_prompt=system_prompt,
+                        token_callback=check_cancelled
                     )
                     
-                    if result and 'response' in result:
+                    if task.cancelled:
+                        self.parent.root.after(0, lambda: self.add_to_chat("🛑 Generowanie zatrzymane", "system"))
+                    elif result and 'response' in result:
                         response = result['response']
                         self.parent.root.after(0, lambda r=response: self.add_to_chat(r, "model"))
                     else:
                         self.parent.root.after(0, lambda: self.add_to_chat("❌ Błąd podczas generowania odpowiedzi", "error"))
                 
             except Exception as e:
+                self.parent.root.after(0, self.stream_renderer.finish)
                 self.parent.root.after(0, lambda: self.add_to_chat(f"❌ Błąd: {str(e)}", "error"))
             
             finally:
                 self.parent.root.after(0, lambda: self.parent.progress_bar.stop())
                 self.parent.root.after(0, lambda: self.parent.progress_var.set("Gotowy"))
         
-        threading.Thread(target=send_in_thread, daemon=True).start()
+        self.parent.task_executor.submit('chat', f"{model}: {message[:40]}", send_in_thread)
     
     def add_to_chat(self, text, tag=None):
         """Dodaje tekst do obszaru czatu"""
-        self.chat_display.config(state=tk.NORMAL)
-        self.chat_display.insert(tk.END, text + "\n", tag)
-        self.chat_display.see(tk.END)
-        self.chat_display.config(state=tk.DISABLED)
+        self.history.add(text, tag)
     
     def append_to_last_message(self, text):
-        """Dołącza tekst do ostatniej wiadomości (dla streamingu)"""
-        self.chat_display.config(state=tk.NORMAL)
-        # Usuń ostatni znak nowej linii jeśli istnieje
-        current_pos = self.chat_display.index(tk.END)
-        last_char_pos = f"{current_pos.split('.')[0]}.{int(current_pos.split('.')[1]) - 1}"
-        if self.chat_display.get(last_char_pos) == '\n':
-            self.chat_display.delete(last_char_pos)
-        # Dodaj nowy tekst
-        self.chat_display.insert(tk.END, text)
-        self.chat_display.see(tk.END)
-        self.chat_display.config(state=tk.DISABLED)
+        """Dołącza tekst do ostatniej wiadomości (dla streamingu; wyświetlany w najbliższej klatce)"""
+        self.stream_renderer.push(text)
     
     def finalize_stream_message(self):
         """Finalizuje wiadomość po zakończeniu streamingu"""
-        self.chat_display.config(state=tk.NORMAL)
-        self.chat_display.insert(tk.END, "\n")
-        self.chat_display.see(tk.END)
-        self.chat_display.config(state=tk.DISABLED)
+        self.stream_renderer.finish()
     
     def clear_chat(self):
         """Czyści obszar czatu"""
         if messagebox.askyesno("Potwierdzenie", "Czy na pewno chcesz wyczyścić czat?"):
-            self.chat_display.config(state=tk.NORMAL)
-            self.chat_display.delete("1.0", tk.END)
-            self.chat_display.config(state=tk.DISABLED)
+            self.stream_renderer.stop()
+            self.history.clear()
             self.current_chat_file = None
             self.add_to_chat("💬 Czat wyczyszczony", "system")
     
     def save_chat(self):
         """Zapisuje czat do pliku"""
-        content = self.chat_display.get("1.0", tk.END)
-        if not content.strip():
+        if self.history.is_empty():
             messagebox.showwarning("Ostrzeżenie", "Czat jest pusty!")
             return
         
@@ -255,8 +258,7 @@ class ChatComponent:
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                self.history.save(filename)
                 messagebox.showinfo("Sukces", f"Czat zapisany do: {filename}")
             except Exception as e:
                 messagebox.showerror("Błąd", f"Nie można zapisać pliku: {str(e)}")
@@ -270,21 +272,18 @@ class ChatComponent:
         
         if filename:
             try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                self.chat_display.config(state=tk.NORMAL)
-                self.chat_display.delete("1.0", tk.END)
-                self.chat_display.insert("1.0", content)
-                self.chat_display.config(state=tk.DISABLED)
+                # Wyświetlana tylko końcówka pliku - starsze wiadomości przy przewijaniu w górę
+                self.stream_renderer.stop()
+                self.history.load_transcript(filename)
                 
                 messagebox.showinfo("Sukces", f"Czat wczytany z: {filename}")
             except Exception as e:
                 messagebox.showerror("Błąd", f"Nie można wczytać pliku: {str(e)}")
     
     def stop_generation(self):
-        """Zatrzymuje generowanie odpowiedzi (placeholder)"""
-        messagebox.showinfo("Info", "Funkcja zatrzymywania zostanie zaimplementowana w przyszłości")
+        """Zatrzymuje generowanie odpowiedzi (także wiadomości czekające w kolejce)"""
+        if not self.parent.task_executor.cancel_all('chat'):
+            messagebox.showinfo("Info", "Brak generowanej odpowiedzi")
     
     def on_system_mode_changed(self, event=None):
         """Obsługuje zmianę trybu systemowego"""
@@ -0,0 +1,274 @@
+"""
+Chat History for Ollama GUI
+===========================
+
+Message model behind the chat view. Only a window of the most recent messages
+(CHAT_CONFIG['max_chat_history']) lives in the Text widget; older messages are
+paged back in (CHAT_CONFIG['history_page_size'] at a time) when the view is
+scrolled to the top - first those evicted during the session, then those read
+backwards from the loaded transcript file. Opening a transcript reads only its
+tail, so its size does not matter.
+"""
+
+import os
+import re
+import tkinter as tk
+from collections import deque
+
+from ..config import CHAT_CONFIG
+
+
+_BLOCK_SIZE = 64 * 1024
+_MAX_MESSAGE_BYTES = 16 * 1024  # Dłuższe fragmenty bez nagłówka dzielone na granicach linii
+_HEADER = re.compile(rb'\[([^\]\n]{1,80})\]: ')
+_USER_SPEAKER = b'Ty'
+
+
+class TranscriptReader:
+    """Odczyt wiadomości pliku transkryptu od końca, stronami"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Ścieżka pliku transkryptu ("[Ty]: ...", "[model]: ...")
+        """
+        self.path = path
+        self.offset = os.path.getsize(path)  # Początek najstarszej odczytanej wiadomości (bajty)
+
+    @property
+    def has_older(self):
+        """Czy w pliku zostały nieodczytane (starsze) wiadomości"""
+        return self.offset > 0
+
+    def read_older(self, count):
+        """
+        Czyta do count wiadomości poprzedzających już odczytane.
+
+        Plik jest czytany blokami od końca, linia po linii; wiadomość zaczyna się
+        linią z nagłówkiem "[mówca]: ".
+
+        Args:
+            count (int): Maksymalna liczba wiadomości
+
+        Returns:
+            list: Krotki (tekst, tag) w kolejności chronologicznej
+        """
+        messages = []
+        current, current_size = [], 0
+        cursor = pos = self.offset
+        carry = b''
+        with open(self.path, 'rb') as f:
+            while pos > 0 and len(messages) < count:
+                size = min(_BLOCK_SIZE, pos)
+                pos -= size
+                f.seek(pos)
+                lines = (f.read(size) + carry).splitlines(keepends=True)
+                # Pierwsza linia bloku może być niepełna - chyba że to początek pliku
+                carry = lines.pop(0) if pos > 0 and lines else b''
+                for line in reversed(lines):
+                    cursor -= len(line)
+                    current.append(line)
+                    current_size += len(line)
+                    if _HEADER.match(line) or current_size >= _MAX_MESSAGE_BYTES:
+                        messages.append(self._message(current))
+                        current, current_size = [], 0
+                        self.offset = cursor
+                        if len(messages) == count:
+                            break
+            if pos == 0 and current and len(messages) < count:
+                # Tekst przed pierwszym nagłówkiem
+                messages.append(self._message(current))
+                self.offset = 0
+        messages.reverse()
+        return messages
+
+    @staticmethod
+    def _message(lines_newest_first):
+        raw = b''.join(reversed(lines_newest_first))
+        text = raw.decode('utf-8', errors='replace').replace('\r\n', '\n')
+        if not text.endswith('\n'):
+            text += '\n'
+        header = _HEADER.match(raw)
+        tag = None
+        if header:
+            tag = 'user' if header.group(1) == _USER_SPEAKER else 'model'
+        return text, tag
+
+    def copy_prefix(self, out):
+        """Kopiuje nieodczytaną część pliku (bajty 0..offset) do otwartego pliku binarnego"""
+        remaining = self.offset
+        with open(self.path, 'rb') as f:
+            while remaining > 0:
+                block = f.read(min(_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                out.write(block)
+                remaining -= len(block)
+
+
+class ChatHistory:
+    """Model wiadomości czatu: ograniczone okno w widgecie + stronicowanie starszych"""
+
+    def __init__(self, text_widget, max_messages=None, page_size=None):
+        """
+        Args:
+            text_widget (tk.Text): Widget czatu (ScrolledText - przewijanie wczytuje starsze strony)
+            max_messages (int): Rozmiar okna wiadomości (domyślnie CHAT_CONFIG['max_chat_history'])
+            page_size (int): Wiadomości na stronę (domyślnie CHAT_CONFIG['history_page_size'])
+        """
+        self.widget = text_widget
+        self.max_messages = max_messages or CHAT_CONFIG['max_chat_history']
+        self.page_size = page_size or CHAT_CONFIG['history_page_size']
+        self._marks = deque()  # Znaczniki początków wiadomości w widgecie (od najstarszej)
+        self._tags = deque()
+        self._archive = []     # Wiadomości usunięte z widgetu w tej sesji (od najstarszej)
+        self._reader = None
+        self._mark_counter = 0
+        self._paging = False
+
+        vbar = getattr(text_widget, 'vbar', None)
+        if vbar is not None:
+            def on_scroll(first, last):
+                vbar.set(first, last)
+                self._on_scroll(first)
+            text_widget.configure(yscrollcommand=on_scroll)
+
+    @property
+    def has_older(self):
+        """Czy istnieją wiadomości starsze niż wyświetlone"""
+        return bool(self._archive) or (self._reader is not None and self._reader.has_older)
+
+    def __len__(self):
+        return len(self._marks)
+
+    def add(self, text, tag=None):
+        """
+        Dodaje wiadomość na końcu czatu i przycina okno do max_messages.
+
+        Args:
+            text (str): Treść wiadomości (bez końcowego znaku nowej linii)
+            tag (str): Tag formatowania (CHAT_TAGS)
+        """
+        self.widget.config(state=tk.NORMAL)
+        self._insert_end(text + "\n", tag)
+        self._trim()
+        self.widget.see(tk.END)
+        self.widget.config(state=tk.DISABLED)
+
+    def clear(self):
+        """Usuwa wszystkie wiadomości (także archiwum i powiązanie z plikiem)"""
+        self.widget.config(state=tk.NORMAL)
+        self.widget.delete("1.0", tk.END)
+        self.widget.config(state=tk.DISABLED)
+        for mark in self._marks:
+            self.widget.mark_unset(mark)
+        self._marks.clear()
+        self._tags.clear()
+        self._archive = []
+        self._reader = None
+
+    def load_transcript(self, path):
+        """
+        Otwiera transkrypt: wyświetla tylko ostatnią stronę, starsze wczytywane przy przewijaniu.
+
+        Args:
+            path (str): Ścieżka pliku transkryptu
+
+        Returns:
+            int: Liczba wyświetlonych wiadomości
+        """
+        self.clear()
+        reader = TranscriptReader(path)
+        messages = reader.read_older(self.page_size)
+        self._reader = reader
+        self.widget.config(state=tk.NORMAL)
+        for text, tag in messages:
+            self._insert_end(text, tag)
+        self.widget.see(tk.END)
+        self.widget.config(state=tk.DISABLED)
+        return len(messages)
+
+    def is_empty(self):
+        """Czy czat nie zawiera żadnej treści"""
+        return not self.has_older and not self.widget.get("1.0", "end-1c").strip()
+
+    def save(self, path):
+        """
+        Zapisuje pełną rozmowę: niewczytaną część transkryptu, archiwum i okno widgetu.
+
+        Zapis przez plik tymczasowy, więc można nadpisać wczytany transkrypt.
+
+        Args:
+            path (str): Ścieżka pliku docelowego
+        """
+        temporary = path + ".tmp"
+        with open(temporary, 'wb') as out:
+            if self._reader is not None:
+                self._reader.copy_prefix(out)
+            for text, _ in self._archive:
+                out.write(text.encode('utf-8'))
+            out.write(self.widget.get("1.0", "end-1c").encode('utf-8'))
+        os.replace(temporary, path)
+
+    def load_older(self):
+        """
+        Wczytuje stronę starszych wiadomości na górę widgetu, zachowując pozycję widoku.
+
+        Returns:
+            int: Liczba wczytanych wiadomości
+        """
+        self._paging = False
+        older = []
+        if self._archive:
+            older = self._archive[-self.page_size:]
+            del self._archive[-self.page_size:]
+        if len(older) < self.page_size and self._reader is not None and self._reader.has_older:
+            older = self._reader.read_older(self.page_size - len(older)) + older
+        if not older:
+            return 0
+
+        top_line, top_char = self.widget.index("@0,0").split('.')
+        lines_before = self._line_count()
+        self.widget.config(state=tk.NORMAL)
+        for text, tag in reversed(older):
+            self.widget.insert("1.0", text, tag)
+            self._marks.appendleft(self._new_mark("1.0"))
+            self._tags.appendleft(tag)
+        self.widget.config(state=tk.DISABLED)
+        # Ta sama treść zostaje na górze widoku
+        self.widget.yview(f"{int(top_line) + self._line_count() - lines_before}.{top_char}")
+        return len(older)
+
+    def _on_scroll(self, first):
+        if float(first) <= 0.0 and not self._paging and self.has_older:
+            self._paging = True
+            self.widget.after_idle(self.load_older)
+
+    def _insert_end(self, text, tag):
+        start = self.widget.index("end-1c")
+        self.widget.insert(tk.END, text, tag)
+        self._marks.append(self._new_mark(start))
+        self._tags.append(tag)
+
+    def _new_mark(self, index):
+        self._mark_counter += 1
+        mark = f"chat_msg_{self._mark_counter}"
+        self.widget.mark_set(mark, index)
+        # Grawitacja w prawo: tekst wstawiony w miejscu znacznika trafia przed niego
+        self.widget.mark_gravity(mark, tk.RIGHT)
+        return mark
+
+    def _trim(self):
+        excess = len(self._marks) - self.max_messages
+        if excess <= 0:
+            return
+        marks = [self._marks.popleft() for _ in range(excess)]
+        boundaries = marks + [self._marks[0]]
+        for i, mark in enumerate(marks):
+            self._archive.append((self.widget.get(mark, boundaries[i + 1]), self._tags.popleft()))
+        self.widget.delete("1.0", boundaries[-1])
+        for mark in marks:
+            self.widget.mark_unset(mark)
+
+    def _line_count(self):
+        return int(self.widget.index("end-1c").split('.')[0])
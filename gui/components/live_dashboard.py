@@ -0,0 +1,255 @@
+"""
+Live Dashboard for Ollama GUI
+=============================
+
+Canvas panel with the metrics of the current run: a tokens/s gauge for the
+active stream, a per-model leaderboard with a TTFT sparkline and the last vs
+mean tokens/s (a degrading model is highlighted), the ETA and the models the
+Ollama server currently keeps in memory (/api/ps). Workers only update a
+LiveRunMetrics object; the panel samples it at DASHBOARD_CONFIG['refresh_ms']
+and redraws only when something changed. /api/ps is queried by one long-lived
+background thread woken up by the refresh loop.
+"""
+
+import re
+import threading
+import time
+import tkinter as tk
+from datetime import datetime
+
+from src.api import get_running_models
+from src.utils.live_metrics import LiveRunMetrics, format_eta
+
+from ..config import DASHBOARD_CONFIG
+
+
+_FONT = ('Consolas', 9)
+_BOLD = ('Consolas', 9, 'bold')
+_GAUGE_WIDTH = 190
+_SERVER_WIDTH = 250
+_ROW_HEIGHT = 17
+_SPARK_WIDTH = 90
+
+# Kolumny rankingu: (nagłówek, przesunięcie x od lewej krawędzi rankingu)
+_LEADERBOARD_COLUMNS = (
+    ('#', 0), ('Model', 18), ('n', 175), ('TTFT', 205), ('TTFT - przebieg', 255),
+    ('tok/s', 355), ('ostatnie', 405), ('⭐', 470),
+)
+_LAST_TPS_COLUMN = 6
+_EXPIRES_AT = re.compile(r'^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.\d+)?(Z|[+-]\d\d:\d\d)?$')
+
+
+class LiveDashboard:
+    """Panel metryk przebiegu rysowany na Canvas z ograniczoną częstotliwością odświeżania"""
+
+    def __init__(self, parent, metrics=None):
+        """
+        Args:
+            parent: Kontener Tk, w którym tworzony jest panel (self.canvas)
+            metrics (LiveRunMetrics): Źródło metryk (domyślnie nowy obiekt - self.metrics)
+        """
+        self.metrics = metrics if metrics is not None else LiveRunMetrics()
+        self.canvas = tk.Canvas(parent, height=DASHBOARD_CONFIG['height'],
+                                background='white', highlightthickness=0)
+        self._after_id = None
+        self._drawn_version = None
+        self._gauge_max = DASHBOARD_CONFIG['gauge_max_tps']
+        self._server_models = None
+        self._server_checked = None  # Czas ostatniej odpowiedzi /api/ps
+        self._server_version = 0
+        self._drawn_server_version = None
+        self._polling = False
+        self._next_poll = 0.0
+        self._poll_request = threading.Event()
+        self._poller = None
+        self.canvas.bind('<Configure>', lambda e: self.redraw())
+
+    def start(self):
+        """Uruchamia pętlę odświeżania (wątek GUI)"""
+        if self._after_id is None:
+            self._tick()
+
+    def stop(self):
+        """Zatrzymuje pętlę odświeżania"""
+        if self._after_id is not None:
+            self.canvas.after_cancel(self._after_id)
+            self._after_id = None
+
+    def redraw(self):
+        """Wymusza przerysowanie przy następnym cyklu"""
+        self._drawn_version = None
+
+    def _tick(self):
+        now = time.monotonic()
+        version = self.metrics.version
+        snapshot = self.metrics.snapshot()
+        # Aktywny strumień zmienia szybkość w każdej klatce; poza nim rysowanie tylko po zmianie
+        if (self._drawn_version != version or self._drawn_server_version != self._server_version
+                or snapshot['active_model'] is not None):
+            self._drawn_version = version
+            self._drawn_server_version = self._server_version
+            self.draw(snapshot)
+        if not self._polling and now >= self._next_poll:
+            interval = DASHBOARD_CONFIG['ps_interval_ms' if snapshot['running'] else 'ps_idle_interval_ms']
+            self._next_poll = now + interval / 1000
+            self._polling = True
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll_loop, daemon=True)
+                self._poller.start()
+            self._poll_request.set()
+        self._after_id = self.canvas.after(DASHBOARD_CONFIG['refresh_ms'], self._tick)
+
+    def _poll_loop(self):
+        """Wątek odpytujący /api/ps na żądanie pętli odświeżania (jeden na cały czas życia panelu)"""
+        while True:
+            self._poll_request.wait()
+            self._poll_request.clear()
+            try:
+                self._poll_server()
+            except Exception as e:
+                # Błąd pojedynczego zapytania nie może zatrzymać wątku
+                print(f"⚠️ Błąd odpytywania /api/ps: {e}")
+
+    def _poll_server(self):
+        """Pobiera modele załadowane w Ollama (wątek w tle - zapytanie nie blokuje GUI)"""
+        try:
+            self._server_models = get_running_models()
+            self._server_checked = datetime.now()
+            self._server_version += 1
+        finally:
+            self._polling = False
+
+    # --- rysowanie ---
+
+    def draw(self, snapshot):
+        """Rysuje cały panel od nowa na podstawie migawki metryk"""
+        canvas = self.canvas
+        canvas.delete('all')
+        width = max(canvas.winfo_width(), int(canvas.cget('width')))
+        height = max(canvas.winfo_height(), int(canvas.cget('height')))
+        self._draw_gauge(snapshot, height)
+        self._draw_leaderboard(snapshot, _GAUGE_WIDTH + 10, width - _SERVER_WIDTH - 10, height)
+        self._draw_server(width - _SERVER_WIDTH, height)
+
+    def _draw_gauge(self, snapshot, height):
+        canvas = self.canvas
+        rate = snapshot['stream_rate']
+        if rate > self._gauge_max:
+            # Skala rośnie do najszybszego zaobserwowanego strumienia
+            self._gauge_max = rate * 1.25
+        cx, cy, radius = _GAUGE_WIDTH // 2, 85, 70
+        box = (cx - radius, cy - radius, cx + radius, cy + radius)
+        canvas.create_arc(*box, start=0, extent=180, style=tk.ARC, width=12, outline='#e6e6e6')
+        if rate > 0:
+            extent = 180 * min(rate / self._gauge_max, 1.0)
+            canvas.create_arc(*box, start=180, extent=-extent, style=tk.ARC, width=12, outline='#2e8b57')
+        canvas.create_text(cx, cy - 15, text=f"{rate:.1f}", font=('Consolas', 18, 'bold'))
+        canvas.create_text(cx, cy + 5, text="tokenów/s", font=_FONT, fill='gray')
+        canvas.create_text(cx - radius, cy + 12, text="0", font=_FONT, fill='gray')
+        canvas.create_text(cx + radius, cy + 12, text=f"{self._gauge_max:.0f}", font=_FONT, fill='gray')
+
+        model = snapshot['active_model']
+        label = f"🤖 {model} · {snapshot['stream_tokens']} tok." if model else "⏸ brak aktywnego strumienia"
+        canvas.create_text(cx, cy + 32, text=_shorten(label, 28), font=_FONT)
+        progress = f"Postęp: {snapshot['completed']}/{snapshot['total']}"
+        canvas.create_text(cx, cy + 52, text=progress, font=_FONT)
+        if snapshot['running']:
+            canvas.create_text(cx, cy + 70, text=f"ETA: {format_eta(snapshot['eta'])}", font=_BOLD)
+
+    def _draw_leaderboard(self, snapshot, left, right, height):
+        canvas = self.canvas
+        canvas.create_text(left, 8, text="🏆 Ranking modeli (na żywo)", font=_BOLD, anchor=tk.W)
+        for heading, x in _LEADERBOARD_COLUMNS:
+            if left + x < right:
+                canvas.create_text(left + x, 28, text=heading, font=_BOLD, anchor=tk.W, fill='gray')
+        ratio = DASHBOARD_CONFIG['degradation_ratio']
+        rows = max(0, (height - 40) // _ROW_HEIGHT)
+        for rank, entry in enumerate(snapshot['models'][:rows], 1):
+            y = 28 + rank * _ROW_HEIGHT
+            fill = 'purple' if entry['model'] == snapshot['active_model'] else 'black'
+            tps_mean, tps_last = entry['tps_mean'], entry['tps_last']
+            degrading = tps_mean and tps_last is not None and tps_last < tps_mean * ratio
+            rating = entry['rating_mean']
+            cells = (
+                str(rank),
+                _shorten(entry['model'], 22),
+                f"{entry['done']}" + (f"/❌{entry['errors']}" if entry['errors'] else ""),
+                _number(entry['ttft_mean'], "{:.2f}s"),
+                None,
+                _number(tps_mean, "{:.1f}"),
+                _number(tps_last, "{:.1f}") + (" ↓" if degrading else ""),
+                _number(rating, "{:.1f}"),
+            )
+            for column, ((_, x), text) in enumerate(zip(_LEADERBOARD_COLUMNS, cells)):
+                if text is None or left + x >= right:
+                    continue
+                color = 'red' if degrading and column == _LAST_TPS_COLUMN else fill
+                canvas.create_text(left + x, y, text=text, font=_FONT, anchor=tk.W, fill=color)
+            spark_x = left + 255
+            if spark_x + _SPARK_WIDTH < right:
+                self._draw_sparkline(entry['ttft_history'], spark_x, y - 6, _SPARK_WIDTH, 12)
+
+    def _draw_sparkline(self, values, x, y, width, height):
+        if len(values) < 2:
+            if values:
+                self.canvas.create_oval(x, y + height / 2 - 1, x + 2, y + height / 2 + 1, fill='steelblue', outline='')
+            return
+        low, high = min(values), max(values)
+        span = (high - low) or 1.0
+        step = width / (len(values) - 1)
+        # Wyżej = dłuższy czas do pierwszego tokenu
+        points = []
+        for i, value in enumerate(values):
+            points += [x + i * step, y + height - (value - low) / span * height]
+        self.canvas.create_line(*points, fill='steelblue', width=1)
+        self.canvas.create_oval(points[-2] - 2, points[-1] - 2, points[-2] + 2, points[-1] + 2,
+                                fill='steelblue', outline='')
+
+    def _draw_server(self, left, height):
+        canvas = self.canvas
+        canvas.create_line(left - 5, 5, left - 5, height - 5, fill='#e6e6e6')
+        canvas.create_text(left, 8, text="🖥️ Ollama - modele w pamięci", font=_BOLD, anchor=tk.W)
+        models = self._server_models
+        if self._server_checked is None:
+            lines = [("sprawdzanie...", 'gray')]
+        elif models is None:
+            lines = [("❌ serwer niedostępny", 'red')]
+        elif not models:
+            lines = [("brak załadowanych modeli", 'gray')]
+        else:
+            lines = []
+            for model in models:
+                vram = model.get('size_vram', 0) / 1024 ** 3
+                size = model.get('size', 0) / 1024 ** 3
+                lines.append((_shorten(model.get('name', '?'), 32), 'black'))
+                lines.append((f"   VRAM {vram:.1f}/{size:.1f} GB{_expires_in(model.get('expires_at'))}", 'gray'))
+        max_lines = max(0, (height - 45) // _ROW_HEIGHT)
+        for i, (text, color) in enumerate(lines[:max_lines]):
+            canvas.create_text(left, 28 + i * _ROW_HEIGHT, text=text, font=_FONT, anchor=tk.W, fill=color)
+        if self._server_checked is not None:
+            canvas.create_text(left, height - 10, text=f"aktualizacja: {self._server_checked:%H:%M:%S}",
+                               font=_FONT, anchor=tk.W, fill='gray')
+
+
+def _number(value, fmt):
+    return "-" if value is None else fmt.format(value)
+
+
+def _shorten(text, length):
+    return text if len(text) <= length else text[:length - 1] + "…"
+
+
+def _expires_in(expires_at):
+    """Czas do zwolnienia modelu z pamięci na podstawie expires_at z /api/ps"""
+    # Ollama podaje czas z nanosekundami i strefą (2024-06-04T14:38:31.83753-07:00)
+    match = _EXPIRES_AT.match(expires_at or "")
+    if not match:
+        return ""
+    zone = match.group(2)
+    moment = datetime.fromisoformat(match.group(1) + (zone if zone and zone != 'Z' else '+00:00'))
+    seconds = (moment - datetime.now(moment.tzinfo)).total_seconds()
+    if seconds <= 0:
+        return ""
+    if seconds > 86400:
+        return " · bez limitu"  # keep_alive < 0
+    return f" · zwolnienie za {format_eta(seconds)}"
@@ -0,0 +1,440 @@
+"""
+Results Grid for Ollama GUI
+===========================
+
+Sortable ``ttk.Treeview`` table of a run's results. All rows live in an
+in-memory index (display values, sort keys, a lazy loader of the full
+response); the Treeview itself only holds a fixed pool of visible items that
+are refilled on scroll, so sorting, filtering and appending stay cheap with
+tens of thousands of rows. The full response is read only when a row is
+selected - from the ResultStore blob file when the result came from one.
+"""
+
+import tkinter as tk
+from bisect import bisect_right
+from tkinter import ttk, scrolledtext
+
+from ..config import RESULTS_GRID_CONFIG
+
+
+# Kolumny tabeli: (pole wyniku, nagłówek, szerokość, wyrównanie)
+GRID_COLUMNS = (
+    ('model', 'Model', 170, tk.W),
+    ('test_name', 'Test', 220, tk.W),
+    ('first_token_time', 'TTFT [s]', 80, tk.E),
+    ('tokens_per_second', 'Tokeny/s', 80, tk.E),
+    ('total_time', 'Czas [s]', 80, tk.E),
+    ('judge_rating', 'Sędzia', 70, tk.CENTER),
+    ('status', 'Status', 90, tk.CENTER),
+)
+
+_FORMATS = {
+    'first_token_time': "{:.2f}",
+    'tokens_per_second': "{:.1f}",
+    'total_time': "{:.2f}",
+    'judge_rating': "⭐{}/5",
+}
+
+# Pola szczegółów wyświetlane nad pełną odpowiedzią
+DETAIL_FIELDS = (
+    ('model', 'Model'), ('test_name', 'Test'), ('category', 'Kategoria'),
+    ('first_token_time', 'Pierwszy token [s]'), ('total_time', 'Całkowity czas [s]'),
+    ('tokens_per_second', 'Tokeny/s'), ('eval_count', 'Tokeny'), ('judge_rating', 'Ocena sędziego'),
+    ('rule_verdict', 'Reguły'), ('answer_verdict', 'Odpowiedź'), ('code_passed', 'Testy kodu'),
+    ('status', 'Status'),
+)
+
+
+def result_status(result):
+    """
+    Zwraca status wyniku do kolumny Status.
+
+    Args:
+        result (dict): Wynik testu (ask_ollama + pola graderów)
+
+    Returns:
+        str: error, werdykt weryfikacji odpowiedzi lub reguł, albo ok
+    """
+    if result.get('status'):
+        return result['status']
+    if not result.get('response'):
+        return 'error'
+    for field in ('answer_verdict', 'rule_verdict'):
+        if result.get(field):
+            return result[field]
+    return 'ok'
+
+
+class _GridRecord:
+    """Wiersz indeksu: wartości kolumn i leniwy dostęp do pełnych danych"""
+
+    __slots__ = ('key', 'fields', 'store', 'row', 'response')
+
+    def __init__(self, key, fields, store=None, row=None, response=None):
+        self.key = key
+        self.fields = fields
+        self.store = store
+        self.row = row
+        self.response = response
+
+    def load_response(self):
+        if self.store is not None and self.row is not None:
+            return self._read_blob('response') or ''
+        return self.response or ''
+
+    def load_justification(self):
+        if self.store is not None and self.row is not None:
+            return self._read_blob('judge_justification')
+        return self.fields.get('judge_justification')
+
+    def _read_blob(self, field):
+        handle = self.store.get_handle(self.row, field)
+        if handle is None:
+            return None
+        try:
+            return handle.read()
+        except ValueError:
+            # Magazyn zamknięty po przebiegu - odczyt bezpośrednio z pliku blob
+            try:
+                with open(self.store.blob.path, 'rb') as f:
+                    f.seek(handle.offset)
+                    return f.read(handle.size).decode('utf-8')
+            except OSError:
+                return "(treść niedostępna - plik odpowiedzi usunięty)"
+
+
+class ResultsGrid:
+    """Tabela wyników z wirtualizacją wierszy, sortowaniem, filtrem i panelem szczegółów"""
+
+    def __init__(self, parent, visible_rows=None):
+        """
+        Args:
+            parent: Kontener Tk, w którym tworzona jest tabela (self.frame)
+            visible_rows (int): Liczba wierszy widocznych naraz (domyślnie RESULTS_GRID_CONFIG)
+        """
+        self.visible_rows = visible_rows or RESULTS_GRID_CONFIG['visible_rows']
+        self._records = []       # Wszystkie wiersze w kolejności dodania
+        self._by_key = {}
+        self._order = []         # Indeksy rekordów pasujących do filtra, rosnąco wg klucza sortowania
+        self._order_keys = []    # Klucze sortowania równoległe do _order (bisect)
+        self._sort_column = None
+        self._sort_reverse = False
+        self._filter = ''
+        self._offset = 0
+        self._pool = []          # Identyfikatory elementów Treeview (stała pula)
+        self._selected = None    # Indeks wybranego rekordu
+        self._refresh_pending = False
+        self._detail_record = None
+
+        self.frame = ttk.Frame(parent)
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(1, weight=1)
+        self.frame.rowconfigure(2, weight=1)
+        self.setup_filter_bar()
+        self.setup_table()
+        self.setup_detail_pane()
+
+    def setup_filter_bar(self):
+        """Tworzy pasek filtra i licznika wierszy"""
+        bar = ttk.Frame(self.frame)
+        bar.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        ttk.Label(bar, text="🔍 Filtr:").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        entry = ttk.Entry(bar, textvariable=self.filter_var, width=30)
+        entry.pack(side=tk.LEFT, padx=(5, 10))
+        self.filter_var.trace_add('write', lambda *_: self.set_filter(self.filter_var.get()))
+        self.count_var = tk.StringVar(value="0 wyników")
+        ttk.Label(bar, textvariable=self.count_var).pack(side=tk.RIGHT)
+
+    def setup_table(self):
+        """Tworzy tabelę (Treeview) i przewijanie po indeksie"""
+        columns = [field for field, _, _, _ in GRID_COLUMNS]
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings',
+                                 height=self.visible_rows, selectmode='browse')
+        for field, heading, width, anchor in GRID_COLUMNS:
+            self.tree.heading(field, text=heading, command=lambda f=field: self.sort_by(f))
+            self.tree.column(field, width=width, anchor=anchor, stretch=field in ('model', 'test_name'))
+        self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Pasek przewijania steruje przesunięciem w indeksie, nie zawartością Treeview
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Up>', lambda e: self._move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self._move_selection(1))
+        self.tree.bind('<Prior>', lambda e: self._move_selection(-self.visible_rows))
+        self.tree.bind('<Next>', lambda e: self._move_selection(self.visible_rows))
+
+    def setup_detail_pane(self):
+        """Tworzy panel szczegółów (pełna odpowiedź wczytywana po wybraniu wiersza)"""
+        detail_frame = ttk.LabelFrame(self.frame, text="Szczegóły wyniku", padding="5")
+        detail_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(5, 0))
+        detail_frame.columnconfigure(0, weight=1)
+        detail_frame.rowconfigure(0, weight=1)
+        self.detail_display = scrolledtext.ScrolledText(
+            detail_frame, wrap=tk.WORD, height=RESULTS_GRID_CONFIG['detail_height'],
+            font=('Consolas', 9), state=tk.DISABLED
+        )
+        self.detail_display.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.detail_display.tag_configure("label", font=('Consolas', 9, 'bold'))
+
+    # --- dane ---
+
+    def add_result(self, result, row=None, store=None):
+        """
+        Dodaje wynik do tabeli (wątek GUI; odświeżenie widoku raz na cykl bezczynności).
+
+        Args:
+            result (dict): Wynik testu (ask_ollama + pola graderów)
+            row (int): Wiersz w ResultStore (klucz do późniejszych aktualizacji)
+            store (ResultStore): Magazyn wyników - pełna odpowiedź czytana z niego leniwie
+
+        Returns:
+            Klucz wiersza (row lub kolejny numer)
+        """
+        fields = {field: result.get(field) for field, _, _, _ in GRID_COLUMNS}
+        for field, _ in DETAIL_FIELDS:
+            if result.get(field) is not None:
+                fields[field] = result[field]
+        fields['status'] = result_status(result)
+        key = row if row is not None else ('grid', len(self._records))
+        # Z magazynem odpowiedź zostaje w pliku blob - tabela nie trzyma jej w pamięci
+        record = _GridRecord(key, fields, store, row,
+                             None if store is not None else result.get('response'))
+        index = len(self._records)
+        self._records.append(record)
+        self._by_key[key] = index
+        if self._matches(record):
+            at_end = self._offset + self.visible_rows >= len(self._order)
+            self._insert_ordered(index)
+            # Widok "przyklejony" do końca podąża za nowymi wynikami (kolejność dodawania)
+            if at_end and self._sort_column is None:
+                self._offset = max(0, len(self._order) - self.visible_rows)
+        self._schedule_refresh()
+        return key
+
+    def update_result(self, key, **fields):
+        """
+        Aktualizuje pola wiersza (np. ocenę sędziego dostarczoną później).
+
+        Args:
+            key: Klucz zwrócony przez add_result (wiersz ResultStore)
+            **fields: Nowe wartości pól
+        """
+        index = self._by_key.get(key)
+        if index is None:
+            return
+        record = self._records[index]
+        was_visible = self._matches(record)
+        if was_visible:
+            self._remove_ordered(index)
+        record.fields.update(fields)
+        if self._matches(record):
+            self._insert_ordered(index)
+        self._schedule_refresh()
+        if self._detail_record is record:
+            self._show_detail(record)
+
+    def clear(self):
+        """Usuwa wszystkie wiersze"""
+        self._records, self._by_key = [], {}
+        self._order, self._order_keys = [], []
+        self._offset = 0
+        self._selected = None
+        self._detail_record = None
+        self._set_detail("")
+        self._refresh()
+
+    def __len__(self):
+        return len(self._records)
+
+    # --- sortowanie i filtr ---
+
+    def sort_by(self, column):
+        """Sortuje po kolumnie; ponowne kliknięcie odwraca kierunek"""
+        if self._sort_column == column:
+            self._sort_reverse = not self._sort_reverse
+        else:
+            self._sort_column, self._sort_reverse = column, False
+        for field, heading, _, _ in GRID_COLUMNS:
+            arrow = (" ▼" if self._sort_reverse else " ▲") if field == column else ""
+            self.tree.heading(field, text=heading + arrow)
+        self._offset = 0
+        self._rebuild_order()
+
+    def set_filter(self, text):
+        """Pokazuje tylko wiersze, których model, test lub status zawiera tekst"""
+        self._filter = text.strip().lower()
+        self._offset = 0
+        self._rebuild_order()
+
+    def _matches(self, record):
+        if not self._filter:
+            return True
+        fields = record.fields
+        return any(self._filter in str(fields.get(field) or '').lower() for field in ('model', 'test_name', 'status'))
+
+    def _sort_key(self, index):
+        if self._sort_column is None:
+            return (0, index)
+        value = self._records[index].fields.get(self._sort_column)
+        # Brakujące wartości na końcu (przy sortowaniu rosnącym); remis rozstrzyga kolejność dodania
+        return (1, 0, index) if value is None else (0, value, index)
+
+    def _rebuild_order(self):
+        indices = [i for i, record in enumerate(self._records) if self._matches(record)]
+        keys = [self._sort_key(i) for i in indices]
+        pairs = sorted(zip(keys, indices))
+        self._order_keys = [key for key, _ in pairs]
+        self._order = [index for _, index in pairs]
+        self._clamp_offset()
+        self._refresh()
+
+    def _insert_ordered(self, index):
+        key = self._sort_key(index)
+        position = bisect_right(self._order_keys, key)
+        self._order_keys.insert(position, key)
+        self._order.insert(position, index)
+
+    def _remove_ordered(self, index):
+        key = self._sort_key(index)
+        position = bisect_right(self._order_keys, key) - 1
+        if 0 <= position < len(self._order) and self._order[position] == index:
+            del self._order[position]
+            del self._order_keys[position]
+
+    def _record_at(self, position):
+        """Rekord na pozycji widoku (odwrócony kierunek bez przebudowy indeksu)"""
+        if self._sort_reverse:
+            position = len(self._order) - 1 - position
+        return self._order[position]
+
+    def _position_of(self, index):
+        try:
+            position = self._order.index(index)
+        except ValueError:
+            return None
+        return len(self._order) - 1 - position if self._sort_reverse else position
+
+    # --- widok ---
+
+    def _schedule_refresh(self):
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.tree.after_idle(self._refresh)
+
+    def _clamp_offset(self):
+        self._offset = max(0, min(self._offset, len(self._order) - self.visible_rows))
+
+    def _refresh(self):
+        """Wypełnia pulę widocznych elementów Treeview bieżącym oknem indeksu"""
+        self._refresh_pending = False
+        total = len(self._order)
+        visible = min(self.visible_rows, total)
+        while len(self._pool) < visible:
+            self._pool.append(self.tree.insert('', tk.END, values=()))
+        while len(self._pool) > visible:
+            self.tree.delete(self._pool.pop())
+
+        selected_item = None
+        for i, item in enumerate(self._pool):
+            index = self._record_at(self._offset + i)
+            self.tree.item(item, values=self._display_values(self._records[index]))
+            if index == self._selected:
+                selected_item = item
+        if selected_item is not None:
+            if self.tree.selection() != (selected_item,):
+                self.tree.selection_set(selected_item)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        if total:
+            self.scrollbar.set(self._offset / total, (self._offset + visible) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        shown = f"{total}/{len(self._records)}" if self._filter else str(total)
+        self.count_var.set(f"{shown} wyników")
+
+    @staticmethod
+    def _display_values(record):
+        values = []
+        for field, _, _, _ in GRID_COLUMNS:
+            value = record.fields.get(field)
+            if value is None:
+                values.append("-")
+            elif field in _FORMATS and isinstance(value, (int, float)):
+                values.append(_FORMATS[field].format(value))
+            else:
+                values.append(str(value))
+        return values
+
+    def scroll(self, rows):
+        """Przesuwa okno widoku o podaną liczbę wierszy"""
+        self._offset += rows
+        self._clamp_offset()
+        self._refresh()
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self._offset = int(float(amount) * len(self._order))
+            self._clamp_offset()
+            self._refresh()
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self.scroll(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        # Windows: wielokrotności 120; macOS: małe wartości
+        steps = -int(event.delta / 120) if abs(event.delta) >= 120 else -event.delta
+        return self.scroll(steps * 3)
+
+    def _move_selection(self, step):
+        if not self._order:
+            return "break"
+        position = self._position_of(self._selected) if self._selected is not None else None
+        position = 0 if position is None else max(0, min(len(self._order) - 1, position + step))
+        self._selected = self._record_at(position)
+        if position < self._offset:
+            self._offset = position
+        elif position >= self._offset + self.visible_rows:
+            self._offset = position - self.visible_rows + 1
+        self._refresh()
+        self._show_detail(self._records[self._selected])
+        return "break"
+
+    def _on_select(self, event=None):
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self._pool:
+            return
+        index = self._record_at(self._offset + self._pool.index(selection[0]))
+        if index != self._selected or self._detail_record is not self._records[index]:
+            self._selected = index
+            self._show_detail(self._records[index])
+
+    # --- szczegóły ---
+
+    def _show_detail(self, record):
+        """Wyświetla metryki i pełną odpowiedź wiersza (odczyt z magazynu dopiero teraz)"""
+        self._detail_record = record
+        parts = []
+        for field, label in DETAIL_FIELDS:
+            value = record.fields.get(field)
+            if value is not None:
+                parts += [f"{label}: ", "label", f"{value}\n", ""]
+        justification = record.load_justification()
+        if justification:
+            parts += ["Uzasadnienie sędziego: ", "label", f"{justification}\n", ""]
+        parts += ["\nOdpowiedź:\n", "label", record.load_response(), ""]
+        self._set_detail(*parts)
+
+    def _set_detail(self, *parts):
+        self.detail_display.config(state=tk.NORMAL)
+        self.detail_display.delete("1.0", tk.END)
+        if parts:
+            self.detail_display.insert(tk.END, *parts)
+        self.detail_display.config(state=tk.DISABLED)
@@ -0,0 +1,181 @@
+"""
+Stream Renderer for Ollama GUI
+==============================
+
+Tokens from the streaming thread go into a thread-safe buffer and are drained
+once per frame (CHAT_CONFIG['render_fps']), so a whole frame's worth of text is
+inserted into the Text widget with a single call instead of one Tk event per
+token. The view follows the stream only when it was already scrolled to the
+bottom.
+
+Benchmark (requires a display):
+    python -m gui.components.stream_renderer --tokens 20000
+"""
+
+import argparse
+import threading
+import time
+import tkinter as tk
+
+from ..config import CHAT_CONFIG
+
+
+STREAM_MARK = "stream_end"
+
+
+class StreamRenderer:
+    """Koalescencja tokenów streamingu w jedną aktualizację widgetu na klatkę"""
+
+    def __init__(self, text_widget, fps=None, tag=None):
+        """
+        Args:
+            text_widget (tk.Text): Widget, do którego dopisywane są tokeny
+            fps (int): Częstotliwość odświeżania (domyślnie CHAT_CONFIG['render_fps'])
+            tag (str): Tag nadawany wstawianemu tekstowi (opcjonalnie)
+        """
+        self.widget = text_widget
+        self.frame_ms = max(1, int(1000 / (fps or CHAT_CONFIG['render_fps'])))
+        self.tag = tag
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._after_id = None
+        self.rendered_tokens = 0
+
+    @property
+    def active(self):
+        """Czy pętla odświeżania działa"""
+        return self._after_id is not None
+
+    def start(self):
+        """Rozpoczyna wiadomość: tokeny trafią przed końcowy znak nowej linii (wątek GUI)"""
+        self.stop()
+        with self._lock:
+            self._buffer = []
+        # Znacznik przed ostatnim "\n" ostatniej wiadomości; grawitacja w prawo przesuwa go za wstawiany tekst
+        self.widget.mark_set(STREAM_MARK, "end-2c")
+        self.widget.mark_gravity(STREAM_MARK, tk.RIGHT)
+        self._after_id = self.widget.after(self.frame_ms, self._tick)
+
+    def push(self, token):
+        """Dodaje token do bufora (bezpieczne z dowolnego wątku)"""
+        with self._lock:
+            self._buffer.append(token)
+
+    def flush(self):
+        """
+        Wstawia zbuforowane tokeny jednym wywołaniem insert (wątek GUI).
+
+        Returns:
+            int: Liczba wstawionych tokenów
+        """
+        with self._lock:
+            tokens, self._buffer = self._buffer, []
+        if not tokens:
+            return 0
+
+        # Przewijanie tylko wtedy, gdy użytkownik jest na dole widoku
+        at_bottom = self.widget.yview()[1] >= 1.0
+        self.widget.config(state=tk.NORMAL)
+        self.widget.insert(STREAM_MARK, "".join(tokens), self.tag)
+        self.widget.config(state=tk.DISABLED)
+        if at_bottom:
+            self.widget.see(tk.END)
+        self.rendered_tokens += len(tokens)
+        return len(tokens)
+
+    def finish(self):
+        """Wstawia pozostałe tokeny i kończy pętlę odświeżania (wątek GUI)"""
+        self.stop()
+        self.flush()
+        self.widget.mark_unset(STREAM_MARK)
+
+    def stop(self):
+        """Zatrzymuje pętlę odświeżania bez opróżniania bufora"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        self.flush()
+        self._after_id = self.widget.after(self.frame_ms, self._tick)
+
+
+def _append_per_token(widget, token):
+    """Dawna ścieżka: osobna aktualizacja widgetu dla każdego tokenu (punkt odniesienia benchmarku)"""
+    widget.config(state=tk.NORMAL)
+    widget.insert("end-2c", token)
+    widget.see(tk.END)
+    widget.config(state=tk.DISABLED)
+
+
+def benchmark_stream_render(token_count=20000, fps=None, token="słowo "):
+    """
+    Mierzy maksymalną przepustowość widgetu czatu (tokeny/s) dla obu ścieżek renderowania.
+
+    Wątek producenta wysyła tokeny bez ograniczenia tempa; czas mierzony jest do
+    wyświetlenia ostatniego tokenu, więc wynik to najwyższe tempo, jakie widget
+    nadąża pokazywać.
+
+    Args:
+        token_count (int): Liczba tokenów na pomiar
+        fps (int): Częstotliwość klatek renderera (domyślnie z konfiguracji)
+        token (str): Treść pojedynczego tokenu
+
+    Returns:
+        dict: Tokeny/s dla ścieżek 'per_token' i 'coalesced'
+    """
+    root = tk.Tk()
+    root.withdraw()
+    widget = tk.Text(root, wrap=tk.WORD, width=80, height=20, state=tk.DISABLED)
+    widget.pack()
+    results = {}
+
+    def run(mode):
+        widget.config(state=tk.NORMAL)
+        widget.delete("1.0", tk.END)
+        widget.insert(tk.END, "[model]: \n")
+        widget.config(state=tk.DISABLED)
+        renderer = StreamRenderer(widget, fps=fps)
+        done = threading.Event()
+
+        def produce():
+            for _ in range(token_count):
+                if mode == 'per_token':
+                    root.after(0, lambda: _append_per_token(widget, token))
+                else:
+                    renderer.push(token)
+            root.after(0, finalize)
+
+        def finalize():
+            if mode == 'coalesced':
+                renderer.finish()
+            done.set()
+
+        if mode == 'coalesced':
+            renderer.start()
+        start = time.perf_counter()
+        threading.Thread(target=produce, daemon=True).start()
+        while not done.is_set():
+            root.update()
+        results[mode] = token_count / (time.perf_counter() - start)
+
+    try:
+        for mode in ('per_token', 'coalesced'):
+            run(mode)
+    finally:
+        root.destroy()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark renderowania tokenów w widgecie czatu")
+    parser.add_argument("--tokens", type=int, default=20000, help="Liczba tokenów na pomiar")
+    parser.add_argument("--fps", type=int, default=None, help="Częstotliwość klatek renderera")
+    args = parser.parse_args()
+    try:
+        rates = benchmark_stream_render(args.tokens, args.fps)
+    except tk.TclError as e:
+        raise SystemExit(f"❌ Benchmark wymaga środowiska graficznego: {e}")
+    for mode, rate in rates.items():
+        print(f"{mode:>10}: {rate:,.0f} tokenów/s")
+    print(f"   przyspieszenie: {rates['coalesced'] / rates['per_token']:.1f}x")
@@ -0,0 +1,120 @@
+"""
+Tasks Panel for Ollama GUI
+==========================
+
+Lists the background tasks of a TaskExecutor - running, queued and recently
+finished - with their kind, state and run time, and lets the user cancel the
+selected task or everything that is still pending. The panel polls the
+executor every TASK_EXECUTOR_CONFIG['refresh_ms'] and rebuilds the list only
+when the executor state changed (or a task is running, for the timer).
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from ..config import TASK_EXECUTOR_CONFIG
+from ..task_executor import QUEUED, RUNNING, DONE, FAILED, CANCELLED
+
+
+_STATE_LABELS = {
+    QUEUED: "⏳ w kolejce",
+    RUNNING: "▶️ działa",
+    DONE: "✅ zakończone",
+    FAILED: "❌ błąd",
+    CANCELLED: "🛑 anulowane",
+}
+
+_KIND_LABELS = {
+    'chat': "Czat",
+    'test': "Test",
+    'models': "Modele",
+    'judge': "Sędzia",
+}
+
+
+class TasksPanel:
+    """Panel zadań w tle z możliwością anulowania"""
+
+    def __init__(self, parent, executor):
+        """
+        Args:
+            parent: Kontener Tk, w którym tworzony jest panel (self.frame)
+            executor (TaskExecutor): Executor, którego zadania są wyświetlane
+        """
+        self.executor = executor
+        self._after_id = None
+        self._drawn_version = None
+        self._tasks = {}  # Identyfikator elementu Treeview -> TaskHandle
+
+        self.frame = ttk.Frame(parent, padding="10")
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(1, weight=1)
+
+        bar = ttk.Frame(self.frame)
+        bar.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        self.summary_var = tk.StringVar(value="Brak zadań")
+        ttk.Label(bar, textvariable=self.summary_var).pack(side=tk.LEFT)
+        ttk.Button(bar, text="🛑 Anuluj wszystkie", command=self.cancel_all).pack(side=tk.RIGHT)
+        ttk.Button(bar, text="✖ Anuluj wybrane", command=self.cancel_selected).pack(side=tk.RIGHT, padx=(0, 5))
+
+        columns = ('kind', 'name', 'state', 'time')
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings', height=12, selectmode='extended')
+        for column, heading, width, anchor in (('kind', 'Rodzaj', 80, tk.W), ('name', 'Zadanie', 380, tk.W),
+                                               ('state', 'Stan', 120, tk.W), ('time', 'Czas [s]', 80, tk.E)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor=anchor, stretch=column == 'name')
+        self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+    def start(self):
+        """Uruchamia odświeżanie panelu (wątek GUI)"""
+        if self._after_id is None:
+            self._tick()
+
+    def stop(self):
+        """Zatrzymuje odświeżanie panelu"""
+        if self._after_id is not None:
+            self.frame.after_cancel(self._after_id)
+            self._after_id = None
+
+    def cancel_selected(self):
+        """Anuluje zaznaczone zadania"""
+        for item in self.tree.selection():
+            task = self._tasks.get(item)
+            if task is not None and task.active:
+                self.executor.cancel(task)
+
+    def cancel_all(self):
+        """Anuluje wszystkie aktywne zadania"""
+        self.executor.cancel_all()
+
+    def _tick(self):
+        version = self.executor.version
+        tasks = self.executor.tasks()
+        if version != self._drawn_version or any(task.state == RUNNING for task in tasks):
+            self._drawn_version = version
+            self._refresh(tasks)
+        self._after_id = self.frame.after(TASK_EXECUTOR_CONFIG['refresh_ms'], self._tick)
+
+    def _refresh(self, tasks):
+        selected = {self._tasks[item].id for item in self.tree.selection() if item in self._tasks}
+        self.tree.delete(*self.tree.get_children())
+        self._tasks = {}
+        for task in tasks:
+            state = _STATE_LABELS.get(task.state, task.state)
+            if task.active and task.cancelled:
+                state = "🛑 anulowanie..."
+            elif task.error:
+                state += f": {task.error[:40]}"
+            values = (_KIND_LABELS.get(task.kind, task.kind), task.name, state,
+                      f"{task.elapsed:.1f}" if task.started_at is not None else "-")
+            item = self.tree.insert('', tk.END, values=values)
+            self._tasks[item] = task
+            if task.id in selected:
+                self.tree.selection_add(item)
+
+        running = sum(1 for task in tasks if task.state == RUNNING)
+        queued = sum(1 for task in tasks if task.state == QUEUED)
+        self.summary_var.set(f"Działające: {running} · W kolejce: {queued}")
@@ -5,12 +5,15 @@ Testing Component for Ollama GUI
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-import threading
 import os
 import json
 from datetime import datetime
 
 from ..config import TEST_CONFIG, JUDGE_CONFIG, PREDEFINED_TESTS
+from .results_grid import ResultsGrid
+from src.api import create_judge_provider
+from src.graders import score_response, should_skip_judge, grade_code_response, verify_answer
+from src.config import ANSWER_SKIP_JUDGE_POLICY, CODE_GRADER_ENABLED
 
 
 class TestingComponent:
@@ -183,9 +186,11 @@ class TestingComponent:
         state = "normal" if enabled else "disabled"
         self.provider_combo.configure(state="readonly" if enabled else "disabled")
         self.judge_model_combo.configure(state="readonly" if enabled else "disabled")
-        self.api_key_entry.configure(state=state)
+        self.api_key_entry.configure(state=state if self.provider_requires_api_key() else "disabled")
         
-        if enabled:
+        if enabled and not self.provider_requires_api_key():
+            self.judge_status_label.configure(text="Status: Włączony - sędzia lokalny (bez klucza API)", foreground="green")
+        elif enabled:
             self.judge_status_label.configure(text="Status: Włączony - skonfiguruj klucz API", foreground="orange")
         else:
             self.judge_status_label.configure(text="Status: Wyłączony", foreground="gray")
@@ -198,14 +203,46 @@ class TestingComponent:
             self.judge_model_combo.configure(values=models)
             self.judge_model.set(JUDGE_CONFIG['providers'][provider]['default_model'])
             
-            # Załaduj klucz z ENV jeśli dostępny
             env_key = JUDGE_CONFIG['providers'][provider]['api_key_env']
-            import os
+            if not env_key:
+                # Sędzia lokalny - klucz niepotrzebny, lista modeli z instancji Ollama sędziego
+                self.api_key_entry.configure(state="disabled")
+                self.judge_status_label.configure(text="Status: Sędzia lokalny (bez klucza API)", foreground="green")
+                self.refresh_local_judge_models()
+                return
+            if self.enable_judge.get():
+                self.api_key_entry.configure(state="normal")
+            
+            # Załaduj klucz z ENV jeśli dostępny
             api_key = os.getenv(env_key, "")
             if api_key:
                 self.judge_api_key.set(api_key)
                 self.judge_status_label.configure(text="Status: Klucz załadowany z ENV", foreground="green")
     
+    def provider_requires_api_key(self):
+        """Sprawdza, czy wybrany dostawca sędziego wymaga klucza API"""
+        provider = JUDGE_CONFIG['providers'].get(self.judge_provider.get(), {})
+        return bool(provider.get('api_key_env'))
+    
+    def create_judge(self):
+        """Tworzy dostawcę sędziego z bieżących ustawień (None, gdy niezaimplementowany)"""
+        return create_judge_provider(
+            self.judge_provider.get(),
+            self.judge_model.get(),
+            self.judge_api_key.get().strip() or None
+        )
+    
+    def refresh_local_judge_models(self):
+        """Pobiera w tle listę modeli z instancji Ollama sędziego"""
+        judge = create_judge_provider('ollama', self.judge_model.get())
+        
+        def fetch_models(task):
+            models = judge.available_models()
+            if models:
+                self.parent.root.after(0, lambda: self.judge_model_combo.configure(values=models))
+        
+        self.parent.task_executor.submit('judge', "Lista modeli sędziego", fetch_models, dedupe=True)
+    
     def on_test_set_changed(self, event=None):
         """Obsługuje zmianę zestawu testów"""
         test_set = self.selected_test_set.get()
@@ -217,6 +254,10 @@ class TestingComponent:
     
     def save_api_key(self):
         """Zapisuje klucz API do zmiennej środowiskowej lub pliku"""
+        if not self.provider_requires_api_key():
+            messagebox.showinfo("Info", f"Dostawca {self.judge_provider.get()} nie wymaga klucza API")
+            return
+        
         api_key = self.judge_api_key.get().strip()
         if not api_key:
             messagebox.showerror("Błąd", "Wprowadź klucz API!")
@@ -235,8 +276,10 @@ class TestingComponent:
         """Wczytuje klucz API ze zmiennych środowiskowych"""
         provider = self.judge_provider.get()
         env_key = JUDGE_CONFIG['providers'][provider]['api_key_env']
+        if not env_key:
+            messagebox.showinfo("Info", f"Dostawca {provider} nie wymaga klucza API")
+            return
         
-        import os
         api_key = os.getenv(env_key, "")
         if api_key:
             self.judge_api_key.set(api_key)
@@ -246,60 +289,52 @@ class TestingComponent:
             messagebox.showwarning("Ostrzeżenie", f"Brak zmiennej środowiskowej {env_key}")
     
     def test_api_key(self):
-        """Testuje klucz API"""
+        """Testuje klucz API (lub dostępność sędziego lokalnego)"""
         api_key = self.judge_api_key.get().strip()
-        if not api_key:
+        if not api_key and self.provider_requires_api_key():
             messagebox.showerror("Błąd", "Wprowadź klucz API!")
             return
         
         provider = self.judge_provider.get()
         model = self.judge_model.get()
+        judge = self.create_judge()
         
-        self.judge_status_label.configure(text="Status: Testowanie klucza...", foreground="orange")
+        if judge is None:
+            # Dla innych dostawców (OpenAI, Claude) - placeholder
+            self.judge_status_label.configure(text=f"Status: {provider} - test nie zaimplementowany", foreground="orange")
+            messagebox.showinfo("Info", f"Test dla {provider} nie jest jeszcze zaimplementowany")
+            return
         
-        def test_in_thread():
+        self.judge_status_label.configure(text="Status: Testowanie sędziego...", foreground="orange")
+        
+        def test_in_thread(task):
             try:
-                if provider == "gemini":
-                    from src.api import judge_with_gemini
-                    score, response = judge_with_gemini(
-                        "Test response", 
-                        "Test prompt for API validation", 
-                        api_key
-                    )
-                    
-                    self.parent.root.after(0, lambda: 
-                        self.judge_status_label.configure(
-                            text=f"Status: ✅ Klucz API działa ({provider}:{model})", 
-                            foreground="green"
-                        )
-                    )
-                    self.parent.root.after(0, lambda: 
-                        messagebox.showinfo("Sukces", f"Test klucza API pomyślny!\nOcena testowa: {score}/10")
-                    )
-                else:
-                    # Dla innych dostawców (OpenAI, Claude) - placeholder
-                    self.parent.root.after(0, lambda: 
-                        self.judge_status_label.configure(
-                            text=f"Status: {provider} - test nie zaimplementowany", 
-                            foreground="orange"
-                        )
-                    )
-                    self.parent.root.after(0, lambda: 
-                        messagebox.showinfo("Info", f"Test dla {provider} nie jest jeszcze zaimplementowany")
-                    )
-                    
+                ok, message = judge.check()
             except Exception as e:
+                ok, message = False, str(e)
+            
+            if ok:
+                self.parent.root.after(0, lambda: 
+                    self.judge_status_label.configure(
+                        text=f"Status: ✅ Sędzia działa ({provider}:{model})", 
+                        foreground="green"
+                    )
+                )
+                self.parent.root.after(0, lambda: 
+                    messagebox.showinfo("Sukces", f"Test sędziego pomyślny!\n{message}")
+                )
+            else:
                 self.parent.root.after(0, lambda: 
                     self.judge_status_label.configure(
-                        text="Status: ❌ Błąd klucza API", 
+                        text="Status: ❌ Błąd sędziego", 
                         foreground="red"
                     )
                 )
-                self.parent.root.after(0, lambda e=e: 
-                    messagebox.showerror("Błąd", f"Test klucza API nieudany:\n{str(e)}")
+                self.parent.root.after(0, lambda: 
+                    messagebox.showerror("Błąd", f"Test sędziego nieudany:\n{message}")
                 )
         
-        threading.Thread(target=test_in_thread, daemon=True).start()
+        self.parent.task_executor.submit('judge', f"Test sędziego {provider}:{model}", test_in_thread, dedupe=True)
     
     def run_predefined_tests(self):
         """Uruchamia predefiniowane testy"""
@@ -309,7 +344,9 @@ class TestingComponent:
         
         test_set_key = self.selected_test_set.get()
         test_set = PREDEFINED_TESTS[test_set_key]
+        model = self.parent.selected_model.get()
         
+        self.notify_if_queued()
         self.add_to_results(f"🚀 URUCHAMIANIE ZESTAWU: {test_set['name']}", "header")
         self.add_to_results(f"Opis: {test_set['description']}", "info")
         
@@ -319,11 +356,16 @@ class TestingComponent:
         
         self.add_to_results("=" * 60, "header")
         
-        # Uruchom testy w wątku
-        def run_tests_thread():
-            model = self.parent.selected_model.get()
-            
+        judge = self.create_judge() if self.enable_judge.get() else None
+        judge_ready = judge is not None and (judge.api_key or not judge.requires_api_key)
+        
+        # Uruchom testy w tle (przebiegi testów wykonywane kolejno)
+        def run_tests_thread(task):
             for i, test in enumerate(test_set['tests'], 1):
+                if task.cancelled:
+                    self.parent.root.after(0, lambda: self.add_to_results("🛑 Zestaw zatrzymany", "warning"))
+                    break
+                
                 self.parent.root.after(0, lambda i=i, total=len(test_set['tests']): 
                     self.parent.progress_var.set(f"Test {i}/{total}...")
                 )
@@ -347,22 +389,58 @@ class TestingComponent:
                             self.add_to_results(f"📝 Odpowiedź: {r[:200]}{'...' if len(r) > 200 else ''}", None)
                         )
                         
-                        # Oceń odpowiedź sędzią (jeśli włączony)
-                        if self.enable_judge.get():
-                            api_key = self.judge_api_key.get().strip()
-                            if api_key:
+                        # Szybka ocena regułami (oczekiwane elementy odpowiedzi)
+                        if test.get('expected_elements'):
+                            result.update(score_response(response, test['expected_elements']))
+                            self.parent.root.after(0, lambda r=dict(result): 
+                                self.add_to_results(
+                                    f"📏 Reguły: {r['rule_verdict']} ({r['rule_score']:.0%} elementów)"
+                                    + (f" - brak: {r['rule_missing']}" if r['rule_missing'] else ""),
+                                    "success" if r['rule_verdict'] == 'pass' else "warning" if r['rule_verdict'] == 'fail' else "info"
+                                )
+                            )
+                        
+                        # Weryfikacja odpowiedzi końcowej (zadania zamknięte)
+                        if test.get('answer'):
+                            result.update(verify_answer(response, test['answer']))
+                            self.parent.root.after(0, lambda r=dict(result): 
+                                self.add_to_results(
+                                    f"✅ Odpowiedź: {r['answer_verdict']} ({r['answer_extracted'] or 'nie odczytano'})",
+                                    "success" if r['answer_verdict'] == 'pass' else "warning" if r['answer_verdict'] == 'fail' else "info"
+                                )
+                            )
+                        
+                        # Uruchomienie kodu z odpowiedzi na przypadkach testowych (piaskownica)
+                        if CODE_GRADER_ENABLED and test.get('code_tests'):
+                            code = grade_code_response(response, test['code_tests'])
+                            self.parent.root.after(0, lambda c=code: 
+                                self.add_to_results(
+                                    f"🧪 Testy kodu: {c['code_tests_passed']}/{c['code_tests_total']}"
+                                    + (f" - {c['code_error']}" if c['code_error'] else ""),
+                                    "success" if c['code_passed'] else "warning"
+                                )
+                            )
+                        
+                        # Oceń odpowiedź sędzią (jeśli włączony i reguły nie dały jednoznacznego werdyktu)
+                        if self.enable_judge.get() and (should_skip_judge(result)
+                                                        or should_skip_judge(result, ANSWER_SKIP_JUDGE_POLICY, 'answer_verdict')):
+                            self.parent.root.after(0, lambda: 
+                                self.add_to_results("⏭️ Sędzia pominięty - jednoznaczny wynik reguł lub weryfikacji", "info")
+                            )
+                        elif self.enable_judge.get():
+                            if judge_ready:
                                 self.parent.root.after(0, lambda: 
                                     self.add_to_results("🤖 Ocenianie przez sędziego...", "info")
                                 )
                                 
                                 try:
-                                    from src.api import judge_with_gemini
-                                    judge_prompt = f"Oceń następującą odpowiedź:\n\nPytanie: {question}\nKryteria: {criteria}\nOdpowiedź: {response}\n\nOceń odpowiedź w skali 1-10 i uzasadnij ocenę."
-                                    
-                                    score, judge_response = judge_with_gemini(response, judge_prompt, api_key)
+                                    judge_question = f"{question}\n\nKryteria oceny: {criteria}"
+                                    score, judge_response = judge.judge(response, judge_question)
+                                    if score > 0:
+                                        result['judge_rating'] = score
                                     
                                     self.parent.root.after(0, lambda s=score, jr=judge_response: 
-                                        self.add_to_results(f"⭐ Ocena sędziego: {s}/10", "success" if s >= 7 else "warning")
+                                        self.add_to_results(f"⭐ Ocena sędziego: {s}/5", "success" if s >= 4 else "warning")
                                     )
                                     self.parent.root.after(0, lambda jr=judge_response: 
                                         self.add_to_results(f"💬 Uzasadnienie: {jr[:300]}{'...' if len(jr) > 300 else ''}", None)
@@ -371,15 +449,23 @@ class TestingComponent:
                                     self.parent.root.after(0, lambda e=e: 
                                         self.add_to_results(f"❌ Błąd sędziego: {str(e)}", "error")
                                     )
+                            elif judge is None:
+                                self.parent.root.after(0, lambda: 
+                                    self.add_to_results(f"⚠️ Sędzia {self.judge_provider.get()} nie jest zaimplementowany", "warning")
+                                )
                             else:
                                 self.parent.root.after(0, lambda: 
                                     self.add_to_results("⚠️ Brak klucza API sędziego", "warning")
                                 )
                         
+                        self.parent.root.after(0, lambda r=dict(result): self.results_grid.add_result(r))
                         self.parent.root.after(0, lambda: 
                             self.add_to_results("✅ Test zakończony", "success")
                         )
                     else:
+                        self.parent.root.after(0, lambda i=i: self.results_grid.add_result(
+                            {'model': model, 'test_name': f"PredefinedTest_{i}", 'status': 'error'}
+                        ))
                         self.parent.root.after(0, lambda: 
                             self.add_to_results("❌ Błąd wykonania testu", "error")
                         )
@@ -395,7 +481,12 @@ class TestingComponent:
                 self.add_to_results(f"\n🏁 ZESTAW ZAKOŃCZONY: {test_set['name']}", "header")
             )
         
-        threading.Thread(target=run_tests_thread, daemon=True).start()
+        self.parent.task_executor.submit('test', f"Zestaw: {test_set['name']} ({model})", run_tests_thread)
+    
+    def notify_if_queued(self):
+        """Informuje, że nowy test poczeka na zakończenie bieżącego (limit przebiegów testów)"""
+        if self.parent.task_executor.is_busy('test'):
+            self.add_to_results("⏳ Trwa inny test - ten rozpocznie się po jego zakończeniu (zakładka Zadania)", "warning")
     
     def setup_test_parameters(self, parent):
         """Tworzy panel parametrów testu"""
@@ -449,11 +540,18 @@ class TestingComponent:
         results_frame.columnconfigure(0, weight=1)
         results_frame.rowconfigure(0, weight=1)
         
+        # Log testów i tabela wyników (sortowanie, filtr, pełne odpowiedzi)
+        results_notebook = ttk.Notebook(results_frame)
+        results_notebook.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
         self.results_display = scrolledtext.ScrolledText(
-            results_frame, wrap=tk.WORD, height=15, width=80,
+            results_notebook, wrap=tk.WORD, height=15, width=80,
             font=('Consolas', 9), state=tk.DISABLED
         )
-        self.results_display.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        results_notebook.add(self.results_display, text="📜 Log")
+        
+        self.results_grid = ResultsGrid(results_notebook)
+        results_notebook.add(self.results_grid.frame, text="📋 Tabela wyników")
         
         # Konfiguracja tagów dla kolorowania wyników
         self.results_display.tag_configure("success", foreground="green", font=('Consolas', 9, 'bold'))
@@ -478,6 +576,7 @@ class TestingComponent:
         self.results_display.config(state=tk.NORMAL)
         self.results_display.delete("1.0", tk.END)
         self.results_display.config(state=tk.DISABLED)
+        self.results_grid.clear()
         self.add_to_results("🗑️ Wyniki testów wyczyszczone", "info")
     
     def run_quick_test(self):
@@ -497,11 +596,12 @@ class TestingComponent:
             messagebox.showerror("Błąd", "Wprowadź pytanie testowe!")
             return
         
-        def test_in_thread():
-            model = self.parent.selected_model.get()
-            iterations = self.num_iterations.get()
-            temperature = self.temperature.get()
-            
+        model = self.parent.selected_model.get()
+        iterations = self.num_iterations.get()
+        temperature = self.temperature.get()
+        self.notify_if_queued()
+        
+        def test_in_thread(task):
             # Aktualizuj status
             self.parent.root.after(0, lambda: self.parent.progress_var.set("Wykonywanie testów..."))
             self.parent.root.after(0, lambda: self.parent.progress_bar.start())
@@ -531,6 +631,10 @@ class TestingComponent:
                 total_chars = 0
                 
                 for i in range(iterations):
+                    if task.cancelled:
+                        self.parent.root.after(0, lambda: self.add_to_results("🛑 Test zatrzymany", "warning"))
+                        break
+                    
                     self.parent.root.after(0, lambda i=i: self.add_to_results(
                         f"\n📋 ITERACJA {i+1}/{iterations}", "info"
                     ))
@@ -558,6 +662,7 @@ class TestingComponent:
                             })
                             
                             total_chars += char_count
+                            self.parent.root.after(0, lambda r=dict(result): self.results_grid.add_result(r))
                             
                             # Wyświetl wynik
                             self.parent.root.after(0, lambda response=response, c=char_count, w=word_count: self.add_to_results(
@@ -567,6 +672,9 @@ class TestingComponent:
                                 f"{response[:200]}{'...' if len(response) > 200 else ''}", None
                             ))
                         else:
+                            self.parent.root.after(0, lambda i=i: self.results_grid.add_result(
+                                {'model': model, 'test_name': f"Test_{i+1}", 'status': 'error'}
+                            ))
                             self.parent.root.after(0, lambda i=i: self.add_to_results(
                                 f"❌ Błąd w iteracji {i+1}: Brak odpowiedzi", "error"
                             ))
@@ -606,7 +714,7 @@ class TestingComponent:
                 self.parent.root.after(0, lambda: self.parent.progress_bar.stop())
                 self.parent.root.after(0, lambda: self.parent.progress_var.set("Gotowy"))
         
-        threading.Thread(target=test_in_thread, daemon=True).start()
+        self.parent.task_executor.submit('test', f"Test szybki: {model} ({question[:30]})", test_in_thread)
     
     def create_custom_test(self):
         """Otwiera dialog tworzenia własnego testu"""
@@ -637,9 +745,10 @@ class TestingComponent:
             messagebox.showerror("Błąd", "Wybierz model przed uruchomieniem testu!")
             return
         
-        def test_in_thread():
-            model = self.parent.selected_model.get()
-            
+        model = self.parent.selected_model.get()
+        self.notify_if_queued()
+        
+        def test_in_thread(task):
             self.parent.root.after(0, lambda: self.parent.progress_var.set("Wykonywanie testu..."))
             self.parent.root.after(0, lambda: self.parent.progress_bar.start())
             
@@ -696,7 +805,7 @@ class TestingComponent:
                 self.parent.root.after(0, lambda: self.parent.progress_bar.stop())
                 self.parent.root.after(0, lambda: self.parent.progress_var.set("Gotowy"))
         
-        threading.Thread(target=test_in_thread, daemon=True).start()
+        self.parent.task_executor.submit('test', f"Test z pliku: {os.path.basename(filename)} ({model})", test_in_thread)
     
     def save_test_results(self):
         """Zapisuje wyniki testów do pliku"""
@@ -37,9 +37,45 @@ WINDOW_CONFIG = {
 # Chat configuration
 CHAT_CONFIG = {
     'enable_streaming': True,  # Włącza streaming odpowiedzi (tokeny na bieżąco)
-    'stream_delay': 0.01,      # Opóźnienie między tokenami (sekundy)
+    'render_fps': 30,          # Odświeżenia widoku czatu na sekundę podczas streamingu (tokeny łączone w klatki)
     'auto_save_chat': True,    # Automatyczne zapisywanie czatu
-    'max_chat_history': 1000   # Maksymalna liczba wiadomości w historii
+    'max_chat_history': 1000,  # Maksymalna liczba wiadomości w widoku czatu (starsze stronicowane)
+    'history_page_size': 100   # Wiadomości wczytywane naraz przy przewijaniu historii w górę
+}
+
+# UI event bus configuration (zdarzenia wątków roboczych stosowane partiami)
+EVENT_BUS_CONFIG = {
+    'drain_interval_ms': 50,     # Odstęp między cyklami opróżniania kolejki zdarzeń (ms)
+    'max_events_per_tick': 5000  # Limit zdarzeń stosowanych w jednym cyklu
+}
+
+# Results grid configuration (tabela wyników w zakładce testów)
+RESULTS_GRID_CONFIG = {
+    'visible_rows': 15,  # Wiersze widoczne naraz (pula elementów Treeview)
+    'detail_height': 10  # Wysokość panelu szczegółów (linie)
+}
+
+# Live dashboard configuration (panel metryk przebiegu w zakładce testów)
+DASHBOARD_CONFIG = {
+    'height': 190,                  # Wysokość panelu (px)
+    'refresh_ms': 250,              # Odstęp między przerysowaniami (ms)
+    'ps_interval_ms': 5000,         # Odpytywanie /api/ps podczas przebiegu (ms)
+    'ps_idle_interval_ms': 30000,   # Odpytywanie /api/ps poza przebiegiem (ms)
+    'gauge_max_tps': 50,            # Początkowa skala wskaźnika tokenów/s (rośnie automatycznie)
+    'degradation_ratio': 0.8        # Ostatnie tokeny/s poniżej tej części średniej = spadek (↓)
+}
+
+# Task executor configuration (zadania w tle: czat, testy, lista modeli, sędzia)
+TASK_EXECUTOR_CONFIG = {
+    'max_workers': 4,     # Maksymalna liczba wątków roboczych
+    'kind_limits': {      # Jednocześnie działające zadania danego rodzaju (reszta czeka w kolejce)
+        'chat': 1,        # Odpowiedzi czatu
+        'test': 1,        # Przebiegi testów (każdy obciąża serwer Ollama)
+        'models': 1,      # Pobieranie listy modeli
+        'judge': 1        # Sprawdzanie i odświeżanie sędziego
+    },
+    'history': 20,        # Zakończone zadania widoczne w panelu zadań
+    'refresh_ms': 500     # Odświeżanie panelu zadań (ms)
 }
 
 # Chat display tags
@@ -74,7 +110,7 @@ TEST_CONFIG = {
 # Judge configuration (AI evaluation)
 JUDGE_CONFIG = {
     'enable_judge': True,
-    'default_provider': 'gemini',  # gemini, openai, claude
+    'default_provider': 'gemini',  # gemini, ollama, openai, claude
     'providers': {
         'gemini': {
             'name': 'Google Gemini',
@@ -82,6 +118,12 @@ JUDGE_CONFIG = {
             'models': ['gemini-1.5-flash', 'gemini-1.5-pro'],
             'default_model': 'gemini-1.5-flash'
         },
+        'ollama': {
+            'name': 'Ollama (lokalny)',
+            'api_key_env': None,  # Sędzia lokalny - bez klucza API, działa offline
+            'models': ['llama3.1:8b', 'qwen2.5:7b', 'mistral:7b'],
+            'default_model': 'llama3.1:8b'
+        },
         'openai': {
             'name': 'OpenAI GPT',
             'api_key_env': 'OPENAI_API_KEY', 
@@ -106,7 +148,12 @@ PREDEFINED_TESTS = {
             {
                 'question': 'Napisz funkcję Python, która sprawdza czy liczba jest pierwsza',
                 'criteria': 'Kod powinien być poprawny, wydajny i zawierać obsługę błędów',
-                'expected_elements': ['def', 'for', 'if', 'return', 'range']
+                'expected_elements': ['def', 'for', 'if', 'return', 'range'],
+                'code_tests': {
+                    'function_names': ['is_prime', 'czy_pierwsza', 'jest_pierwsza'],
+                    'compare': 'truthy',
+                    'cases': [[[2], True], [[7], True], [[1], False], [[9], False], [[97], True]]
+                }
             },
             {
                 'question': 'Wyjaśnij różnicę między listą a tuple w Python',
@@ -127,7 +174,8 @@ PREDEFINED_TESTS = {
             {
                 'question': 'Rozwiąż równanie kwadratowe: x² - 5x + 6 = 0',
                 'criteria': 'Prawidłowe rozwiązanie z pokazaniem kroków',
-                'expected_elements': ['x=2', 'x=3', 'delta', 'wzór']
+                'expected_elements': ['x=2', 'x=3', 'delta', 'wzór'],
+                'answer': {'type': 'assignments', 'variable': 'x', 'values': [2, 3]}
             },
             {
                 'question': 'Oblicz pochodną funkcji f(x) = x³ + 2x² - 5x + 1',
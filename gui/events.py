@@ -0,0 +1,172 @@
+"""
+UI Event Bus for Ollama GUI
+===========================
+
+Worker threads publish typed events instead of scheduling their own
+``root.after(0, ...)`` closures. The GUI thread drains the queue once per tick
+(monitor_queue) and applies the whole batch: consecutive text chunks for the
+same display become one insert call, and only the latest Progress and Status
+per target is applied - so the cost of a tick depends on how many widgets
+change, not on how chatty the workers are.
+"""
+
+import queue
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import EVENT_BUS_CONFIG
+
+
+@dataclass
+class TokenChunk:
+    """Fragment tekstu dopisywany na końcu widoku (tokeny, linie wyników)"""
+    text: str
+    tag: Optional[str] = None
+    target: str = 'test'
+
+
+@dataclass
+class ResultReady:
+    """Nowy wynik testu (z wierszem ResultStore, jeśli został w nim zapisany)"""
+    result: Dict[str, Any]
+    row: Optional[int] = None
+    store: Any = None
+
+
+@dataclass
+class ResultUpdated:
+    """Pola wyniku uzupełnione później (np. ocena sędziego)"""
+    row: int
+    fields: Dict[str, Any]
+
+
+@dataclass
+class Progress:
+    """Postęp przebiegu (stosowana tylko ostatnia wartość w cyklu)"""
+    value: int
+    maximum: Optional[int] = None
+    target: str = 'test'
+
+
+@dataclass
+class Status:
+    """Tekst statusu (stosowany tylko ostatni w cyklu)"""
+    text: str
+    target: str = 'test'
+    style: Optional[str] = None
+
+
+@dataclass
+class UICall:
+    """Jednorazowa operacja w wątku GUI (np. wyczyszczenie widoku) - wykonywana w kolejności zdarzeń"""
+    callback: Callable[[], Any]
+
+
+# Zdarzenia, z których w jednym cyklu liczy się tylko najnowsze (per typ i cel)
+COALESCED_EVENTS = (Progress, Status)
+
+
+class UIEventBus:
+    """Kolejka zdarzeń UI: publikacja z dowolnego wątku, stosowanie partiami w wątku GUI"""
+
+    def __init__(self, max_events_per_tick: int = None):
+        """
+        Args:
+            max_events_per_tick (int): Limit zdarzeń w jednym cyklu (reszta w kolejnym)
+        """
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._handlers: Dict[type, List[Callable[[List[Any]], None]]] = {}
+        self.max_events_per_tick = max_events_per_tick or EVENT_BUS_CONFIG['max_events_per_tick']
+        self.published = 0
+        self.applied_batches = 0
+
+    def publish(self, event: Any) -> None:
+        """Publikuje zdarzenie (bezpieczne z dowolnego wątku)"""
+        self.published += 1
+        self._queue.put(event)
+
+    def subscribe(self, event_type: type, handler: Callable[[List[Any]], None]) -> None:
+        """
+        Rejestruje obsługę typu zdarzeń.
+
+        Args:
+            event_type (type): Klasa zdarzenia (TokenChunk, ResultReady, ResultUpdated, Progress, Status)
+            handler (Callable): Funkcja przyjmująca listę kolejnych zdarzeń tego typu
+        """
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def drain(self) -> int:
+        """
+        Stosuje zdarzenia oczekujące w kolejce (wątek GUI).
+
+        Kolejne zdarzenia tego samego typu trafiają do obsługi jedną listą;
+        Progress i Status są scalane do najnowszego i stosowane na końcu cyklu.
+
+        Returns:
+            int: Liczba pobranych zdarzeń
+        """
+        events = []
+        try:
+            while len(events) < self.max_events_per_tick:
+                events.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not events:
+            return 0
+
+        latest: Dict[tuple, Any] = {}
+        run: List[Any] = []
+        for event in events:
+            if isinstance(event, COALESCED_EVENTS):
+                key = (type(event), event.target)
+                previous = latest.get(key)
+                if isinstance(event, Progress) and event.maximum is None and previous is not None:
+                    # Zakres ustawiony wcześniej w tym cyklu nie może zginąć przy scalaniu
+                    event = Progress(event.value, previous.maximum, event.target)
+                latest[key] = event
+                continue
+            if run and type(run[0]) is not type(event):
+                self._dispatch(run)
+                run = []
+            run.append(event)
+        if run:
+            self._dispatch(run)
+        for event in latest.values():
+            self._dispatch([event])
+        return len(events)
+
+    def _dispatch(self, run: List[Any]) -> None:
+        self.applied_batches += 1
+        if isinstance(run[0], UICall):
+            handlers = [lambda calls: [event.callback() for event in calls]]
+        else:
+            handlers = self._handlers.get(type(run[0]), ())
+        for handler in handlers:
+            try:
+                handler(run)
+            except Exception as e:
+                # Błąd jednej obsługi nie może zatrzymać pętli zdarzeń GUI
+                print(f"⚠️ Błąd obsługi zdarzenia {type(run[0]).__name__}: {e}")
+
+
+def group_chunks(chunks: List[TokenChunk]) -> Dict[str, List[Any]]:
+    """
+    Łączy fragmenty tekstu w argumenty jednego wywołania Text.insert na widok.
+
+    Sąsiednie fragmenty z tym samym tagiem są sklejane.
+
+    Args:
+        chunks (List[TokenChunk]): Kolejne fragmenty tekstu
+
+    Returns:
+        Dict[str, List[Any]]: Cel -> [tekst, tag, tekst, tag, ...]
+    """
+    grouped: Dict[str, List[Any]] = {}
+    for chunk in chunks:
+        args = grouped.setdefault(chunk.target, [])
+        tag = chunk.tag or ''  # Tkinter obcina argumenty od pierwszego None
+        if args and args[-1] == tag:
+            args[-2] += chunk.text
+        else:
+            args += [chunk.text, tag]
+    return grouped
@@ -5,12 +5,13 @@ Main GUI Window for Ollama Application
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
 import os
 
 from .config import WINDOW_CONFIG, GUI_STYLES, GUI_FONTS
 from .components.chat_component import ChatComponent
 from .components.testing_component import TestingComponent
+from .components.tasks_panel import TasksPanel
+from .task_executor import TaskExecutor
 
 
 class OllamaGUI:
@@ -28,6 +29,7 @@ class OllamaGUI:
         self.root.title(WINDOW_CONFIG['title'])
         self.root.geometry(f"{WINDOW_CONFIG['width']}x{WINDOW_CONFIG['height']}")
         self.root.resizable(True, True)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
         # Ikona (jeśli istnieje)
         if os.path.exists("icon.ico"):
@@ -38,6 +40,8 @@ class OllamaGUI:
         self.selected_model = tk.StringVar()
         self.progress_var = tk.StringVar(value="Gotowy")
         self.status_var = tk.StringVar(value="Ładowanie modeli...")
+        # Wszystkie zadania w tle (czat, testy, lista modeli) przez jedną ograniczoną pulę
+        self.task_executor = TaskExecutor()
     
     def setup_gui(self):
         """Tworzy interfejs użytkownika"""
@@ -105,7 +109,7 @@ class OllamaGUI:
         file_menu.add_command(label="Zapisz czat...", command=self.save_chat)
         file_menu.add_command(label="Wczytaj czat...", command=self.load_chat)
         file_menu.add_separator()
-        file_menu.add_command(label="Wyjście", command=self.root.quit)
+        file_menu.add_command(label="Wyjście", command=self.on_closing)
         
         # Menu Test
         test_menu = tk.Menu(menubar, tearoff=0)
@@ -131,6 +135,11 @@ class OllamaGUI:
         # Komponenty
         self.chat_component = ChatComponent(self, self.notebook)
         self.testing_component = TestingComponent(self, self.notebook)
+        
+        # Zadania w tle (działające, w kolejce, zakończone)
+        self.tasks_panel = TasksPanel(self.notebook, self.task_executor)
+        self.notebook.add(self.tasks_panel.frame, text="⚙️ Zadania")
+        self.tasks_panel.start()
     
     def setup_status_bar(self, parent):
         """Tworzy pasek statusu"""
@@ -156,7 +165,7 @@ class OllamaGUI:
     
     def load_models(self):
         """Ładuje listę dostępnych modeli"""
-        def load_in_thread():
+        def load_in_thread(task):
             try:
                 self.root.after(0, lambda: self.progress_bar.start())
                 self.root.after(0, lambda: self.progress_var.set("Ładowanie modeli..."))
@@ -180,7 +189,8 @@ class OllamaGUI:
                 self.root.after(0, lambda: self.progress_bar.stop())
                 self.root.after(0, lambda: self.progress_var.set("Gotowy"))
         
-        threading.Thread(target=load_in_thread, daemon=True).start()
+        # Wielokrotne kliknięcie odświeżania nie dubluje zapytań
+        self.task_executor.submit('models', "Pobieranie listy modeli", load_in_thread, dedupe=True)
     
     def refresh_models(self):
         """Odświeża listę modeli"""
@@ -266,6 +276,12 @@ TRYBY SYSTEMOWE:
         
         messagebox.showinfo("Pomoc", help_text)
     
+    def on_closing(self):
+        """Zamyka aplikację, anulując zadania w tle"""
+        self.tasks_panel.stop()
+        self.task_executor.shutdown(cancel_pending=True)
+        self.root.destroy()
+    
     def run(self):
         """Uruchamia aplikację"""
         self.root.mainloop()
@@ -0,0 +1,270 @@
+"""
+Task Executor for Ollama GUI
+============================
+
+Background work of the GUI (chat replies, test runs, model lists, judge checks)
+goes through one executor instead of a fresh thread per click. A fixed number
+of worker threads (TASK_EXECUTOR_CONFIG['max_workers']) takes tasks from a
+queue; each task kind has its own concurrency limit, so e.g. a second test run
+waits for the first instead of hitting Ollama at the same time. Every task gets
+a TaskHandle: the task polls ``handle.cancelled`` at safe points, the GUI uses
+it to cancel and to show what is queued or running.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import TASK_EXECUTOR_CONFIG
+
+
+# Stany zadania
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class TaskCancelled(Exception):
+    """Zgłaszany przez TaskHandle.check() w anulowanym zadaniu"""
+
+
+class TaskHandle:
+    """Uchwyt zadania: stan, czasy i anulowanie (bezpieczne z dowolnego wątku)"""
+
+    def __init__(self, task_id: int, kind: str, name: str):
+        self.id = task_id
+        self.kind = kind
+        self.name = name
+        self.state = QUEUED
+        self.error: Optional[str] = None
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._on_dropped: Optional[Callable[['TaskHandle'], None]] = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Czy zażądano anulowania (zadanie kończy się w najbliższym bezpiecznym punkcie)"""
+        return self._cancel.is_set()
+
+    @property
+    def active(self) -> bool:
+        """Czy zadanie czeka w kolejce lub działa"""
+        return self.state not in FINISHED_STATES
+
+    @property
+    def elapsed(self) -> float:
+        """Czas działania (s); 0 dla zadania w kolejce"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def cancel(self) -> None:
+        """Żąda anulowania (zadanie w kolejce nie zostanie uruchomione)"""
+        self._cancel.set()
+
+    def check(self) -> None:
+        """Zgłasza TaskCancelled, jeśli zażądano anulowania"""
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Czeka na zakończenie zadania; zwraca True, jeśli się zakończyło"""
+        return self._finished.wait(timeout)
+
+    def __repr__(self) -> str:
+        return f"<TaskHandle #{self.id} {self.kind}:{self.name} {self.state}>"
+
+
+class TaskExecutor:
+    """Ograniczona pula wątków z kolejką i limitami współbieżności per rodzaj zadania"""
+
+    def __init__(self, max_workers: int = None, kind_limits: Dict[str, int] = None, history: int = None):
+        """
+        Args:
+            max_workers (int): Maksymalna liczba wątków roboczych
+            kind_limits (Dict[str, int]): Limit jednocześnie działających zadań danego rodzaju
+            history (int): Liczba zakończonych zadań zachowywanych do podglądu
+        """
+        self.max_workers = max_workers or TASK_EXECUTOR_CONFIG['max_workers']
+        self.kind_limits = dict(TASK_EXECUTOR_CONFIG['kind_limits'] if kind_limits is None else kind_limits)
+        self._condition = threading.Condition()
+        self._queue: deque = deque()
+        self._running: Dict[str, int] = {}
+        self._tasks: List[TaskHandle] = []
+        self._finished: deque = deque(maxlen=history or TASK_EXECUTOR_CONFIG['history'])
+        self._workers: List[threading.Thread] = []
+        self._idle = 0
+        self._ids = itertools.count(1)
+        self._shutdown = False
+        self.version = 0  # Rośnie przy każdej zmianie stanu (panel zadań odświeża się po zmianie)
+
+    def submit(self, kind: str, name: str, fn: Callable[..., Any], *args: Any,
+               dedupe: bool = False, on_dropped: Callable[[TaskHandle], None] = None) -> Optional[TaskHandle]:
+        """
+        Dodaje zadanie do kolejki.
+
+        Args:
+            kind (str): Rodzaj zadania (klucz kind_limits, np. 'chat', 'test', 'models')
+            name (str): Opis zadania w panelu zadań
+            fn (Callable): Funkcja zadania wywoływana jako fn(handle, *args) w wątku roboczym
+            *args: Dodatkowe argumenty funkcji
+            dedupe (bool): Zwróć istniejące aktywne zadanie o tym samym rodzaju i nazwie zamiast dodawać nowe
+            on_dropped (Callable): Wywoływane z uchwytem, gdy zadanie anulowano, zanim się rozpoczęło
+                (fn nie zostanie wywołana - np. do przywrócenia stanu GUI ustawionego przed submit)
+
+        Returns:
+            Optional[TaskHandle]: Uchwyt zadania (None po zamknięciu executora)
+        """
+        with self._condition:
+            if self._shutdown:
+                return None
+            if dedupe:
+                for task in self._tasks:
+                    if task.kind == kind and task.name == name and not task.cancelled:
+                        return task
+            task = TaskHandle(next(self._ids), kind, name)
+            task._on_dropped = on_dropped
+            self._tasks.append(task)
+            self._queue.append((task, fn, args))
+            self._changed()
+            if len(self._queue) > self._idle and len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, name=f"gui-worker-{len(self._workers) + 1}",
+                                          daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            else:
+                self._condition.notify()
+            return task
+
+    def tasks(self) -> List[TaskHandle]:
+        """Zadania aktywne (w kolejności dodania), a po nich ostatnio zakończone (najnowsze pierwsze)"""
+        with self._condition:
+            return list(self._tasks) + list(reversed(self._finished))
+
+    def active(self, kind: str = None) -> List[TaskHandle]:
+        """Aktywne zadania (opcjonalnie tylko danego rodzaju)"""
+        with self._condition:
+            return [task for task in self._tasks if kind is None or task.kind == kind]
+
+    def is_busy(self, kind: str) -> bool:
+        """Czy zadanie danego rodzaju czeka lub działa (i nie zostało anulowane)"""
+        return any(not task.cancelled for task in self.active(kind))
+
+    def cancel_all(self, kind: str = None) -> int:
+        """
+        Anuluje aktywne zadania.
+
+        Args:
+            kind (str): Tylko zadania tego rodzaju (domyślnie wszystkie)
+
+        Returns:
+            int: Liczba anulowanych zadań
+        """
+        tasks = self.active(kind)
+        for task in tasks:
+            self.cancel(task)
+        return len(tasks)
+
+    def cancel(self, task: TaskHandle) -> None:
+        """Anuluje zadanie (zadanie w kolejce jest od razu usuwane, działające kończy się samo)"""
+        dropped = False
+        with self._condition:
+            task.cancel()
+            if task.state == QUEUED:
+                for entry in self._queue:
+                    if entry[0] is task:
+                        self._queue.remove(entry)
+                        self._finish(task, CANCELLED)
+                        dropped = True
+                        break
+            self._changed()
+        if dropped and task._on_dropped is not None:
+            # Poza blokadą - callback może odpytywać executor
+            try:
+                task._on_dropped(task)
+            except Exception as e:
+                print(f"⚠️ Błąd obsługi anulowania {task.kind}:{task.name}: {e}")
+
+    def shutdown(self, cancel_pending: bool = True, timeout: float = None) -> None:
+        """
+        Zamyka executor: nowe zadania są odrzucane, wątki kończą się po bieżących zadaniach.
+
+        Args:
+            cancel_pending (bool): Anuluj zadania w kolejce i zażądaj przerwania działających
+            timeout (float): Maksymalny czas oczekiwania na wątki (None - bez czekania)
+        """
+        if cancel_pending:
+            self.cancel_all()
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+            workers = list(self._workers)
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            for worker in workers:
+                worker.join(max(0.0, deadline - time.monotonic()))
+
+    def _changed(self) -> None:
+        self.version += 1
+
+    def _next(self):
+        """Pierwsze zadanie z kolejki, którego rodzaj ma wolny limit (wywoływane z blokadą)"""
+        for entry in self._queue:
+            task = entry[0]
+            if self._running.get(task.kind, 0) < self.kind_limits.get(task.kind, self.max_workers):
+                self._queue.remove(entry)
+                return entry
+        return None
+
+    def _finish(self, task: TaskHandle, state: str, error: str = None) -> None:
+        task.state = state
+        task.error = error
+        task.finished_at = time.monotonic()
+        self._tasks.remove(task)
+        self._finished.append(task)
+        task._finished.set()
+        self._changed()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                entry = self._next()
+                while entry is None:
+                    if self._shutdown and not self._queue:
+                        return
+                    self._idle += 1
+                    self._condition.wait()
+                    self._idle -= 1
+                    entry = self._next()
+                task, fn, args = entry
+                self._running[task.kind] = self._running.get(task.kind, 0) + 1
+                task.state = RUNNING
+                task.started_at = time.monotonic()
+                self._changed()
+
+            state, error = DONE, None
+            try:
+                fn(task, *args)
+                if task.cancelled:
+                    state = CANCELLED
+            except TaskCancelled:
+                state = CANCELLED
+            except Exception as e:
+                # Błąd zadania nie może zabić wątku roboczego
+                state, error = FAILED, str(e)
+                print(f"⚠️ Błąd zadania {task.kind}:{task.name}: {e}")
+
+            with self._condition:
+                self._running[task.kind] -= 1
+                self._finish(task, state, error)
+                # Zwolniony limit rodzaju może odblokować zadania czekające w kolejce
+                self._condition.notify_all()
@@ -12,17 +12,15 @@ Wersja: 2.0.0 GUI
 
 import sys
 import os
-import threading
 import time
 from datetime import datetime
-from queue import Queue
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 
 # Dodaj src do PYTHONPATH
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.api import get_available_models, ask_ollama, judge_with_gemini
+from src.api import get_available_models, ask_ollama, judge_with_gemini, PRIORITY_BATCH
 from src.utils import (
     get_comprehensive_test_prompts, 
     get_quick_test_prompts,
@@ -30,9 +28,20 @@ from src.utils import (
     get_available_languages,
     get_language_display_name,
     get_timestamp,
-    generate_summary
+    generate_summary,
+    ResultStore
 )
+from src.utils.exporters import export_run
+from src.testers import JudgePipeline
 from src.config import DEFAULT_SLEEP_BETWEEN_MODELS
+from gui.config import EVENT_BUS_CONFIG
+from gui.events import (
+    UIEventBus, TokenChunk, ResultReady, ResultUpdated, Progress, Status, UICall, group_chunks
+)
+from gui.components.results_grid import ResultsGrid
+from gui.components.live_dashboard import LiveDashboard
+from gui.components.tasks_panel import TasksPanel
+from gui.task_executor import TaskExecutor
 
 
 class OllamaGUI:
@@ -67,7 +76,10 @@ class OllamaGUI:
         self.current_chat_file = None
         self.is_testing = False
         self.stop_testing = False  # Flaga do zatrzymywania testów
-        self.test_queue = Queue()
+        # Zdarzenia z wątków roboczych stosowane partiami w monitor_queue
+        self.ui_events = UIEventBus()
+        # Zadania w tle (czat, testy, lista modeli) przez jedną ograniczoną pulę wątków
+        self.task_executor = TaskExecutor()
         
         # Style
         self.setup_styles()
@@ -79,6 +91,11 @@ class OllamaGUI:
         self.load_models()
         
         # Start monitoring queue
+        self.ui_events.subscribe(TokenChunk, self.apply_text_chunks)
+        self.ui_events.subscribe(Status, self.apply_status)
+        self.ui_events.subscribe(Progress, self.apply_progress)
+        self.ui_events.subscribe(ResultReady, self.apply_results)
+        self.ui_events.subscribe(ResultUpdated, self.apply_result_updates)
         self.monitor_queue()
     
     def load_gemini_api_key(self):
@@ -86,7 +103,8 @@ class OllamaGUI:
         return os.getenv("GEMINI_API_KEY", "")
 
     def stop_test(self):
-        """Zatrzymuje aktualnie działający test"""
+        """Zatrzymuje aktualnie działający test (i testy czekające w kolejce)"""
+        cancelled = self.task_executor.cancel_all('test')
         if self.is_testing:
             self.stop_testing = True
             if hasattr(self, 'test_status_var'):
@@ -95,7 +113,7 @@ class OllamaGUI:
                 self.stop_test_btn.config(state="disabled")
             if hasattr(self, 'status_label'):
                 self.status_label.config(text="🛑 Zatrzymywanie testów...", style='Warning.TLabel')
-        else:
+        elif not cancelled:
             messagebox.showinfo("Info", "Żaden test obecnie nie jest uruchomiony")
 
     def setup_styles(self):
@@ -211,6 +229,11 @@ class OllamaGUI:
         # Zakładka testów
         self.setup_test_tab()
         
+        # Zakładka zadań w tle
+        self.tasks_panel = TasksPanel(self.notebook, self.task_executor)
+        self.notebook.add(self.tasks_panel.frame, text="⚙️ Zadania")
+        self.tasks_panel.start()
+        
         # === PASEK STANU ===
         status_frame = ttk.Frame(main_frame)
         status_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
@@ -304,7 +327,7 @@ class OllamaGUI:
         self.notebook.add(test_frame, text="🧪 Testy")
         
         test_frame.columnconfigure(0, weight=1)
-        test_frame.rowconfigure(1, weight=1)
+        test_frame.rowconfigure(2, weight=1)
         
         # Panel kontrolny testów
         control_frame = ttk.LabelFrame(test_frame, text="Kontrola testów", padding="10")
@@ -355,12 +378,27 @@ class OllamaGUI:
         self.test_progress = ttk.Progressbar(control_frame, mode='determinate')
         self.test_progress.grid(row=2, column=1, sticky=(tk.W, tk.E), padx=(10, 0), pady=(5, 0))
         
-        # Wyniki testów
+        # Metryki przebiegu na żywo (wątki testów aktualizują self.live_metrics)
+        metrics_frame = ttk.LabelFrame(test_frame, text="📈 Metryki na żywo", padding="5")
+        metrics_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        metrics_frame.columnconfigure(0, weight=1)
+        self.live_dashboard = LiveDashboard(metrics_frame)
+        self.live_dashboard.canvas.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        self.live_metrics = self.live_dashboard.metrics
+        self.live_dashboard.start()
+        
+        # Wyniki testów: log przebiegu i tabela wyników
+        results_notebook = ttk.Notebook(test_frame)
+        results_notebook.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
         self.test_display = scrolledtext.ScrolledText(
-            test_frame, wrap=tk.WORD, height=25, width=80,
+            results_notebook, wrap=tk.WORD, height=25, width=80,
             font=('Consolas', 9), state=tk.DISABLED
         )
-        self.test_display.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        results_notebook.add(self.test_display, text="📜 Log")
+        
+        self.results_grid = ResultsGrid(results_notebook)
+        results_notebook.add(self.results_grid.frame, text="📋 Tabela wyników")
         
         # Tagi dla wyników testów
         self.test_display.tag_configure("header", font=('Consolas', 11, 'bold'), foreground="blue")
@@ -388,7 +426,7 @@ class OllamaGUI:
 
     def load_models(self):
         """Ładuje dostępne modele i języki"""
-        def load_in_thread():
+        def load_in_thread(task):
             try:
                 self.root.after(0, lambda: self.status_label.config(text="Ładowanie modeli..."))
                 models = get_available_models()
@@ -403,7 +441,7 @@ class OllamaGUI:
                 self.root.after(0, lambda: self.status_label.config(
                     text=f"❌ Błąd: {str(e)}", style='Error.TLabel'))
         
-        threading.Thread(target=load_in_thread, daemon=True).start()
+        self.task_executor.submit('models', "Pobieranie listy modeli", load_in_thread, dedupe=True)
     
     def load_languages(self):
         """Ładuje dostępne języki testów"""
@@ -599,7 +637,7 @@ class OllamaGUI:
         self.add_to_chat(f"[Ty]: {message}", "user")
         
         # Wyślij do modelu w osobnym wątku
-        def send_in_thread():
+        def send_in_thread(task):
             model = self.selected_model.get()
             self.root.after(0, lambda: self.add_to_chat(f"[{model}]: ", "model"))
             self.root.after(0, lambda: self.progress_var.set("Generowanie odpowiedzi..."))
@@ -618,16 +656,24 @@ class OllamaGUI:
                 
                 # Uzyskaj odpowiedź z promptem systemowym
                 system_prompt = self.get_current_system_prompt()
+                
+                def check_cancelled(token):
+                    # Wyjątek w callbacku przerywa strumień i zamyka połączenie z Ollama
+                    task.check()
+                
                 result = ask_ollama(
                     model, 
                     message, 
                     "Czat GUI", 
                     self.current_chat_file, 
                     temperature=0.7,
-                    system_prompt=system_prompt
+                    system_prompt=system_prompt,
+                    token_callback=check_cancelled
                 )
                 
-                if result and 'response' in result:
+                if task.cancelled:
+                    self.root.after(0, lambda: self.add_to_chat("🛑 Generowanie zatrzymane", "system"))
+                elif result and 'response' in result:
                     response = result['response']
                     self.root.after(0, lambda: self.add_to_chat(response, "model"))
                 else:
@@ -640,7 +686,7 @@ class OllamaGUI:
                 self.root.after(0, lambda: self.progress_bar.stop())
                 self.root.after(0, lambda: self.progress_var.set("Gotowy"))
         
-        threading.Thread(target=send_in_thread, daemon=True).start()
+        self.task_executor.submit('chat', f"{self.selected_model.get()}: {message[:40]}", send_in_thread)
     
     def add_to_chat(self, text, tag=None):
         """Dodaje tekst do obszaru czatu"""
@@ -850,8 +896,9 @@ class OllamaGUI:
             return ""
     
     def stop_generation(self):
-        """Zatrzymuje generowanie odpowiedzi (placeholder)"""
-        messagebox.showinfo("Info", "Funkcja zatrzymywania zostanie zaimplementowana w przyszłości")
+        """Zatrzymuje generowanie odpowiedzi (także wiadomości czekające w kolejce)"""
+        if not self.task_executor.cancel_all('chat'):
+            messagebox.showinfo("Info", "Brak generowanej odpowiedzi")
     
     def ask_all_models_dialog(self):
         """Dialog do zadania pytania wszystkim modelom"""
@@ -894,6 +941,21 @@ class OllamaGUI:
         # Bind Enter
         prompt_text.bind("<Control-Return>", lambda e: submit())
     
+    def on_test_dropped(self, task):
+        """
+        Przywraca stan GUI po anulowaniu testu, który nie zdążył wystartować
+        (worker nie wykona wtedy swojego bloku finally)
+        
+        Args:
+            task (TaskHandle): Anulowane zadanie z kolejki
+        """
+        if self.task_executor.active('test'):
+            return  # Inny test nadal działa lub czeka - on przywróci stan po sobie
+        self.is_testing = False
+        self.stop_testing = False
+        self.ui_events.publish(UICall(lambda: self.update_test_buttons_state(testing=False)))
+        self.ui_events.publish(Status("✅ Gotowy", target='main', style='Success.TLabel'))
+    
     def ask_all_models(self, prompt):
         """Zadaje pytanie wszystkim modelom"""
         if not self.models:
@@ -912,7 +974,7 @@ class OllamaGUI:
         # Przełącz na zakładkę testów
         self.notebook.select(1)
         
-        def test_in_thread():
+        def test_in_thread(task):
             try:
                 # Pobierz aktualnie wybrany język
                 current_language = getattr(self, 'selected_language_code', 'polish')
@@ -937,7 +999,7 @@ class OllamaGUI:
                 self.root.after(0, lambda: self.test_progress.config(maximum=len(self.models)))
                 
                 for i, model in enumerate(self.models):
-                    if self.stop_testing:
+                    if task.cancelled:
                         break
                         
                     self.root.after(0, lambda m=model: self.test_status_var.set(f"Testowanie: {m}"))
@@ -961,12 +1023,12 @@ class OllamaGUI:
                         self.root.after(0, lambda e=str(e): self.test_display.insert(tk.END, 
                             f"{error_prefix}{e}\n\n", "error"))
                     
-                    if not self.stop_testing:
+                    if not task.cancelled:
                         time.sleep(DEFAULT_SLEEP_BETWEEN_MODELS)
                 
                 self.root.after(0, lambda: self.test_progress.config(value=len(self.models)))
                 
-                if self.stop_testing:
+                if task.cancelled:
                     completion_text = "Test zatrzymany" if current_language == "polish" else "Test stopped"
                     saved_text = "Test zatrzymany!" if current_language == "polish" else "Test stopped!"
                 else:
@@ -1043,7 +1105,8 @@ class OllamaGUI:
             self.root.after(0, lambda: self.test_display.config(state=tk.DISABLED))
             self.root.after(0, lambda: self.test_display.see(tk.END))
         
-        threading.Thread(target=test_in_thread, daemon=True).start()
+        self.task_executor.submit('test', f"Pytanie do wszystkich modeli: {prompt[:30]}", test_in_thread,
+                                  on_dropped=self.on_test_dropped)
     
     def run_quick_test(self):
         """Uruchamia szybki test"""
@@ -1072,7 +1135,7 @@ class OllamaGUI:
         # Przełącz na zakładkę testów
         self.notebook.select(1)
         
-        def test_in_thread():
+        def test_in_thread(task):
             timestamp = get_timestamp()
             lang_suffix = f"_{language}" if language != "polish" else ""
             output_file = f"{test_type}_test{lang_suffix}_{timestamp}.txt"
@@ -1080,90 +1143,101 @@ class OllamaGUI:
             total_tests = len(test_prompts) * len(self.models)
             current_test = 0
             
-            self.root.after(0, lambda: self.test_display.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.test_display.delete("1.0", tk.END))
+            self.ui_events.publish(UICall(self.reset_test_views))
             
             lang_name = get_language_display_name(language)
-            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                f"🚀 Test {test_type} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", "header"))
-            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                f"Język: {lang_name}\n", "header"))
-            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                f"Modele: {', '.join(self.models)}\n", "header"))
-            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                f"Zadania: {len(test_prompts)}\n\n", "header"))
-            
-            self.root.after(0, lambda: self.test_progress.config(maximum=total_tests))
+            self.post_text(f"🚀 Test {test_type} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", "header")
+            self.post_text(f"Język: {lang_name}\n", "header")
+            self.post_text(f"Modele: {', '.join(self.models)}\n", "header")
+            self.post_text(f"Zadania: {len(test_prompts)}\n\n", "header")
             
-            results = []
+            self.ui_events.publish(Progress(0, total_tests))
             
-            for i, test in enumerate(test_prompts, 1):
-                self.root.after(0, lambda t=test['name'], i=i: self.test_display.insert(tk.END, 
-                    f"📝 Zadanie {i}: {t}\n", "header"))
+            results = judge_pipeline = None
+            try:
+                self.live_metrics.start_run(self.models, total_tests)
+                results = ResultStore.for_output_file(output_file)
                 
-                for j, model in enumerate(self.models, 1):
-                    current_test += 1
-                    self.root.after(0, lambda m=model, c=current_test, t=total_tests: 
-                        self.test_status_var.set(f"Test {c}/{t}: {m}"))
-                    self.root.after(0, lambda c=current_test: self.test_progress.config(value=c))
-                    
-                    self.root.after(0, lambda m=model: self.test_display.insert(tk.END, 
-                        f"  🤖 {m}: ", "model"))
+                if self.use_judge.get() and self.gemini_api_key:
+                    judge_pipeline = JudgePipeline(
+                        lambda response, prompt: judge_with_gemini(
+                            response, prompt, self.gemini_api_key, priority=PRIORITY_BATCH),
+                        output_file, results, on_verdict=self.show_judge_verdict
+                    )
+                
+                for i, test in enumerate(test_prompts, 1):
+                    if task.cancelled:
+                        break
+                    self.post_text(f"📝 Zadanie {i}: {test['name']}\n", "header")
                     
-                    try:
-                        result = ask_ollama(model, test['prompt'], test['name'], output_file, 
-                                          **test.get('options', {}))
-                        if result:
-                            results.append(result)
-                            
-                            # Używaj sędziego LLM jeśli włączony
-                            if self.use_judge.get() and 'response' in result and self.gemini_api_key:
-                                try:
-                                    self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                                        "🔄 Ocena AI...", "model"))
-                                    
-                                    rating, justification = judge_with_gemini(
-                                        result['response'],  # odpowiedź modelu
-                                        test['prompt'],      # oryginalne pytanie  
-                                        self.gemini_api_key  # klucz API
-                                    )
-                                    
-                                    # Dodaj ocenę do wyniku
-                                    result['judge_rating'] = rating
-                                    result['judge_justification'] = justification
-                                    
-                                    self.root.after(0, lambda r=rating, j=justification: self.test_display.insert(tk.END, 
-                                        f" ⭐{r}/5 [szczegóły]\n", "success"))
-                                    
-                                    # Dodaj uzasadnienie jako ukryty tekst (można rozwinąć klikając)
-                                    # TODO: Implementować rozwijane szczegóły
-                                    
-                                except Exception as judge_error:
-                                    self.root.after(0, lambda e=str(judge_error): self.test_display.insert(tk.END, 
-                                        f" ❌ Błąd sędziego: {e[:50]}...\n", "error"))
+                    for j, model in enumerate(self.models, 1):
+                        if task.cancelled:
+                            break
+                        current_test += 1
+                        self.ui_events.publish(Status(f"Test {current_test}/{total_tests}: {model}"))
+                        self.ui_events.publish(Progress(current_test))
+                        
+                        self.post_text(f"  🤖 {model}: ", "model")
+                        
+                        try:
+                            self.live_metrics.start_stream(model)
+                            result = ask_ollama(model, test['prompt'], test['name'], output_file, 
+                                              token_callback=self.live_metrics.record_token,
+                                              **test.get('options', {}))
+                            self.live_metrics.record_result(model, result)
+                            if result:
+                                result['category'] = test.get('category')
+                                result['language'] = language
+                                row = results.append(result)
+                                self.ui_events.publish(ResultReady(result, row, results))
+                                
+                                # Oceń sędzią LLM w tle - kolejny model startuje od razu
+                                if judge_pipeline and 'response' in result:
+                                    judge_pipeline.submit(result, test['prompt'], row)
+                                    self.post_text("✅ OK · 🔄 ocena AI w kolejce\n", "success")
+                                else:
+                                    self.post_text("✅ OK\n", "success")
                             else:
-                                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                                    "✅ OK\n", "success"))
-                        else:
-                            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                                "❌ Błąd\n", "error"))
-                    except Exception as e:
-                        self.root.after(0, lambda e=str(e): self.test_display.insert(tk.END, 
-                            f"❌ {e}\n", "error"))
-                
-                # Podsumowanie
-                summary = generate_summary(results, output_file)
+                                self.post_text("❌ Błąd\n", "error")
+                                self.publish_failed_result(model, test['name'])
+                        except Exception as e:
+                            self.post_text(f"❌ {e}\n", "error")
+                            self.publish_failed_result(model, test['name'])
+                    
+                    if judge_pipeline:
+                        judge_pipeline.join()
+                    
+                    # Podsumowanie
+                    summary = generate_summary(results, output_file)
+                    
+                    self.post_text(f"📊 PODSUMOWANIE:\n{summary}\n", "summary")
+                    self.post_text(f"✅ Test zakończony! Wyniki zapisane w: {output_file}\n", "summary")
+                    for export_path in export_run(results, output_file):
+                        self.post_text(f"📦 Eksport: {export_path}\n", "summary")
                 
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"📊 PODSUMOWANIE:\n{summary}\n", "summary"))
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"✅ Test zakończony! Wyniki zapisane w: {output_file}\n", "summary"))
-            
-            self.root.after(0, lambda: self.test_status_var.set("Test zakończony"))
-            self.root.after(0, lambda: self.test_display.config(state=tk.DISABLED))
-            self.root.after(0, lambda: self.test_display.see(tk.END))
-        
-        threading.Thread(target=test_in_thread, daemon=True).start()
+            finally:
+                # Pliki magazynu wyników i pula sędziego zwalniane także po błędzie w trakcie testu
+                if judge_pipeline:
+                    judge_pipeline.close()
+                if results is not None:
+                    results.close()
+                # Panel metryk nie może zostać w stanie "w toku" po błędzie
+                self.live_metrics.finish_run()
+            self.ui_events.publish(Status("Test zakończony"))
+        
+        self.task_executor.submit('test', f"Test {test_type} ({language})", test_in_thread)
+    
+    def show_judge_verdict(self, job, rating, justification):
+        """Wyświetla ocenę sędziego dostarczoną przez JudgePipeline (wywoływane z wątku sędziego)"""
+        tag = "success" if rating > 0 else "error"
+        text = f"    ⚖️ {job['model']} · {job['test_name']}: "
+        text += f"⭐{rating}/5\n" if rating > 0 else f"❌ {justification[:50]}...\n"
+        self.post_text(text, tag)
+        self.live_metrics.record_rating(job['model'], rating)
+        if job.get('row') is not None:
+            fields = {'judge_rating': rating} if rating > 0 else {'status': 'judge error'}
+            self.ui_events.publish(ResultUpdated(job['row'], fields))
+
     
     def run_quick_test_async(self):
         """Uruchamia szybki test asynchronicznie z możliwością zatrzymania"""
@@ -1232,7 +1306,8 @@ class OllamaGUI:
         # Przełącz na zakładkę testów
         self.notebook.select(1)
         
-        def test_in_thread():
+        def test_in_thread(task):
+            results = judge_pipeline = None
             try:
                 timestamp = get_timestamp()
                 lang_suffix = f"_{language}" if language != "polish" else ""
@@ -1241,124 +1316,123 @@ class OllamaGUI:
                 total_tests = len(test_prompts) * len(self.models)
                 current_test = 0
                 
-                self.root.after(0, lambda: self.test_display.config(state=tk.NORMAL))
-                self.root.after(0, lambda: self.test_display.delete("1.0", tk.END))
+                self.ui_events.publish(UICall(self.reset_test_views))
                 
                 lang_name = get_language_display_name(language)
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"🚀 Test {test_type} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", "header"))
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"Język: {lang_name}\n", "header"))
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"Modele: {', '.join(self.models)}\n", "header"))
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"Zadania: {len(test_prompts)}\n\n", "header"))
+                self.post_text(f"🚀 Test {test_type} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", "header")
+                self.post_text(f"Język: {lang_name}\n", "header")
+                self.post_text(f"Modele: {', '.join(self.models)}\n", "header")
+                self.post_text(f"Zadania: {len(test_prompts)}\n\n", "header")
+                
+                self.ui_events.publish(Progress(0, total_tests))
+                self.live_metrics.start_run(self.models, total_tests, DEFAULT_SLEEP_BETWEEN_MODELS)
                 
-                self.root.after(0, lambda: self.test_progress.config(maximum=total_tests))
+                results = ResultStore.for_output_file(output_file)
                 
-                results = []
+                # Oceny sędziego wykonywane równolegle z generowaniem kolejnych odpowiedzi
+                judge_pipeline = None
+                if self.use_judge.get() and self.gemini_api_key:
+                    judge_pipeline = JudgePipeline(
+                        lambda response, prompt: judge_with_gemini(
+                            response, prompt, self.gemini_api_key, priority=PRIORITY_BATCH),
+                        output_file, results, on_verdict=self.show_judge_verdict
+                    )
                 
                 for i, test in enumerate(test_prompts, 1):
-                    if self.stop_testing:
+                    if task.cancelled:
                         break
                         
-                    self.root.after(0, lambda t=test['name'], i=i: self.test_display.insert(tk.END, 
-                        f"📝 Zadanie {i}: {t}\n", "header"))
+                    self.post_text(f"📝 Zadanie {i}: {test['name']}\n", "header")
                     
                     for j, model in enumerate(self.models, 1):
-                        if self.stop_testing:
+                        if task.cancelled:
                             break
                             
                         current_test += 1
-                        self.root.after(0, lambda m=model, c=current_test, t=total_tests: 
-                            self.test_status_var.set(f"Test {c}/{t}: {m}"))
-                        self.root.after(0, lambda c=current_test: self.test_progress.config(value=c))
+                        self.ui_events.publish(Status(f"Test {current_test}/{total_tests}: {model}"))
+                        self.ui_events.publish(Progress(current_test))
                         
-                        self.root.after(0, lambda m=model: self.test_display.insert(tk.END, 
-                            f"  🤖 {m}: ", "model"))
+                        self.post_text(f"  🤖 {model}: ", "model")
                         
                         try:
+                            self.live_metrics.start_stream(model)
                             result = ask_ollama(model, test['prompt'], test['name'], output_file, 
+                                              token_callback=self.live_metrics.record_token,
                                               **test.get('options', {}))
+                            self.live_metrics.record_result(model, result)
                             if result:
-                                results.append(result)
+                                result['category'] = test.get('category')
+                                result['language'] = language
+                                row = results.append(result)
+                                self.ui_events.publish(ResultReady(result, row, results))
                                 
-                                # Używaj sędziego LLM jeśli włączony i dostępny
-                                if self.use_judge.get() and 'response' in result and self.gemini_api_key:
-                                    try:
-                                        self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                                            "🔄 Ocena AI...", "model"))
-                                        
-                                        rating, justification = judge_with_gemini(
-                                            result['response'],  # odpowiedź modelu
-                                            test['prompt'],      # oryginalne pytanie  
-                                            self.gemini_api_key  # klucz API
-                                        )
-                                        
-                                        # Dodaj ocenę do wyniku
-                                        result['judge_rating'] = rating
-                                        result['judge_justification'] = justification
-                                        
-                                        self.root.after(0, lambda r=rating: self.test_display.insert(tk.END, 
-                                            f" ⭐{r}/5\n", "success"))
-                                        
-                                    except Exception as judge_error:
-                                        self.root.after(0, lambda e=str(judge_error): self.test_display.insert(tk.END, 
-                                            f" ❌ Błąd sędziego: {e[:50]}...\n", "error"))
+                                # Oceń sędzią LLM w tle - kolejny model startuje od razu
+                                if judge_pipeline and 'response' in result:
+                                    judge_pipeline.submit(result, test['prompt'], row)
+                                    self.post_text("✅ OK · 🔄 ocena AI w kolejce\n", "success")
                                 elif self.use_judge.get() and not self.gemini_api_key:
-                                    self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                                        " ⚠️ Sędzia: brak klucza API\n", "error"))
+                                    self.post_text(" ⚠️ Sędzia: brak klucza API\n", "error")
                                 else:
-                                    self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                                        "✅ OK\n", "success"))
+                                    self.post_text("✅ OK\n", "success")
                             else:
-                                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                                    "❌ Błąd\n", "error"))
+                                self.post_text("❌ Błąd\n", "error")
+                                self.publish_failed_result(model, test['name'])
                         except Exception as e:
-                            self.root.after(0, lambda e=str(e): self.test_display.insert(tk.END, 
-                                f"❌ {e}\n", "error"))
+                            self.post_text(f"❌ {e}\n", "error")
+                            self.publish_failed_result(model, test['name'])
                         
-                        if not self.stop_testing:
+                        if not task.cancelled:
                             time.sleep(DEFAULT_SLEEP_BETWEEN_MODELS)
                     
-                    if not self.stop_testing:
-                        self.root.after(0, lambda: self.test_display.insert(tk.END, "\n"))
+                    if not task.cancelled:
+                        self.post_text("\n")
+                
+                if judge_pipeline:
+                    if task.cancelled:
+                        judge_pipeline.close(cancel_pending=True)
+                    else:
+                        pending = judge_pipeline.pending
+                        if pending:
+                            self.ui_events.publish(Status(f"Oczekiwanie na {pending} ocen sędziego..."))
+                        judge_pipeline.join()
+                        judge_pipeline.close()
                 
                 # Podsumowanie
-                if self.stop_testing:
-                    self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                        f"🛑 Test został zatrzymany przez użytkownika\n", "error"))
-                    self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                        f"📊 Częściowe wyniki ({len(results)} testów):\n", "summary"))
+                if task.cancelled:
+                    self.post_text(f"🛑 Test został zatrzymany przez użytkownika\n", "error")
+                    self.post_text(f"📊 Częściowe wyniki ({len(results)} testów):\n", "summary")
                 else:
-                    self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                        f"📊 PODSUMOWANIE:\n", "summary"))
+                    self.post_text(f"📊 PODSUMOWANIE:\n", "summary")
                 
                 if results:
                     summary = generate_summary(results, output_file)
-                    self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                        f"{summary}\n", "summary"))
-                    self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                        f"✅ Wyniki zapisane w: {output_file}\n", "summary"))
+                    self.post_text(f"{summary}\n", "summary")
+                    self.post_text(f"✅ Wyniki zapisane w: {output_file}\n", "summary")
+                    for export_path in export_run(results, output_file):
+                        self.post_text(f"📦 Eksport: {export_path}\n", "summary")
                 
-                final_status = "Test zatrzymany" if self.stop_testing else "Test zakończony"
-                self.root.after(0, lambda: self.test_status_var.set(final_status))
+                final_status = "Test zatrzymany" if task.cancelled else "Test zakończony"
+                self.ui_events.publish(Status(final_status))
                 
             except Exception as e:
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"❌ Krytyczny błąd: {str(e)}\n", "error"))
-                self.root.after(0, lambda: self.test_status_var.set("Błąd testu"))
+                self.post_text(f"❌ Krytyczny błąd: {str(e)}\n", "error")
+                self.ui_events.publish(Status("Błąd testu"))
             
             finally:
+                # Pliki magazynu wyników i pula sędziego zwalniane także po błędzie w trakcie testu
+                if judge_pipeline:
+                    judge_pipeline.close(cancel_pending=True)
+                if results is not None:
+                    results.close()
                 # Przywróć stan GUI
+                self.live_metrics.finish_run()
                 self.is_testing = False
                 self.stop_testing = False
-                self.root.after(0, lambda: self.update_test_buttons_state(testing=False))
-                self.root.after(0, lambda: self.test_display.config(state=tk.DISABLED))
-                self.root.after(0, lambda: self.test_display.see(tk.END))
-                self.root.after(0, lambda: self.status_label.config(text="✅ Gotowy", style='Success.TLabel'))
+                self.ui_events.publish(UICall(lambda: self.update_test_buttons_state(testing=False)))
+                self.ui_events.publish(Status("✅ Gotowy", target='main', style='Success.TLabel'))
         
-        threading.Thread(target=test_in_thread, daemon=True).start()
+        self.task_executor.submit('test', f"Test {test_type} ({language})", test_in_thread,
+                                  on_dropped=self.on_test_dropped)
     
     def update_test_buttons_state(self, testing=False):
         """Aktualizuje stan wszystkich przycisków testów"""
@@ -1384,8 +1458,9 @@ class OllamaGUI:
                 self.stop_test_btn.config(state="disabled")
 
     def stop_generation(self):
-        """Zatrzymuje generowanie odpowiedzi (placeholder)"""
-        messagebox.showinfo("Info", "Funkcja zatrzymywania zostanie zaimplementowana w przyszłości")
+        """Zatrzymuje generowanie odpowiedzi (także wiadomości czekające w kolejce)"""
+        if not self.task_executor.cancel_all('chat'):
+            messagebox.showinfo("Info", "Brak generowanej odpowiedzi")
     
     def ask_all_models_dialog(self):
         """Dialog do zadania pytania wszystkim modelom"""
@@ -1446,7 +1521,7 @@ class OllamaGUI:
         # Przełącz na zakładkę testów
         self.notebook.select(1)
         
-        def test_in_thread():
+        def test_in_thread(task):
             try:
                 # Pobierz aktualnie wybrany język
                 current_language = getattr(self, 'selected_language_code', 'polish')
@@ -1455,142 +1530,134 @@ class OllamaGUI:
                 lang_suffix = f"_{current_language}" if current_language != "polish" else ""
                 output_file = f"single_test{lang_suffix}_{timestamp}.txt"
                 
-                self.root.after(0, lambda: self.test_display.config(state=tk.NORMAL))
-                self.root.after(0, lambda: self.test_display.delete("1.0", tk.END))
+                self.ui_events.publish(UICall(self.reset_test_views))
                 
                 lang_name = get_language_display_name(current_language)
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"🚀 Test własnego pytania - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", "header"))
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"Język: {lang_name}\n", "header"))
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"Pytanie: {prompt}\n", "header"))
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"Modele: {', '.join(self.models)}\n\n", "header"))
+                self.post_text(f"🚀 Test własnego pytania - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", "header")
+                self.post_text(f"Język: {lang_name}\n", "header")
+                self.post_text(f"Pytanie: {prompt}\n", "header")
+                self.post_text(f"Modele: {', '.join(self.models)}\n\n", "header")
                 
-                self.root.after(0, lambda: self.test_progress.config(maximum=len(self.models)))
+                self.ui_events.publish(Progress(0, len(self.models)))
+                self.live_metrics.start_run(self.models, len(self.models), DEFAULT_SLEEP_BETWEEN_MODELS)
                 
                 for i, model in enumerate(self.models):
-                    if self.stop_testing:
+                    if task.cancelled:
                         break
                         
-                    self.root.after(0, lambda m=model: self.test_status_var.set(f"Testowanie: {m}"))
-                    self.root.after(0, lambda i=i: self.test_progress.config(value=i))
+                    self.ui_events.publish(Status(f"Testowanie: {model}"))
+                    self.ui_events.publish(Progress(i))
                     
-                    self.root.after(0, lambda m=model: self.test_display.insert(tk.END, 
-                        f"🤖 Model: {m}\n", "model"))
+                    self.post_text(f"🤖 Model: {model}\n", "model")
                     
                     try:
                         test_name = "Single Question GUI" if current_language == "english" else "Pojedyncze pytanie GUI"
-                        result = ask_ollama(model, prompt, test_name, output_file)
+                        self.live_metrics.start_stream(model)
+                        result = ask_ollama(model, prompt, test_name, output_file,
+                                            token_callback=self.live_metrics.record_token)
+                        self.live_metrics.record_result(model, result)
                         if result and 'response' in result:
+                            self.ui_events.publish(ResultReady(result))
                             response = result['response'][:500] + "..." if len(result['response']) > 500 else result['response']
-                            self.root.after(0, lambda r=response: self.test_display.insert(tk.END, 
-                                f"Odpowiedź: {r}\n\n", "success"))
+                            self.post_text(f"Odpowiedź: {response}\n\n", "success")
                         else:
                             error_text = "❌ Error in response\n\n" if current_language == "english" else "❌ Błąd w odpowiedzi\n\n"
-                            self.root.after(0, lambda: self.test_display.insert(tk.END, error_text, "error"))
+                            self.post_text(error_text, "error")
                     except Exception as e:
                         error_prefix = "❌ Error: " if current_language == "english" else "❌ Błąd: "
-                        self.root.after(0, lambda e=str(e): self.test_display.insert(tk.END, 
-                            f"{error_prefix}{e}\n\n", "error"))
+                        self.post_text(f"{error_prefix}{e}\n\n", "error")
                     
-                    if not self.stop_testing:
+                    if not task.cancelled:
                         time.sleep(DEFAULT_SLEEP_BETWEEN_MODELS)
                 
-                self.root.after(0, lambda: self.test_progress.config(value=len(self.models)))
+                self.ui_events.publish(Progress(len(self.models)))
                 
-                if self.stop_testing:
+                if task.cancelled:
                     completion_text = "Test zatrzymany" if current_language == "polish" else "Test stopped"
                     saved_text = "Test zatrzymany!" if current_language == "polish" else "Test stopped!"
                 else:
                     completion_text = "Test zakończony" if current_language == "polish" else "Test completed"
                     saved_text = "Test zakończony! Wyniki zapisane w:" if current_language == "polish" else "Test completed! Results saved in:"
                     
-                self.root.after(0, lambda: self.test_status_var.set(completion_text))
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"✅ {saved_text} {output_file}\n", "summary"))
+                self.ui_events.publish(Status(completion_text))
+                self.post_text(f"✅ {saved_text} {output_file}\n", "summary")
                     
             except Exception as e:
-                self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                    f"❌ Krytyczny błąd: {str(e)}\n", "error"))
-                self.root.after(0, lambda: self.test_status_var.set("Błąd testu"))
+                self.post_text(f"❌ Krytyczny błąd: {str(e)}\n", "error")
+                self.ui_events.publish(Status("Błąd testu"))
             
             finally:
                 # Przywróć stan GUI
+                self.live_metrics.finish_run()
                 self.is_testing = False
                 self.stop_testing = False
-                self.root.after(0, lambda: self.update_test_buttons_state(testing=False))
-                self.root.after(0, lambda: self.test_display.config(state=tk.DISABLED))
-                self.root.after(0, lambda: self.test_display.see(tk.END))
-                self.root.after(0, lambda: self.status_label.config(text="✅ Gotowy", style='Success.TLabel'))
-            
-            timestamp = get_timestamp()
-            lang_suffix = f"_{current_language}" if current_language != "polish" else ""
-            output_file = f"single_test{lang_suffix}_{timestamp}.txt"
-            
-            self.root.after(0, lambda: self.test_display.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.test_display.delete("1.0", tk.END))
-            
-            lang_name = get_language_display_name(current_language)
-            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                f"🚀 Test własnego pytania - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", "header"))
-            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                f"Język: {lang_name}\n", "header"))
-            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                f"Pytanie: {prompt}\n", "header"))
-            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                f"Modele: {', '.join(self.models)}\n\n", "header"))
-            
-            self.root.after(0, lambda: self.test_progress.config(maximum=len(self.models)))
-            
-            for i, model in enumerate(self.models):
-                self.root.after(0, lambda m=model: self.test_status_var.set(f"Testowanie: {m}"))
-                self.root.after(0, lambda i=i: self.test_progress.config(value=i))
-                
-                self.root.after(0, lambda m=model: self.test_display.insert(tk.END, 
-                    f"🤖 Model: {m}\n", "model"))
-                
-                try:
-                    test_name = "Single Question GUI" if current_language == "english" else "Pojedyncze pytanie GUI"
-                    result = ask_ollama(model, prompt, test_name, output_file)
-                    if result and 'response' in result:
-                        response = result['response'][:500] + "..." if len(result['response']) > 500 else result['response']
-                        self.root.after(0, lambda r=response: self.test_display.insert(tk.END, 
-                            f"Odpowiedź: {r}\n\n", "success"))
-                    else:
-                        error_text = "❌ Error in response\n\n" if current_language == "english" else "❌ Błąd w odpowiedzi\n\n"
-                        self.root.after(0, lambda: self.test_display.insert(tk.END, error_text, "error"))
-                except Exception as e:
-                    error_prefix = "❌ Error: " if current_language == "english" else "❌ Błąd: "
-                    self.root.after(0, lambda e=str(e): self.test_display.insert(tk.END, 
-                        f"{error_prefix}{e}\n\n", "error"))
-                
-                time.sleep(DEFAULT_SLEEP_BETWEEN_MODELS)
-            
-            self.root.after(0, lambda: self.test_progress.config(value=len(self.models)))
-            completion_text = "Test completed" if current_language == "english" else "Test zakończony"
-            saved_text = "Test completed! Results saved in:" if current_language == "english" else "Test zakończony! Wyniki zapisane w:"
-            self.root.after(0, lambda: self.test_status_var.set(completion_text))
-            self.root.after(0, lambda: self.test_display.insert(tk.END, 
-                f"✅ {saved_text} {output_file}\n", "summary"))
-            self.root.after(0, lambda: self.test_display.config(state=tk.DISABLED))
-            self.root.after(0, lambda: self.test_display.see(tk.END))
+                self.ui_events.publish(UICall(lambda: self.update_test_buttons_state(testing=False)))
+                self.ui_events.publish(Status("✅ Gotowy", target='main', style='Success.TLabel'))
         
-        threading.Thread(target=test_in_thread, daemon=True).start()
+        self.task_executor.submit('test', f"Pytanie do wszystkich modeli: {prompt[:30]}", test_in_thread,
+                                  on_dropped=self.on_test_dropped)
+    
+    def post_text(self, text, tag=None):
+        """Publikuje fragment tekstu do widoku testów (bezpieczne z dowolnego wątku)"""
+        self.ui_events.publish(TokenChunk(text, tag))
+    
+    def publish_failed_result(self, model, test_name):
+        """Publikuje wiersz nieudanego testu do tabeli wyników"""
+        self.ui_events.publish(ResultReady({'model': model, 'test_name': test_name, 'status': 'error'}))
+    
+    def clear_display(self, display):
+        """Czyści widok tekstowy (wątek GUI)"""
+        display.config(state=tk.NORMAL)
+        display.delete("1.0", tk.END)
+        display.config(state=tk.DISABLED)
+    
+    def reset_test_views(self):
+        """Czyści log i tabelę wyników przed nowym przebiegiem (wątek GUI)"""
+        self.clear_display(self.test_display)
+        self.results_grid.clear()
+    
+    def apply_text_chunks(self, chunks):
+        """Dopisuje partię fragmentów tekstu - jedno wywołanie insert na widok"""
+        displays = {'test': self.test_display, 'chat': self.chat_display}
+        for target, args in group_chunks(chunks).items():
+            display = displays[target]
+            display.config(state=tk.NORMAL)
+            display.insert(tk.END, *args)
+            display.config(state=tk.DISABLED)
+            display.see(tk.END)
+    
+    def apply_status(self, events):
+        """Ustawia tekst statusu (test: pasek testów, main: etykieta nagłówka)"""
+        for event in events:
+            if event.target == 'main':
+                self.status_label.config(text=event.text, style=event.style or 'Info.TLabel')
+            else:
+                self.test_status_var.set(event.text)
+    
+    def apply_results(self, events):
+        """Dodaje partię wyników do tabeli (odświeżenie widoku raz na partię)"""
+        for event in events:
+            self.results_grid.add_result(event.result, event.row, event.store)
+    
+    def apply_result_updates(self, events):
+        """Uzupełnia wiersze tabeli polami dostarczonymi później (ocena sędziego)"""
+        for event in events:
+            self.results_grid.update_result(event.row, **event.fields)
+    
+    def apply_progress(self, events):
+        """Ustawia pasek postępu testów"""
+        for event in events:
+            if event.maximum is not None:
+                self.test_progress.config(maximum=event.maximum)
+            self.test_progress.config(value=event.value)
     
     def monitor_queue(self):
-        """Monitoruje kolejkę wiadomości"""
-        try:
-            while True:
-                message = self.test_queue.get_nowait()
-                # Przetwarzaj wiadomości z kolejki
-                pass
-        except:
-            pass
+        """Stosuje zdarzenia opublikowane przez wątki robocze (jedna partia na cykl)"""
+        self.ui_events.drain()
         
         # Planuj następne sprawdzenie
-        self.root.after(100, self.monitor_queue)
+        self.root.after(EVENT_BUS_CONFIG['drain_interval_ms'], self.monitor_queue)
+
 
 def main():
     """Główna funkcja aplikacji GUI"""
@@ -1600,6 +1667,7 @@ def main():
     # Obsługa zamykania
     def on_closing():
         if messagebox.askokcancel("Wyjście", "Czy na pewno chcesz zamknąć aplikację?"):
+            app.task_executor.shutdown(cancel_pending=True)
             root.quit()
             root.destroy()
     
@@ -28,8 +28,10 @@ from src.utils import (
     get_timestamp,
     print_progress_bar,
     format_test_header,
-    generate_summary
+    generate_summary,
+    ResultStore
 )
+from src.utils.exporters import export_run
 from src.config import DEFAULT_SLEEP_BETWEEN_MODELS
 
 
@@ -128,7 +130,7 @@ def run_comprehensive_test(language: str = "polish"):
         print(f"Rozpoczynam test {len(models)} modeli z {len(test_prompts)} zadaniami...")
         print(f"Wyniki będą zapisywane do: {output_file}")
     
-    results = []
+    results = ResultStore.for_output_file(output_file)
     total_tests = len(test_prompts) * len(models)
     current_test = 0
     
@@ -143,6 +145,8 @@ def run_comprehensive_test(language: str = "polish"):
             
             result = ask_ollama(model, test['prompt'], test['name'], output_file, **test.get('options', {}))
             if result:
+                result['category'] = test.get('category')
+                result['language'] = language
                 results.append(result)
             
             time.sleep(DEFAULT_SLEEP_BETWEEN_MODELS)
@@ -150,6 +154,9 @@ def run_comprehensive_test(language: str = "polish"):
     # Podsumowanie wyników
     summary = generate_summary(results, output_file)
     print(summary)
+    for export_path in export_run(results, output_file):
+        print(f"📦 Eksport: {export_path}")
+    results.close()
     
     if language == "english":
         print(f"\nTest completed! Results saved in: {output_file}")
@@ -194,7 +201,7 @@ def run_quick_test(language: str = "polish"):
         print(f"Rozpoczynam szybki test {len(models)} modeli z {len(test_prompts)} zadaniami...")
         print(f"Wyniki będą zapisywane do: {output_file}")
     
-    results = []
+    results = ResultStore.for_output_file(output_file)
     total_tests = len(test_prompts) * len(models)
     current_test = 0
     
@@ -209,6 +216,8 @@ def run_quick_test(language: str = "polish"):
             
             result = ask_ollama(model, test['prompt'], test['name'], output_file, **test.get('options', {}))
             if result:
+                result['category'] = test.get('category')
+                result['language'] = language
                 results.append(result)
             
             time.sleep(DEFAULT_SLEEP_BETWEEN_MODELS)
@@ -216,6 +225,9 @@ def run_quick_test(language: str = "polish"):
     # Podsumowanie wyników
     summary = generate_summary(results, output_file)
     print(summary)
+    for export_path in export_run(results, output_file):
+        print(f"📦 Eksport: {export_path}")
+    results.close()
     
     if language == "english":
         print(f"\nQuick test completed! Results saved in: {output_file}")
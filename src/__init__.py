@@ -8,6 +8,7 @@ Structure:
 - api/: API communication modules
 - utils/: Utility functions and helpers
 - testers/: Specific testing implementations
+- graders/: Deterministic (non-LLM) answer graders
 """
 
 __version__ = "1.0.0"
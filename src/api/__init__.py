@@ -1,6 +1,14 @@
 """API module initialization."""
 
-from .ollama_client import get_available_models, ask_ollama, ask_ollama_stream
-from .gemini_client import judge_with_gemini
+from .ollama_client import get_available_models, get_running_models, ask_ollama, ask_ollama_stream, get_embeddings
+from .gemini_client import judge_with_gemini, judge_batch_with_gemini, judge_with_gemini_stream
+from .judge_cache import JudgeCache, get_judge_cache
+from .judge_providers import (
+    JudgeProvider, GeminiJudgeProvider, OllamaJudgeProvider, JUDGE_PROVIDERS, create_judge_provider
+)
+from .rate_limiter import get_rate_limiter, get_rate_limit_metrics, PRIORITY_INTERACTIVE, PRIORITY_BATCH
 
-__all__ = ['get_available_models', 'ask_ollama', 'ask_ollama_stream', 'judge_with_gemini']
+__all__ = ['get_available_models', 'get_running_models', 'ask_ollama', 'ask_ollama_stream', 'get_embeddings', 'judge_with_gemini', 'judge_batch_with_gemini', 'judge_with_gemini_stream', 'JudgeCache', 'get_judge_cache',
+           'get_rate_limiter', 'get_rate_limit_metrics', 'PRIORITY_INTERACTIVE', 'PRIORITY_BATCH',
+           'JudgeProvider', 'GeminiJudgeProvider', 'OllamaJudgeProvider', 'JUDGE_PROVIDERS',
+           'create_judge_provider']
@@ -2,18 +2,127 @@
 Gemini API communication module for AI judge functionality.
 """
 
-import requests
+import json
+import logging
 import re
-from typing import Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from ..config import (
+    GEMINI_API_URL, 
+    GEMINI_JUDGE_MODEL_NAME, 
+    GEMINI_JUDGE_TIMEOUT,
+    GEMINI_JUDGE_CONTEXT_TOKENS,
+    DEFAULT_JUDGE_CONTEXT_TOKENS,
+    JUDGE_BATCH_SIZE,
+    JUDGE_BATCH_MAX_OUTPUT_TOKENS,
+    JUDGE_BATCH_TOKENS_PER_VERDICT,
+    JUDGE_MAX_RETRIES,
+    JUDGE_RETRY_BASE_DELAY,
+    JUDGE_STRUCTURED_OUTPUT,
+    JUDGE_SCORE_ONLY
+)
+from .judge_cache import get_judge_cache, judge_cache_key
+from .rate_limiter import get_rate_limiter, parse_retry_after, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+
+logger = logging.getLogger(__name__)
+
+# Kody HTTP ponawiane po odczekaniu (limit zapytań, przeciążenie serwera)
+RETRYABLE_STATUS_CODES = (429, 503)
+
+# Szablon promptu sędziego (część klucza cache ocen - zmiana szablonu unieważnia cache)
+JUDGE_PROMPT_TEMPLATE = """Oceń jakość poniższej odpowiedzi na oryginalne pytanie.
+    Twoja ocena powinna dotyczyć:
+    1. Poprawności (czy odpowiedź jest prawdziwa/logiczna?).
+    2. Kompletności (czy odpowiedź w pełni odnosi się do pytania?).
+    3. Zrozumiałości (czy odpowiedź jest jasna i dobrze sformułowana?).
+    4. Zgodności z instrukcją (czy odpowiedź spełnia wszystkie wymogi pytania, np. format kodu, komentarze?).
+
+    Twoja ocena powinna być w skali od 1 (bardzo słaba) do 5 (doskonała).
+    Następnie uzasadnij swoją ocenę w kilku zdaniach.
+
+    Format odpowiedzi - wyłącznie obiekt JSON:
+    {{"ocena": [liczba od 1 do 5], "uzasadnienie": "[Twoje uzasadnienie]"}}
+
+    ---
+    ORYGINALNE PYTANIE:
+    {original_prompt}
+
+    ---
+    ODPOWIEDŹ DO OCENY:
+    {model_response}
+    """
+
+# Przybliżona liczba znaków na token (do planowania paczek)
+CHARS_PER_TOKEN = 4
+
+BATCH_JUDGE_PROMPT_HEADER = """Oceń jakość {count} poniższych odpowiedzi na ich oryginalne pytania.
+    Każdą pozycję oceniaj niezależnie. Twoja ocena powinna dotyczyć:
+    1. Poprawności (czy odpowiedź jest prawdziwa/logiczna?).
+    2. Kompletności (czy odpowiedź w pełni odnosi się do pytania?).
+    3. Zrozumiałości (czy odpowiedź jest jasna i dobrze sformułowana?).
+    4. Zgodności z instrukcją (czy odpowiedź spełnia wszystkie wymogi pytania, np. format kodu, komentarze?).
+
+    Każda ocena powinna być w skali od 1 (bardzo słaba) do 5 (doskonała), z krótkim uzasadnieniem.
+
+    Format odpowiedzi - wyłącznie tablica JSON z jednym obiektem na każdą pozycję, w kolejności:
+    [{{"pozycja": 1, "ocena": [liczba od 1 do 5], "uzasadnienie": "[Twoje uzasadnienie]"}}, ...]
+
+"""
+BATCH_JUDGE_ITEM_TEMPLATE = """=== POZYCJA [#{number}] ===
+ORYGINALNE PYTANIE:
+{original_prompt}
+
+ODPOWIEDŹ DO OCENY:
+{model_response}
+"""
+# Szablon, którym klucze cache oznaczają oceny z zapytań paczkowych (inny prompt niż pojedynczy)
+BATCH_JUDGE_CACHE_TEMPLATE = BATCH_JUDGE_PROMPT_HEADER + BATCH_JUDGE_ITEM_TEMPLATE
+
+# Schematy odpowiedzi sędziego (JSON Schema; dla Gemini konwertowane przez _to_gemini_schema)
+JUDGE_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "ocena": {"type": "integer", "minimum": 1, "maximum": 5},
+        "uzasadnienie": {"type": "string"}
+    },
+    "required": ["ocena", "uzasadnienie"]
+}
+BATCH_JUDGE_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "pozycja": {"type": "integer"},
+            "ocena": {"type": "integer", "minimum": 1, "maximum": 5},
+            "uzasadnienie": {"type": "string"}
+        },
+        "required": ["pozycja", "ocena", "uzasadnienie"]
+    }
+}
 
-from ..config import GEMINI_API_URL, GEMINI_JUDGE_MODEL_NAME, GEMINI_JUDGE_TIMEOUT
+_BATCH_ITEM_MARKER = re.compile(r'^\W*(?:POZYCJA\s*)?\[#(\d+)\]\W*$', re.MULTILINE | re.IGNORECASE)
+
+# Awaryjne parsowanie odpowiedzi tekstowych (gdy model zignorował format JSON)
+_CODE_FENCE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```\s*$', re.DOTALL | re.IGNORECASE)
+_RATING_LABELED = re.compile(r'\b(?:ocena|rating|score)\b(?:\s*\([^)]*\))?[\W_]{0,6}?(\d+)(?!\s*[-–]\s*\d)', re.IGNORECASE)
+_RATING_FRACTION = re.compile(r'\b(\d)\s*(?:/|z|na)\s*5\b', re.IGNORECASE)
+# Ocena w niepełnym strumieniu - liczba musi być zakończona (następny znak nie jest cyfrą)
+_STREAM_RATING_JSON = re.compile(r'"(?:ocena|rating|score)"\s*:\s*"?(\d)(?=[^\d])')
+_STREAM_RATING_TEXT = re.compile(r'\b(?:ocena|rating|score)\b[\W_]{0,6}?(\d)(?=[^\d])', re.IGNORECASE)
+_STREAM_JUSTIFICATION_JSON = re.compile(r'"(?:uzasadnienie|justification)"\s*:\s*"((?:[^"\\]|\\.)*\\?)')
+_JUSTIFICATION_LINE = re.compile(
+    r'^[\W_]*(?:uzasadnienie|justification|explanation)[\W_]*?:[*_\s]*(.+)$', re.IGNORECASE | re.MULTILINE
+)
 
 
 def judge_with_gemini(
     model_response: str, 
     original_prompt: str, 
     gemini_api_key: str, 
-    judge_model_name: str = GEMINI_JUDGE_MODEL_NAME
+    judge_model_name: str = GEMINI_JUDGE_MODEL_NAME,
+    priority: int = PRIORITY_INTERACTIVE
 ) -> Tuple[int, str]:
     """
     Wykorzystuje zewnętrzny model LLM (Gemini) jako sędziego do oceny jakości odpowiedzi.
@@ -23,80 +132,456 @@ def judge_with_gemini(
         original_prompt (str): Oryginalne pytanie
         gemini_api_key (str): Klucz API Gemini
         judge_model_name (str): Nazwa modelu sędziego
+        priority (int): Priorytet w limiterze (ocena interaktywna przed paczkową)
         
     Returns:
         Tuple[int, str]: Ocena (1-5) i uzasadnienie
     """
-    judge_prompt = f"""Oceń jakość poniższej odpowiedzi na oryginalne pytanie.
-    Twoja ocena powinna dotyczyć:
-    1. Poprawności (czy odpowiedź jest prawdziwa/logiczna?).
-    2. Kompletności (czy odpowiedź w pełni odnosi się do pytania?).
-    3. Zrozumiałości (czy odpowiedź jest jasna i dobrze sformułowana?).
-    4. Zgodności z instrukcją (czy odpowiedź spełnia wszystkie wymogi pytania, np. format kodu, komentarze?).
+    judge_prompt = JUDGE_PROMPT_TEMPLATE.format(
+        original_prompt=original_prompt, 
+        model_response=model_response
+    )
+    
+    cache = get_judge_cache()
+    cache_key = judge_cache_key(JUDGE_PROMPT_TEMPLATE, original_prompt, model_response, judge_model_name)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached:
+            return cached
+    
+    try:
+        judge_full_response = _call_gemini(
+            judge_prompt, gemini_api_key, judge_model_name, 2000, priority, JUDGE_RESPONSE_SCHEMA
+        )
+        
+        # Parsowanie oceny i uzasadnienia z tekstu odpowiedzi sędziego
+        rating, justification = _parse_judge_response(judge_full_response)
+        if cache is not None:
+            cache.put(cache_key, judge_model_name, rating, justification)
+        
+        return rating, justification
+        
+    except requests.exceptions.Timeout:
+        print(f"\nBłąd: Model sędzia ({judge_model_name}) przekroczył limit {GEMINI_JUDGE_TIMEOUT}s.")
+        return 0, f"Błąd sędziego: Timeout ({GEMINI_JUDGE_TIMEOUT}s)"
+    except requests.exceptions.RequestException as e:
+        print(f"\nBłąd zapytania HTTP do modelu sędziego ({judge_model_name}): {e}")
+        return 0, f"Błąd sędziego: Błąd HTTP ({e})"
+    except Exception as e:
+        print(f"\nNieoczekiwany błąd w funkcji sędziego: {e}")
+        return 0, f"Nieoczekiwany błąd sędziego: {e}"
 
-    Twoja ocena powinna być w skali od 1 (bardzo słaba) do 5 (doskonała).
-    Następnie uzasadnij swoją ocenę w kilku zdaniach.
 
-    Format odpowiedzi:
-    OCENA: [liczba od 1 do 5]
-    UZASADNIENIE: [Twoje uzasadnienie]
+def _call_gemini(
+    prompt: str, 
+    gemini_api_key: str, 
+    judge_model_name: str, 
+    max_output_tokens: int,
+    priority: int = PRIORITY_INTERACTIVE,
+    response_schema: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Wysyła prompt do Gemini i zwraca tekst odpowiedzi.
+    
+    Args:
+        prompt (str): Treść zapytania
+        gemini_api_key (str): Klucz API Gemini
+        judge_model_name (str): Nazwa modelu sędziego
+        max_output_tokens (int): Limit tokenów odpowiedzi
+        priority (int): Priorytet w kolejce limitera (PRIORITY_INTERACTIVE / PRIORITY_BATCH)
+        response_schema (dict): Schemat JSON odpowiedzi (używany, gdy JUDGE_STRUCTURED_OUTPUT)
+        
+    Returns:
+        str: Tekst odpowiedzi sędziego
+        
+    Raises:
+        requests.exceptions.RequestException: Przy błędach HTTP lub timeoucie
+    """
+    judge_response = _gemini_request(
+        prompt, gemini_api_key, judge_model_name, max_output_tokens, priority, response_schema
+    )
+    result_data = judge_response.json()
+    judge_full_response = _extract_response_text(result_data)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sędzia (%s): HTTP %s, odpowiedź: %.200s", judge_model_name, judge_response.status_code, judge_full_response)
+    
+    return judge_full_response
 
-    ---
-    ORYGINALNE PYTANIE:
-    {original_prompt}
 
-    ---
-    ODPOWIEDŹ DO OCENY:
-    {model_response}
+def _gemini_request(
+    prompt: str, 
+    gemini_api_key: str, 
+    judge_model_name: str, 
+    max_output_tokens: int,
+    priority: int = PRIORITY_INTERACTIVE,
+    response_schema: Optional[Dict[str, Any]] = None,
+    stream: bool = False
+) -> requests.Response:
     """
+    Wysyła zapytanie generateContent (lub streamGenerateContent w trybie SSE).
     
-    # URL dla API Gemini
-    api_url = f"{GEMINI_API_URL}/{judge_model_name}:generateContent?key={gemini_api_key}"
+    Zapytania przechodzą przez limiter zapytań/tokenów dla klucza API; odpowiedzi
+    429/503 są ponawiane po czasie z Retry-After (lub z wykładniczym odstępem).
+    
+    Args:
+        prompt (str): Treść zapytania
+        gemini_api_key (str): Klucz API Gemini
+        judge_model_name (str): Nazwa modelu sędziego
+        max_output_tokens (int): Limit tokenów odpowiedzi
+        priority (int): Priorytet w kolejce limitera
+        response_schema (dict): Schemat JSON odpowiedzi (używany, gdy JUDGE_STRUCTURED_OUTPUT)
+        stream (bool): Odpowiedź strumieniowa (Server-Sent Events)
+        
+    Returns:
+        requests.Response: Odpowiedź HTTP z kodem 2xx
+        
+    Raises:
+        requests.exceptions.RequestException: Przy błędach HTTP lub timeoucie
+    """
+    method = "streamGenerateContent?alt=sse&" if stream else "generateContent?"
+    api_url = f"{GEMINI_API_URL}/{judge_model_name}:{method}key={gemini_api_key}"
     
     payload = {
         "contents": [
             {
                 "role": "user",
-                "parts": [{"text": judge_prompt}]
+                "parts": [{"text": prompt}]
             }
         ],
         "generationConfig": {
             "temperature": 0.2,  # Niższa temperatura dla bardziej deterministycznych ocen
-            "maxOutputTokens": 2000  # Zwiększony limit dla stabilnych odpowiedzi
+            "maxOutputTokens": max_output_tokens
         }
     }
+    if response_schema and JUDGE_STRUCTURED_OUTPUT:
+        payload["generationConfig"]["responseMimeType"] = "application/json"
+        payload["generationConfig"]["responseSchema"] = _to_gemini_schema(response_schema)
+    
+    headers = {'Content-Type': 'application/json'}
+    limiter = get_rate_limiter('gemini', gemini_api_key)
+    estimated_tokens = len(prompt) // CHARS_PER_TOKEN + max_output_tokens
+    
+    for attempt in range(JUDGE_MAX_RETRIES + 1):
+        limiter.acquire(estimated_tokens, priority)
+        judge_response = requests.post(
+            api_url, headers=headers, json=payload, timeout=GEMINI_JUDGE_TIMEOUT, stream=stream
+        )
+        if judge_response.status_code in RETRYABLE_STATUS_CODES and attempt < JUDGE_MAX_RETRIES:
+            delay = parse_retry_after(judge_response) or JUDGE_RETRY_BASE_DELAY * 2 ** attempt
+            logger.warning("Sędzia (%s): HTTP %s, ponowienie za %.1fs", judge_model_name, judge_response.status_code, delay)
+            limiter.penalize(delay)
+            judge_response.close()
+            continue
+        break
+    judge_response.raise_for_status()  # Sprawdź błędy HTTP (także po wyczerpaniu ponowień)
+    return judge_response
+
 
+def _iter_gemini_stream(judge_response: requests.Response) -> Iterator[str]:
+    """Zwraca kolejne fragmenty tekstu ze strumienia SSE streamGenerateContent."""
+    for line in judge_response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith('data:'):
+            continue
+        try:
+            chunk = json.loads(line[5:])
+        except ValueError:
+            continue
+        for candidate in chunk.get('candidates', [])[:1]:
+            for part in candidate.get('content', {}).get('parts', []):
+                if 'text' in part:
+                    yield part['text']
+
+
+def judge_with_gemini_stream(
+    model_response: str, 
+    original_prompt: str, 
+    gemini_api_key: str, 
+    judge_model_name: str = GEMINI_JUDGE_MODEL_NAME,
+    score_only: bool = JUDGE_SCORE_ONLY,
+    priority: int = PRIORITY_INTERACTIVE
+) -> Dict[str, Any]:
+    """
+    Ocenia odpowiedź sędzią Gemini w trybie strumieniowym.
+    
+    Ocena jest odczytywana, gdy tylko pojawi się w strumieniu. W trybie score_only
+    strumień jest zamykany zaraz po ocenie - nie czekamy na uzasadnienie, którego
+    rankingi nie potrzebują. Ucięte oceny nie trafiają do cache (pełne oceny z
+    cache są zwracane także w trybie score_only).
+    
+    Args:
+        model_response (str): Odpowiedź modelu do oceny
+        original_prompt (str): Oryginalne pytanie
+        gemini_api_key (str): Klucz API Gemini
+        judge_model_name (str): Nazwa modelu sędziego
+        score_only (bool): Zamknij strumień po odczytaniu oceny
+        priority (int): Priorytet w limiterze
+        
+    Returns:
+        Dict[str, Any]: rating, justification, justification_chars (liczba odebranych
+        znaków uzasadnienia) i truncated (czy strumień zamknięto przed końcem)
+    """
+    judge_prompt = JUDGE_PROMPT_TEMPLATE.format(
+        original_prompt=original_prompt, 
+        model_response=model_response
+    )
+    
+    cache = get_judge_cache()
+    cache_key = judge_cache_key(JUDGE_PROMPT_TEMPLATE, original_prompt, model_response, judge_model_name)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached:
+            return _stream_verdict(cached[0], cached[1], False)
+    
+    text = ""
     try:
-        headers = {'Content-Type': 'application/json'}
-        judge_response = requests.post(api_url, headers=headers, json=payload, timeout=GEMINI_JUDGE_TIMEOUT)
-        judge_response.raise_for_status()  # Sprawdź błędy HTTP
+        judge_response = _gemini_request(
+            judge_prompt, gemini_api_key, judge_model_name, 2000, priority, JUDGE_RESPONSE_SCHEMA, stream=True
+        )
+        try:
+            for chunk in _iter_gemini_stream(judge_response):
+                text += chunk
+                if score_only:
+                    rating = _stream_rating(text)
+                    if rating:
+                        return _stream_verdict(rating, _partial_justification(text), True)
+        finally:
+            judge_response.close()
+    except requests.exceptions.Timeout:
+        return _stream_verdict(0, f"Błąd sędziego: Timeout ({GEMINI_JUDGE_TIMEOUT}s)", False)
+    except requests.exceptions.RequestException as e:
+        return _stream_verdict(0, f"Błąd sędziego: Błąd HTTP ({e})", False)
+    
+    rating, justification = _parse_judge_response(text)
+    if cache is not None:
+        cache.put(cache_key, judge_model_name, rating, justification)
+    return _stream_verdict(rating, justification, False)
+
+
+def _stream_verdict(rating: int, justification: str, truncated: bool) -> Dict[str, Any]:
+    """Wynik judge_with_gemini_stream."""
+    return {
+        'rating': rating,
+        'justification': justification,
+        'justification_chars': len(justification) if rating > 0 else 0,
+        'truncated': truncated,
+    }
+
+
+def _stream_rating(partial_text: str) -> int:
+    """Ocena z niepełnej odpowiedzi strumieniowej (0, gdy jeszcze jej nie ma)."""
+    for pattern in (_STREAM_RATING_JSON, _STREAM_RATING_TEXT):
+        match = pattern.search(partial_text)
+        if match and 1 <= int(match.group(1)) <= 5:
+            return int(match.group(1))
+    return 0
+
+
+def _partial_justification(partial_text: str) -> str:
+    """Odebrana dotąd część uzasadnienia (JSON lub format tekstowy)."""
+    match = _STREAM_JUSTIFICATION_JSON.search(partial_text)
+    if match:
+        escaped = match.group(1)
+        if (len(escaped) - len(escaped.rstrip('\\'))) % 2:
+            escaped = escaped[:-1]  # Ucięta sekwencja ucieczki
+        try:
+            return json.loads(f'"{escaped}"')
+        except ValueError:
+            return escaped
+    match = _JUSTIFICATION_LINE.search(partial_text)
+    return match.group(1).strip(' *_') if match else ""
+
+
+def _to_gemini_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Konwertuje JSON Schema na podzbiór OpenAPI akceptowany przez Gemini.
+    
+    Gemini oczekuje typów wielkimi literami i nie obsługuje minimum/maximum.
+    """
+    converted: Dict[str, Any] = {"type": schema["type"].upper()}
+    if "properties" in schema:
+        converted["properties"] = {name: _to_gemini_schema(sub) for name, sub in schema["properties"].items()}
+    if "items" in schema:
+        converted["items"] = _to_gemini_schema(schema["items"])
+    if "required" in schema:
+        converted["required"] = list(schema["required"])
+    return converted
+
+
+def get_judge_context_tokens(judge_model_name: str) -> int:
+    """
+    Zwraca rozmiar okna kontekstu modelu sędziego (w tokenach).
+    
+    Args:
+        judge_model_name (str): Nazwa modelu sędziego
         
-        result_data = judge_response.json()
+    Returns:
+        int: Rozmiar kontekstu z konfiguracji lub wartość domyślna
+    """
+    for prefix, tokens in GEMINI_JUDGE_CONTEXT_TOKENS.items():
+        if judge_model_name.startswith(prefix):
+            return tokens
+    return DEFAULT_JUDGE_CONTEXT_TOKENS
+
+
+def plan_judge_batches(
+    items: List[Tuple[str, str]], 
+    judge_model_name: str = GEMINI_JUDGE_MODEL_NAME,
+    max_items: int = JUDGE_BATCH_SIZE
+) -> List[List[int]]:
+    """
+    Dzieli pary (odpowiedź, pytanie) na paczki mieszczące się w limitach sędziego.
+    
+    Paczka jest ograniczona połową okna kontekstu (zapas na instrukcje i odpowiedź),
+    budżetem tokenów odpowiedzi (JUDGE_BATCH_TOKENS_PER_VERDICT na ocenę) i max_items.
+    
+    Args:
+        items (List[Tuple[str, str]]): Pary (odpowiedź modelu, oryginalne pytanie)
+        judge_model_name (str): Nazwa modelu sędziego
+        max_items (int): Maksymalna liczba pozycji w paczce
         
-        # Debug: wypisz surową odpowiedź
-        print(f"\n[DEBUG] Status kod: {judge_response.status_code}")
-        print(f"[DEBUG] Surowa odpowiedź: {result_data}")
+    Returns:
+        List[List[int]]: Indeksy pozycji w kolejnych paczkach
+    """
+    input_budget = get_judge_context_tokens(judge_model_name) // 2
+    max_items = max(1, min(max_items, JUDGE_BATCH_MAX_OUTPUT_TOKENS // JUDGE_BATCH_TOKENS_PER_VERDICT))
+    
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, (model_response, original_prompt) in enumerate(items):
+        item_tokens = (len(model_response) + len(original_prompt)) // CHARS_PER_TOKEN + 50
+        if current and (len(current) >= max_items or current_tokens + item_tokens > input_budget):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += item_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def judge_batch_with_gemini(
+    items: List[Tuple[str, str]], 
+    gemini_api_key: str, 
+    judge_model_name: str = GEMINI_JUDGE_MODEL_NAME,
+    max_items: int = JUDGE_BATCH_SIZE,
+    priority: int = PRIORITY_BATCH
+) -> List[Tuple[int, str]]:
+    """
+    Ocenia wiele odpowiedzi w jednym zapytaniu do Gemini na paczkę.
+    
+    Odpowiedzi ocenione wcześniej są brane z cache ocen i nie trafiają do paczek.
+    Pozycje, których nie udało się odczytać z odpowiedzi paczki (lub cała
+    paczka przekroczyła limit czasu), są oceniane pojedynczo przez judge_with_gemini.
+    
+    Args:
+        items (List[Tuple[str, str]]): Pary (odpowiedź modelu, oryginalne pytanie)
+        gemini_api_key (str): Klucz API Gemini
+        judge_model_name (str): Nazwa modelu sędziego
+        max_items (int): Maksymalna liczba pozycji w jednym zapytaniu
+        priority (int): Priorytet w limiterze
         
-        # Parsowanie odpowiedzi Gemini
-        judge_full_response = _extract_response_text(result_data)
+    Returns:
+        List[Tuple[int, str]]: Ocena i uzasadnienie dla każdej pozycji (w kolejności wejścia)
+    """
+    # Oceny paczkowe mają własny klucz (szablon paczki); ocena pojedyncza z cache też jest przyjmowana
+    cache = get_judge_cache()
+    cache_keys = [
+        judge_cache_key(BATCH_JUDGE_CACHE_TEMPLATE, original_prompt, model_response, judge_model_name)
+        for model_response, original_prompt in items
+    ]
+    verdicts: List[Optional[Tuple[int, str]]] = [None] * len(items)
+    if cache is not None:
+        for index, (model_response, original_prompt) in enumerate(items):
+            verdicts[index] = cache.get(cache_keys[index]) or cache.get(
+                judge_cache_key(JUDGE_PROMPT_TEMPLATE, original_prompt, model_response, judge_model_name)
+            )
+    uncached = [index for index, verdict in enumerate(verdicts) if verdict is None]
+    
+    for planned in plan_judge_batches([items[index] for index in uncached], judge_model_name, max_items):
+        batch = [uncached[position] for position in planned]
+        if len(batch) == 1:
+            continue
         
-        # Debug: wypisz odpowiedź sędziego (tylko pierwsze 200 znaków)
-        print(f"\n[DEBUG] Odpowiedź sędziego: {judge_full_response[:200]}...")
+        sections = []
+        for number, index in enumerate(batch, 1):
+            model_response, original_prompt = items[index]
+            sections.append(BATCH_JUDGE_ITEM_TEMPLATE.format(
+                number=number, original_prompt=original_prompt, model_response=model_response
+            ))
+        batch_prompt = BATCH_JUDGE_PROMPT_HEADER.format(count=len(batch)) + "\n".join(sections)
         
-        # Parsowanie oceny i uzasadnienia z tekstu odpowiedzi sędziego
-        rating, justification = _parse_judge_response(judge_full_response)
+        try:
+            batch_response = _call_gemini(
+                batch_prompt, 
+                gemini_api_key, 
+                judge_model_name, 
+                min(JUDGE_BATCH_MAX_OUTPUT_TOKENS, JUDGE_BATCH_TOKENS_PER_VERDICT * len(batch)),
+                priority,
+                BATCH_JUDGE_RESPONSE_SCHEMA
+            )
+        except requests.exceptions.Timeout:
+            print(f"\nPaczka {len(batch)} ocen przekroczyła limit {GEMINI_JUDGE_TIMEOUT}s - ocena pojedyncza.")
+            continue
+        except requests.exceptions.RequestException as e:
+            print(f"\nBłąd zapytania HTTP do modelu sędziego ({judge_model_name}): {e}")
+            for index in batch:
+                verdicts[index] = (0, f"Błąd sędziego: Błąd HTTP ({e})")
+            continue
         
-        return rating, justification
+        for number, (rating, justification) in _parse_batch_response(batch_response).items():
+            if 1 <= number <= len(batch):
+                if rating > 0:
+                    index = batch[number - 1]
+                    verdicts[index] = (rating, justification)
+                    if cache is not None:
+                        cache.put(cache_keys[index], judge_model_name, rating, justification)
+    
+    # Pozycje pojedyncze i te, których odpowiedź paczki była nieprawidłowa
+    for index, verdict in enumerate(verdicts):
+        if verdict is None:
+            model_response, original_prompt = items[index]
+            verdicts[index] = judge_with_gemini(
+                model_response, original_prompt, gemini_api_key, judge_model_name, priority
+            )
+    
+    return verdicts
+
+
+def _parse_batch_response(batch_response: str) -> Dict[int, Tuple[int, str]]:
+    """
+    Parsuje odpowiedź paczki: tablicę JSON lub (awaryjnie) sekcje POZYCJA [#n].
+    
+    Args:
+        batch_response (str): Odpowiedź sędziego na zapytanie paczkowe
         
-    except requests.exceptions.Timeout:
-        print(f"\nBłąd: Model sędzia ({judge_model_name}) przekroczył limit {GEMINI_JUDGE_TIMEOUT}s.")
-        return 0, f"Błąd sędziego: Timeout ({GEMINI_JUDGE_TIMEOUT}s)"
-    except requests.exceptions.RequestException as e:
-        print(f"\nBłąd zapytania HTTP do modelu sędziego ({judge_model_name}): {e}")
-        return 0, f"Błąd sędziego: Błąd HTTP ({e})"
-    except Exception as e:
-        print(f"\nNieoczekiwany błąd w funkcji sędziego: {e}")
-        return 0, f"Nieoczekiwany błąd sędziego: {e}"
+    Returns:
+        Dict[int, Tuple[int, str]]: Numer pozycji -> ocena i uzasadnienie
+    """
+    decoded = _decode_json(batch_response)
+    if isinstance(decoded, list):
+        verdicts = {}
+        for entry in decoded:
+            verdict = _verdict_from_json(entry)
+            if verdict and isinstance(entry.get('pozycja'), int):
+                verdicts.setdefault(entry['pozycja'], verdict)
+        if verdicts:
+            return verdicts
+    return {
+        number: _parse_judge_response(section)
+        for number, section in _split_batch_response(batch_response).items()
+    }
+
+
+def _split_batch_response(batch_response: str) -> Dict[int, str]:
+    """Dzieli odpowiedź paczki na sekcje według nagłówków "=== POZYCJA [#n] ===" (lub samych [#n])."""
+    markers = list(_BATCH_ITEM_MARKER.finditer(batch_response))
+    sections = {}
+    for marker, next_marker in zip(markers, markers[1:] + [None]):
+        end = next_marker.start() if next_marker else len(batch_response)
+        sections.setdefault(int(marker.group(1)), batch_response[marker.end():end])
+    return sections
 
 
 def _extract_response_text(result_data: dict) -> str:
@@ -141,56 +626,61 @@ def _extract_response_text(result_data: dict) -> str:
     return "Brak treści odpowiedzi od sędziego."
 
 
+def _decode_json(text: str) -> Any:
+    """Dekoduje JSON z odpowiedzi sędziego (także w bloku ```json); None, gdy to nie JSON."""
+    text = text.strip()
+    fenced = _CODE_FENCE.match(text)
+    if fenced:
+        text = fenced.group(1)
+    if not text.startswith(('{', '[')):
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _verdict_from_json(data: Any) -> Optional[Tuple[int, str]]:
+    """Wyciąga ocenę i uzasadnienie z obiektu JSON sędziego (None, gdy niepoprawny)."""
+    if not isinstance(data, dict):
+        return None
+    rating = data.get('ocena', data.get('rating', data.get('score')))
+    if isinstance(rating, str) and rating.strip().isdigit():
+        rating = int(rating)
+    if isinstance(rating, bool) or not isinstance(rating, int) or not 1 <= rating <= 5:
+        return None
+    justification = data.get('uzasadnienie', data.get('justification'))
+    return rating, str(justification).strip() if justification else "Brak uzasadnienia."
+
+
 def _parse_judge_response(judge_full_response: str) -> Tuple[int, str]:
     """
     Parsuje odpowiedź sędziego aby wyciągnąć ocenę i uzasadnienie.
     
+    Odpowiedź JSON (format wymuszony schematem) jest dekodowana jednym wywołaniem;
+    odpowiedzi tekstowe obsługują prekompilowane wyrażenia (także z formatowaniem
+    Markdown, np. "OCENA: **4**").
+    
     Args:
         judge_full_response (str): Pełna odpowiedź sędziego
         
     Returns:
         Tuple[int, str]: Ocena (0-5) i uzasadnienie
     """
+    verdict = _verdict_from_json(_decode_json(judge_full_response))
+    if verdict:
+        return verdict
+    
     rating = 0
-    justification = "Brak uzasadnienia."
-    
-    # Próbuj znaleźć ocenę w różnych formatach
-    lines = judge_full_response.split('\n')
-    for line in lines:
-        line = line.strip()
-        # Szukaj wzorców: "OCENA: X", "Ocena: X", "Rating: X", "Score: X"
-        if any(keyword in line.upper() for keyword in ["OCENA:", "RATING:", "SCORE:"]):
-            try:
-                # Wyciągnij liczbę z linii
-                numbers = re.findall(r'\d+', line)
-                if numbers:
-                    potential_rating = int(numbers[0])
-                    if 1 <= potential_rating <= 5:
-                        rating = potential_rating
-            except (ValueError, IndexError):
-                continue
-        elif any(keyword in line.upper() for keyword in ["UZASADNIENIE:", "JUSTIFICATION:", "EXPLANATION:"]):
-            justification = line.split(":", 1)[1].strip() if ":" in line else line
-    
-    # Jeśli nie znaleziono oceny w standardowy sposób, spróbuj znaleźć liczbę w całym tekście
-    if rating == 0:
-        # Szukaj wzorców jak "5/5", "4 z 5", "ocena 3"
-        patterns = [
-            r'(\d)/5',
-            r'(\d)\s*z\s*5',
-            r'ocena\s*(\d)',
-            r'rating\s*(\d)',
-            r'score\s*(\d)'
-        ]
-        for pattern in patterns:
-            matches = re.findall(pattern, judge_full_response.lower())
-            if matches:
-                try:
-                    potential_rating = int(matches[0])
-                    if 1 <= potential_rating <= 5:
-                        rating = potential_rating
-                        break
-                except ValueError:
-                    continue
+    for pattern in (_RATING_LABELED, _RATING_FRACTION):
+        for match in pattern.finditer(judge_full_response):
+            if 1 <= int(match.group(1)) <= 5:
+                rating = int(match.group(1))
+                break
+        if rating:
+            break
+    
+    justification_match = _JUSTIFICATION_LINE.search(judge_full_response)
+    justification = justification_match.group(1).strip(' *_') if justification_match else "Brak uzasadnienia."
     
     return rating, justification
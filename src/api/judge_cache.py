@@ -0,0 +1,145 @@
+"""
+Persistent, content-addressed cache of AI judge verdicts.
+
+A verdict is keyed by a SHA-256 hash of the judge prompt template, the
+original prompt, the judged response and the judge model name, so the same
+response is never sent to a (paid) judge twice. Error verdicts are not cached.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from ..config import CACHE_DIR, JUDGE_CACHE_ENABLED, JUDGE_CACHE_FILE
+
+
+DEFAULT_JUDGE_CACHE_PATH = os.path.join(CACHE_DIR, JUDGE_CACHE_FILE)
+
+
+def judge_cache_key(template: str, original_prompt: str, model_response: str, judge_model_name: str) -> str:
+    """
+    Wylicza klucz oceny w cache.
+
+    Args:
+        template (str): Szablon promptu sędziego
+        original_prompt (str): Oryginalne pytanie
+        model_response (str): Oceniana odpowiedź
+        judge_model_name (str): Nazwa modelu sędziego
+
+    Returns:
+        str: Klucz heksadecymalny SHA-256
+    """
+    digest = hashlib.sha256()
+    for part in (template, original_prompt, model_response, judge_model_name):
+        encoded = part.encode('utf-8')
+        # Długość przed treścią - granice pól są jednoznaczne
+        digest.update(len(encoded).to_bytes(8, 'little'))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class JudgeCache:
+    """Cache ocen sędziego w bazie SQLite (bezpieczny dla wielu wątków)."""
+
+    def __init__(self, path: str = DEFAULT_JUDGE_CACHE_PATH):
+        """
+        Otwiera (lub tworzy) cache.
+
+        Args:
+            path (str): Ścieżka do pliku bazy SQLite
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS verdicts (
+                key TEXT PRIMARY KEY,
+                judge_model TEXT,
+                rating INTEGER,
+                justification TEXT,
+                created_at REAL
+            )
+        """)
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[Tuple[int, str]]:
+        """
+        Zwraca zapisaną ocenę.
+
+        Args:
+            key (str): Klucz z judge_cache_key
+
+        Returns:
+            Optional[Tuple[int, str]]: Ocena i uzasadnienie lub None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT rating, justification FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0], row[1]
+
+    def put(self, key: str, judge_model_name: str, rating: int, justification: str) -> None:
+        """
+        Zapisuje ocenę; oceny błędne (rating <= 0) są pomijane.
+
+        Args:
+            key (str): Klucz z judge_cache_key
+            judge_model_name (str): Nazwa modelu sędziego
+            rating (int): Ocena 1-5
+            justification (str): Uzasadnienie
+        """
+        if rating <= 0:
+            return
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?)",
+                (key, judge_model_name, rating, justification, time.time())
+            )
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def clear(self) -> None:
+        """Usuwa wszystkie zapisane oceny."""
+        with self._lock:
+            self._connection.execute("DELETE FROM verdicts")
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Zamyka połączenie z bazą."""
+        with self._lock:
+            self._connection.close()
+
+
+_default_cache: Optional[JudgeCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_judge_cache() -> Optional[JudgeCache]:
+    """
+    Zwraca współdzielony cache ocen (None, gdy wyłączony w konfiguracji).
+
+    Returns:
+        Optional[JudgeCache]: Cache w CACHE_DIR lub None
+    """
+    global _default_cache
+    if not JUDGE_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = JudgeCache()
+        return _default_cache
@@ -0,0 +1,254 @@
+"""
+Pluggable AI judge providers.
+
+`JudgeProvider` is the common interface used by testers and the GUI. The
+Gemini provider wraps the existing Gemini judge; the Ollama provider uses a
+designated local model as the judge (fully offline), with the same prompt
+template, parsing, verdict cache and rate limiter. Its endpoint is configured
+separately (OLLAMA_JUDGE_API_URL), so judging can run on a second Ollama
+instance concurrently with generation.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import requests
+
+from ..config import (
+    GEMINI_JUDGE_MODEL_NAME,
+    OLLAMA_JUDGE_API_URL,
+    OLLAMA_JUDGE_MODEL_NAME,
+    OLLAMA_JUDGE_TIMEOUT,
+    JUDGE_STRUCTURED_OUTPUT,
+    JUDGE_SCORE_ONLY
+)
+from .gemini_client import (
+    JUDGE_PROMPT_TEMPLATE,
+    JUDGE_RESPONSE_SCHEMA,
+    CHARS_PER_TOKEN,
+    judge_with_gemini,
+    judge_batch_with_gemini,
+    judge_with_gemini_stream,
+    _parse_judge_response
+)
+from .judge_cache import get_judge_cache, judge_cache_key
+from .rate_limiter import get_rate_limiter, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+
+
+class JudgeProvider(ABC):
+    """Interfejs dostawcy sędziego AI (podklasy implementują co najmniej judge)."""
+
+    name = "base"
+    display_name = "Sędzia AI"
+    requires_api_key = True
+    default_model = ""
+
+    def __init__(self, model_name: Optional[str] = None, api_key: Optional[str] = None):
+        """
+        Args:
+            model_name (str): Nazwa modelu sędziego (domyślnie default_model)
+            api_key (str): Klucz API (jeśli dostawca go wymaga)
+        """
+        self.model_name = model_name or self.default_model
+        self.api_key = api_key
+
+    @abstractmethod
+    def judge(
+        self,
+        model_response: str,
+        original_prompt: str,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Tuple[int, str]:
+        """
+        Ocenia pojedynczą odpowiedź.
+
+        Args:
+            model_response (str): Odpowiedź modelu do oceny
+            original_prompt (str): Oryginalne pytanie
+            priority (int): Priorytet w limiterze zapytań
+
+        Returns:
+            Tuple[int, str]: Ocena (1-5, 0 = błąd) i uzasadnienie
+        """
+
+    def judge_batch(
+        self,
+        items: List[Tuple[str, str]],
+        priority: int = PRIORITY_BATCH
+    ) -> List[Tuple[int, str]]:
+        """
+        Ocenia wiele odpowiedzi (domyślnie po kolei, pojedynczo).
+
+        Args:
+            items (List[Tuple[str, str]]): Pary (odpowiedź modelu, oryginalne pytanie)
+            priority (int): Priorytet w limiterze zapytań
+
+        Returns:
+            List[Tuple[int, str]]: Oceny w kolejności wejścia
+        """
+        return [self.judge(model_response, original_prompt, priority) for model_response, original_prompt in items]
+
+    def judge_stream(
+        self,
+        model_response: str,
+        original_prompt: str,
+        score_only: bool = JUDGE_SCORE_ONLY,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Dict[str, Any]:
+        """
+        Ocenia odpowiedź w trybie strumieniowym (domyślnie: zwykła ocena bez ucinania).
+
+        Args:
+            model_response (str): Odpowiedź modelu do oceny
+            original_prompt (str): Oryginalne pytanie
+            score_only (bool): Zakończ po odczytaniu oceny (bez pełnego uzasadnienia)
+            priority (int): Priorytet w limiterze zapytań
+
+        Returns:
+            Dict[str, Any]: rating, justification, justification_chars, truncated
+        """
+        rating, justification = self.judge(model_response, original_prompt, priority)
+        return {
+            'rating': rating,
+            'justification': justification,
+            'justification_chars': len(justification) if rating > 0 else 0,
+            'truncated': False,
+        }
+
+    def check(self) -> Tuple[bool, str]:
+        """
+        Sprawdza, czy sędzia jest dostępny (klucz API, model).
+
+        Returns:
+            Tuple[bool, str]: Czy działa i opis wyniku
+        """
+        rating, justification = self.judge("4", "Ile to jest 2 + 2?")
+        if rating > 0:
+            return True, f"Ocena testowa: {rating}/5"
+        return False, justification
+
+    def __repr__(self) -> str:
+        return f"{self.name}:{self.model_name}"
+
+
+class GeminiJudgeProvider(JudgeProvider):
+    """Sędzia Google Gemini (API w chmurze)."""
+
+    name = "gemini"
+    display_name = "Google Gemini"
+    requires_api_key = True
+    default_model = GEMINI_JUDGE_MODEL_NAME
+
+    def judge(self, model_response, original_prompt, priority=PRIORITY_INTERACTIVE):
+        return judge_with_gemini(model_response, original_prompt, self.api_key, self.model_name, priority)
+
+    def judge_batch(self, items, priority=PRIORITY_BATCH):
+        return judge_batch_with_gemini(items, self.api_key, self.model_name, priority=priority)
+
+    def judge_stream(self, model_response, original_prompt, score_only=JUDGE_SCORE_ONLY, priority=PRIORITY_INTERACTIVE):
+        return judge_with_gemini_stream(
+            model_response, original_prompt, self.api_key, self.model_name, score_only, priority
+        )
+
+
+class OllamaJudgeProvider(JudgeProvider):
+    """Lokalny sędzia - wskazany model Ollama (działa bez dostępu do internetu)."""
+
+    name = "ollama"
+    display_name = "Ollama (lokalny)"
+    requires_api_key = False
+    default_model = OLLAMA_JUDGE_MODEL_NAME
+
+    def __init__(self, model_name: Optional[str] = None, api_key: Optional[str] = None,
+                 api_url: str = OLLAMA_JUDGE_API_URL):
+        """
+        Args:
+            model_name (str): Model Ollama pełniący rolę sędziego
+            api_key (str): Nieużywany (zgodność interfejsu)
+            api_url (str): Adres instancji Ollama dla sędziego
+        """
+        super().__init__(model_name, api_key)
+        self.api_url = api_url
+
+    def judge(self, model_response, original_prompt, priority=PRIORITY_INTERACTIVE):
+        judge_prompt = JUDGE_PROMPT_TEMPLATE.format(
+            original_prompt=original_prompt,
+            model_response=model_response
+        )
+
+        cache = get_judge_cache()
+        cache_key = judge_cache_key(JUDGE_PROMPT_TEMPLATE, original_prompt, model_response, repr(self))
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached:
+                return cached
+
+        payload = {
+            "model": self.model_name,
+            "prompt": judge_prompt,
+            "stream": False,
+            "options": {"temperature": 0.2, "num_predict": 1000}
+        }
+        if JUDGE_STRUCTURED_OUTPUT:
+            payload["format"] = JUDGE_RESPONSE_SCHEMA
+        try:
+            # Osobny limiter dla każdej instancji Ollama sędziego
+            get_rate_limiter(self.name, self.api_url).acquire(len(judge_prompt) // CHARS_PER_TOKEN, priority)
+            response = requests.post(f"{self.api_url}/api/generate", json=payload, timeout=OLLAMA_JUDGE_TIMEOUT)
+            response.raise_for_status()
+            rating, justification = _parse_judge_response(response.json().get('response', ''))
+        except requests.exceptions.Timeout:
+            return 0, f"Błąd sędziego: Timeout ({OLLAMA_JUDGE_TIMEOUT}s)"
+        except requests.exceptions.RequestException as e:
+            return 0, f"Błąd sędziego: Błąd HTTP ({e})"
+        except ValueError as e:
+            return 0, f"Błąd sędziego: Nieprawidłowa odpowiedź ({e})"
+
+        if cache is not None:
+            cache.put(cache_key, repr(self), rating, justification)
+        return rating, justification
+
+    def available_models(self) -> List[str]:
+        """Zwraca modele dostępne na instancji Ollama sędziego."""
+        try:
+            response = requests.get(f"{self.api_url}/api/tags", timeout=10)
+            response.raise_for_status()
+            return [model['name'] for model in response.json().get('models', [])]
+        except (requests.exceptions.RequestException, ValueError):
+            return []
+
+    def check(self):
+        models = self.available_models()
+        if not models:
+            return False, f"Brak połączenia z Ollama sędziego ({self.api_url})"
+        if self.model_name not in models:
+            return False, f"Model sędziego {self.model_name} nie jest dostępny na {self.api_url}"
+        return super().check()
+
+
+JUDGE_PROVIDERS: Dict[str, Type[JudgeProvider]] = {
+    GeminiJudgeProvider.name: GeminiJudgeProvider,
+    OllamaJudgeProvider.name: OllamaJudgeProvider,
+}
+
+
+def create_judge_provider(
+    provider: str,
+    model_name: Optional[str] = None,
+    api_key: Optional[str] = None
+) -> Optional[JudgeProvider]:
+    """
+    Tworzy dostawcę sędziego po nazwie.
+
+    Args:
+        provider (str): Nazwa dostawcy (gemini, ollama)
+        model_name (str): Nazwa modelu sędziego (None = domyślny)
+        api_key (str): Klucz API
+
+    Returns:
+        Optional[JudgeProvider]: Dostawca lub None, gdy nie jest zaimplementowany
+    """
+    provider_class = JUDGE_PROVIDERS.get(provider)
+    if provider_class is None:
+        return None
+    return provider_class(model_name, api_key)
@@ -5,9 +5,10 @@ Ollama API communication module.
 import requests
 import json
 import time
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 
-from ..config import OLLAMA_API_URL, DEFAULT_TIMEOUT_PER_MODEL
+from ..config import OLLAMA_API_URL, DEFAULT_TIMEOUT_PER_MODEL, EMBEDDING_TIMEOUT, OLLAMA_PS_TIMEOUT
+from ..utils.helpers import append_to_output_file
 
 
 def get_available_models() -> List[str]:
@@ -31,6 +32,27 @@ def get_available_models() -> List[str]:
         return []
 
 
+def get_running_models(api_url: str = OLLAMA_API_URL, timeout: int = OLLAMA_PS_TIMEOUT) -> Optional[List[Dict[str, Any]]]:
+    """
+    Pobiera modele załadowane obecnie w pamięci serwera Ollama (/api/ps).
+    
+    Args:
+        api_url (str): Adres instancji Ollama
+        timeout (int): Timeout zapytania w sekundach
+        
+    Returns:
+        Optional[List[Dict[str, Any]]]: Modele (name, size, size_vram, expires_at)
+        lub None, gdy serwer jest niedostępny
+    """
+    try:
+        response = requests.get(f"{api_url}/api/ps", timeout=timeout)
+        response.raise_for_status()
+        return response.json().get('models', [])
+    except (requests.exceptions.RequestException, ValueError):
+        # Odpytywane cyklicznie - brak serwera nie jest raportowany przy każdym zapytaniu
+        return None
+
+
 def ask_ollama(
     model: str, 
     prompt: str, 
@@ -38,6 +60,7 @@ def ask_ollama(
     output_file: Optional[str] = None, 
     timeout: Optional[int] = None,
     system_prompt: Optional[str] = None,
+    token_callback: Optional[Callable[[str], None]] = None,
     **model_options
 ) -> Optional[Dict[str, Any]]:
     """
@@ -50,6 +73,7 @@ def ask_ollama(
         output_file (str): Ścieżka do pliku wyników
         timeout (int): Timeout w sekundach
         system_prompt (str): Opcjonalny prompt systemowy (persona/context)
+        token_callback (callable): Opcjonalna funkcja wywoływana dla każdego tokenu (metryki na żywo)
         **model_options: Dodatkowe opcje dla modelu (temperature, top_p, etc.)
         
     Returns:
@@ -106,23 +130,32 @@ def ask_ollama(
                             first_token_time = time.time()
                         print(data['response'], end="", flush=True)
                         full_response += data['response']
+                        if token_callback:
+                            token_callback(data['response'])
                     
                     if data.get('done', False):
                         end_time = time.time()
                         total_time = end_time - start_time
                         first_token_delay = first_token_time - start_time if first_token_time else 0
                         
+                        # Statystyki generowania z ostatniej linii strumienia (czasy w nanosekundach)
+                        eval_count = data.get('eval_count', 0)
+                        eval_duration = data.get('eval_duration', 0)
+                        tokens_per_second = eval_count / (eval_duration / 1e9) if eval_count and eval_duration else None
+                        
                         timing_info = f"\n\nCzas odpowiedzi:"
                         timing_info += f"\n  - Pierwszy token: {first_token_delay:.2f}s"
                         timing_info += f"\n  - Całkowity czas: {total_time:.2f}s"
-                        timing_info += f"\n  - Długość odpowiedzi: {len(full_response)} znaków\n"
+                        timing_info += f"\n  - Długość odpowiedzi: {len(full_response)} znaków"
+                        if tokens_per_second is not None:
+                            timing_info += f"\n  - Szybkość generowania: {tokens_per_second:.2f} tokenów/s ({eval_count} tokenów)"
+                        timing_info += "\n"
                         
                         print(timing_info)
                         
                         # Zapisz do pliku jeśli podano (tylko surowa odpowiedź + timing)
                         if output_file:
-                            with open(output_file, 'a', encoding='utf-8') as f:
-                                f.write(result_header + full_response + timing_info + "\n")
+                            append_to_output_file(output_file, result_header + full_response + timing_info + "\n")
                         
                         return {
                             'model': model,
@@ -131,7 +164,11 @@ def ask_ollama(
                             'response': full_response,
                             'first_token_time': first_token_delay,
                             'total_time': total_time,
-                            'response_length': len(full_response)
+                            'response_length': len(full_response),
+                            'prompt_eval_count': data.get('prompt_eval_count', 0),
+                            'eval_count': eval_count,
+                            'eval_duration': eval_duration,
+                            'tokens_per_second': tokens_per_second
                         }
                         
                 except json.JSONDecodeError:
@@ -141,22 +178,19 @@ def ask_ollama(
         error_msg = f"\n\nTIMEOUT: Model {model} przekroczył limit {current_timeout}s."
         print(error_msg)
         if output_file:
-            with open(output_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n{result_header}(Brak pełnej odpowiedzi z powodu timeoutu)\n{error_msg}\n")
+            append_to_output_file(output_file, f"\n{result_header}(Brak pełnej odpowiedzi z powodu timeoutu)\n{error_msg}\n")
         return None
     except requests.exceptions.RequestException as e:
         error_msg = f"\n\nBłąd zapytania HTTP dla modelu {model}: {e}"
         print(error_msg)
         if output_file:
-            with open(output_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n{result_header}(Błąd połączenia/zapytania)\n{error_msg}\n")
+            append_to_output_file(output_file, f"\n{result_header}(Błąd połączenia/zapytania)\n{error_msg}\n")
         return None
     except Exception as e:
         error_msg = f"\n\nNieoczekiwany błąd podczas pytania do modelu {model}: {e}"
         print(error_msg)
         if output_file:
-            with open(output_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n{result_header}(Nieoczekiwany błąd)\n{error_msg}\n")
+            append_to_output_file(output_file, f"\n{result_header}(Nieoczekiwany błąd)\n{error_msg}\n")
         return None
 
 
@@ -189,6 +223,7 @@ def ask_ollama_stream(
             'response': str,
             'prompt_eval_count': int,
             'eval_count': int,
+            'eval_duration': int,
             'total_duration': int,
             'first_token_time': float,
             'total_time': float
@@ -240,13 +275,13 @@ def ask_ollama_stream(
                         
                         # Zapisz do pliku jeśli podano
                         if output_file:
-                            with open(output_file, 'a', encoding='utf-8') as f:
-                                f.write(full_response + "\n")
+                            append_to_output_file(output_file, full_response + "\n")
                         
                         return {
                             'response': full_response,
                             'prompt_eval_count': data.get('prompt_eval_count', 0),
                             'eval_count': data.get('eval_count', 0),
+                            'eval_duration': data.get('eval_duration', 0),
                             'total_duration': data.get('total_duration', 0),
                             'first_token_time': first_token_delay,
                             'total_time': total_time
@@ -278,3 +313,37 @@ def ask_ollama_stream(
         error_msg = f"Niespodziewany błąd: {e}"
         print(f"❌ {error_msg}")
         return {'error': error_msg}
+
+
+def get_embeddings(
+    texts: List[str],
+    model_name: str,
+    api_url: str = OLLAMA_API_URL,
+    timeout: int = EMBEDDING_TIMEOUT
+) -> List[List[float]]:
+    """
+    Pobiera embeddingi tekstów z endpointu Ollama /api/embed (jedno zapytanie na paczkę).
+    
+    Args:
+        texts (List[str]): Teksty do zakodowania
+        model_name (str): Nazwa modelu embeddingów
+        api_url (str): Adres instancji Ollama
+        timeout (int): Timeout zapytania w sekundach
+        
+    Returns:
+        List[List[float]]: Wektory w kolejności tekstów
+        
+    Raises:
+        requests.exceptions.RequestException: Błąd połączenia lub HTTP (np. brak modelu)
+        ValueError: Odpowiedź bez oczekiwanej liczby wektorów
+    """
+    response = requests.post(
+        f"{api_url}/api/embed",
+        json={"model": model_name, "input": texts},
+        timeout=timeout
+    )
+    response.raise_for_status()
+    embeddings = response.json().get('embeddings', [])
+    if len(embeddings) != len(texts):
+        raise ValueError(f"Oczekiwano {len(texts)} wektorów, otrzymano {len(embeddings)}")
+    return embeddings
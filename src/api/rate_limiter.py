@@ -0,0 +1,224 @@
+"""
+Client-side rate limiting for judge providers.
+
+Each (provider, API key) pair gets a limiter with two token buckets -
+requests per minute and tokens per minute. Waiting callers are served in
+priority order (interactive judging before batch judging), a server-side
+`Retry-After` pauses the whole limiter, and per-limiter metrics are exposed
+for the UI and logs.
+"""
+
+import hashlib
+import heapq
+import itertools
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import JUDGE_RATE_LIMITS
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+_RETRY_DELAY_PATTERN = re.compile(r'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"')
+
+
+class TokenBucket:
+    """Wiadro tokenów o pojemności `capacity` uzupełniane w stałym tempie."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Args:
+            capacity (float): Maksymalna liczba tokenów
+            refill_per_second (float): Tempo uzupełniania (tokeny/s)
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Czas (s) do chwili, gdy w wiadrze będzie `amount` tokenów."""
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Limiter zapytań/min i tokenów/min z kolejką priorytetową oczekujących."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, name: str = ""):
+        """
+        Args:
+            requests_per_minute (float): Limit zapytań na minutę
+            tokens_per_minute (float): Limit tokenów (wejście + wyjście) na minutę
+            name (str): Nazwa do metryk (dostawca)
+        """
+        self.name = name
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self._condition = threading.Condition()
+        self._waiting: list = []
+        self._sequence = itertools.count()
+        self._blocked_until = 0.0
+        self._metrics = {
+            'requests': 0,
+            'tokens': 0,
+            'throttled': 0,
+            'wait_seconds': 0.0,
+            'rate_limited': 0,
+        }
+
+    def _delay(self, tokens: int, now: float) -> float:
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        return max(self._blocked_until - now, self._requests.delay_for(1), self._tokens.delay_for(tokens))
+
+    def acquire(self, tokens: int = 0, priority: int = PRIORITY_BATCH, timeout: Optional[float] = None) -> bool:
+        """
+        Czeka na pozwolenie wykonania zapytania.
+
+        Args:
+            tokens (int): Szacowana liczba tokenów zapytania
+            priority (int): Priorytet (niższy = wcześniej), np. PRIORITY_INTERACTIVE
+            timeout (float): Maksymalny czas oczekiwania (None = bez limitu)
+
+        Returns:
+            bool: True, jeśli zapytanie może zostać wykonane; False po przekroczeniu timeout
+        """
+        ticket = (priority, next(self._sequence))
+        start = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._waiting[0] == ticket:
+                        wait = self._delay(tokens, now)
+                        if wait <= 0:
+                            self._requests.consume(1)
+                            self._tokens.consume(tokens)
+                            self._metrics['requests'] += 1
+                            self._metrics['tokens'] += tokens
+                            waited = now - start
+                            if waited > 0.01:
+                                self._metrics['throttled'] += 1
+                                self._metrics['wait_seconds'] += waited
+                            return True
+                    if timeout is not None:
+                        remaining = timeout - (now - start)
+                        if remaining <= 0:
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._condition.wait(wait)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def penalize(self, retry_after: float) -> None:
+        """
+        Wstrzymuje wszystkie zapytania po odpowiedzi 429 (Retry-After).
+
+        Args:
+            retry_after (float): Czas wstrzymania w sekundach
+        """
+        with self._condition:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self._metrics['rate_limited'] += 1
+            # Serwer odrzucił zapytanie - wiadra nie mogą pozwolić na natychmiastową serię
+            self._requests.available = 0
+            self._condition.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Zwraca metryki limitera.
+
+        Returns:
+            Dict[str, Any]: Zapytania, tokeny, liczba i czas oczekiwań, liczba 429,
+            dostępny zapas limitów i długość kolejki
+        """
+        with self._condition:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            return dict(
+                self._metrics,
+                name=self.name,
+                requests_available=int(self._requests.available),
+                tokens_available=int(self._tokens.available),
+                queued=len(self._waiting),
+                blocked_for=max(0.0, self._blocked_until - now),
+            )
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, api_key: Optional[str] = None) -> RateLimiter:
+    """
+    Zwraca limiter współdzielony przez wszystkie wywołania danego dostawcy i klucza.
+
+    Args:
+        provider (str): Nazwa dostawcy (klucz w JUDGE_RATE_LIMITS)
+        api_key (str): Klucz API (limity są liczone osobno dla każdego klucza)
+
+    Returns:
+        RateLimiter: Limiter dla pary (dostawca, klucz)
+    """
+    key_id = hashlib.sha256((api_key or "").encode('utf-8')).hexdigest()[:12]
+    with _limiters_lock:
+        limiter = _limiters.get((provider, key_id))
+        if limiter is None:
+            limits = JUDGE_RATE_LIMITS.get(provider, JUDGE_RATE_LIMITS['default'])
+            limiter = RateLimiter(limits['rpm'], limits['tpm'], name=provider)
+            _limiters[(provider, key_id)] = limiter
+        return limiter
+
+
+def get_rate_limit_metrics() -> Dict[str, Dict[str, Any]]:
+    """Zwraca metryki wszystkich limiterów (klucz: dostawca/identyfikator klucza)."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {f"{provider}/{key_id}": limiter.metrics() for (provider, key_id), limiter in limiters.items()}
+
+
+def parse_retry_after(response: Any) -> Optional[float]:
+    """
+    Odczytuje czas wstrzymania z odpowiedzi 429.
+
+    Obsługuje nagłówek Retry-After (sekundy lub data HTTP) oraz pole
+    `retryDelay` zwracane przez Gemini w treści błędu.
+
+    Args:
+        response: Odpowiedź requests
+
+    Returns:
+        Optional[float]: Czas w sekundach lub None
+    """
+    header = getattr(response, 'headers', {}).get('Retry-After')
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(header).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    match = _RETRY_DELAY_PATTERN.search(getattr(response, 'text', '') or '')
+    if match:
+        return float(match.group(1))
+    return None
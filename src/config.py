@@ -6,12 +6,18 @@ Configuration settings for Ollama LLM testing suite.
 OLLAMA_API_URL = "http://localhost:11434"
 DEFAULT_TIMEOUT_PER_MODEL = 180  # Domyślny timeout dla pojedynczej odpowiedzi modelu testowanego
 DEFAULT_SLEEP_BETWEEN_MODELS = 2  # Domyślna pauza między modelami testowanymi
+OLLAMA_PS_TIMEOUT = 5  # Timeout zapytania o modele załadowane w pamięci (/api/ps)
 
 # Gemini API Configuration
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models"
 GEMINI_JUDGE_MODEL_NAME = "gemini-1.5-flash"  # Starsza, stabilniejsza wersja
 GEMINI_JUDGE_TIMEOUT = 60  # Timeout dla odpowiedzi modelu sędziego
 
+# Local Judge (Ollama) Configuration
+OLLAMA_JUDGE_API_URL = OLLAMA_API_URL  # Osobna instancja Ollama pozwala oceniać równolegle z generowaniem
+OLLAMA_JUDGE_MODEL_NAME = "llama3.1:8b"  # Model Ollama pełniący rolę sędziego
+OLLAMA_JUDGE_TIMEOUT = 120  # Timeout dla odpowiedzi lokalnego sędziego
+
 # Cache Configuration
 CACHE_EXPIRY_HOURS = 24  # Cache ważny przez 24 godziny
 
@@ -19,3 +25,92 @@ CACHE_EXPIRY_HOURS = 24  # Cache ważny przez 24 godziny
 OUTPUT_DIR = "outputs"
 CACHE_DIR = "cache"
 EXPORTS_DIR = "exports"
+
+# Export Configuration
+AUTO_EXPORT_FORMATS = ("jsonl",)  # Formaty eksportu po każdym przebiegu testów (jsonl, csv, parquet)
+AUTO_EXPORT_COMPRESSION = None  # None, "gzip" lub "zstd" (wymaga pakietu zstandard)
+
+# Judge Pipeline Configuration
+JUDGE_MAX_WORKERS = 4  # Liczba równoległych ocen sędziego podczas testów
+JUDGE_MAX_PENDING = 32  # Maksymalna liczba odpowiedzi oczekujących na ocenę
+
+# Batch Judge Configuration
+JUDGE_BATCH_SIZE = 10  # Maksymalna liczba odpowiedzi ocenianych w jednym zapytaniu (1 = bez paczek)
+JUDGE_BATCH_MAX_OUTPUT_TOKENS = 8192  # Limit tokenów odpowiedzi sędziego dla paczki
+JUDGE_BATCH_TOKENS_PER_VERDICT = 200  # Szacowany koszt jednej oceny w odpowiedzi paczki
+DEFAULT_JUDGE_CONTEXT_TOKENS = 32768  # Okno kontekstu dla nieznanych modeli sędziego
+GEMINI_JUDGE_CONTEXT_TOKENS = {  # Okno kontekstu modeli sędziego (prefiks nazwy -> tokeny)
+    "gemini-1.5-pro": 2097152,
+    "gemini-1.5-flash": 1048576,
+    "gemini-2.0-flash": 1048576,
+    "gemini-2.5": 1048576,
+}
+
+# Structured Judge Output
+JUDGE_STRUCTURED_OUTPUT = True  # Sędzia zwraca JSON zgodny ze schematem (Gemini responseSchema, Ollama format)
+
+# Streaming Judge Configuration
+JUDGE_STREAMING = False  # Oceny potoku przez streamGenerateContent (ocena odczytywana w trakcie strumienia)
+JUDGE_SCORE_ONLY = False  # Zamknij strumień zaraz po ocenie (uzasadnienie ucięte, rankingi bez zmian)
+
+# Judge Sampling Configuration
+JUDGE_SAMPLING = False  # Oceniaj warstwową próbę komórek zamiast wszystkich (ranking z przedziałami ufności)
+JUDGE_SAMPLE_FRACTION = 0.25  # Udział komórek (model, kategoria) ocenianych w pierwszej rundzie
+JUDGE_SAMPLE_MIN_PER_STRATUM = 2  # Minimalna liczba ocen w warstwie w pierwszej rundzie
+JUDGE_SAMPLE_CONFIDENCE = 0.95  # Poziom ufności przedziałów średniej oceny
+JUDGE_SAMPLE_MAX_ROUNDS = 10  # Maksymalna liczba rund doboru kolejnych komórek
+
+# Rule Pre-scorer Configuration (expected_elements)
+RULE_PASS_THRESHOLD = 1.0  # Udział znalezionych elementów, od którego odpowiedź jest zaliczona
+RULE_FAIL_THRESHOLD = 0.0  # Udział elementów, do którego odpowiedź jest odrzucona (0.0 = żaden element)
+RULE_SKIP_JUDGE_POLICY = "fail"  # Pomijaj sędziego dla werdyktów reguł: never, pass, fail, both
+
+# Answer Verifier Configuration (answer)
+ANSWER_TOLERANCE = 1e-3  # Tolerancja porównań liczbowych (względna i bezwzględna)
+ANSWER_SKIP_JUDGE_POLICY = "pass"  # Pomijaj sędziego dla zweryfikowanych odpowiedzi: never, pass, fail, both (błąd odczytu "fail" nie zastępuje sędziego)
+
+# Reference Metrics Configuration (references)
+TEXT_METRICS_ENABLED = True  # Licz chrF / ROUGE-L / stosunek długości względem odpowiedzi wzorcowych
+CHRF_MAX_ORDER = 6  # Najwyższy rząd n-gramów znakowych chrF
+CHRF_BETA = 2.0  # Waga kompletności w chrF (standardowo 2)
+
+# Embedding Similarity Configuration (references)
+EMBEDDING_ENABLED = True  # Podobieństwo semantyczne odpowiedzi do wzorców (wymaga modelu embeddingów w Ollama)
+EMBEDDING_API_URL = OLLAMA_API_URL  # Instancja Ollama licząca embeddingi
+EMBEDDING_MODEL_NAME = "nomic-embed-text"  # Model embeddingów (ollama pull nomic-embed-text)
+EMBEDDING_BATCH_SIZE = 32  # Liczba tekstów w jednym zapytaniu /api/embed
+EMBEDDING_TIMEOUT = 120  # Timeout jednego zapytania o embeddingi
+EMBEDDING_CACHE_DIR = "embeddings"  # Katalog cache embeddingów w CACHE_DIR (plik .npz na model)
+
+# Code Grader Configuration (code_tests)
+CODE_GRADER_ENABLED = False  # Uruchamiaj kod z odpowiedzi na przypadkach testowych promptu (niezaufany kod - tylko z piaskownicą)
+CODE_GRADER_SANDBOX = 'auto'  # Piaskownica: auto | bwrap | unshare (Linux; bez niej kod nie jest uruchamiany)
+CODE_GRADER_SANDBOX_USER = 'nobody'  # Użytkownik piaskownicy, gdy grader działa jako root
+CODE_GRADER_PYTHON = None  # Interpreter w piaskownicy (None - sys.executable; musi być dostępny dla CODE_GRADER_SANDBOX_USER)
+CODE_GRADER_TIMEOUT = 10  # Limit czasu jednego uruchomienia (s, czas rzeczywisty)
+CODE_GRADER_CPU_SECONDS = 5  # Limit czasu procesora kodu odpowiedzi (s)
+CODE_GRADER_MEMORY_MB = 256  # Limit pamięci kodu odpowiedzi (MB)
+CODE_GRADER_MAX_PROCESSES = 64  # Limit procesów/wątków użytkownika piaskownicy (RLIMIT_NPROC)
+CODE_GRADER_WORKERS = 2  # Liczba równolegle ocenianych odpowiedzi
+
+# SQL Grader Configuration (sql_tests)
+SQL_GRADER_ENABLED = True  # Wykonuj zapytania z odpowiedzi na testowej bazie SQLite w pamięci
+SQL_GRADER_TIMEOUT = 2.0  # Limit czasu wykonania jednego zapytania (s)
+SQL_GRADER_SEED = 42  # Ziarno danych bazy testowej (powtarzalne wyniki)
+
+# Judge Cache Configuration
+JUDGE_CACHE_ENABLED = True  # Zapamiętuj oceny sędziego (klucz: szablon, pytanie, odpowiedź, model sędziego)
+JUDGE_CACHE_FILE = "judge_cache.sqlite"  # Plik cache ocen w CACHE_DIR
+
+# Judge Rate Limits (po stronie klienta, na parę dostawca + klucz API)
+JUDGE_RATE_LIMITS = {
+    "gemini": {"rpm": 15, "tpm": 1000000},  # Limity darmowego planu Gemini Flash
+    "ollama": {"rpm": 600, "tpm": 10000000},  # Sędzia lokalny - ograniczony głównie liczbą wątków
+    "default": {"rpm": 60, "tpm": 1000000},
+}
+JUDGE_MAX_RETRIES = 3  # Liczba ponowień po odpowiedzi 429/503
+JUDGE_RETRY_BASE_DELAY = 2.0  # Odstęp bazowy (s), gdy serwer nie podał Retry-After
+
+# Live Metrics Configuration (panel metryk przebiegu w GUI)
+LIVE_METRICS_HISTORY = 30  # Liczba ostatnich wartości TTFT i tokenów/s na model (sparkline)
+LIVE_METRICS_RATE_WINDOW = 2.0  # Okno (s) chwilowej szybkości aktywnego strumienia
@@ -0,0 +1,32 @@
+"""Graders module initialization."""
+
+from .rule_scorer import RuleSet, compile_rules, score_response, should_skip_judge, normalize_text
+from .code_grader import CodeGrader, extract_python_code, grade_code_response, run_code_tests
+from .sql_grader import SqlGrader, extract_sql_queries, grade_sql_response
+from .answer_verifier import verify_answer, verify_results, parse_number
+from .text_metrics import ReferenceSet, reference_metrics, score_results
+from .embedding_scorer import EmbeddingCache, EmbeddingScorer, score_embedding_similarity
+
+__all__ = [
+    'RuleSet',
+    'compile_rules',
+    'score_response',
+    'should_skip_judge',
+    'normalize_text',
+    'CodeGrader',
+    'extract_python_code',
+    'grade_code_response',
+    'run_code_tests',
+    'SqlGrader',
+    'extract_sql_queries',
+    'grade_sql_response',
+    'verify_answer',
+    'verify_results',
+    'parse_number',
+    'ReferenceSet',
+    'reference_metrics',
+    'score_results',
+    'EmbeddingCache',
+    'EmbeddingScorer',
+    'score_embedding_similarity'
+]
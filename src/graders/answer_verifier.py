@@ -0,0 +1,265 @@
+"""
+Answer-extraction verifier for closed-form prompts.
+
+Final answers are extracted from free text (Polish and English) with compiled
+patterns and checked against the ``answer`` specification attached to a prompt
+definition, numerically where that applies. Verification needs no model calls,
+so a whole run can be (re)verified in bulk (verify_results), and a definite
+verdict may replace the LLM judge (ANSWER_SKIP_JUDGE_POLICY).
+
+Specification types:
+    {"type": "assignments", "variable": "x", "values": [3, 0.5]}  # wszystkie rozwiązania równania
+    {"type": "quantity", "value": 200, "unit": "km"}  # ostatnia liczba z jednostką
+    {"type": "score", "min": -5, "max": -4}  # ocena na skali (z etykietą lub ostatnia liczba ze znakiem)
+    {"type": "choice", "expected": "yes", "options": {"yes": [...], "no": [...]}}  # najwcześniejsza opcja
+    {"type": "pairs", "pairs": [["red", "green"], ...]}  # przypisania pudełko -> piłka
+Verdicts: pass, fail or uncertain (no answer could be extracted).
+"""
+
+import json
+import math
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from ..config import ANSWER_TOLERANCE
+from .rule_scorer import normalize_text
+
+
+_NUMBER = r'[-+]?\d+(?:[.,]\d+)?'
+_NUMBER_VALUE = re.compile(rf'({_NUMBER})(?:\s*/\s*({_NUMBER}))?')
+_LATEX_FRAC = re.compile(r'\\d?frac\s*\{([^{}]+)\}\s*\{([^{}]+)\}')
+_LATEX_NOISE = re.compile(r'\\[()\[\]]|\\boxed|\\text\{[^{}]*\}|[$*`{}]')
+_SEGMENT_SPLIT = re.compile(r',\s|;|\s(?:lub|albo|oraz|or|and|i)\s|\n')
+_SIGNED = re.compile(r'(?<![\w.,])([-+]\s?\d+(?:[.,]\d+)?|0)(?![\w]|[.,]\d)')
+_SCALE_RANGE = re.compile(rf'(?:od|from|between)?\s*{_NUMBER}\s*(?:do|to|and|-|–|\.\.)\s*\+?\d+(?:[.,]\d+)?')
+# Ocena opisana etykietą ("ocena: -5", "overall -5", "sentyment wynosi -4") - ostatnia jest końcowa
+_SCORE_LABELED = re.compile(
+    r'\b(?:ocen|score|overall|rating|sentyment|sentiment|wynik|final|koncow)\w*[^\d+\-\n]{0,20}?'
+    r'([-+]?\s?\d+(?:[.,]\d+)?)(?![\w]|[.,]\d)'
+)
+# Rozwiązania podane bez przypisania ("pierwiastki to 3 i 1/2", "the roots are 3 and 1/2")
+_SOLUTIONS = re.compile(
+    r'\b(?:rozwiazani|pierwiastk|roots?\b|solutions?\b)\w*[^.\n]*?(?:\bto\b|\bare\b|\bis\b|\bsa\b|wynosza|:)'
+    r'\s*(.+?)(?:\.(?:\s|$)|\n|$)'
+)
+_NEGATION = re.compile(r"\b(?:nie|not|no|cannot|nigdy|never)\b|n't")
+_CLAUSE_SPLIT = re.compile(r'[\n.;,]|\s-\s')
+
+# Rdzenie kolorów (PL/EN) -> nazwa kanoniczna
+COLOR_STEMS = {'czerwon': 'red', 'niebiesk': 'blue', 'zielon': 'green', 'red': 'red', 'blue': 'blue', 'green': 'green'}
+_COLOR = '(' + '|'.join(COLOR_STEMS) + r')\w*'
+_BOX_NOUN = r'(?:pudel\w*|box\w*|skrzyn\w*)'
+_BALL_NOUN = r'(?:pilk\w*|ball\w*|kul\w*)'
+_BOX_PATTERNS = (re.compile(rf'\b{_COLOR}\s+{_BOX_NOUN}'), re.compile(rf'\b{_BOX_NOUN}\s+{_COLOR}\b'))
+_BALL_PATTERNS = (re.compile(rf'\b{_COLOR}\s+{_BALL_NOUN}'), re.compile(rf'\b{_BALL_NOUN}\s+{_COLOR}\b'))
+
+
+def parse_number(text: str) -> Optional[float]:
+    """
+    Zamienia zapis liczby na float: przecinek dziesiętny, ułamki (1/2, ½, \\frac{1}{2}).
+
+    Args:
+        text (str): Zapis liczby (tekst znormalizowany lub surowy)
+
+    Returns:
+        Optional[float]: Wartość lub None, gdy tekst nie jest liczbą
+    """
+    text = _LATEX_FRAC.sub(r'\1/\2', normalize_text(text).replace('\u2044', '/').replace('\u2212', '-'))
+    text = _LATEX_NOISE.sub('', text).strip().rstrip('.').strip()
+    match = _NUMBER_VALUE.fullmatch(text)
+    if not match:
+        return None
+    numerator = float(match.group(1).replace(',', '.').replace(' ', ''))
+    if match.group(2) is None:
+        return numerator
+    denominator = float(match.group(2).replace(',', '.'))
+    return numerator / denominator if denominator else None
+
+
+def _prepare(response: str) -> str:
+    """Tekst do ekstrakcji: znormalizowany, bez znaczników LaTeX/markdown."""
+    text = normalize_text(response).replace('\u2044', '/').replace('\u2212', '-')
+    return _LATEX_NOISE.sub('', _LATEX_FRAC.sub(r'\1/\2', text))
+
+
+def _close(value: float, expected: float, tolerance: float) -> bool:
+    return math.isclose(value, expected, rel_tol=tolerance, abs_tol=tolerance)
+
+
+def _format_value(value: float) -> str:
+    return f"{value:g}"
+
+
+def _verify_assignments(text: str, spec: Dict[str, Any], pattern: re.Pattern) -> Tuple[str, str]:
+    values = []
+    matches = list(pattern.finditer(text))
+    for match, following in zip(matches, matches[1:] + [None]):
+        # Prawa strona przypisania: do następnego przypisania, spójnika lub końca linii
+        right = text[match.end():following.start() if following else len(text)]
+        segment = _SEGMENT_SPLIT.split(right, maxsplit=1)[0]
+        # W łańcuchu "x = 12/4 = 3" wynikiem jest ostatni człon
+        value = parse_number(segment.split('=')[-1])
+        if value is not None:
+            values.append(value)
+    if not values:
+        # Bez "x = ..." - lista rozwiązań w zdaniu (ostatnie takie zdanie to odpowiedź końcowa)
+        for match in _SOLUTIONS.finditer(text):
+            listed = [parse_number(part) for part in _SEGMENT_SPLIT.split(match.group(1))]
+            listed = [value for value in listed if value is not None]
+            if listed:
+                values = listed
+    if not values:
+        return 'uncertain', ''
+    tolerance = spec.get('tolerance', ANSWER_TOLERANCE)
+    found = all(any(_close(value, expected, tolerance) for value in values) for expected in spec['values'])
+    return ('pass' if found else 'fail'), ', '.join(_format_value(value) for value in dict.fromkeys(values))
+
+
+def _verify_quantity(text: str, spec: Dict[str, Any], pattern: re.Pattern) -> Tuple[str, str]:
+    matches = [parse_number(match.group(1)) for match in pattern.finditer(text)]
+    matches = [value for value in matches if value is not None]
+    if not matches:
+        return 'uncertain', ''
+    # Ostatnia wartość z jednostką to zwykle odpowiedź końcowa (wcześniejsze - kroki obliczeń)
+    final = matches[-1]
+    passed = _close(final, spec['value'], spec.get('tolerance', ANSWER_TOLERANCE))
+    return ('pass' if passed else 'fail'), f"{_format_value(final)} {spec.get('unit', '')}".strip()
+
+
+def _verify_score(text: str, spec: Dict[str, Any], pattern: Optional[re.Pattern]) -> Tuple[str, str]:
+    # Przytoczenia skali ("od -5 do +5") nie są oceną
+    text = _SCALE_RANGE.sub(' ', text)
+    low, high = spec.get('scale_min', -5), spec.get('scale_max', 5)
+
+    def in_scale(matches):
+        values = [parse_number(match.group(1).replace(' ', '')) for match in matches]
+        return [value for value in values if value is not None and low <= value <= high]
+
+    # Ocena z etykietą, a bez niej ostatnia liczba ze znakiem na skali (wcześniejsze to zwykle cząstkowe)
+    candidates = in_scale(_SCORE_LABELED.finditer(text)) or in_scale(_SIGNED.finditer(text))
+    if not candidates:
+        return 'uncertain', ''
+    value = candidates[-1]
+    passed = spec['min'] <= value <= spec['max']
+    return ('pass' if passed else 'fail'), _format_value(value)
+
+
+def _verify_choice(text: str, spec: Dict[str, Any], pattern: re.Pattern) -> Tuple[str, str]:
+    # Wygrywa opcja wskazana najwcześniej w odpowiedzi
+    match = pattern.search(text)
+    if not match:
+        return 'uncertain', ''
+    option = match.lastgroup[len('opt_'):]
+    return ('pass' if option == spec['expected'] else 'fail'), option
+
+
+def _clause_color(clause: str, patterns: Sequence[re.Pattern]) -> Optional[str]:
+    for pattern in patterns:
+        colors = {COLOR_STEMS[stem] for stem in pattern.findall(clause)}
+        if len(colors) == 1:
+            return colors.pop()
+        if colors:
+            return None
+    return None
+
+
+def _verify_pairs(text: str, spec: Dict[str, Any], pattern: Optional[re.Pattern]) -> Tuple[str, str]:
+    assignment: Dict[str, str] = {}
+    for clause in _CLAUSE_SPLIT.split(text):
+        if _NEGATION.search(clause):
+            continue
+        box = _clause_color(clause, _BOX_PATTERNS)
+        ball = _clause_color(clause, _BALL_PATTERNS)
+        if box and ball:
+            assignment[box] = ball  # Późniejsze przypisania (odpowiedź końcowa) nadpisują wcześniejsze
+    if not assignment:
+        return 'uncertain', ''
+    expected = {box: ball for box, ball in spec['pairs']}
+    passed = all(assignment.get(box) == ball for box, ball in expected.items())
+    return ('pass' if passed else 'fail'), ', '.join(f"{box}:{ball}" for box, ball in sorted(assignment.items()))
+
+
+def _assignments_pattern(spec: Dict[str, Any]) -> re.Pattern:
+    variable = re.escape(normalize_text(spec.get('variable', 'x')))
+    return re.compile(rf'(?<![a-z0-9]){variable}\s*_?\d?\s*=(?!=)')
+
+
+def _quantity_pattern(spec: Dict[str, Any]) -> re.Pattern:
+    units = spec.get('units') or [spec['unit']]
+    alternation = '|'.join(re.escape(normalize_text(unit)) for unit in units)
+    # Jednostka bez "/h" (km/h to prędkość, nie odległość)
+    return re.compile(rf'({_NUMBER})\s*(?:{alternation})\w*(?!\s*/)')
+
+
+def _choice_pattern(spec: Dict[str, Any]) -> re.Pattern:
+    groups = []
+    for option, patterns in spec['options'].items():
+        # Wzorce dopasowywane do tekstu znormalizowanego (małe litery, bez znaków diakrytycznych)
+        groups.append(f"(?P<opt_{option}>" + '|'.join(f'(?:{pattern})' for pattern in patterns) + ')')
+    return re.compile('|'.join(groups))
+
+
+# Typ specyfikacji -> (budowa wzorca lub None, weryfikacja)
+ANSWER_TYPES: Dict[str, Tuple[Optional[Callable[[Dict[str, Any]], re.Pattern]], Callable]] = {
+    'assignments': (_assignments_pattern, _verify_assignments),
+    'quantity': (_quantity_pattern, _verify_quantity),
+    'score': (None, _verify_score),
+    'choice': (_choice_pattern, _verify_choice),
+    'pairs': (None, _verify_pairs),
+}
+
+
+@lru_cache(maxsize=256)
+def _compiled_pattern(spec_json: str) -> Optional[re.Pattern]:
+    spec = json.loads(spec_json)
+    builder = ANSWER_TYPES[spec['type']][0]
+    return builder(spec) if builder else None
+
+
+def verify_answer(response: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Wyciąga odpowiedź końcową i sprawdza ją ze specyfikacją.
+
+    Args:
+        response (str): Odpowiedź modelu
+        spec (Dict[str, Any]): Specyfikacja answer z definicji promptu
+
+    Returns:
+        Dict[str, Any]: answer_verdict (pass/fail/uncertain) i answer_extracted (odczytana odpowiedź)
+    """
+    if spec['type'] not in ANSWER_TYPES:
+        raise ValueError(f"Nieznany typ specyfikacji odpowiedzi: {spec['type']}")
+    if not response or not response.strip():
+        return {'answer_verdict': 'fail', 'answer_extracted': ''}
+    # Wzorce kompilowane raz na specyfikację
+    pattern = _compiled_pattern(json.dumps(spec, sort_keys=True))
+    verdict, extracted = ANSWER_TYPES[spec['type']][1](_prepare(response), spec, pattern)
+    return {'answer_verdict': verdict, 'answer_extracted': extracted}
+
+
+def verify_results(results: Any, tests: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Weryfikuje hurtowo wszystkie wyniki przebiegu (np. wczytane ponownie z ResultStore).
+
+    Args:
+        results: ResultStore lub lista słowników wyników
+        tests (Iterable[Dict[str, Any]]): Definicje testów (dopasowanie po nazwie testu)
+
+    Returns:
+        Dict[str, int]: Liczba werdyktów pass/fail/uncertain
+    """
+    specs = {test['name']: test['answer'] for test in tests if test.get('answer')}
+    counts = {'pass': 0, 'fail': 0, 'uncertain': 0}
+    set_fields = getattr(results, 'set_fields', None)
+    for row, result in enumerate(results):
+        spec = specs.get(result.get('test_name'))
+        if spec is None:
+            continue
+        outcome = verify_answer(result.get('response') or '', spec)
+        counts[outcome['answer_verdict']] += 1
+        if set_fields is not None:
+            set_fields(row, **outcome)
+        else:
+            result.update(outcome)
+    return counts
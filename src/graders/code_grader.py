@@ -0,0 +1,383 @@
+"""
+Execution-based grader for programming prompts.
+
+Python code blocks are extracted from a response and executed in a sandbox
+against the test cases attached to the prompt definition (``code_tests``).
+The sandbox (bubblewrap, or unshare + setpriv from util-linux) gives the code
+no network, a read-only filesystem with a private /tmp, its own PID namespace
+and no capabilities; started as root, the grader first drops to an
+unprivileged user. Inside, a small harness sets CPU/memory/process limits and
+forks the process that loads the response, so the channel the harness reports
+on is closed before any untrusted code runs. Only the arguments of the cases
+enter the sandbox - return values come back as plain JSON and are compared
+with the expected values here, outside. Subprocesses are driven from a small
+thread pool, so grading runs in parallel with generation; pass/fail counts and
+the runtime are merged into the results like judge verdicts.
+
+A ``code_tests`` specification:
+    {
+        "function_names": ["sieve_of_eratosthenes", ...],  # preferowane nazwy (opcjonalnie)
+        "compare": "sequence",  # value | sequence | sorted | truthy
+        "cases": [[[10], [2, 3, 5, 7]], ...]  # [argumenty, oczekiwany wynik]
+    }
+Functions defined by the response are tried in turn (preferred names first);
+the one passing the most cases is reported.
+"""
+
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from ..config import (
+    CODE_GRADER_TIMEOUT,
+    CODE_GRADER_CPU_SECONDS,
+    CODE_GRADER_MEMORY_MB,
+    CODE_GRADER_MAX_PROCESSES,
+    CODE_GRADER_WORKERS,
+    CODE_GRADER_SANDBOX,
+    CODE_GRADER_SANDBOX_USER,
+    CODE_GRADER_PYTHON
+)
+from ..utils import ResultStore
+
+try:
+    import pwd
+except ImportError:  # Windows - brak piaskownicy, ocenianie kodu niedostępne
+    pwd = None
+
+
+_CODE_BLOCK = re.compile(r'```[ \t]*([\w+-]*)[^\n]*\n(.*?)```', re.DOTALL)
+_PYTHON_TAGS = frozenset({'python', 'py', 'python3'})
+
+# Przygotowanie piaskownicy unshare (wykonywane jako root przestrzeni nazw użytkownika):
+# wszystkie punkty montowania tylko do odczytu, prywatny /tmp, potem zrzucenie uprawnień
+_UNSHARE_SETUP = r'''
+for mp in $(awk '{print $2}' /proc/self/mounts); do mount -o remount,bind,ro "$mp" 2>/dev/null; done
+mount -t tmpfs -o size=16m,mode=1777 tmpfs /tmp || exit 1
+cd /tmp || exit 1
+exec setpriv --no-new-privs --bounding-set=-all --inh-caps=-all -- "$@"
+'''
+
+# Skrypt uruchamiany w piaskownicy: kod odpowiedzi i argumenty przypadków przychodzą przez stdin.
+# Kod odpowiedzi działa w procesie potomnym z limitami i bez dostępu do stdout - raport (zwrócone
+# wartości jako zwykły JSON) wypisuje dopiero proces nadrzędny, który sam nie wykonuje kodu odpowiedzi.
+_HARNESS = r'''
+import inspect, json, os, resource, struct, sys, time
+data = json.loads(sys.stdin.read())
+report = os.fdopen(os.dup(1), "w")
+devnull = os.open(os.devnull, os.O_RDWR)
+for fd in (0, 1, 2):
+    os.dup2(devnull, fd)
+read_end, write_end = os.pipe()
+pid = os.fork()
+if pid == 0:
+    report.close()
+    os.close(read_end)
+    for limit, value in ((resource.RLIMIT_CPU, data["cpu_seconds"]), (resource.RLIMIT_AS, data["memory"]),
+                         (resource.RLIMIT_NPROC, data["processes"])):
+        resource.setrlimit(limit, (value, value))
+    def plain(value, depth=0):
+        # Tylko dokładne typy wbudowane - podklasy mogłyby podmienić __eq__, __iter__ lub __repr__
+        kind = type(value)
+        if value is None or kind in (bool, int, float, str):
+            return value
+        if depth < 50 and kind in (list, tuple):
+            return [plain(item, depth + 1) for item in value]
+        if depth < 50 and kind is dict and all(type(key) is str for key in value):
+            return {key: plain(item, depth + 1) for key, item in value.items()}
+        raise TypeError("wynik typu %s" % kind.__name__)
+    def call(function, args, compare):
+        value = function(*args)
+        if compare == "truthy":
+            return bool(value)
+        if compare in ("sequence", "sorted"):
+            value = list(value)
+        value = plain(value)
+        json.dumps(value)
+        return value
+    outcome = {"load_error": None, "functions": []}
+    namespace = {"__name__": "__grader__"}
+    try:
+        exec(compile(data["code"], "<response>", "exec"), namespace)
+    except SyntaxError as e:
+        outcome["load_error"] = "SyntaxError: %s" % e
+        namespace = {}
+    except BaseException as e:
+        # Błąd w przykładowym kodzie na końcu odpowiedzi - funkcje zdefiniowane wcześniej nadal są testowane
+        outcome["load_error"] = "%s: %s" % (type(e).__name__, e)
+    functions = [v for v in list(namespace.values())
+                 if inspect.isfunction(v) and v.__code__.co_filename == "<response>"]
+    preferred = data["function_names"]
+    functions.sort(key=lambda f: preferred.index(f.__name__) if f.__name__ in preferred else len(preferred))
+    for function in functions:
+        outputs = []
+        start = time.perf_counter()
+        for args in data["args"]:
+            try:
+                outputs.append({"value": call(function, args, data["compare"])})
+            except BaseException as e:
+                outputs.append({"error": "%s: %s" % (type(e).__name__, e)})
+        outcome["functions"].append({"name": function.__name__, "outputs": outputs,
+                                     "runtime": time.perf_counter() - start})
+    message = json.dumps(outcome).encode()
+    with os.fdopen(write_end, "wb") as channel:
+        channel.write(struct.pack("!Q", len(message)) + message)
+    os._exit(0)
+os.close(write_end)
+with os.fdopen(read_end, "rb") as channel:
+    header = channel.read(8)
+    message = channel.read(struct.unpack("!Q", header)[0]).decode() if len(header) == 8 else ""
+if not message:
+    _, status = os.waitpid(pid, 0)
+    code = os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+    message = json.dumps({"crashed": code})
+report.write(message)
+report.flush()
+'''
+
+
+def extract_python_code(response: str) -> str:
+    """
+    Wyciąga kod Pythona z bloków ``` odpowiedzi.
+
+    Bloki oznaczone jako python (lub nieoznaczone, ale zawierające definicję
+    funkcji) są łączone w kolejności wystąpienia.
+
+    Args:
+        response (str): Odpowiedź modelu
+
+    Returns:
+        str: Kod (pusty, gdy odpowiedź nie zawiera kodu Pythona)
+    """
+    blocks = []
+    for tag, body in _CODE_BLOCK.findall(response):
+        tag = tag.lower()
+        if tag in _PYTHON_TAGS or (not tag and re.search(r'^\s*def \w+\(', body, re.MULTILINE)):
+            blocks.append(body)
+    return "\n\n".join(blocks)
+
+
+def _sandbox_command() -> Optional[List[str]]:
+    """
+    Buduje polecenie piaskownicy poprzedzające interpreter.
+
+    Returns:
+        Optional[List[str]]: Argumenty (None, gdy żadna piaskownica nie jest dostępna)
+    """
+    if CODE_GRADER_SANDBOX in ('auto', 'bwrap') and shutil.which('bwrap'):
+        return ['bwrap', '--ro-bind', '/', '/', '--dev', '/dev', '--proc', '/proc', '--tmpfs', '/tmp',
+                '--unshare-all', '--die-with-parent', '--new-session', '--cap-drop', 'ALL',
+                '--chdir', '/tmp', '--']
+    if CODE_GRADER_SANDBOX in ('auto', 'unshare') and shutil.which('unshare') and shutil.which('setpriv'):
+        return ['unshare', '--user', '--map-root-user', '--mount', '--net', '--pid', '--ipc', '--uts',
+                '--fork', '--kill-child', '--mount-proc', '--propagation', 'private',
+                'sh', '-c', _UNSHARE_SETUP, 'code-grader']
+    return None
+
+
+def _sandbox_user() -> Dict[str, Any]:
+    """Argumenty Popen zmieniające użytkownika, gdy grader działa jako root (POSIX)."""
+    if pwd is None or os.geteuid() != 0:
+        return {}
+    user = pwd.getpwnam(CODE_GRADER_SANDBOX_USER)
+    return {'user': user.pw_uid, 'group': user.pw_gid, 'extra_groups': []}
+
+
+def _canonical(value: Any) -> str:
+    """Postać JSON do porównania wyników (liczby całkowite zapisane jako float są równe int)."""
+    def normalize(item):
+        if isinstance(item, float) and item.is_integer():
+            return int(item)
+        if isinstance(item, list):
+            return [normalize(element) for element in item]
+        if isinstance(item, dict):
+            return {key: normalize(element) for key, element in item.items()}
+        return item
+    return json.dumps(normalize(value), sort_keys=True)
+
+
+def _matches(actual: Any, expected: Any, compare: str) -> bool:
+    """Porównuje zwróconą wartość (zwykły JSON z piaskownicy) z oczekiwaną."""
+    if compare == 'truthy':
+        return actual is bool(expected)
+    if compare == 'sorted':
+        if not isinstance(actual, list) or not isinstance(expected, list):
+            return False
+        return sorted(map(_canonical, actual)) == sorted(map(_canonical, expected))
+    return _canonical(actual) == _canonical(expected)
+
+
+def run_code_tests(code: str, spec: Dict[str, Any], timeout: float = CODE_GRADER_TIMEOUT) -> Dict[str, Any]:
+    """
+    Uruchamia kod w piaskownicy i sprawdza przypadki testowe.
+
+    Args:
+        code (str): Kod Pythona z odpowiedzi
+        spec (Dict[str, Any]): Specyfikacja testów (cases, compare, function_names)
+        timeout (float): Limit czasu całego uruchomienia (s)
+
+    Returns:
+        Dict[str, Any]: code_passed, code_tests_passed, code_tests_total,
+        code_runtime (s, wywołania funkcji), code_function, code_error
+    """
+    cases = spec['cases']
+    compare = spec.get('compare', 'value')
+    total = len(cases)
+    outcome = {'code_passed': False, 'code_tests_passed': 0, 'code_tests_total': total,
+               'code_runtime': None, 'code_function': None, 'code_error': None}
+    if not code.strip():
+        outcome['code_error'] = "Brak kodu Pythona w odpowiedzi"
+        return outcome
+    sandbox = _sandbox_command()
+    if sandbox is None:
+        outcome['code_error'] = "Brak piaskownicy - zainstaluj bubblewrap (bwrap) lub util-linux (unshare, setpriv)"
+        return outcome
+
+    # Oczekiwane wyniki nie trafiają do piaskownicy - porównanie odbywa się tutaj
+    payload = json.dumps({'code': code, 'args': [args for args, _ in cases], 'compare': compare,
+                          'function_names': spec.get('function_names', []),
+                          'cpu_seconds': CODE_GRADER_CPU_SECONDS,
+                          'memory': CODE_GRADER_MEMORY_MB * 1024 * 1024,
+                          'processes': CODE_GRADER_MAX_PROCESSES})
+    try:
+        process = subprocess.Popen(
+            sandbox + [CODE_GRADER_PYTHON or sys.executable, '-I', '-c', _HARNESS],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            env={'PYTHONIOENCODING': 'utf-8', 'PATH': os.environ.get('PATH', '')}, cwd='/',
+            start_new_session=True, **_sandbox_user()
+        )
+    except (OSError, KeyError) as e:
+        outcome['code_error'] = f"Nie udało się uruchomić piaskownicy: {e}"
+        return outcome
+    try:
+        stdout, stderr = process.communicate(payload, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        # Cała grupa procesów - razem z piaskownicą giną wszystkie procesy w jej przestrzeni PID
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.communicate()
+        outcome['code_error'] = f"Przekroczono limit czasu ({timeout}s)"
+        return outcome
+
+    try:
+        report = json.loads(stdout)
+    except ValueError:
+        detail = stderr.strip().splitlines()[-1] if stderr.strip() else f"kod {process.returncode}"
+        outcome['code_error'] = f"Błąd piaskownicy: {detail}"
+        return outcome
+    if 'crashed' in report:
+        outcome['code_error'] = f"Proces zakończony kodem {report['crashed']} (limit CPU/pamięci?)"
+        return outcome
+
+    best = None
+    for function in report['functions']:
+        passed, error = 0, None
+        for (_, expected), output in zip(cases, function['outputs']):
+            if 'error' in output:
+                error = output['error']
+            elif _matches(output['value'], expected, compare):
+                passed += 1
+        if best is None or passed > best[0]:
+            best = (passed, function['name'], error, function['runtime'])
+        if passed == total:
+            break
+    if best is None:
+        outcome['code_error'] = report['load_error'] or "Brak funkcji w kodzie odpowiedzi"
+        return outcome
+
+    passed, name, error, runtime = best
+    outcome.update(
+        code_passed=passed == total and total > 0,
+        code_tests_passed=passed,
+        code_runtime=runtime,
+        code_function=name,
+        code_error=error,
+    )
+    return outcome
+
+
+def grade_code_response(response: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ocenia odpowiedź programistyczną wykonaniem testów (zob. run_code_tests).
+
+    Args:
+        response (str): Odpowiedź modelu
+        spec (Dict[str, Any]): Specyfikacja code_tests z definicji promptu
+
+    Returns:
+        Dict[str, Any]: Pola code_* do dołączenia do wyniku
+    """
+    return run_code_tests(extract_python_code(response), spec)
+
+
+class CodeGrader:
+    """Ocenianie kodu w tle (równolegle z generowaniem kolejnych odpowiedzi)."""
+
+    def __init__(self, results: Any = None, max_workers: int = CODE_GRADER_WORKERS):
+        """
+        Args:
+            results: ResultStore, do którego scalane są wyniki testów (opcjonalnie)
+            max_workers (int): Liczba równoległych podprocesów
+        """
+        self.results = results
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="code-grader")
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+    def submit(self, result: Dict[str, Any], spec: Dict[str, Any], row: Optional[int] = None) -> Future:
+        """
+        Zleca ocenę odpowiedzi.
+
+        Args:
+            result (Dict[str, Any]): Wynik z ask_ollama (response)
+            spec (Dict[str, Any]): Specyfikacja code_tests
+            row (int): Wiersz ResultStore, do którego trafią pola code_*
+
+        Returns:
+            Future: Przyszły słownik pól code_*
+        """
+        future = self._executor.submit(self._grade, result, spec, row)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def _grade(self, result: Dict[str, Any], spec: Dict[str, Any], row: Optional[int]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            outcome = grade_code_response(result.get('response', ''), spec)
+        except Exception as e:
+            outcome = {'code_passed': False, 'code_error': f"Błąd oceniania kodu: {e}"}
+        outcome['code_grading_time'] = time.perf_counter() - start
+        if row is not None and isinstance(self.results, ResultStore):
+            self.results.set_fields(row, **outcome)
+        else:
+            result.update(outcome)
+        return outcome
+
+    def join(self) -> None:
+        """Czeka na zakończenie wszystkich zleconych ocen."""
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """Czeka na oceny i zamyka pulę wątków."""
+        self.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'CodeGrader':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
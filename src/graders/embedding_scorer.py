@@ -0,0 +1,253 @@
+"""
+Embedding-based semantic similarity of responses to reference answers.
+
+Responses and the reference answers of their prompts (``references``) are
+embedded through Ollama's ``/api/embed`` endpoint. Vectors are kept in a
+persistent NumPy-backed cache (one ``.npz`` file per embedding model, rows keyed
+by the SHA-256 of the text), so each distinct text is embedded once across
+runs. Cosine similarities of all responses against all references are computed
+with a single matrix product; each response gets the best match among its own
+prompt's references.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import zipfile
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+from ..api import get_embeddings
+from ..config import (
+    CACHE_DIR,
+    EMBEDDING_API_URL,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_DIR
+)
+
+try:
+    import numpy as np
+except ImportError:  # Bez NumPy podobieństwo semantyczne jest pomijane
+    np = None
+
+
+DEFAULT_EMBEDDING_CACHE_DIR = os.path.join(CACHE_DIR, EMBEDDING_CACHE_DIR)
+
+
+def text_hash(text: str) -> str:
+    """Klucz tekstu w cache embeddingów (SHA-256)."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """Trwały cache embeddingów jednego modelu: macierz wektorów + indeks skrótów tekstów."""
+
+    def __init__(self, model_name: str, directory: str = DEFAULT_EMBEDDING_CACHE_DIR):
+        """
+        Otwiera (lub tworzy) cache modelu.
+
+        Args:
+            model_name (str): Nazwa modelu embeddingów (osobny plik na model)
+            directory (str): Katalog plików cache
+        """
+        if np is None:
+            raise RuntimeError("Cache embeddingów wymaga pakietu numpy")
+        self.model_name = model_name
+        self.path = os.path.join(directory, re.sub(r'[^\w.-]+', '_', model_name) + '.npz')
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._matrix = None
+        self._pending: List[Any] = []
+        self._dirty = False
+        if os.path.exists(self.path):
+            try:
+                with np.load(self.path) as data:
+                    matrix, keys = data['vectors'], data['keys'].tolist()
+                if len(keys) != len(matrix):
+                    raise ValueError(f"{len(keys)} kluczy dla {len(matrix)} wektorów")
+                self._matrix = matrix
+                self._index = {key: row for row, key in enumerate(keys)}
+            except (zipfile.BadZipFile, KeyError, OSError, EOFError, ValueError) as e:
+                # Uszkodzony lub obcięty plik - cache zaczyna od zera i zostanie nadpisany przy zapisie
+                print(f"⚠️ Uszkodzony cache embeddingów {self.path} ({e}) - pusty cache")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _flush_pending(self) -> None:
+        if self._pending:
+            stacked = np.vstack(self._pending)
+            self._matrix = stacked if self._matrix is None else np.vstack([self._matrix, stacked])
+            self._pending = []
+
+    def lookup(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Zwraca zapisane wektory dla kluczy.
+
+        Args:
+            keys (List[str]): Skróty tekstów
+
+        Returns:
+            Dict[str, Any]: Klucz -> wektor (tylko klucze obecne w cache)
+        """
+        with self._lock:
+            self._flush_pending()
+            return {key: self._matrix[self._index[key]] for key in keys if key in self._index}
+
+    def add(self, keys: List[str], vectors: Any) -> None:
+        """
+        Dodaje wektory (zapis na dysk w save()).
+
+        Args:
+            keys (List[str]): Skróty tekstów
+            vectors: Macierz (len(keys) x wymiar)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self._matrix is not None and vectors.shape[1] != self._matrix.shape[1]:
+                # Zmiana wymiaru (inna wersja modelu pod tą samą nazwą) - stary cache jest nieaktualny
+                self._matrix, self._index, self._pending = None, {}, []
+            offset = len(self._index)
+            for i, key in enumerate(keys):
+                self._index[key] = offset + i
+            self._pending.append(vectors)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Zapisuje cache atomowo (plik tymczasowy + podmiana)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._flush_pending()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            keys = np.array(sorted(self._index, key=self._index.get))
+            temporary = self.path + '.tmp.npz'
+            np.savez(temporary, keys=keys, vectors=self._matrix)
+            os.replace(temporary, self.path)
+            self._dirty = False
+
+
+class EmbeddingScorer:
+    """Podobieństwo semantyczne odpowiedzi do wzorców (embeddingi Ollama + cache)."""
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        api_url: str = EMBEDDING_API_URL,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = EMBEDDING_BATCH_SIZE
+    ):
+        """
+        Args:
+            model_name (str): Model embeddingów
+            api_url (str): Adres instancji Ollama
+            cache (EmbeddingCache): Cache wektorów (domyślnie plik modelu w CACHE_DIR)
+            batch_size (int): Liczba tekstów w jednym zapytaniu
+        """
+        self.model_name = model_name
+        self.api_url = api_url
+        self.cache = cache if cache is not None else EmbeddingCache(model_name)
+        self.batch_size = batch_size
+        self.requested = 0
+
+    def embed(self, texts: List[str]) -> Any:
+        """
+        Zwraca znormalizowane (długość 1) embeddingi tekstów; brakujące pobiera paczkami.
+
+        Args:
+            texts (List[str]): Teksty
+
+        Returns:
+            np.ndarray: Macierz len(texts) x wymiar
+
+        Raises:
+            requests.exceptions.RequestException, ValueError: Błąd pobierania embeddingów
+        """
+        keys = [text_hash(text) for text in texts]
+        known = self.cache.lookup(keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in known and key not in missing:
+                missing[key] = text
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), self.batch_size):
+            batch = missing_keys[start:start + self.batch_size]
+            vectors = get_embeddings([missing[key] for key in batch], self.model_name, self.api_url)
+            self.cache.add(batch, vectors)
+            self.requested += len(batch)
+        if missing_keys:
+            known.update(self.cache.lookup(missing_keys))
+            self.cache.save()
+        matrix = np.vstack([known[key] for key in keys]).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms > 0, norms, 1.0)
+
+    def score_results(self, results: Any, tests: Iterable[Dict[str, Any]]) -> int:
+        """
+        Liczy embed_similarity (podobieństwo kosinusowe do najlepszego wzorca) dla wyników z wzorcami.
+
+        Args:
+            results: ResultStore lub lista słowników wyników
+            tests (Iterable[Dict[str, Any]]): Definicje testów (dopasowanie po nazwie testu)
+
+        Returns:
+            int: Liczba ocenionych wyników
+        """
+        references = {test['name']: list(test['references']) for test in tests if test.get('references')}
+        rows, responses, records = [], [], []
+        for row, result in enumerate(results):
+            records.append(result)
+            response = result.get('response')
+            if result.get('test_name') in references and response and response.strip():
+                rows.append(row)
+                responses.append(response)
+        if not rows:
+            return 0
+
+        # Wszystkie wzorcy w jednej macierzy; kolumny przypisane testom
+        reference_texts, columns = [], {}
+        for test_name, texts in references.items():
+            columns[test_name] = list(range(len(reference_texts), len(reference_texts) + len(texts)))
+            reference_texts += texts
+        response_matrix = self.embed(responses)
+        reference_matrix = self.embed(reference_texts)
+        similarity = response_matrix @ reference_matrix.T
+
+        # Maska: odpowiedź porównywana tylko z wzorcami własnego testu
+        mask = np.zeros(similarity.shape, dtype=bool)
+        for i, row in enumerate(rows):
+            mask[i, columns[records[row].get('test_name')]] = True
+        best = np.where(mask, similarity, -np.inf).max(axis=1)
+
+        set_fields = getattr(results, 'set_fields', None)
+        for row, value in zip(rows, best.tolist()):
+            if set_fields is not None:
+                set_fields(row, embed_similarity=value)
+            else:
+                records[row]['embed_similarity'] = value
+        return len(rows)
+
+
+def score_embedding_similarity(results: Any, tests: Iterable[Dict[str, Any]],
+                               model_name: str = EMBEDDING_MODEL_NAME) -> int:
+    """
+    Liczy podobieństwo semantyczne dla przebiegu; błędy Ollama nie przerywają testów.
+
+    Args:
+        results: ResultStore lub lista słowników wyników
+        tests (Iterable[Dict[str, Any]]): Definicje testów
+        model_name (str): Model embeddingów
+
+    Returns:
+        int: Liczba ocenionych wyników (0, gdy embeddingi są niedostępne)
+    """
+    if np is None:
+        return 0
+    try:
+        return EmbeddingScorer(model_name).score_results(results, tests)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"⚠️ Podobieństwo semantyczne pominięte ({model_name}): {e}")
+        return 0
@@ -0,0 +1,188 @@
+"""
+Cheap deterministic pre-scorer based on expected answer elements.
+
+Each expected element is a keyword (matched case- and diacritic-insensitively,
+tolerant to whitespace around punctuation; longer words also match inflected
+forms), a regular expression prefixed with ``re:`` (matched against the
+normalized text) or a list of alternatives. The patterns of a test are compiled
+once and each is searched separately in the response (normalized once), so an
+element contained in or overlapping another element's match is still found.
+Clearly passing or failing answers may skip the LLM judge (see should_skip_judge).
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from ..config import RULE_PASS_THRESHOLD, RULE_FAIL_THRESHOLD, RULE_SKIP_JUDGE_POLICY
+
+
+REGEX_PREFIX = "re:"
+MIN_PREFIX_MATCH_LENGTH = 4
+
+# Polityki pomijania sędziego: które werdykty reguł nie wymagają oceny LLM
+SKIP_JUDGE_POLICIES = {
+    'never': frozenset(),
+    'pass': frozenset({'pass'}),
+    'fail': frozenset({'fail'}),
+    'both': frozenset({'pass', 'fail'}),
+}
+
+# Litery bez rozkładu NFKD (ł nie rozkłada się na l + znak diakrytyczny)
+_EXTRA_FOLDS = str.maketrans({'ł': 'l', 'ß': 'ss', 'ø': 'o', 'đ': 'd', '^': ''})
+_TOKEN = re.compile(r'\w+|[^\w\s]')
+
+Element = Union[str, Sequence[str]]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizuje tekst do dopasowań: małe litery, bez znaków diakrytycznych.
+
+    Indeksy górne są zamieniane na cyfry (x² -> x2), a znak potęgi jest usuwany
+    (x^2 -> x2), więc oba zapisy są równoważne.
+
+    Args:
+        text (str): Tekst wejściowy
+
+    Returns:
+        str: Tekst znormalizowany
+    """
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).translate(_EXTRA_FOLDS)
+
+
+def _keyword_pattern(keyword: str) -> str:
+    tokens = _TOKEN.findall(normalize_text(keyword))
+    if not tokens:
+        return r'(?!)'
+    pattern = re.escape(tokens[0])
+    for previous, token in zip(tokens, tokens[1:]):
+        # Między słowami wymagany odstęp, wokół interpunkcji opcjonalny ("x=2" == "x = 2")
+        separator = r'\s+' if previous[-1].isalnum() and token[0].isalnum() else r'\s*'
+        pattern += separator + re.escape(token)
+    if tokens[0][0].isalnum():
+        pattern = r'(?<!\w)' + pattern
+    last = tokens[-1]
+    # Dłuższe słowa dopasowywane jako przedrostek - odmiana (wzór -> wzoru, pivot -> pivota)
+    if last[-1].isalnum() and not (last.isalpha() and len(last) >= MIN_PREFIX_MATCH_LENGTH):
+        pattern += r'(?!\w)'
+    return pattern
+
+
+def _element_pattern(element: Element) -> str:
+    if isinstance(element, str):
+        if element.startswith(REGEX_PREFIX):
+            return element[len(REGEX_PREFIX):]
+        return _keyword_pattern(element)
+    return '|'.join(f'(?:{_element_pattern(alternative)})' for alternative in element)
+
+
+def _element_label(element: Element) -> str:
+    return element if isinstance(element, str) else ' / '.join(element)
+
+
+class RuleSet:
+    """Skompilowany zestaw oczekiwanych elementów jednego testu."""
+
+    def __init__(self, expected_elements: Sequence[Element]):
+        """
+        Args:
+            expected_elements (Sequence[Element]): Słowa kluczowe, wyrażenia "re:..." lub listy alternatyw
+        """
+        self.labels = [_element_label(element) for element in expected_elements]
+        # Osobny wzorzec na element - wspólna alternacja "zjada" tekst i gubi elementy zawarte w innych
+        self._patterns = [re.compile(_element_pattern(element), re.IGNORECASE) for element in expected_elements]
+
+    def match(self, response: str) -> List[bool]:
+        """Zwraca, które elementy występują w odpowiedzi (tekst normalizowany raz)."""
+        text = normalize_text(response)
+        return [pattern.search(text) is not None for pattern in self._patterns]
+
+    def score(
+        self,
+        response: str,
+        pass_threshold: float = RULE_PASS_THRESHOLD,
+        fail_threshold: float = RULE_FAIL_THRESHOLD
+    ) -> Dict[str, Any]:
+        """
+        Ocenia odpowiedź regułami.
+
+        Args:
+            response (str): Odpowiedź modelu
+            pass_threshold (float): Udział elementów, od którego odpowiedź jest zaliczona
+            fail_threshold (float): Udział elementów, do którego odpowiedź jest odrzucona
+
+        Returns:
+            Dict[str, Any]: rule_score (0-1), rule_verdict (pass/fail/uncertain),
+            rule_matched i rule_missing (elementy rozdzielone przecinkami)
+        """
+        found = self.match(response) if response and response.strip() else [False] * len(self.labels)
+        score = sum(found) / len(found) if found else 0.0
+        if not self.labels:
+            verdict = 'uncertain'
+        elif not response or not response.strip() or score <= fail_threshold:
+            verdict = 'fail'
+        elif score >= pass_threshold:
+            verdict = 'pass'
+        else:
+            verdict = 'uncertain'
+        return {
+            'rule_score': score,
+            'rule_verdict': verdict,
+            'rule_matched': ', '.join(label for label, hit in zip(self.labels, found) if hit),
+            'rule_missing': ', '.join(label for label, hit in zip(self.labels, found) if not hit),
+        }
+
+
+@lru_cache(maxsize=1024)
+def _compiled_rules(expected_elements: Tuple[Any, ...]) -> RuleSet:
+    return RuleSet(expected_elements)
+
+
+def compile_rules(expected_elements: Sequence[Element]) -> RuleSet:
+    """
+    Zwraca skompilowany zestaw reguł (z cache - każdy zestaw kompilowany raz).
+
+    Args:
+        expected_elements (Sequence[Element]): Oczekiwane elementy odpowiedzi
+
+    Returns:
+        RuleSet: Zestaw reguł
+    """
+    key = tuple(element if isinstance(element, str) else tuple(element) for element in expected_elements)
+    return _compiled_rules(key)
+
+
+def score_response(response: str, expected_elements: Sequence[Element]) -> Dict[str, Any]:
+    """
+    Ocenia odpowiedź oczekiwanymi elementami (zob. RuleSet.score).
+
+    Args:
+        response (str): Odpowiedź modelu
+        expected_elements (Sequence[Element]): Oczekiwane elementy odpowiedzi
+
+    Returns:
+        Dict[str, Any]: Pola rule_* do dołączenia do wyniku
+    """
+    return compile_rules(expected_elements).score(response)
+
+
+def should_skip_judge(
+    rule_result: Dict[str, Any],
+    policy: str = RULE_SKIP_JUDGE_POLICY,
+    verdict_field: str = 'rule_verdict'
+) -> bool:
+    """
+    Sprawdza, czy wynik reguł jest na tyle jednoznaczny, że sędzia LLM jest zbędny.
+
+    Args:
+        rule_result (Dict[str, Any]): Wynik score_response (lub verify_answer)
+        policy (str): never, pass, fail lub both
+        verdict_field (str): Pole werdyktu (rule_verdict, answer_verdict)
+
+    Returns:
+        bool: True, jeśli ocenę sędziego można pominąć
+    """
+    return rule_result.get(verdict_field) in SKIP_JUDGE_POLICIES.get(policy, frozenset())
@@ -0,0 +1,289 @@
+"""
+Query-execution grader for SQL prompts.
+
+A seeded in-memory SQLite fixture database is built once per grader (one run).
+SQL statements extracted from a response are executed read-only under a
+statement timeout (SQLite progress handler) and their result is compared with
+the reference queries of the prompt (``sql_tests``). Results are cached by
+normalized SQL text, so identical answers of different models are executed once.
+
+A ``sql_tests`` specification:
+    {
+        "fixture": "customers_orders",  # nazwa bazy z SQL_FIXTURES
+        "reference": ["SELECT ...", ...],  # zapytania wzorcowe (dowolne z nich zalicza)
+        "ordered": True  # czy kolejność wierszy ma znaczenie
+    }
+A result matches a reference when it has the same number of rows and every
+reference column appears (in row order) among the answer's columns, so extra
+columns such as an id or a differently named alias do not fail the answer.
+"""
+
+import random
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..config import SQL_GRADER_TIMEOUT, SQL_GRADER_SEED
+
+
+_CODE_BLOCK = re.compile(r'```[ \t]*([\w+-]*)[^\n]*\n(.*?)```', re.DOTALL)
+_SQL_TAGS = frozenset({'sql', 'sqlite', 'postgresql', 'postgres', 'mysql', 'tsql', 'plsql'})
+_QUERY_START = re.compile(r'^\s*(?:select|with)\b', re.IGNORECASE)
+_INLINE_QUERY = re.compile(r'(?:^|\n)\s*((?:SELECT|WITH)\b.*?)(?:;|\n\s*\n|$)', re.DOTALL | re.IGNORECASE)
+_LINE_COMMENT = re.compile(r'--[^\n]*')
+_BLOCK_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+
+# Najczęstsze konstrukcje innych dialektów przepisywane na SQLite (odpowiedzi zwykle zakładają PostgreSQL/MySQL)
+_DIALECT_REWRITES = [
+    (re.compile(r"(?:CURRENT_DATE|NOW\(\)|CURRENT_TIMESTAMP|GETDATE\(\)|CURDATE\(\))\s*-\s*INTERVAL\s*'?\s*(\d+)\s*'?\s*(YEAR|MONTH|DAY)S?'?",
+                re.IGNORECASE),
+     lambda m: f"date('now', '-{m.group(1)} {m.group(2).lower()}s')"),
+    (re.compile(r"DATE_SUB\(\s*(?:CURDATE\(\)|NOW\(\)|CURRENT_DATE)\s*,\s*INTERVAL\s+(\d+)\s+(YEAR|MONTH|DAY)\s*\)", re.IGNORECASE),
+     lambda m: f"date('now', '-{m.group(1)} {m.group(2).lower()}s')"),
+    (re.compile(r"DATEADD\(\s*(YEAR|MONTH|DAY)\s*,\s*-(\d+)\s*,\s*(?:GETDATE\(\)|CURRENT_TIMESTAMP)\s*\)", re.IGNORECASE),
+     lambda m: f"date('now', '-{m.group(2)} {m.group(1).lower()}s')"),
+    (re.compile(r"EXTRACT\(\s*YEAR\s+FROM\s+([\w.]+(?:\(\))?)\s*\)", re.IGNORECASE),
+     lambda m: f"CAST(strftime('%Y', {m.group(1)}) AS INTEGER)"),
+    (re.compile(r"\bYEAR\(\s*([\w.]+(?:\(\))?)\s*\)", re.IGNORECASE),
+     lambda m: f"CAST(strftime('%Y', {m.group(1)}) AS INTEGER)"),
+    (re.compile(r"\b(?:NOW\(\)|GETDATE\(\)|CURDATE\(\))", re.IGNORECASE), lambda m: "date('now')"),
+    (re.compile(r"\bCURRENT_DATE\b", re.IGNORECASE), lambda m: "date('now')"),
+]
+_TSQL_TOP = re.compile(r'^\s*SELECT\s+TOP\s*\(?\s*(\d+)\s*\)?', re.IGNORECASE)
+
+
+def _build_customers_orders(connection: sqlite3.Connection, seed: int) -> None:
+    """Klienci i zamówienia z 3 lat; daty względem dnia dzisiejszego (zapytania o "ostatni rok")."""
+    rng = random.Random(seed)
+    today = date.today()
+    names = ["Anna Kowalska", "Jan Nowak", "Piotr Wiśniewski", "Maria Wójcik", "Tomasz Kamiński",
+             "Katarzyna Lewandowska", "Michał Zieliński", "Agnieszka Szymańska", "Paweł Woźniak",
+             "Ewa Dąbrowska", "Krzysztof Kozłowski", "Magdalena Jankowska"]
+    connection.execute("CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+    connection.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER NOT NULL "
+                       "REFERENCES customers(id), order_date DATE NOT NULL, total_amount REAL NOT NULL)")
+    connection.executemany("INSERT INTO customers VALUES (?, ?)", list(enumerate(names, 1)))
+
+    # Daty odsunięte od granic (365 dni wstecz, 1 stycznia), więc >= / > i różne zapisy "roku" dają ten sam wynik
+    boundaries = [today - timedelta(days=365), date(today.year, 1, 1), date(today.year - 1, 1, 1)]
+
+    def order_date(min_days: int, max_days: int) -> str:
+        while True:
+            day = today - timedelta(days=rng.randint(min_days, max_days))
+            if all(abs((day - boundary).days) > 3 for boundary in boundaries):
+                return day.isoformat()
+
+    orders = []
+    for customer_id in range(1, len(names) + 1):
+        for _ in range(rng.randint(2, 6)):
+            orders.append((customer_id, order_date(5, 355), round(rng.uniform(20, 900), 2)))
+        # Duże stare zamówienia części klientów - ranking "wszech czasów" różni się od rocznego
+        if customer_id % 3 == 0:
+            orders.append((customer_id, order_date(400, 1000), round(rng.uniform(2000, 5000), 2)))
+    connection.executemany(
+        "INSERT INTO orders (customer_id, order_date, total_amount) VALUES (?, ?, ?)", orders
+    )
+
+
+# Bazy testowe (nazwa -> funkcja wypełniająca połączenie)
+SQL_FIXTURES: Dict[str, Callable[[sqlite3.Connection, int], None]] = {
+    'customers_orders': _build_customers_orders,
+}
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normalizuje tekst zapytania (klucz cache): bez komentarzy, zbędnych odstępów i średnika.
+
+    Args:
+        sql (str): Zapytanie SQL
+
+    Returns:
+        str: Zapytanie znormalizowane
+    """
+    sql = _BLOCK_COMMENT.sub(' ', _LINE_COMMENT.sub(' ', sql))
+    return _WHITESPACE.sub(' ', sql).strip().rstrip(';').strip()
+
+
+def to_sqlite_dialect(sql: str) -> str:
+    """Przepisuje popularne konstrukcje PostgreSQL/MySQL/T-SQL na odpowiedniki SQLite."""
+    for pattern, replacement in _DIALECT_REWRITES:
+        sql = pattern.sub(replacement, sql)
+    top = _TSQL_TOP.match(sql)
+    if top:
+        sql = "SELECT " + sql[top.end():].lstrip() + f" LIMIT {top.group(1)}"
+    return sql
+
+
+def extract_sql_queries(response: str) -> List[str]:
+    """
+    Wyciąga zapytania SELECT/WITH z odpowiedzi.
+
+    Bloki ``` oznaczone jako SQL (lub nieoznaczone, zaczynające się od zapytania)
+    są dzielone na instrukcje; bez bloków kodu szukane są zapytania w tekście.
+
+    Args:
+        response (str): Odpowiedź modelu
+
+    Returns:
+        List[str]: Znormalizowane zapytania w kolejności wystąpienia
+    """
+    statements = []
+    for tag, body in _CODE_BLOCK.findall(response):
+        if tag.lower() in _SQL_TAGS or (not tag and _QUERY_START.match(normalize_sql(body))):
+            statements += body.split(';')
+    if not statements:
+        statements = _INLINE_QUERY.findall(response)
+    queries = [normalize_sql(statement) for statement in statements]
+    return [query for query in queries if _QUERY_START.match(query)]
+
+
+def _columns_match(rows: Sequence[Tuple], reference: Sequence[Tuple], ordered: bool) -> bool:
+    if len(rows) != len(reference):
+        return False
+    if not reference:
+        return True
+
+    def canonical(value: Any) -> Any:
+        return round(value, 2) if isinstance(value, float) else value
+
+    answer_columns = [tuple(canonical(row[i]) for row in rows) for i in range(len(rows[0]))]
+    reference_columns = [tuple(canonical(row[i]) for row in reference) for i in range(len(reference[0]))]
+    if not ordered:
+        # Bez kolejności: porównanie wierszy rzutowanych na pasujące kolumny
+        answer_columns = [tuple(sorted(column, key=repr)) for column in answer_columns]
+        reference_columns = [tuple(sorted(column, key=repr)) for column in reference_columns]
+    return all(column in answer_columns for column in reference_columns)
+
+
+class SqlGrader:
+    """Wykonywanie zapytań z odpowiedzi na bazach testowych (wspólne bazy i cache w obrębie przebiegu)."""
+
+    def __init__(self, seed: int = SQL_GRADER_SEED, timeout: float = SQL_GRADER_TIMEOUT):
+        """
+        Args:
+            seed (int): Ziarno danych baz testowych
+            timeout (float): Limit czasu wykonania jednego zapytania (s)
+        """
+        self.seed = seed
+        self.timeout = timeout
+        self._connections: Dict[str, sqlite3.Connection] = {}
+        self._cache: Dict[Tuple[str, str, Tuple[str, ...], bool], Dict[str, Any]] = {}
+        self._references: Dict[Tuple[str, str], List[Tuple]] = {}
+        self._lock = threading.Lock()
+
+    def _connection(self, fixture: str) -> sqlite3.Connection:
+        connection = self._connections.get(fixture)
+        if connection is None:
+            connection = sqlite3.connect(':memory:', check_same_thread=False)
+            SQL_FIXTURES[fixture](connection, self.seed)
+            connection.commit()
+            connection.execute("PRAGMA query_only = ON")
+            self._connections[fixture] = connection
+        return connection
+
+    def _execute(self, connection: sqlite3.Connection, sql: str) -> List[Tuple]:
+        deadline = time.perf_counter() + self.timeout
+        # Niezerowa wartość z handlera przerywa zapytanie (sqlite3.OperationalError: interrupted)
+        connection.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+        try:
+            return connection.execute(sql).fetchall()
+        finally:
+            connection.set_progress_handler(None, 0)
+
+    def _reference_rows(self, fixture: str, reference: str) -> List[Tuple]:
+        key = (fixture, reference)
+        if key not in self._references:
+            self._references[key] = self._execute(self._connection(fixture), reference)
+        return self._references[key]
+
+    def grade_query(self, sql: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wykonuje jedno zapytanie i porównuje wynik z zapytaniami wzorcowymi.
+
+        Args:
+            sql (str): Zapytanie (znormalizowane)
+            spec (Dict[str, Any]): Specyfikacja sql_tests
+
+        Returns:
+            Dict[str, Any]: sql_passed, sql_rows, sql_error
+        """
+        fixture = spec.get('fixture', 'customers_orders')
+        # Werdykt zależy też od zapytań wzorcowych i porządku - ten sam SQL w innym teście to inny klucz
+        key = (fixture, sql, tuple(spec['reference']), spec.get('ordered', True))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return dict(cached, sql_cached=True)
+            connection = self._connection(fixture)
+            outcome = {'sql_passed': False, 'sql_rows': None, 'sql_error': None}
+            try:
+                rows = self._execute(connection, to_sqlite_dialect(sql))
+                outcome['sql_rows'] = len(rows)
+                outcome['sql_passed'] = any(
+                    _columns_match(rows, self._reference_rows(fixture, reference), spec.get('ordered', True))
+                    for reference in spec['reference']
+                )
+            except sqlite3.OperationalError as e:
+                message = str(e)
+                outcome['sql_error'] = (f"Przekroczono limit czasu zapytania ({self.timeout}s)"
+                                        if message == 'interrupted' else f"Błąd SQL: {message}")
+            except (sqlite3.Error, sqlite3.Warning) as e:
+                outcome['sql_error'] = f"Błąd SQL: {e}"
+            self._cache[key] = outcome
+        return dict(outcome, sql_cached=False)
+
+    def grade(self, response: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ocenia odpowiedź: zalicza, jeśli którekolwiek z jej zapytań daje wynik wzorcowy.
+
+        Args:
+            response (str): Odpowiedź modelu
+            spec (Dict[str, Any]): Specyfikacja sql_tests z definicji promptu
+
+        Returns:
+            Dict[str, Any]: Pola sql_* do dołączenia do wyniku (sql_query - oceniane zapytanie)
+        """
+        queries = extract_sql_queries(response)
+        if not queries:
+            return {'sql_passed': False, 'sql_rows': None, 'sql_error': "Brak zapytania SQL w odpowiedzi",
+                    'sql_query': None, 'sql_cached': False}
+        first = None
+        for query in queries:
+            outcome = dict(self.grade_query(query, spec), sql_query=query)
+            if outcome['sql_passed']:
+                return outcome
+            first = first or outcome
+        return first
+
+    def close(self) -> None:
+        """Zamyka bazy testowe."""
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+
+
+def grade_sql_response(response: str, spec: Dict[str, Any], grader: Optional[SqlGrader] = None) -> Dict[str, Any]:
+    """
+    Ocenia odpowiedź SQL (zob. SqlGrader.grade); bez podanego gradera tworzy jednorazowy.
+
+    Args:
+        response (str): Odpowiedź modelu
+        spec (Dict[str, Any]): Specyfikacja sql_tests
+        grader (SqlGrader): Grader współdzielony w obrębie przebiegu (opcjonalnie)
+
+    Returns:
+        Dict[str, Any]: Pola sql_*
+    """
+    if grader is not None:
+        return grader.grade(response, spec)
+    grader = SqlGrader()
+    try:
+        return grader.grade(response, spec)
+    finally:
+        grader.close()
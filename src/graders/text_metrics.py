@@ -0,0 +1,186 @@
+"""
+Reference-based text metrics: chrF, ROUGE-L and length ratio.
+
+Prompts with stored reference answers (``references``) - summarization and
+translation - get a cheap, reproducible quality signal computed offline.
+Reference-side tables (character n-gram counts per order, word-position bit
+masks for the bit-parallel LCS) are built once per reference set, and scoring
+runs in batches: all responses of a test are scored against the same tables,
+identical responses only once.
+"""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from ..config import CHRF_MAX_ORDER, CHRF_BETA
+from .rule_scorer import normalize_text
+
+
+_WORD = re.compile(r'\w+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _char_ngrams(text: str, max_order: int) -> List[Counter]:
+    """Liczności n-gramów znakowych rzędów 1..max_order (bez odstępów, jak w chrF)."""
+    chars = _WHITESPACE.sub('', text.casefold())
+    return [Counter([chars[i:i + n] for i in range(len(chars) - n + 1)]) for n in range(1, max_order + 1)]
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(normalize_text(text))
+
+
+class _Reference:
+    """Tablice jednego tekstu wzorcowego liczone raz: n-gramy znakowe i maski pozycji słów."""
+
+    def __init__(self, text: str, max_order: int):
+        self.ngrams = _char_ngrams(text, max_order)
+        words = _words(text)
+        self.length = len(words)
+        # Słowo -> maska bitowa pozycji w tekście wzorcowym (LCS bitowo-równoległy)
+        self.masks: Dict[str, int] = {}
+        for position, word in enumerate(words):
+            self.masks[word] = self.masks.get(word, 0) | (1 << position)
+        self.full_mask = (1 << self.length) - 1
+
+    def lcs(self, words: Sequence[str]) -> int:
+        """Długość najdłuższego wspólnego podciągu słów (algorytm Allisona-Dixa / Hyyrö)."""
+        row = self.full_mask
+        for word in words:
+            matches = row & self.masks.get(word, 0)
+            row = ((row + matches) | (row - matches)) & self.full_mask
+        return self.length - bin(row).count('1')
+
+
+def chrf_score(hypothesis: Sequence[Counter], reference: Sequence[Counter], beta: float = CHRF_BETA) -> float:
+    """
+    Liczy chrF z liczności n-gramów znakowych (średnie precyzja i kompletność po rzędach).
+
+    Args:
+        hypothesis (Sequence[Counter]): N-gramy odpowiedzi (rzędy 1..N)
+        reference (Sequence[Counter]): N-gramy tekstu wzorcowego
+        beta (float): Waga kompletności względem precyzji
+
+    Returns:
+        float: chrF w skali 0-100
+    """
+    precisions, recalls = [], []
+    for hyp_counts, ref_counts in zip(hypothesis, reference):
+        hyp_total, ref_total = sum(hyp_counts.values()), sum(ref_counts.values())
+        if not hyp_total or not ref_total:
+            continue
+        # Tylko n-gramy wspólne (przecięcie kluczy liczone po stronie C)
+        matches = sum([min(hyp_counts[ngram], ref_counts[ngram]) for ngram in hyp_counts.keys() & ref_counts.keys()])
+        precisions.append(matches / hyp_total)
+        recalls.append(matches / ref_total)
+    if not precisions:
+        return 0.0
+    precision, recall = math.fsum(precisions) / len(precisions), math.fsum(recalls) / len(recalls)
+    if not precision and not recall:
+        return 0.0
+    beta2 = beta ** 2
+    return 100.0 * (1 + beta2) * precision * recall / (beta2 * precision + recall)
+
+
+class ReferenceSet:
+    """Teksty wzorcowe jednego testu z prekomputowanymi tablicami."""
+
+    def __init__(self, references: Sequence[str], max_order: int = CHRF_MAX_ORDER):
+        """
+        Args:
+            references (Sequence[str]): Odpowiedzi wzorcowe (wynik: najlepszy wzorzec per metryka)
+            max_order (int): Najwyższy rząd n-gramów znakowych chrF
+        """
+        self.max_order = max_order
+        self._references = [_Reference(text, max_order) for text in references]
+
+    def score(self, response: str) -> Dict[str, Any]:
+        """
+        Ocenia odpowiedź względem wzorców.
+
+        Args:
+            response (str): Odpowiedź modelu
+
+        Returns:
+            Dict[str, Any]: ref_chrf (0-100), ref_rouge_l (F1 0-1),
+            ref_length_ratio (słowa odpowiedzi / słowa najbliższego długością wzorca)
+        """
+        if not self._references or not response or not response.strip():
+            return {'ref_chrf': 0.0, 'ref_rouge_l': 0.0, 'ref_length_ratio': 0.0}
+        ngrams = _char_ngrams(response, self.max_order)
+        words = _words(response)
+        chrf = max(chrf_score(ngrams, reference.ngrams) for reference in self._references)
+        rouge = 0.0
+        for reference in self._references:
+            common = reference.lcs(words)
+            if common:
+                precision, recall = common / len(words), common / reference.length
+                rouge = max(rouge, 2 * precision * recall / (precision + recall))
+        closest = min(self._references, key=lambda reference: abs(reference.length - len(words)))
+        ratio = len(words) / closest.length if closest.length else 0.0
+        return {'ref_chrf': chrf, 'ref_rouge_l': rouge, 'ref_length_ratio': ratio}
+
+    def score_batch(self, responses: Sequence[str]) -> List[Dict[str, Any]]:
+        """Ocenia wiele odpowiedzi (identyczne odpowiedzi liczone raz)."""
+        unique: Dict[str, Dict[str, Any]] = {}
+        for response in responses:
+            if response not in unique:
+                unique[response] = self.score(response)
+        return [dict(unique[response]) for response in responses]
+
+
+@lru_cache(maxsize=128)
+def _reference_set(references: Tuple[str, ...]) -> ReferenceSet:
+    return ReferenceSet(references)
+
+
+def reference_metrics(response: str, references: Sequence[str]) -> Dict[str, Any]:
+    """
+    Liczy metryki odpowiedzi względem wzorców (tablice wzorców z cache).
+
+    Args:
+        response (str): Odpowiedź modelu
+        references (Sequence[str]): Odpowiedzi wzorcowe
+
+    Returns:
+        Dict[str, Any]: Pola ref_* do dołączenia do wyniku
+    """
+    return _reference_set(tuple(references)).score(response)
+
+
+def score_results(results: Any, tests: Iterable[Dict[str, Any]]) -> int:
+    """
+    Liczy metryki wzorcowe hurtowo dla wszystkich wyników przebiegu.
+
+    Wyniki są grupowane po teście, więc odpowiedzi wszystkich modeli na ten sam
+    prompt są oceniane jedną paczką względem tych samych tablic wzorców.
+
+    Args:
+        results: ResultStore lub lista słowników wyników
+        tests (Iterable[Dict[str, Any]]): Definicje testów (dopasowanie po nazwie testu)
+
+    Returns:
+        int: Liczba ocenionych wyników
+    """
+    references = {test['name']: tuple(test['references']) for test in tests if test.get('references')}
+    rows_by_test: Dict[str, List[int]] = {}
+    records = []
+    for row, result in enumerate(results):
+        records.append(result)
+        if result.get('test_name') in references:
+            rows_by_test.setdefault(result.get('test_name'), []).append(row)
+
+    set_fields = getattr(results, 'set_fields', None)
+    scored = 0
+    for test_name, rows in rows_by_test.items():
+        responses = [records[row].get('response') or '' for row in rows]
+        for row, metrics in zip(rows, _reference_set(references[test_name]).score_batch(responses)):
+            if set_fields is not None:
+                set_fields(row, **metrics)
+            else:
+                records[row].update(metrics)
+            scored += 1
+    return scored
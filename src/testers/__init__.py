@@ -1,5 +1,6 @@
 """Testers module initialization."""
 
 from .base_tester import BaseTester
+from .judge_pipeline import JudgePipeline
 
-__all__ = ['BaseTester']
+__all__ = ['BaseTester', 'JudgePipeline']
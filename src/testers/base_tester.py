@@ -3,18 +3,43 @@ Base tester class providing common functionality for all LLM testers.
 """
 
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-from ..api import get_available_models, ask_ollama, judge_with_gemini
+from ..api import get_available_models, ask_ollama, JudgeProvider, GeminiJudgeProvider, PRIORITY_BATCH
 from ..utils import (
     print_progress_bar, 
     get_gemini_api_key, 
     create_file_header, 
     format_test_header,
-    generate_summary
+    generate_summary,
+    append_to_output_file,
+    ResultStore
 )
-from ..config import DEFAULT_SLEEP_BETWEEN_MODELS, GEMINI_JUDGE_MODEL_NAME
+from ..utils.exporters import export_run
+from ..utils.judge_sampling import JudgeSampler
+from ..graders import (
+    score_response,
+    should_skip_judge,
+    verify_answer,
+    score_results,
+    score_embedding_similarity,
+    CodeGrader,
+    SqlGrader
+)
+from ..config import (
+    DEFAULT_SLEEP_BETWEEN_MODELS,
+    JUDGE_BATCH_SIZE,
+    JUDGE_STREAMING,
+    JUDGE_SCORE_ONLY,
+    JUDGE_SAMPLING,
+    CODE_GRADER_ENABLED,
+    SQL_GRADER_ENABLED,
+    ANSWER_SKIP_JUDGE_POLICY,
+    TEXT_METRICS_ENABLED,
+    EMBEDDING_ENABLED
+)
+from .judge_pipeline import JudgePipeline
 
 
 class BaseTester:
@@ -23,18 +48,22 @@ class BaseTester:
     Zapewnia wspólną funkcjonalność dla testowania modeli.
     """
     
-    def __init__(self, use_judge: bool = True):
+    def __init__(self, use_judge: bool = True, judge_provider: Optional[JudgeProvider] = None):
         """
         Inicjalizuje bazowy tester.
         
         Args:
             use_judge (bool): Czy używać sędziego AI do oceny odpowiedzi
+            judge_provider (JudgeProvider): Dostawca sędziego (None = Gemini z kluczem z ENV)
         """
         self.use_judge = use_judge
         self.gemini_api_key = None
-        if use_judge:
+        self.judge_provider = judge_provider
+        if use_judge and judge_provider is None:
             self.gemini_api_key = get_gemini_api_key()
-            self.use_judge = self.gemini_api_key is not None
+            if self.gemini_api_key:
+                self.judge_provider = GeminiJudgeProvider(api_key=self.gemini_api_key)
+        self.use_judge = use_judge and self.judge_provider is not None
     
     def get_models(self) -> List[str]:
         """
@@ -53,7 +82,8 @@ class BaseTester:
         self, 
         model: str, 
         test: Dict[str, Any], 
-        output_file: str
+        output_file: str,
+        judge_inline: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Uruchamia pojedynczy test dla modelu.
@@ -62,6 +92,7 @@ class BaseTester:
             model (str): Nazwa modelu
             test (Dict[str, Any]): Definicja testu
             output_file (str): Plik wyjściowy
+            judge_inline (bool): Oceń od razu; False = ocenę zleca wywołujący (JudgePipeline)
             
         Returns:
             Optional[Dict[str, Any]]: Wyniki testu lub None w przypadku błędu
@@ -77,13 +108,22 @@ class BaseTester:
             **test.get('options', {})
         )
         
-        if result and self.use_judge:
+        if result and test.get('category'):
+            result['category'] = test['category']
+        
+        if result and test.get('expected_elements'):
+            # Szybka ocena regułami - jednoznaczne odpowiedzi nie trafiają do sędziego (RULE_SKIP_JUDGE_POLICY)
+            result.update(score_response(result.get('response', ''), test['expected_elements']))
+            print(f"\nReguły: {result['rule_verdict']} ({result['rule_score']:.0%} oczekiwanych elementów)")
+        
+        if result and test.get('answer'):
+            # Weryfikacja odpowiedzi końcowej (zadania zamknięte) - jednoznaczny werdykt zastępuje sędziego
+            result.update(verify_answer(result.get('response', ''), test['answer']))
+            print(f"\nWeryfikacja odpowiedzi: {result['answer_verdict']} ({result['answer_extracted'] or 'nie odczytano'})")
+        
+        if result and self.use_judge and judge_inline and self.needs_judge(result):
             print("\n--- Ocena sędziego AI ---", end="", flush=True)
-            rating, justification = judge_with_gemini(
-                result['response'], 
-                test['prompt'], 
-                self.gemini_api_key
-            )
+            rating, justification = self.judge(result['response'], test['prompt'])
             result['judge_rating'] = rating
             result['judge_justification'] = justification
             
@@ -92,22 +132,72 @@ class BaseTester:
             print("--------------------------\n")
             
             # Zaktualizuj plik wyników o ocenę sędziego
-            with open(output_file, 'a', encoding='utf-8') as f:
-                f.write(f"\nOcena Sędziego AI ({GEMINI_JUDGE_MODEL_NAME}): {rating}/5\n")
-                f.write(f"Uzasadnienie Sędziego AI: {justification}\n")
-                f.write("="*80 + "\n")
+            append_to_output_file(
+                output_file,
+                f"\nOcena Sędziego AI ({self.judge_provider.model_name}): {rating}/5\n"
+                f"Uzasadnienie Sędziego AI: {justification}\n" + "="*80 + "\n"
+            )
         elif result:
-            with open(output_file, 'a', encoding='utf-8') as f:
-                f.write("="*80 + "\n")
+            append_to_output_file(output_file, "="*80 + "\n")
         
         return result
     
+    def needs_judge(self, result: Dict[str, Any]) -> bool:
+        """Czy wynik wymaga oceny sędziego (False, gdy reguły lub weryfikacja odpowiedzi dały jednoznaczny werdykt)."""
+        if should_skip_judge(result, ANSWER_SKIP_JUDGE_POLICY, 'answer_verdict'):
+            return False
+        return 'rule_verdict' not in result or not should_skip_judge(result)
+    
+    def judge(self, model_response: str, original_prompt: str) -> Tuple[int, str]:
+        """
+        Ocenia pojedynczą odpowiedź sędzią AI.
+        
+        Args:
+            model_response (str): Odpowiedź modelu
+            original_prompt (str): Oryginalne pytanie
+            
+        Returns:
+            Tuple[int, str]: Ocena (1-5, 0 = błąd) i uzasadnienie
+        """
+        return self.judge_provider.judge(model_response, original_prompt, priority=PRIORITY_BATCH)
+    
+    def judge_stream(self, model_response: str, original_prompt: str) -> Dict[str, Any]:
+        """
+        Ocenia odpowiedź sędzią strumieniowym (JUDGE_SCORE_ONLY: bez pełnego uzasadnienia).
+        
+        Args:
+            model_response (str): Odpowiedź modelu
+            original_prompt (str): Oryginalne pytanie
+            
+        Returns:
+            Dict[str, Any]: rating, justification, justification_chars, truncated
+        """
+        return self.judge_provider.judge_stream(
+            model_response, original_prompt, score_only=JUDGE_SCORE_ONLY, priority=PRIORITY_BATCH
+        )
+    
+    def judge_batch(self, items: List[Tuple[str, str]]) -> List[Tuple[int, str]]:
+        """
+        Ocenia paczkę odpowiedzi (Gemini: jednym zapytaniem do sędziego AI).
+        
+        Args:
+            items (List[Tuple[str, str]]): Pary (odpowiedź modelu, oryginalne pytanie)
+            
+        Returns:
+            List[Tuple[int, str]]: Oceny i uzasadnienia w kolejności wejścia
+        """
+        return self.judge_provider.judge_batch(items, priority=PRIORITY_BATCH)
+    
+    def _print_verdict(self, job: Dict[str, Any], rating: int, justification: str) -> None:
+        """Wypisuje ocenę dostarczoną przez JudgePipeline."""
+        print(f"\n⚖️ Ocena sędziego [{job['model']} | {job['test_name']}]: {rating}/5")
+    
     def run_test_suite(
         self, 
         test_prompts: List[Dict[str, Any]], 
         test_name_prefix: str,
         output_file: str
-    ) -> List[Dict[str, Any]]:
+    ) -> ResultStore:
         """
         Uruchamia zestaw testów dla wszystkich modeli.
         
@@ -117,17 +207,17 @@ class BaseTester:
             output_file (str): Plik wyjściowy
             
         Returns:
-            List[Dict[str, Any]]: Lista wyników testów
+            ResultStore: Wyniki testów (metryki w pamięci, odpowiedzi w pliku .responses.blob)
         """
         models = self.get_models()
         if not models:
-            return []
+            return ResultStore()
         
         # Nagłówek pliku
         header = create_file_header(
             test_name_prefix, 
             models, 
-            GEMINI_JUDGE_MODEL_NAME, 
+            self.judge_provider.model_name if self.judge_provider else "brak", 
             self.use_judge
         )
         
@@ -137,10 +227,30 @@ class BaseTester:
         print(f"Rozpoczynam {test_name_prefix.lower()} test {len(models)} modeli z {len(test_prompts)} zadaniami...")
         print(f"Wyniki będą zapisywane do: {output_file}")
         
-        results = []
+        results = ResultStore.for_output_file(output_file)
         total_tests = len(test_prompts) * len(models)
         current_test = 0
         
+        # Oceny sędziego wykonywane równolegle z generowaniem kolejnych odpowiedzi
+        judge_pipeline = None
+        if self.use_judge:
+            judge_pipeline = JudgePipeline(
+                self.judge_stream if JUDGE_STREAMING else self.judge, output_file, results, on_verdict=self._print_verdict,
+                batch_judge=self.judge_batch if JUDGE_BATCH_SIZE > 1 and not JUDGE_STREAMING else None,
+                batch_size=JUDGE_BATCH_SIZE,
+                judge_model_name=self.judge_provider.model_name
+            )
+        # Próbkowanie: oceny po generowaniu, tylko dla warstwowej próby komórek
+        judge_sampler = JudgeSampler(results) if judge_pipeline and JUDGE_SAMPLING else None
+        # Kod z odpowiedzi uruchamiany w piaskownicy równolegle z generowaniem
+        code_grader = None
+        if CODE_GRADER_ENABLED and any(test.get('code_tests') for test in test_prompts):
+            code_grader = CodeGrader(results)
+        # Zapytania SQL wykonywane na bazie testowej budowanej raz na przebieg (wynik natychmiastowy)
+        sql_grader = None
+        if SQL_GRADER_ENABLED and any(test.get('sql_tests') for test in test_prompts):
+            sql_grader = SqlGrader()
+        
         for i, test in enumerate(test_prompts, 1):
             print(format_test_header(test['name'], i, len(test_prompts)))
             
@@ -153,15 +263,45 @@ class BaseTester:
                     suffix=f'({current_test}/{total_tests})'
                 )
                 
-                result = self.run_single_test(model, test, output_file)
+                result = self.run_single_test(model, test, output_file, judge_inline=judge_pipeline is None)
                 if result:
-                    results.append(result)
+                    row = results.append(result)
+                    if code_grader and test.get('code_tests'):
+                        code_grader.submit(result, test['code_tests'], row)
+                    if sql_grader and test.get('sql_tests'):
+                        results.set_fields(row, **sql_grader.grade(result.get('response', ''), test['sql_tests']))
+                    needs_judge = self.needs_judge(result)
+                    if judge_sampler and needs_judge:
+                        judge_sampler.add(row, test['prompt'])
+                    elif judge_pipeline and needs_judge:
+                        judge_pipeline.submit(result, test['prompt'], row)
                 
                 time.sleep(DEFAULT_SLEEP_BETWEEN_MODELS)
         
+        if judge_sampler:
+            print(f"\nPróbkowanie ocen sędziego ({len(results)} komórek)...")
+            judge_sampler.run(judge_pipeline)
+            print(f"Ocenionych komórek: {judge_sampler.judged}/{len(results)} w {judge_sampler.rounds} rundach")
+        if judge_pipeline:
+            if judge_pipeline.pending:
+                print(f"\nOczekiwanie na {judge_pipeline.pending} ocen sędziego...")
+            judge_pipeline.join()
+            judge_pipeline.close()
+        if code_grader:
+            code_grader.close()
+        if sql_grader:
+            sql_grader.close()
+        # Metryki względem odpowiedzi wzorcowych - hurtowo, paczka odpowiedzi wszystkich modeli na test
+        if TEXT_METRICS_ENABLED:
+            score_results(results, test_prompts)
+        if EMBEDDING_ENABLED:
+            score_embedding_similarity(results, test_prompts)
+        
         # Generuj podsumowanie
-        summary = generate_summary(results, output_file)
+        summary = generate_summary(results, output_file, judge_sampler.estimates() if judge_sampler else None)
         print(summary)
+        for export_path in export_run(results, output_file):
+            print(f"📦 Eksport: {export_path}")
         print(f"\n{test_name_prefix} test zakończony! Wyniki zapisane w: {output_file}")
         
         return results
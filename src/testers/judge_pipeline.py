@@ -0,0 +1,259 @@
+"""
+Pipelined judge evaluation running alongside generation.
+
+Finished responses are submitted to a bounded pool of judge workers while the
+tester immediately starts the next generation. Verdicts are merged back into
+the results (ResultStore row or result dict) and appended to the output file
+as tagged lines as soon as they arrive.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from ..config import GEMINI_JUDGE_MODEL_NAME, JUDGE_MAX_WORKERS, JUDGE_MAX_PENDING
+from ..utils import ResultStore, append_to_output_file
+
+
+# Funkcja sędziego: (odpowiedź, oryginalne pytanie) -> (ocena, uzasadnienie)
+# lub słownik sędziego strumieniowego (rating, justification, justification_chars, truncated)
+JudgeFunction = Callable[[str, str], Union[Tuple[int, str], Dict[str, Any]]]
+# Funkcja sędziego paczkowego: [(odpowiedź, pytanie), ...] -> [(ocena, uzasadnienie), ...]
+BatchJudgeFunction = Callable[[List[Tuple[str, str]]], List[Tuple[int, str]]]
+# Wywołanie zwrotne po ocenie: (zadanie, ocena, uzasadnienie)
+VerdictCallback = Callable[[Dict[str, Any], int, str], None]
+
+
+def format_verdict(judge_model_name: str, rating: int, justification: str,
+                   model: Optional[str] = None, test_name: Optional[str] = None) -> str:
+    """
+    Formatuje ocenę sędziego do zapisu w pliku wyników.
+
+    Oceny dopisywane z opóźnieniem są oznaczane modelem i testem, aby można
+    je było przypisać do właściwego bloku (zob. src.utils.result_index).
+
+    Args:
+        judge_model_name (str): Nazwa modelu sędziego
+        rating (int): Ocena 1-5 (0 = błąd sędziego)
+        justification (str): Uzasadnienie
+        model (str): Oceniany model (dla oceny oznaczonej)
+        test_name (str): Nazwa testu (dla oceny oznaczonej)
+
+    Returns:
+        str: Tekst do dopisania
+    """
+    tag = f" [Model: {model} | Test: {test_name}]" if model is not None else ""
+    return (f"\nOcena Sędziego AI ({judge_model_name}){tag}: {rating}/5\n"
+            f"Uzasadnienie Sędziego AI: {justification}\n" + "-" * 80 + "\n")
+
+
+class JudgePipeline:
+    """Kolejka ocen sędziego obsługiwana przez ograniczoną pulę wątków."""
+
+    def __init__(
+        self,
+        judge: JudgeFunction,
+        output_file: Optional[str] = None,
+        results: Any = None,
+        judge_model_name: str = GEMINI_JUDGE_MODEL_NAME,
+        max_workers: int = JUDGE_MAX_WORKERS,
+        max_pending: int = JUDGE_MAX_PENDING,
+        on_verdict: Optional[VerdictCallback] = None,
+        batch_judge: Optional[BatchJudgeFunction] = None,
+        batch_size: int = 1
+    ):
+        """
+        Inicjalizuje potok oceniania.
+
+        Args:
+            judge (JudgeFunction): Funkcja oceniająca pojedynczą odpowiedź
+            output_file (str): Plik wyników, do którego dopisywane są oceny
+            results: ResultStore, do którego scalane są oceny (opcjonalnie)
+            judge_model_name (str): Nazwa modelu sędziego (do pliku wyników)
+            max_workers (int): Liczba równoległych wywołań sędziego
+            max_pending (int): Maksymalna liczba ocen w kolejce; submit blokuje po jej przekroczeniu
+            on_verdict (VerdictCallback): Wywoływane w wątku roboczym po każdej ocenie
+            batch_judge (BatchJudgeFunction): Sędzia paczkowy; odpowiedzi są zbierane
+                w paczki po batch_size i oceniane jednym wywołaniem
+            batch_size (int): Liczba odpowiedzi w paczce (1 = ocena pojedyncza)
+        """
+        self.judge = judge
+        self.output_file = output_file
+        self.results = results
+        self.judge_model_name = judge_model_name
+        self.on_verdict = on_verdict
+        self.batch_judge = batch_judge
+        self.batch_size = batch_size if batch_judge else 1
+        self._batch: List[Dict[str, Any]] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="judge")
+        self._slots = threading.BoundedSemaphore(max(max_pending, max_workers, self.batch_size))
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._idle = threading.Condition(self._lock)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, result: Dict[str, Any], prompt: str, row: Optional[int] = None) -> Optional[Future]:
+        """
+        Dodaje odpowiedź do kolejki oceniania i natychmiast wraca.
+
+        Args:
+            result (Dict[str, Any]): Wynik z ask_ollama (model, test_name, response)
+            prompt (str): Oryginalne pytanie
+            row (int): Numer wiersza w ResultStore, do którego trafi ocena
+
+        Returns:
+            Optional[Future]: Przyszły wynik (ocena, uzasadnienie); None w trybie paczkowym
+        """
+        job = {
+            'model': result.get('model'),
+            'test_name': result.get('test_name'),
+            'prompt': prompt,
+            'response': result.get('response', ''),
+            'row': row,
+            'result': result if row is None else None,
+        }
+        self._slots.acquire()
+        with self._lock:
+            self._pending += 1
+            self.submitted += 1
+            if self.batch_size > 1:
+                self._batch.append(job)
+                if len(self._batch) < self.batch_size:
+                    return None
+                jobs, self._batch = self._batch, []
+        if self.batch_size > 1:
+            self._dispatch(self._run_batch, jobs, len(jobs))
+            return None
+        return self._dispatch(self._run, job, 1)
+
+    def flush(self) -> None:
+        """Wysyła do oceny niepełną paczkę (tryb paczkowy)."""
+        with self._lock:
+            jobs, self._batch = self._batch, []
+        if jobs:
+            self._dispatch(self._run_batch, jobs, len(jobs))
+
+    def _dispatch(self, function: Callable, argument: Any, job_count: int) -> Future:
+        try:
+            future = self._executor.submit(function, argument)
+        except RuntimeError:
+            for _ in range(job_count):
+                self._finish()
+            raise
+        def release_cancelled(done: Future) -> None:
+            # Oceny anulowane przy zamykaniu nie wywołają funkcji roboczej - zwolnij ich miejsca w kolejce
+            if done.cancelled():
+                for _ in range(job_count):
+                    self._finish()
+
+        future.add_done_callback(release_cancelled)
+        return future
+
+    def _run(self, job: Dict[str, Any]) -> Tuple[int, str]:
+        try:
+            return self._judge_single(job)
+        finally:
+            self._finish()
+
+    def _judge_single(self, job: Dict[str, Any]) -> Tuple[int, str]:
+        extra = None
+        try:
+            verdict = self.judge(job['response'], job['prompt'])
+            if isinstance(verdict, dict):
+                rating, justification = verdict['rating'], verdict['justification']
+                extra = {'judge_truncated': verdict['truncated'],
+                         'judge_justification_chars': verdict['justification_chars']}
+            else:
+                rating, justification = verdict
+        except Exception as e:
+            rating, justification = 0, f"Nieoczekiwany błąd sędziego: {e}"
+        self._apply(job, rating, justification, extra)
+        return rating, justification
+
+    def _run_batch(self, jobs: List[Dict[str, Any]]) -> None:
+        try:
+            try:
+                verdicts = list(self.batch_judge([(job['response'], job['prompt']) for job in jobs]))
+            except Exception as e:
+                verdicts = [(0, f"Nieoczekiwany błąd sędziego: {e}")] * len(jobs)
+            if len(verdicts) != len(jobs):
+                print(f"⚠️ Paczka sędziego zwróciła {len(verdicts)} ocen dla {len(jobs)} odpowiedzi - "
+                      f"brakujące oceniane pojedynczo")
+            for job, (rating, justification) in zip(jobs, verdicts):
+                self._apply(job, rating, justification)
+            # Pozycje bez werdyktu paczki nie mogą zostać bez oceny ani błędu
+            for job in jobs[len(verdicts):]:
+                self._judge_single(job)
+        finally:
+            for _ in jobs:
+                self._finish()
+
+    def _apply(self, job: Dict[str, Any], rating: int, justification: str,
+               extra: Optional[Dict[str, Any]] = None) -> None:
+        """Scala ocenę z wynikami, plikiem wyników i powiadamia wywołującego."""
+        verdict = {'judge_rating': rating, 'judge_justification': justification,
+                   'judge_model': self.judge_model_name}
+        if extra:
+            verdict.update(extra)
+        if job['row'] is not None and isinstance(self.results, ResultStore):
+            self.results.set_fields(job['row'], **verdict)
+        elif job['result'] is not None:
+            job['result'].update(verdict)
+
+        if self.output_file:
+            append_to_output_file(self.output_file, format_verdict(
+                self.judge_model_name, rating, justification, job['model'], job['test_name']))
+
+        with self._lock:
+            if rating > 0:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+        if self.on_verdict:
+            self.on_verdict(job, rating, justification)
+
+    def _finish(self) -> None:
+        self._slots.release()
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    @property
+    def pending(self) -> int:
+        """Liczba ocen w kolejce lub w trakcie."""
+        with self._lock:
+            return self._pending
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Czeka na zakończenie wszystkich zleconych ocen.
+
+        Args:
+            timeout (float): Maksymalny czas oczekiwania w sekundach (None = bez limitu)
+
+        Returns:
+            bool: True, jeśli wszystkie oceny zostały zakończone
+        """
+        self.flush()
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, cancel_pending: bool = False) -> None:
+        """
+        Zamyka pulę wątków sędziego.
+
+        Args:
+            cancel_pending (bool): Anuluj oceny, które jeszcze się nie rozpoczęły
+        """
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+
+    def __enter__(self) -> 'JudgePipeline':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.join()
+        self.close()
@@ -3,6 +3,7 @@
 from .helpers import (
     print_progress_bar, 
     get_timestamp, 
+    append_to_output_file,
     ensure_directory_exists, 
     get_gemini_api_key,
     generate_output_filename,
@@ -17,11 +18,15 @@ from .multilingual_prompts import (
     get_available_languages,
     get_language_display_name
 )
-from .analysis import generate_summary
+from .analysis import generate_summary, aggregate_results, describe_values
+from .result_store import ResultStore, ResultRecord, ResponseHandle
+from .judge_sampling import JudgeSampler, estimate_judge_scores
+from .live_metrics import LiveRunMetrics, format_eta
 
 __all__ = [
     'print_progress_bar', 
     'get_timestamp', 
+    'append_to_output_file',
     'ensure_directory_exists', 
     'get_gemini_api_key',
     'generate_output_filename',
@@ -34,5 +39,14 @@ __all__ = [
     'get_test_prompts_by_language',
     'get_available_languages',
     'get_language_display_name',
-    'generate_summary'
+    'generate_summary',
+    'aggregate_results',
+    'describe_values',
+    'ResultStore',
+    'ResultRecord',
+    'ResponseHandle',
+    'JudgeSampler',
+    'estimate_judge_scores',
+    'LiveRunMetrics',
+    'format_eta'
 ]
@@ -2,85 +2,590 @@
 Result analysis and summary generation utilities.
 """
 
-from typing import List, Dict, Any
+import math
+from array import array
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union
 
+from ..config import JUDGE_SAMPLE_CONFIDENCE
+from .result_store import ResultStore
 
-def generate_summary(results: List[Dict[str, Any]], output_file: str) -> str:
+try:
+    import numpy as np
+except ImportError:  # NumPy jest opcjonalny - bez niego działa ścieżka czysto pythonowa
+    np = None
+
+
+# Metryki zbierane dla każdego wyniku (klucz metryki -> etykieta w podsumowaniu)
+SUMMARY_METRICS = {
+    'first_token_time': 'Czas pierwszego tokena',
+    'total_time': 'Całkowity czas',
+    'tokens_per_second': 'Szybkość generowania',
+    'judge_rating': 'Ocena sędziego AI',
+    'response_length': 'Długość odpowiedzi',
+}
+
+# Metryki względem odpowiedzi wzorcowych (graders.text_metrics)
+REFERENCE_METRICS = ('ref_chrf', 'ref_rouge_l', 'ref_length_ratio', 'embed_similarity')
+
+# Domyślne grupowania (nazwa grupowania -> pola wyniku tworzące klucz)
+SUMMARY_GROUPINGS = {
+    'model': ('model',),
+    'category': ('category',),
+    'language': ('language',),
+}
+
+PERCENTILES = (50, 95, 99)
+
+# Metryki wymagające reguł z get_metric_value (wyliczane, z wartością zastępczą lub filtrowane)
+_DERIVED_METRICS = frozenset({'tokens_per_second', 'response_length', 'judge_rating'})
+
+GroupKey = Union[Any, Tuple[Any, ...]]
+
+
+def result_tokens_per_second(result: Dict[str, Any]) -> Optional[float]:
+    """
+    Wylicza szybkość generowania (tokeny/s) na podstawie dostępnych pól wyniku.
+
+    Args:
+        result (Dict[str, Any]): Wynik testu
+
+    Returns:
+        Optional[float]: Tokeny na sekundę lub None gdy brak danych
+    """
+    explicit = result.get('tokens_per_second')
+    if explicit is not None:
+        return float(explicit)
+
+    eval_count = result.get('eval_count')
+    if not eval_count:
+        return None
+
+    # eval_duration z Ollama jest w nanosekundach i obejmuje tylko generowanie
+    eval_duration = result.get('eval_duration')
+    if eval_duration:
+        return eval_count / (eval_duration / 1e9)
+
+    total_time = result.get('total_time')
+    first_token_time = result.get('first_token_time') or 0.0
+    if total_time and total_time > first_token_time:
+        return eval_count / (total_time - first_token_time)
+    return None
+
+
+def get_metric_value(result: Dict[str, Any], metric: str) -> Optional[float]:
+    """
+    Zwraca wartość metryki z wyniku lub None, gdy jej brakuje.
+
+    Args:
+        result (Dict[str, Any]): Wynik testu
+        metric (str): Nazwa metryki (klucz z SUMMARY_METRICS lub dowolne pole liczbowe)
+
+    Returns:
+        Optional[float]: Wartość metryki
+    """
+    if metric == 'tokens_per_second':
+        return result_tokens_per_second(result)
+
+    value = result.get(metric)
+    if value is None and metric == 'response_length':
+        response = result.get('response')
+        value = len(response) if response is not None else None
+    if value is None:
+        return None
+
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(value):
+        return None
+    # Ocena 0 oznacza błąd sędziego, a nie rzeczywistą ocenę
+    if metric == 'judge_rating' and value <= 0:
+        return None
+    return value
+
+
+def _percentile_sorted(sorted_values: Sequence[float], percentile: float) -> float:
+    """Percentyl z interpolacją liniową (jak domyślnie w NumPy) dla posortowanej listy."""
+    position = (len(sorted_values) - 1) * percentile / 100.0
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[int(position)]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def describe_values(values: Iterable[float]) -> Optional[Dict[str, float]]:
+    """
+    Liczy statystyki opisowe: średnią, odchylenie standardowe, percentyle i min/max.
+
+    Args:
+        values (Iterable[float]): Wartości metryki (bez brakujących)
+
+    Returns:
+        Optional[Dict[str, float]]: Statystyki lub None dla pustej serii
+    """
+    if np is not None:
+        data = np.asarray(values if isinstance(values, (list, tuple, array)) else list(values), dtype=float)
+        return _describe_numpy(data)
+
+    sorted_values = sorted(values)
+    count = len(sorted_values)
+    if count == 0:
+        return None
+
+    mean = math.fsum(sorted_values) / count
+    variance = math.fsum((v - mean) ** 2 for v in sorted_values) / (count - 1) if count > 1 else 0.0
+    stats = {
+        'count': count,
+        'mean': mean,
+        'stddev': math.sqrt(variance),
+        'min': sorted_values[0],
+        'max': sorted_values[-1],
+    }
+    for percentile in PERCENTILES:
+        stats[f'p{percentile}'] = _percentile_sorted(sorted_values, percentile)
+    return stats
+
+
+def _describe_numpy(data) -> Optional[Dict[str, float]]:
+    """Wektorowa wersja describe_values dla tablicy NumPy bez wartości NaN."""
+    count = int(data.size)
+    if count == 0:
+        return None
+
+    percentiles = np.percentile(data, PERCENTILES)
+    stats = {
+        'count': count,
+        'mean': float(data.mean()),
+        'stddev': float(data.std(ddof=1)) if count > 1 else 0.0,
+        'min': float(data.min()),
+        'max': float(data.max()),
+    }
+    for percentile, value in zip(PERCENTILES, percentiles):
+        stats[f'p{percentile}'] = float(value)
+    return stats
+
+
+def aggregate_results(
+    results: Iterable[Dict[str, Any]],
+    groupings: Optional[Dict[str, Sequence[str]]] = None,
+    metrics: Optional[Sequence[str]] = None
+) -> Dict[str, Dict[GroupKey, Dict[str, Any]]]:
+    """
+    Agreguje wyniki w jednym przebiegu po liście dla wielu grupowań naraz.
+
+    Każdy wynik jest odczytywany dokładnie raz - wartości metryk trafiają do
+    kolumn (brakujące jako NaN), a dla każdego grupowania zapisywany jest kod
+    grupy. Statystyki liczone są potem per grupa, wektorowo gdy dostępny jest NumPy.
+
+    Args:
+        results (Iterable[Dict[str, Any]]): Wyniki testów
+        groupings (Dict[str, Sequence[str]]): Grupowania (domyślnie SUMMARY_GROUPINGS)
+        metrics (Sequence[str]): Metryki do agregacji (domyślnie SUMMARY_METRICS)
+
+    Returns:
+        Dict[str, Dict[GroupKey, Dict[str, Any]]]: {grupowanie: {klucz grupy:
+            {'count': liczba wyników, 'metrics': {metryka: statystyki lub None}}}}
+    """
+    groupings = groupings if groupings is not None else SUMMARY_GROUPINGS
+    metrics = list(metrics if metrics is not None else SUMMARY_METRICS)
+
+    if isinstance(results, ResultStore) and all(
+        len(fields) == 1 and results.codes(fields[0]) is not None for fields in groupings.values()
+    ):
+        columns, group_codes, group_keys = _columns_from_store(results, groupings, metrics)
+    else:
+        columns, group_codes, group_keys = _columns_from_rows(results, groupings, metrics)
+
+    aggregated = {}
+    for name in groupings:
+        keys_by_code = {code: key for key, code in group_keys[name].items()}
+        if np is not None:
+            per_group = _aggregate_numpy(columns, group_codes[name], len(keys_by_code))
+        else:
+            per_group = _aggregate_python(columns, group_codes[name], len(keys_by_code))
+        aggregated[name] = {keys_by_code[code]: stats for code, stats in enumerate(per_group)}
+
+    return aggregated
+
+
+def _columns_from_rows(results, groupings, metrics):
+    """Jeden przebieg po wynikach: kolumny metryk (NaN = brak) i kody grup."""
+    columns = {metric: array('d') for metric in metrics}
+    group_codes = {name: array('l') for name in groupings}
+    group_keys: Dict[str, Dict[GroupKey, int]] = {name: {} for name in groupings}
+    nan = float('nan')
+
+    # Metryki bez reguł specjalnych odczytywane są bezpośrednio (szybka ścieżka pętli)
+    appenders = [
+        (metric, columns[metric].append, metric not in _DERIVED_METRICS)
+        for metric in metrics
+    ]
+    group_appenders = [
+        (fields, group_keys[name], group_codes[name].append)
+        for name, fields in groupings.items()
+    ]
+
+    for result in results:
+        get = result.get
+        for metric, append, plain in appenders:
+            value = get(metric)
+            if plain and value.__class__ in (float, int):
+                append(value)
+                continue
+            value = get_metric_value(result, metric)
+            append(nan if value is None else value)
+
+        for fields, codes, append in group_appenders:
+            if len(fields) == 1:
+                key = get(fields[0])
+            else:
+                key = tuple(get(field) for field in fields)
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(codes)
+            append(code)
+
+    return columns, group_codes, group_keys
+
+
+def _speed_inputs(store: ResultStore) -> Dict[str, array]:
+    """Kolumny ResultStore, z których result_tokens_per_second wylicza brakujące tokeny/s."""
+    inputs = {}
+    for key in ('eval_count', 'eval_duration', 'total_time', 'first_token_time'):
+        column = store.column(key)
+        if column is not None:
+            inputs[key] = column
+    return inputs
+
+
+def _columns_from_store(store: ResultStore, groupings, metrics):
+    """Kolumny metryk i kody grup pobrane wprost z kolumn ResultStore (bez iteracji po rekordach)."""
+    if np is not None:
+        return _columns_from_store_numpy(store, groupings, metrics)
+
+    rows = len(store)
+    nan = float('nan')
+    columns = {}
+    for metric in metrics:
+        column = store.column(metric)
+        columns[metric] = array('d', column) if column is not None else array('d', [nan]) * rows
+
+    if 'judge_rating' in columns:
+        ratings = columns['judge_rating']
+        for row, value in enumerate(ratings):
+            if value <= 0:
+                ratings[row] = nan
+
+    if 'tokens_per_second' in columns:
+        # Uzupełnij brakujące tokeny/s tak samo jak dla rekordów (result_tokens_per_second)
+        speed = columns['tokens_per_second']
+        inputs = _speed_inputs(store)
+        if inputs:
+            for row, value in enumerate(speed):
+                if value != value:
+                    result = {key: column[row] for key, column in inputs.items() if column[row] == column[row]}
+                    computed = result_tokens_per_second(result)
+                    if computed is not None:
+                        speed[row] = computed
+
+    group_codes = {}
+    group_keys = {}
+    for name, fields in groupings.items():
+        raw_codes, strings = store.codes(fields[0])
+        dense = {}
+        codes = array('l')
+        for raw in raw_codes:
+            code = dense.get(raw)
+            if code is None:
+                code = dense[raw] = len(dense)
+            codes.append(code)
+        group_codes[name] = codes
+        group_keys[name] = {(None if raw < 0 else strings[raw]): code for raw, code in dense.items()}
+
+    return columns, group_codes, group_keys
+
+
+def _aggregate_python(columns: Dict[str, array], codes: array, group_count: int) -> List[Dict[str, Any]]:
+    """Statystyki per grupa bez NumPy - indeksy wierszy zbierane są raz na grupowanie."""
+    rows: List[List[int]] = [[] for _ in range(group_count)]
+    for row, code in enumerate(codes):
+        rows[code].append(row)
+
+    per_group = []
+    for group_rows in rows:
+        group_metrics = {}
+        for metric, column in columns.items():
+            values = [column[row] for row in group_rows]
+            group_metrics[metric] = describe_values([v for v in values if v == v])
+        per_group.append({'count': len(group_rows), 'metrics': group_metrics})
+    return per_group
+
+
+def _aggregate_numpy(columns: Dict[str, array], codes: array, group_count: int) -> List[Dict[str, Any]]:
+    """Statystyki per grupa z NumPy - jedno sortowanie kodów i wycinki kolumn."""
+    code_array = np.asarray(codes, dtype=np.intp)
+    order = np.argsort(code_array, kind='stable')
+    counts = np.bincount(code_array, minlength=group_count)
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+
+    sorted_columns = {}
+    for metric, column in columns.items():
+        sorted_columns[metric] = np.asarray(column, dtype=float)[order]
+
+    per_group = []
+    for code in range(group_count):
+        start, end = bounds[code], bounds[code + 1]
+        group_metrics = {}
+        for metric, data in sorted_columns.items():
+            values = data[start:end]
+            group_metrics[metric] = _describe_numpy(values[~np.isnan(values)])
+        per_group.append({'count': int(counts[code]), 'metrics': group_metrics})
+    return per_group
+
+
+def _format_stats(stats: Optional[Dict[str, float]], unit: str, precision: int = 2) -> str:
+    """Formatuje statystyki metryki do jednej linii podsumowania."""
+    if not stats:
+        return "N/A"
+    fmt = f".{precision}f"
+    return (
+        f"śr. {stats['mean']:{fmt}}{unit} ± {stats['stddev']:{fmt}} | "
+        f"p50 {stats['p50']:{fmt}}{unit} | p95 {stats['p95']:{fmt}}{unit} | p99 {stats['p99']:{fmt}}{unit} | "
+        f"min {stats['min']:{fmt}}{unit} | max {stats['max']:{fmt}}{unit}"
+    )
+
+
+def _format_group_table(title: str, groups: Dict[GroupKey, Dict[str, Any]]) -> str:
+    """Formatuje zwięzłą tabelę średnich dla grupowania innego niż model."""
+    section = f"\n{title}\n"
+    section += "-" * 60 + "\n"
+    for key in sorted(groups, key=str):
+        group = groups[key]
+        metrics = group['metrics']
+        ttft = metrics.get('first_token_time')
+        total = metrics.get('total_time')
+        tps = metrics.get('tokens_per_second')
+        rating = metrics.get('judge_rating')
+        section += f"{key} ({group['count']} wyników): "
+        section += f"TTFT p50 {ttft['p50']:.2f}s" if ttft else "TTFT N/A"
+        section += f" | czas p50 {total['p50']:.2f}s" if total else " | czas N/A"
+        section += f" | {tps['mean']:.1f} tok/s" if tps else ""
+        section += f" | ocena {rating['mean']:.2f}/5" if rating else ""
+        section += "\n"
+    return section
+
+
+def generate_summary(results: List[Dict[str, Any]], output_file: str,
+                     judge_estimates: Optional[Dict[Any, Dict[str, Any]]] = None) -> str:
     """
     Generuje podsumowanie wyników testów.
-    
+
     Args:
         results (List[Dict[str, Any]]): Lista wyników testów
         output_file (str): Nazwa pliku wyjściowego
-        
+        judge_estimates (Dict[Any, Dict[str, Any]]): Oszacowania ocen z próbkowania sędziego
+            (JudgeSampler.estimates); None - sędzia oceniał wszystkie wymagające tego komórki
+
     Returns:
         str: Sformatowane podsumowanie
     """
     if not results:
         return ""
-    
+
+    aggregated = aggregate_results(results)
+    by_model = aggregated['model']
+
     summary = f"\n{'='*100}\n"
     summary += "PODSUMOWANIE WYNIKÓW\n"
     summary += f"{'='*100}\n\n"
-    
-    models = list(set(r['model'] for r in results))
-    
-    summary += "Średnie czasy odpowiedzi i oceny jakości:\n"
+
+    summary += "Czasy odpowiedzi i oceny jakości (średnia ± odch. std., percentyle):\n"
     summary += "-" * 60 + "\n"
-    
-    for model in models:
-        model_results = [r for r in results if r['model'] == model]
-        if model_results:
-            avg_first_token = sum(r['first_token_time'] for r in model_results) / len(model_results)
-            avg_total_time = sum(r['total_time'] for r in model_results) / len(model_results)
-            avg_length = sum(r['response_length'] for r in model_results) / len(model_results)
-            
-            # Oblicz średnią ocenę sędziego, jeśli dostępne
-            judge_ratings = [r['judge_rating'] for r in model_results if 'judge_rating' in r and r['judge_rating'] > 0]
-            avg_judge_rating = sum(judge_ratings) / len(judge_ratings) if judge_ratings else "N/A"
-            
-            summary += f"{model}:\n"
-            summary += f"  - Średni czas pierwszego tokena: {avg_first_token:.2f}s\n"
-            summary += f"  - Średni całkowity czas: {avg_total_time:.2f}s\n"
-            summary += f"  - Średnia długość odpowiedzi: {avg_length:.0f} znaków\n"
-            summary += f"  - Zakończonych testów: {len(model_results)}\n"
-            summary += f"  - Średnia ocena sędziego AI: {avg_judge_rating:.2f}/5\n" if isinstance(avg_judge_rating, float) else f"  - Średnia ocena sędziego AI: {avg_judge_rating}\n"
-            summary += "\n"
-    
+
+    for model, group in by_model.items():
+        metrics = group['metrics']
+        length = metrics['response_length']
+        rating = metrics['judge_rating']
+
+        summary += f"{model}:\n"
+        summary += f"  - Czas pierwszego tokena: {_format_stats(metrics['first_token_time'], 's')}\n"
+        summary += f"  - Całkowity czas: {_format_stats(metrics['total_time'], 's')}\n"
+        if metrics['tokens_per_second']:
+            summary += f"  - Szybkość generowania: {_format_stats(metrics['tokens_per_second'], ' tok/s', 1)}\n"
+        summary += f"  - Średnia długość odpowiedzi: {length['mean']:.0f} znaków\n" if length else "  - Średnia długość odpowiedzi: N/A\n"
+        summary += f"  - Zakończonych testów: {group['count']}\n"
+        if rating:
+            summary += f"  - Średnia ocena sędziego AI: {rating['mean']:.2f}/5 (p50 {rating['p50']:.1f}, min {rating['min']:.0f}, max {rating['max']:.0f}, ocen: {rating['count']})\n"
+        else:
+            summary += "  - Średnia ocena sędziego AI: N/A\n"
+        summary += "\n"
+
     summary += "🏆 RANKING SZYBKOŚCI (pierwszy token - niżej = lepiej):\n"
     summary += "-" * 60 + "\n"
-    
-    model_speed = {}
-    for model in models:
-        model_results = [r for r in results if r['model'] == model]
-        if model_results:
-            model_speed[model] = sum(r['first_token_time'] for r in model_results) / len(model_results)
-    
-    sorted_models_speed = sorted(model_speed.items(), key=lambda x: x[1])
+
+    model_speed = {
+        model: group['metrics']['first_token_time']
+        for model, group in by_model.items()
+        if group['metrics']['first_token_time']
+    }
+    sorted_models_speed = sorted(model_speed.items(), key=lambda x: x[1]['mean'])
     for i, (model, speed) in enumerate(sorted_models_speed, 1):
         medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else "  "
-        summary += f"{medal} {i}. {model}: {speed:.2f}s\n"
+        summary += f"{medal} {i}. {model}: {speed['mean']:.2f}s (p95 {speed['p95']:.2f}s)\n"
 
     summary += f"\n🎖️ RANKING JAKOŚCI (ocena sędziego AI - wyżej = lepiej):\n"
     summary += "-" * 60 + "\n"
 
-    model_quality = {}
-    for model in models:
-        model_results = [r for r in results if r['model'] == model]
-        if model_results:
-            judge_ratings = [r['judge_rating'] for r in model_results if 'judge_rating' in r and r['judge_rating'] > 0]
-            if judge_ratings:
-                model_quality[model] = sum(judge_ratings) / len(judge_ratings)
-    
-    if model_quality:
-        sorted_models_quality = sorted(model_quality.items(), key=lambda x: x[1], reverse=True)
+    model_quality = {
+        model: group['metrics']['judge_rating']
+        for model, group in by_model.items()
+        if group['metrics']['judge_rating']
+    }
+
+    # Próbkowanie sędziego oceniło tylko część komórek - ranking z oszacowań warstwowych
+    if judge_estimates and not all(estimate['exact'] for estimate in judge_estimates.values()):
+        sorted_estimates = sorted(judge_estimates.items(), key=lambda x: x[1]['mean'], reverse=True)
+        for i, (model, estimate) in enumerate(sorted_estimates, 1):
+            summary += (f"{i}. {model}: {estimate['mean']:.2f}/5 "
+                        f"({JUDGE_SAMPLE_CONFIDENCE:.0%} CI {estimate['ci_low']:.2f}-{estimate['ci_high']:.2f}, "
+                        f"ocen: {estimate['judged']}/{estimate['total']})\n")
+    elif model_quality:
+        sorted_models_quality = sorted(model_quality.items(), key=lambda x: x[1]['mean'], reverse=True)
         for i, (model, quality) in enumerate(sorted_models_quality, 1):
-            summary += f"{i}. {model}: {quality:.2f}/5\n"
+            summary += f"{i}. {model}: {quality['mean']:.2f}/5\n"
     else:
         summary += "Brak danych o ocenach sędziego AI (upewnij się, że klucz API Gemini jest poprawny).\n"
-    
+
+    summary += _format_code_tests(results)
+    summary += _format_reference_metrics(results)
+    summary += _format_pass_rates(results, 'sql_passed', "🗄️ TESTY ZAPYTAŃ SQL (wynik zgodny z zapytaniem wzorcowym):")
+    summary += _format_pass_rates(results, 'answer_verdict', "✅ WERYFIKACJA ODPOWIEDZI (zadania zamknięte):", 'pass')
+
+    # Sekcje per kategoria / język tylko gdy wyniki niosą te informacje
+    for name, title in (('category', "📂 WYNIKI WG KATEGORII:"), ('language', "🌍 WYNIKI WG JĘZYKA:")):
+        groups = {key: group for key, group in aggregated[name].items() if key is not None}
+        if groups:
+            summary += _format_group_table(title, groups)
+
     # Zapisz podsumowanie do pliku
     with open(output_file, 'a', encoding='utf-8') as f:
         f.write(summary)
-    
+
     return summary
+
+
+def _format_code_tests(results: Iterable[Any]) -> str:
+    """Sekcja wyników testów wykonania kodu (pusta, gdy żadna odpowiedź nie była uruchamiana)."""
+    per_model: Dict[Any, Dict[str, Any]] = {}
+    for result in results:
+        total = result.get('code_tests_total')
+        if not total:
+            continue
+        stats = per_model.setdefault(result.get('model'), {'passed': 0, 'total': 0, 'full': 0, 'runs': 0, 'runtimes': []})
+        stats['passed'] += result.get('code_tests_passed') or 0
+        stats['total'] += total
+        stats['full'] += bool(result.get('code_passed'))
+        stats['runs'] += 1
+        if result.get('code_runtime') is not None:
+            stats['runtimes'].append(result.get('code_runtime'))
+    if not per_model:
+        return ""
+
+    section = "\n🧪 TESTY WYKONANIA KODU (zaliczone przypadki testowe):\n"
+    section += "-" * 60 + "\n"
+    ranking = sorted(per_model.items(), key=lambda item: item[1]['passed'] / item[1]['total'], reverse=True)
+    for model, stats in ranking:
+        runtime = (f", śr. czas wykonania {1000 * math.fsum(stats['runtimes']) / len(stats['runtimes']):.2f} ms"
+                   if stats['runtimes'] else "")
+        section += (f"{model}: {stats['passed']}/{stats['total']} przypadków "
+                    f"({stats['passed'] / stats['total']:.0%}), w pełni poprawne: {stats['full']}/{stats['runs']}{runtime}\n")
+    return section
+
+
+def _format_reference_metrics(results: Iterable[Any]) -> str:
+    """Sekcja metryk względem odpowiedzi wzorcowych (pusta, gdy żaden wynik ich nie ma)."""
+    by_model = aggregate_results(results, {'model': ('model',)}, REFERENCE_METRICS)['model']
+    rows = {model: group['metrics'] for model, group in by_model.items()
+            if group['metrics']['ref_chrf'] or group['metrics']['embed_similarity']}
+    if not rows:
+        return ""
+
+    section = "\n📐 METRYKI WZGLĘDEM WZORCÓW (chrF 0-100, ROUGE-L F1, stosunek długości, podobieństwo semantyczne):\n"
+    section += "-" * 60 + "\n"
+    ranking_metric = 'embed_similarity' if all(metrics['embed_similarity'] for metrics in rows.values()) else 'ref_chrf'
+    for model, metrics in sorted(rows.items(), key=lambda item: (item[1][ranking_metric] or {'mean': 0})['mean'], reverse=True):
+        chrf, rouge, ratio = metrics['ref_chrf'], metrics['ref_rouge_l'], metrics['ref_length_ratio']
+        semantic = metrics['embed_similarity']
+        section += f"{model}:"
+        section += f" chrF {chrf['mean']:.1f}" if chrf else ""
+        section += f" | ROUGE-L {rouge['mean']:.3f}" if rouge else ""
+        section += f" | długość ×{ratio['mean']:.2f}" if ratio else ""
+        section += f" | semantyka {semantic['mean']:.3f}" if semantic else ""
+        section += f" (wyników: {(chrf or semantic)['count']})\n"
+    return section
+
+
+def _format_pass_rates(results: Iterable[Any], field: str, title: str, passed_value: Any = True) -> str:
+    """Sekcja odsetka zaliczeń per model dla pola werdyktu (pusta, gdy pole nie występuje w wynikach)."""
+    per_model: Dict[Any, List[int]] = {}
+    for result in results:
+        verdict = result.get(field)
+        if verdict is None:
+            continue
+        counts = per_model.setdefault(result.get('model'), [0, 0])
+        counts[0] += verdict == passed_value
+        counts[1] += 1
+    if not per_model:
+        return ""
+
+    section = f"\n{title}\n"
+    section += "-" * 60 + "\n"
+    for model, (passed, total) in sorted(per_model.items(), key=lambda item: item[1][0] / item[1][1], reverse=True):
+        section += f"{model}: {passed}/{total} ({passed / total:.0%})\n"
+    return section
+
+
+def _columns_from_store_numpy(store: ResultStore, groupings, metrics):
+    """Wektorowa wersja _columns_from_store."""
+    rows = len(store)
+    columns = {}
+    for metric in metrics:
+        column = store.column(metric)
+        columns[metric] = np.array(column, dtype=float) if column is not None else np.full(rows, np.nan)
+
+    if 'judge_rating' in columns:
+        ratings = columns['judge_rating']
+        ratings[ratings <= 0] = np.nan
+
+    if 'tokens_per_second' in columns:
+        # Ta sama kolejność źródeł co w result_tokens_per_second
+        speed = columns['tokens_per_second']
+        inputs = _speed_inputs(store)
+        if 'eval_count' in inputs:
+            def column(key):
+                values = inputs.get(key)
+                return np.asarray(values, dtype=float) if values is not None else np.full(rows, np.nan)
+
+            counts = column('eval_count')
+            durations = column('eval_duration')
+            total_time = column('total_time')
+            first_token = np.nan_to_num(column('first_token_time'))
+            missing = np.isnan(speed) & (counts != 0) & ~np.isnan(counts)
+            by_duration = missing & (durations != 0) & ~np.isnan(durations)
+            speed[by_duration] = counts[by_duration] / (durations[by_duration] / 1e9)
+            by_time = missing & ~by_duration & (total_time > first_token)
+            speed[by_time] = counts[by_time] / (total_time[by_time] - first_token[by_time])
+
+    group_codes = {}
+    group_keys = {}
+    for name, fields in groupings.items():
+        raw_codes, strings = store.codes(fields[0])
+        unique_codes, dense_codes = np.unique(np.asarray(raw_codes, dtype=np.intp), return_inverse=True)
+        group_codes[name] = dense_codes
+        group_keys[name] = {
+            (None if raw < 0 else strings[raw]): code for code, raw in enumerate(unique_codes.tolist())
+        }
+
+    return columns, group_codes, group_keys
@@ -0,0 +1,330 @@
+"""
+Streaming exporters for test results (JSONL, CSV, Parquet).
+
+Results are written row by row (Parquet: in record batches) straight from a
+ResultStore or any iterable of result dicts, so a run never has to be fully
+materialized. Output may be compressed (gzip, or zstd when `zstandard` is
+installed) and split into chunks of a fixed number of rows.
+
+Usage:
+    python -m src.utils.exporters ŹRÓDŁO [ŹRÓDŁO...] [--format jsonl|csv|parquet] [--compression gzip|zstd]
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ..config import EXPORTS_DIR, AUTO_EXPORT_FORMATS, AUTO_EXPORT_COMPRESSION
+from .result_store import ResultStore
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+EXPORT_FORMATS = ('jsonl', 'csv', 'parquet')
+EXPORT_COMPRESSIONS = ('gzip', 'zstd')
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+PARQUET_BATCH_ROWS = 10_000
+
+# Stała kolejność kolumn eksportu: pola tekstowe, liczbowe, odpowiedź na końcu
+EXPORT_FIELDS = {
+    'model': 'string',
+    'test_name': 'string',
+    'category': 'string',
+    'language': 'string',
+    'system_prompt': 'string',
+    'prompt': 'string',
+    'status': 'string',
+    'first_token_time': 'double',
+    'total_time': 'double',
+    'response_length': 'int64',
+    'prompt_eval_count': 'int64',
+    'eval_count': 'int64',
+    'eval_duration': 'int64',
+    'tokens_per_second': 'double',
+    'judge_model': 'string',
+    'judge_rating': 'int64',
+    'judge_justification': 'string',
+    'judge_justification_chars': 'int64',
+    'judge_truncated': 'bool',
+    'rule_score': 'double',
+    'rule_verdict': 'string',
+    'answer_verdict': 'string',
+    'answer_extracted': 'string',
+    'code_passed': 'bool',
+    'code_tests_passed': 'int64',
+    'code_tests_total': 'int64',
+    'code_runtime': 'double',
+    'code_error': 'string',
+    'sql_passed': 'bool',
+    'sql_rows': 'int64',
+    'sql_error': 'string',
+    'ref_chrf': 'double',
+    'ref_rouge_l': 'double',
+    'ref_length_ratio': 'double',
+    'embed_similarity': 'double',
+    'response': 'string',
+}
+
+
+def is_format_available(fmt: str, compression: Optional[str] = None) -> bool:
+    """
+    Sprawdza, czy format i kompresja są obsługiwane w tym środowisku.
+
+    Args:
+        fmt (str): Format eksportu (jsonl, csv, parquet)
+        compression (str): Kompresja (gzip, zstd) lub None
+
+    Returns:
+        bool: True, jeśli wymagane biblioteki są zainstalowane
+    """
+    if fmt not in EXPORT_FORMATS or (compression and compression not in EXPORT_COMPRESSIONS):
+        return False
+    if fmt == 'parquet':
+        return pa is not None
+    return compression != 'zstd' or zstandard is not None
+
+
+def export_fields(results: Any, include_responses: bool = True) -> List[str]:
+    """Zwraca kolumny eksportu: stałe pola + dodatkowe pola znane ResultStore."""
+    fields = [field for field in EXPORT_FIELDS if include_responses or field != 'response']
+    if isinstance(results, ResultStore):
+        fields += [field for field in results.field_names() if field not in EXPORT_FIELDS]
+    return fields
+
+
+def iter_export_rows(results: Iterable[Any], fields: List[str]) -> Iterator[Dict[str, Any]]:
+    """Strumieniowo zamienia wyniki (dict lub ResultRecord) na wiersze eksportu."""
+    for result in results:
+        yield {field: result.get(field) for field in fields}
+
+
+def _open_text(path: str, compression: Optional[str]):
+    """Otwiera plik tekstowy do zapisu z opcjonalną kompresją."""
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    if compression == 'zstd':
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, 'wb')),
+                                encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _open_text_read(path: str):
+    """Otwiera plik tekstowy do odczytu, rozpoznając kompresję po rozszerzeniu."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise ValueError("Odczyt plików .zst wymaga pakietu zstandard")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb')), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _chunk_path(base_path: str, fmt: str, compression: Optional[str], part: Optional[int]) -> str:
+    suffix = f".part{part:04d}" if part is not None else ""
+    extension = "" if fmt == 'parquet' else COMPRESSION_EXTENSIONS.get(compression, "")
+    return f"{base_path}{suffix}.{fmt}{extension}"
+
+
+def _write_jsonl(rows: Iterator[Dict[str, Any]], fields: List[str], path: str,
+                 compression: Optional[str], limit: Optional[int]) -> int:
+    written = 0
+    with _open_text(path, compression) as f:
+        for row in rows:
+            f.write(json.dumps({key: value for key, value in row.items() if value is not None},
+                               ensure_ascii=False))
+            f.write("\n")
+            written += 1
+            if written == limit:
+                break
+    return written
+
+
+def _write_csv(rows: Iterator[Dict[str, Any]], fields: List[str], path: str,
+               compression: Optional[str], limit: Optional[int]) -> int:
+    written = 0
+    with _open_text(path, compression) as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+            if written == limit:
+                break
+    return written
+
+
+def _parquet_schema(fields: List[str]):
+    types = {'string': pa.string(), 'double': pa.float64(), 'int64': pa.int64(), 'bool': pa.bool_()}
+    return pa.schema([(field, types[EXPORT_FIELDS.get(field, 'string')]) for field in fields])
+
+
+def _write_parquet(rows: Iterator[Dict[str, Any]], fields: List[str], path: str,
+                   compression: Optional[str], limit: Optional[int]) -> int:
+    schema = _parquet_schema(fields)
+    extra_fields = [field for field in fields if field not in EXPORT_FIELDS]
+    written = 0
+    batch: List[Dict[str, Any]] = []
+    with pq.ParquetWriter(path, schema, compression=compression or 'none') as writer:
+        for row in rows:
+            for field in extra_fields:
+                if row[field] is not None:
+                    row[field] = str(row[field])
+            batch.append(row)
+            written += 1
+            if len(batch) >= PARQUET_BATCH_ROWS:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+            if written == limit:
+                break
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    return written
+
+
+_WRITERS = {'jsonl': _write_jsonl, 'csv': _write_csv, 'parquet': _write_parquet}
+
+
+def export_results(
+    results: Iterable[Any],
+    name: str,
+    fmt: str = 'jsonl',
+    compression: Optional[str] = None,
+    chunk_rows: Optional[int] = None,
+    output_dir: str = EXPORTS_DIR,
+    include_responses: bool = True
+) -> List[str]:
+    """
+    Eksportuje wyniki strumieniowo do pliku (lub serii plików) w EXPORTS_DIR.
+
+    Args:
+        results (Iterable[Any]): ResultStore lub iterowalne słowniki wyników
+        name (str): Nazwa bazowa pliku (bez rozszerzenia)
+        fmt (str): Format: jsonl, csv lub parquet
+        compression (str): gzip, zstd lub None (Parquet kompresuje wewnętrznie)
+        chunk_rows (int): Maksymalna liczba wierszy w jednym pliku (None = jeden plik)
+        output_dir (str): Katalog docelowy
+        include_responses (bool): Czy eksportować pełne treści odpowiedzi
+
+    Returns:
+        List[str]: Ścieżki zapisanych plików
+
+    Raises:
+        ValueError: Gdy format lub kompresja nie są dostępne
+    """
+    if not is_format_available(fmt, compression):
+        raise ValueError(f"Format eksportu niedostępny: {fmt}" + (f" ({compression})" if compression else ""))
+
+    os.makedirs(output_dir, exist_ok=True)
+    base_path = os.path.join(output_dir, name)
+    fields = export_fields(results, include_responses)
+    rows = iter_export_rows(results, fields)
+    writer = _WRITERS[fmt]
+
+    if not chunk_rows:
+        path = _chunk_path(base_path, fmt, compression, None)
+        writer(rows, fields, path, compression, None)
+        return [path]
+
+    paths = []
+    part = 1
+    while True:
+        first_row = next(rows, None)
+        if first_row is None:
+            break
+        path = _chunk_path(base_path, fmt, compression, part)
+        writer(itertools.chain((first_row,), rows), fields, path, compression, chunk_rows)
+        paths.append(path)
+        part += 1
+    return paths
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Strumieniowo wczytuje wyniki z pliku JSONL (także .gz / .zst).
+
+    Args:
+        path (str): Ścieżka do pliku JSONL
+
+    Yields:
+        Dict[str, Any]: Kolejne wyniki
+    """
+    with _open_text_read(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def export_run(results: Iterable[Any], output_file: str) -> List[str]:
+    """
+    Eksportuje wyniki przebiegu w formatach z AUTO_EXPORT_FORMATS.
+
+    Nazwa eksportu pochodzi od pliku wyników tekstowych. Niedostępne formaty są pomijane.
+
+    Args:
+        results (Iterable[Any]): ResultStore z wynikami przebiegu
+        output_file (str): Plik wyników tekstowych przebiegu
+
+    Returns:
+        List[str]: Ścieżki zapisanych plików
+    """
+    name = os.path.splitext(os.path.basename(output_file))[0]
+    paths = []
+    for fmt in AUTO_EXPORT_FORMATS:
+        compression = None if fmt == 'parquet' else AUTO_EXPORT_COMPRESSION
+        if is_format_available(fmt, compression):
+            paths.extend(export_results(results, name, fmt, compression))
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punkt wejścia CLI eksportera."""
+    from .result_index import find_result_files, iter_file_records
+
+    parser = argparse.ArgumentParser(description="Eksportuje wyniki testów (pliki .txt lub .jsonl).")
+    parser.add_argument('sources', nargs='+', help="Pliki wyników, katalogi lub wzorce glob")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='jsonl')
+    parser.add_argument('--compression', choices=EXPORT_COMPRESSIONS, default=None)
+    parser.add_argument('--chunk-rows', type=int, default=None, help="Liczba wierszy na plik")
+    parser.add_argument('--name', default='results_export', help="Nazwa bazowa plików wynikowych")
+    parser.add_argument('--output-dir', default=EXPORTS_DIR)
+    parser.add_argument('--no-responses', action='store_true', help="Pomiń pełne treści odpowiedzi")
+    args = parser.parse_args(argv)
+
+    def iter_sources():
+        for source in args.sources:
+            if '.jsonl' in os.path.basename(source):
+                yield from iter_jsonl(source)
+            else:
+                for path in find_result_files([source]):
+                    yield from iter_file_records(path)
+
+    try:
+        paths = export_results(iter_sources(), args.name, args.format, args.compression,
+                               args.chunk_rows, args.output_dir, not args.no_responses)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+
+    for path in paths:
+        print(f"✅ Zapisano: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
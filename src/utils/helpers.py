@@ -3,6 +3,7 @@ Utility functions for the Ollama testing suite.
 """
 
 import os
+import threading
 import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional
@@ -37,6 +38,25 @@ def get_timestamp() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
+_output_file_lock = threading.Lock()
+
+
+def append_to_output_file(output_file: str, text: str) -> None:
+    """
+    Dopisuje tekst do pliku wyników jako jedną, niepodzielną operację.
+
+    Wyniki generowania i oceny sędziego napływają z różnych wątków, więc
+    wszystkie zapisy do plików wyników przechodzą przez wspólną blokadę.
+
+    Args:
+        output_file (str): Ścieżka do pliku wyników
+        text (str): Tekst do dopisania
+    """
+    with _output_file_lock:
+        with open(output_file, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+
 def ensure_directory_exists(directory_path: str) -> None:
     """
     Upewnia się, że katalog istnieje, tworzy go jeśli nie.
@@ -0,0 +1,295 @@
+"""
+Stratified judge sampling with confidence-bounded score estimates.
+
+Instead of judging every (model, test) cell, a stratified subset is judged per
+model and category. Per-model mean scores are estimated with the stratified
+estimator (finite population correction included, so a fully judged model has
+an exact score), and further cells are judged only for models whose confidence
+interval still overlaps a neighbour in the quality ranking.
+"""
+
+import math
+import random
+from collections import defaultdict
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..config import (
+    JUDGE_SAMPLE_FRACTION,
+    JUDGE_SAMPLE_MIN_PER_STRATUM,
+    JUDGE_SAMPLE_CONFIDENCE,
+    JUDGE_SAMPLE_MAX_ROUNDS
+)
+from .result_store import ResultStore
+
+
+RATING_MIN = 1
+RATING_MAX = 5
+# Wariancja przyjmowana, gdy warstwa ma za mało ocen (maksymalna dla skali 1-5)
+PRIOR_VARIANCE = (RATING_MAX - RATING_MIN) ** 2 / 4.0
+
+StratumKey = Tuple[Any, Any]
+
+
+def _rating(result: Any) -> Optional[int]:
+    rating = result.get('judge_rating')
+    if isinstance(rating, (int, float)) and RATING_MIN <= rating <= RATING_MAX:
+        return rating
+    return None
+
+
+def _variance(values: List[float]) -> Optional[float]:
+    if len(values) < 2:
+        return None
+    mean = math.fsum(values) / len(values)
+    return math.fsum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+
+def stratified_estimate(
+    strata: Dict[Any, Tuple[int, List[float]]],
+    confidence: float = JUDGE_SAMPLE_CONFIDENCE
+) -> Optional[Dict[str, Any]]:
+    """
+    Szacuje średnią ocenę modelu z próby warstwowej.
+
+    Warstwy z mniej niż dwiema ocenami używają wariancji wszystkich ocen modelu
+    (lub PRIOR_VARIANCE); warstwy bez ocen - średniej modelu z pełną niepewnością.
+
+    Args:
+        strata (Dict[Any, Tuple[int, List[float]]]): Warstwa -> (liczba komórek, oceny próby)
+        confidence (float): Poziom ufności przedziału
+
+    Returns:
+        Optional[Dict[str, Any]]: mean, ci_low, ci_high, judged, total, exact;
+        None, gdy model nie ma żadnej oceny
+    """
+    all_ratings = [rating for _, ratings in strata.values() for rating in ratings]
+    if not all_ratings:
+        return None
+    total = sum(population for population, _ in strata.values())
+    pooled_mean = math.fsum(all_ratings) / len(all_ratings)
+    pooled_variance = _variance(all_ratings)
+    fallback_variance = pooled_variance if pooled_variance is not None else PRIOR_VARIANCE
+
+    mean = 0.0
+    variance = 0.0
+    for population, ratings in strata.values():
+        weight = population / total
+        judged = len(ratings)
+        if judged == 0:
+            mean += weight * pooled_mean
+            variance += weight ** 2 * PRIOR_VARIANCE
+            continue
+        stratum_variance = _variance(ratings)
+        if stratum_variance is None:
+            stratum_variance = fallback_variance
+        mean += weight * math.fsum(ratings) / judged
+        # Poprawka na skończoną populację - w pełni oceniona warstwa nie wnosi niepewności
+        variance += weight ** 2 * max(0.0, 1.0 - judged / population) * stratum_variance / judged
+
+    margin = NormalDist().inv_cdf((1.0 + confidence) / 2.0) * math.sqrt(variance)
+    return {
+        'mean': mean,
+        'ci_low': max(RATING_MIN, mean - margin),
+        'ci_high': min(RATING_MAX, mean + margin),
+        'judged': len(all_ratings),
+        'total': total,
+        'exact': len(all_ratings) >= total,
+    }
+
+
+def _strata(results: Iterable[Any]) -> Dict[Any, Dict[Any, Tuple[int, List[float]]]]:
+    counts: Dict[Any, Dict[Any, int]] = defaultdict(lambda: defaultdict(int))
+    ratings: Dict[Any, Dict[Any, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for result in results:
+        model, category = result.get('model'), result.get('category')
+        counts[model][category] += 1
+        rating = _rating(result)
+        if rating is not None:
+            ratings[model][category].append(rating)
+    return {
+        model: {category: (population, ratings[model][category]) for category, population in categories.items()}
+        for model, categories in counts.items()
+    }
+
+
+def estimate_judge_scores(
+    results: Iterable[Any],
+    confidence: float = JUDGE_SAMPLE_CONFIDENCE
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Szacuje średnie oceny sędziego per model (warstwy: kategorie testów).
+
+    Args:
+        results: Wyniki (dict lub ResultRecord) - komórki wymagające oceny, także jeszcze nieocenione
+        confidence (float): Poziom ufności przedziałów
+
+    Returns:
+        Dict[Any, Dict[str, Any]]: Model -> wynik stratified_estimate (modele bez ocen pominięte)
+    """
+    estimates = {}
+    for model, strata in _strata(results).items():
+        estimate = stratified_estimate(strata, confidence)
+        if estimate is not None:
+            estimates[model] = estimate
+    return estimates
+
+
+def unresolved_models(estimates: Dict[Any, Dict[str, Any]]) -> List[Any]:
+    """
+    Zwraca modele, których przedział ufności nachodzi na sąsiada w rankingu jakości.
+
+    Args:
+        estimates (Dict[Any, Dict[str, Any]]): Wynik estimate_judge_scores
+
+    Returns:
+        List[Any]: Modele o nierozstrzygniętej pozycji w rankingu
+    """
+    ranking = sorted(estimates, key=lambda model: estimates[model]['mean'], reverse=True)
+    unresolved = set()
+    for better, worse in zip(ranking, ranking[1:]):
+        if estimates[better]['ci_low'] <= estimates[worse]['ci_high']:
+            unresolved.update((better, worse))
+    return [model for model in ranking if model in unresolved]
+
+
+class JudgeSampler:
+    """Adaptacyjny dobór komórek do oceny sędziego (próba warstwowa per model i kategoria)."""
+
+    def __init__(
+        self,
+        results: Any,
+        fraction: float = JUDGE_SAMPLE_FRACTION,
+        min_per_stratum: int = JUDGE_SAMPLE_MIN_PER_STRATUM,
+        confidence: float = JUDGE_SAMPLE_CONFIDENCE,
+        seed: int = 0
+    ):
+        """
+        Args:
+            results: ResultStore (lub lista wyników) z komórkami do oceny
+            fraction (float): Udział komórek ocenianych w pierwszej rundzie
+            min_per_stratum (int): Minimalna liczba ocen w warstwie w pierwszej rundzie
+            confidence (float): Poziom ufności przedziałów
+            seed (int): Ziarno losowania (próba powtarzalna)
+        """
+        self.results = results
+        self.fraction = fraction
+        self.min_per_stratum = min_per_stratum
+        self.confidence = confidence
+        self.rounds = 0
+        self._random = random.Random(seed)
+        self._prompts: Dict[int, str] = {}
+        self._pending: Dict[StratumKey, List[int]] = defaultdict(list)
+        self._populations: Dict[StratumKey, int] = defaultdict(int)
+
+    def add(self, row: int, prompt: str) -> None:
+        """
+        Rejestruje komórkę, którą można ocenić.
+
+        Args:
+            row (int): Numer wiersza w wynikach
+            prompt (str): Oryginalne pytanie (dla sędziego)
+        """
+        result = self.results[row]
+        key = (result.get('model'), result.get('category'))
+        self._prompts[row] = prompt
+        self._populations[key] += 1
+        # Wstawienie w losowe miejsce - kolejne pobrania z końca listy są losową próbą
+        pending = self._pending[key]
+        pending.insert(self._random.randint(0, len(pending)), row)
+
+    @property
+    def judged(self) -> int:
+        """Liczba komórek wysłanych do oceny."""
+        return len(self._prompts) - sum(len(rows) for rows in self._pending.values())
+
+    def estimates(self) -> Dict[Any, Dict[str, Any]]:
+        """Bieżące oszacowania ocen modeli (zob. estimate_judge_scores)."""
+        return estimate_judge_scores((self.results[row] for row in self._prompts), self.confidence)
+
+    def select(self) -> List[int]:
+        """
+        Wybiera komórki do następnej rundy ocen.
+
+        Pierwsza runda: `fraction` każdej warstwy (co najmniej min_per_stratum).
+        Kolejne: tylko modele nierozstrzygnięte w rankingu; nowe oceny trafiają do
+        warstw, w których najbardziej zmniejszą wariancję oszacowania.
+
+        Returns:
+            List[int]: Numery wierszy (pusta lista - próbkowanie zakończone)
+        """
+        if self.rounds == 0:
+            selected = []
+            for key in self._pending:
+                count = max(self.min_per_stratum, math.ceil(self.fraction * self._populations[key]))
+                selected += self._take(key, count)
+        else:
+            selected = []
+            by_model: Dict[Any, List[StratumKey]] = defaultdict(list)
+            for key in self._pending:
+                by_model[key[0]].append(key)
+            ratings = self._stratum_ratings()
+            for model in unresolved_models(self.estimates()):
+                keys = [key for key in by_model.get(model, []) if self._pending[key]]
+                model_population = sum(self._populations[key] for key in by_model.get(model, []))
+                budget = max(1, math.ceil(self.fraction * model_population / 2))
+                for _ in range(budget):
+                    keys = [key for key in keys if self._pending[key]]
+                    if not keys:
+                        break
+                    key = max(keys, key=lambda k: self._variance_reduction(k, ratings, model_population))
+                    taken = self._take(key, 1)
+                    ratings[key].append(None)  # Zarezerwowana ocena (wynik jeszcze nieznany)
+                    selected += taken
+        self.rounds += 1
+        return selected
+
+    def _take(self, key: StratumKey, count: int) -> List[int]:
+        pending = self._pending[key]
+        taken = pending[-count:] if count < len(pending) else pending[:]
+        del pending[len(pending) - len(taken):]
+        return taken
+
+    def _stratum_ratings(self) -> Dict[StratumKey, List[Optional[float]]]:
+        ratings: Dict[StratumKey, List[Optional[float]]] = defaultdict(list)
+        for row in self._prompts:
+            result = self.results[row]
+            rating = _rating(result)
+            if rating is not None:
+                ratings[(result.get('model'), result.get('category'))].append(rating)
+        return ratings
+
+    def _variance_reduction(self, key: StratumKey, ratings, model_population: int) -> float:
+        known = [rating for rating in ratings[key] if rating is not None]
+        variance = _variance(known)
+        if variance is None:
+            variance = PRIOR_VARIANCE
+        judged = max(1, len(ratings[key]))
+        weight = self._populations[key] / model_population
+        return weight ** 2 * variance * (1.0 / judged - 1.0 / (judged + 1))
+
+    def prompt(self, row: int) -> str:
+        """Oryginalne pytanie zarejestrowanej komórki."""
+        return self._prompts[row]
+
+    def run(self, pipeline: Any, max_rounds: int = JUDGE_SAMPLE_MAX_ROUNDS) -> Dict[Any, Dict[str, Any]]:
+        """
+        Ocenia próbę przez JudgePipeline, dobierając komórki aż ranking się rozstrzygnie.
+
+        Args:
+            pipeline: JudgePipeline (submit/join), zapisujący oceny w wynikach
+            max_rounds (int): Maksymalna liczba rund próbkowania
+
+        Returns:
+            Dict[Any, Dict[str, Any]]: Końcowe oszacowania ocen modeli
+        """
+        while self.rounds < max_rounds:
+            rows = self.select()
+            if not rows:
+                break
+            for row in rows:
+                # Oceny trafiają do wiersza ResultStore lub bezpośrednio do słownika wyniku
+                store_row = row if isinstance(self.results, ResultStore) else None
+                pipeline.submit(self.results[row], self._prompts[row], store_row)
+            pipeline.join()
+        return self.estimates()
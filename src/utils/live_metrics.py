@@ -0,0 +1,221 @@
+"""
+Live per-run metrics for the GUI dashboard.
+
+Worker threads report stream starts, tokens and finished results; the GUI
+samples a consistent ``snapshot()`` at its own redraw rate. Per-model
+aggregates are updated incrementally as each result arrives (running sums plus
+short histories for sparklines), so the cost of a result does not grow with the
+run. The ETA multiplies each model's remaining tests by its own observed mean
+duration - a model that slows down mid-run moves the estimate immediately.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ..config import LIVE_METRICS_HISTORY, LIVE_METRICS_RATE_WINDOW
+
+
+class _ModelStats:
+    """Przyrostowe statystyki jednego modelu w przebiegu"""
+
+    __slots__ = ('done', 'errors', 'ttft_sum', 'tps_sum', 'tps_count', 'time_sum',
+                 'rating_sum', 'rating_count', 'ttft_history', 'tps_history')
+
+    def __init__(self, history: int):
+        self.done = 0
+        self.errors = 0
+        self.ttft_sum = 0.0
+        self.tps_sum = 0.0
+        self.tps_count = 0
+        self.time_sum = 0.0
+        self.rating_sum = 0
+        self.rating_count = 0
+        self.ttft_history = deque(maxlen=history)
+        self.tps_history = deque(maxlen=history)
+
+    @property
+    def mean_duration(self) -> Optional[float]:
+        return self.time_sum / self.done if self.done else None
+
+
+class LiveRunMetrics:
+    """Metryki przebiegu testów aktualizowane z wątków roboczych (bezpieczne wątkowo)"""
+
+    def __init__(self, history: int = LIVE_METRICS_HISTORY, rate_window: float = LIVE_METRICS_RATE_WINDOW,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            history (int): Liczba ostatnich wartości TTFT i tokenów/s na model (sparkline)
+            rate_window (float): Okno (s), z którego liczona jest chwilowa szybkość strumienia
+            clock (Callable): Źródło czasu (sekundy)
+        """
+        self.history = history
+        self.rate_window = rate_window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.version = 0  # Rośnie przy każdej zmianie - widok przerysowuje tylko po zmianie
+        self._reset([], 0, 0.0)
+
+    def _reset(self, models: List[str], total: int, overhead: float) -> None:
+        self._models = {model: _ModelStats(self.history) for model in models}
+        self._order = list(models)
+        self._total = total
+        self._per_model = total / len(models) if models else 0
+        self._overhead = overhead
+        self._running = bool(models)
+        self._active_model = None
+        self._stream_start = None
+        self._stream_tokens = 0
+        self._token_times = deque()
+
+    def _stats(self, model: str) -> _ModelStats:
+        stats = self._models.get(model)
+        if stats is None:
+            stats = self._models[model] = _ModelStats(self.history)
+            self._order.append(model)
+        return stats
+
+    def start_run(self, models: Iterable[str], total_tests: int, overhead_per_test: float = 0.0) -> None:
+        """
+        Rozpoczyna nowy przebieg (zeruje statystyki).
+
+        Args:
+            models (Iterable[str]): Testowane modele (każdy dostaje te same zadania)
+            total_tests (int): Łączna liczba testów (zadania x modele)
+            overhead_per_test (float): Stała pauza po każdym teście (s) doliczana do ETA
+        """
+        with self._lock:
+            self._reset(list(models), total_tests, overhead_per_test)
+            self.version += 1
+
+    def finish_run(self) -> None:
+        """Kończy przebieg (statystyki zostają do wglądu)"""
+        with self._lock:
+            self._running = False
+            self._active_model = None
+            self.version += 1
+
+    def start_stream(self, model: str) -> None:
+        """Oznacza początek odpowiedzi modelu (wskaźnik tokenów/s liczy od tej chwili)"""
+        with self._lock:
+            self._stats(model)
+            self._active_model = model
+            self._stream_start = self._clock()
+            self._stream_tokens = 0
+            self._token_times.clear()
+            self.version += 1
+
+    def record_token(self, token: str = None) -> None:
+        """Rejestruje token aktywnego strumienia (sygnatura token_callback ask_ollama)"""
+        with self._lock:
+            self._stream_tokens += 1
+            self._token_times.append(self._clock())
+
+    def record_result(self, model: str, result: Optional[Dict[str, Any]]) -> None:
+        """
+        Dolicza wynik testu do statystyk modelu i kończy jego strumień.
+
+        Args:
+            model (str): Model
+            result (dict): Wynik ask_ollama (None - błąd)
+        """
+        with self._lock:
+            stats = self._stats(model)
+            if not result or not result.get('response'):
+                stats.errors += 1
+            else:
+                stats.done += 1
+                ttft = result.get('first_token_time') or 0.0
+                stats.ttft_sum += ttft
+                stats.ttft_history.append(ttft)
+                stats.time_sum += result.get('total_time') or 0.0
+                tps = result.get('tokens_per_second')
+                if tps is not None:
+                    stats.tps_sum += tps
+                    stats.tps_count += 1
+                    stats.tps_history.append(tps)
+            if self._active_model == model:
+                self._active_model = None
+            self.version += 1
+
+    def record_rating(self, model: str, rating: int) -> None:
+        """Dolicza ocenę sędziego (1-5) do średniej modelu"""
+        if not rating or rating <= 0:
+            return
+        with self._lock:
+            stats = self._stats(model)
+            stats.rating_sum += rating
+            stats.rating_count += 1
+            self.version += 1
+
+    def _eta(self, now: float) -> Optional[float]:
+        observed = [stats for stats in self._models.values() if stats.done]
+        if not self._running or not observed:
+            return None
+        overall = sum(stats.time_sum for stats in observed) / sum(stats.done for stats in observed)
+        eta = 0.0
+        for model, stats in self._models.items():
+            remaining = max(0.0, self._per_model - stats.done - stats.errors)
+            duration = stats.mean_duration or overall
+            eta += remaining * (duration + self._overhead)
+            if model == self._active_model and remaining:
+                # Trwający test jest już częściowo wykonany
+                eta -= min(duration, now - self._stream_start)
+        return max(0.0, eta)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Zwraca spójny stan metryk do narysowania.
+
+        Returns:
+            Dict[str, Any]: running, active_model, stream_rate, stream_tokens, completed,
+            total, eta oraz 'models' - ranking (średnia ocena, potem tokeny/s) z polami
+            model, done, errors, ttft_mean, ttft_history, tps_mean, tps_last, rating_mean
+        """
+        with self._lock:
+            now = self._clock()
+            rate = 0.0
+            if self._active_model is not None:
+                while self._token_times and self._token_times[0] < now - self.rate_window:
+                    self._token_times.popleft()
+                if self._token_times:
+                    span = min(self.rate_window, now - self._stream_start)
+                    rate = len(self._token_times) / span if span > 0 else 0.0
+            models = []
+            for model in self._order:
+                stats = self._models[model]
+                models.append({
+                    'model': model,
+                    'done': stats.done,
+                    'errors': stats.errors,
+                    'ttft_mean': stats.ttft_sum / stats.done if stats.done else None,
+                    'ttft_history': list(stats.ttft_history),
+                    'tps_mean': stats.tps_sum / stats.tps_count if stats.tps_count else None,
+                    'tps_last': stats.tps_history[-1] if stats.tps_history else None,
+                    'rating_mean': stats.rating_sum / stats.rating_count if stats.rating_count else None,
+                })
+            completed = sum(stats.done + stats.errors for stats in self._models.values())
+            snapshot = {
+                'running': self._running,
+                'active_model': self._active_model,
+                'stream_rate': rate,
+                'stream_tokens': self._stream_tokens,
+                'completed': completed,
+                'total': self._total,
+                'eta': self._eta(now),
+            }
+        models.sort(key=lambda m: (m['rating_mean'] or 0, m['tps_mean'] or 0), reverse=True)
+        snapshot['models'] = models
+        return snapshot
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Formatuje czas pozostały (h:mm:ss lub m:ss); '-' gdy nieznany"""
+    if seconds is None:
+        return "-"
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
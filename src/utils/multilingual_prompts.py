@@ -19,6 +19,11 @@ def get_comprehensive_test_prompts_english() -> List[Dict[str, Any]]:
             "name": "Programming Task - Python",
             "prompt": "Write a Python function that finds all prime numbers less than n using the Sieve of Eratosthenes. Add comments and usage example.",
             "category": "programming",
+            "code_tests": {
+                "function_names": ["sieve_of_eratosthenes", "sieve", "primes_less_than", "find_primes"],
+                "compare": "sorted",
+                "cases": [[[10], [2, 3, 5, 7]], [[30], [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]], [[1], []]]
+            },
             "options": {"temperature": 0.3, "num_predict": 2000, "top_p": 0.95}
         },
         {
@@ -31,18 +36,24 @@ def get_comprehensive_test_prompts_english() -> List[Dict[str, Any]]:
             "name": "Sentiment Analysis",
             "prompt": "Rate the sentiment of the following text on a scale from -5 (very negative) to +5 (very positive) and justify your assessment:\\n\\n'This product is a complete failure! It didn't work from day one, customer service ignores my messages, and getting a refund is a nightmare. Definitely do not recommend!'",
             "category": "sentiment_analysis",
+            "answer": {"type": "score", "min": -5, "max": -4},
             "options": {"temperature": 0.5, "num_predict": 300}
         },
         {
             "name": "Logical Reasoning",
             "prompt": "Solve this logic puzzle: I have 3 boxes - red, blue, and green. Each contains one ball: red, blue, or green. I know that: 1) the red ball is not in the red box, 2) the blue ball is not in the blue box, 3) the green ball is in the red box. Where is each ball?",
             "category": "logic",
+            "answer": {"type": "pairs", "pairs": [["red", "green"], ["blue", "red"], ["green", "blue"]]},
             "options": {"temperature": 0.1, "num_predict": 200}
         },
         {
             "name": "Text Summarization",
             "prompt": "Summarize the following text in 2-3 sentences:\\n\\n'Artificial Intelligence (AI) is a field of computer science focused on creating systems capable of performing tasks that require human intelligence. This includes machine learning, natural language processing, image recognition, and decision-making. AI has wide applications - from voice assistants, through recommendation systems, to autonomous vehicles. AI development brings enormous possibilities, but also ethical and social challenges that require a responsible approach to implementing these technologies.'",
             "category": "summarization",
+            "references": [
+                "Artificial intelligence is a field of computer science that creates systems able to perform tasks requiring human intelligence, such as machine learning, natural language processing, image recognition and decision-making. It is widely applied, from voice assistants and recommendation systems to autonomous vehicles. Its development brings enormous possibilities but also ethical and social challenges that require a responsible approach.",
+                "AI is the branch of computer science focused on systems that perform tasks requiring human intelligence, using techniques like machine learning and natural language processing. It powers voice assistants, recommendation systems and autonomous vehicles, but its development raises ethical and social challenges that call for responsible implementation."
+            ],
             "options": {"temperature": 0.6, "num_predict": 150}
         },
         {
@@ -55,18 +66,30 @@ def get_comprehensive_test_prompts_english() -> List[Dict[str, Any]]:
             "name": "Data Analysis - SQL",
             "prompt": "Write an SQL query that finds the top 5 customers by total order value in the last year. Assume tables: customers(id, name), orders(id, customer_id, order_date, total_amount).",
             "category": "data_analysis",
+            "sql_tests": {
+                "fixture": "customers_orders",
+                "reference": [
+                    "SELECT c.name FROM customers c JOIN orders o ON o.customer_id = c.id WHERE o.order_date >= date('now', '-1 year') GROUP BY c.id ORDER BY SUM(o.total_amount) DESC LIMIT 5",
+                    "SELECT c.name FROM customers c JOIN orders o ON o.customer_id = c.id WHERE strftime('%Y', o.order_date) = strftime('%Y', 'now', '-1 year') GROUP BY c.id ORDER BY SUM(o.total_amount) DESC LIMIT 5"
+                ]
+            },
             "options": {"temperature": 0.3, "num_predict": 300}
         },
         {
             "name": "Mathematics",
             "prompt": "Explain step by step how to solve the quadratic equation: 2x² - 7x + 3 = 0",
             "category": "mathematics",
+            "answer": {"type": "assignments", "variable": "x", "values": [3, 0.5]},
             "options": {"temperature": 0.1, "num_predict": 400}
         },
         {
             "name": "Translation and Cultural Context",
             "prompt": "Translate to Polish and explain the cultural context: 'There's no place like home' - English saying.",
             "category": "translation",
+            "references": [
+                "Tłumaczenie: \"Wszędzie dobrze, ale w domu najlepiej\" (dosłownie: \"Nie ma takiego miejsca jak dom\"). Powiedzenie wyraża przywiązanie do domu jako miejsca bezpieczeństwa, spokoju i bliskości rodziny; zostało spopularyzowane przez film \"Czarnoksiężnik z Krainy Oz\", w którym Dorotka powtarza je, by wrócić do domu.",
+                "Translation: \"Wszędzie dobrze, ale w domu najlepiej\" (literally \"Nie ma takiego miejsca jak dom\"). The saying expresses attachment to home as a place of comfort, safety and family. It was popularised by The Wizard of Oz, where Dorothy repeats it to return home, and it is used whenever someone feels that nothing compares to their own home."
+            ],
             "options": {"temperature": 0.5, "num_predict": 300}
         },
         {
@@ -79,6 +102,7 @@ def get_comprehensive_test_prompts_english() -> List[Dict[str, Any]]:
             "name": "Mathematical Reasoning",
             "prompt": "If a train travels at 80 km/h for 2.5 hours, what distance did it cover? Explain step by step.",
             "category": "mathematics",
+            "answer": {"type": "quantity", "value": 200, "unit": "km", "units": ["km", "kilometr", "kilometer"]},
             "options": {"temperature": 0.1, "num_predict": 200}
         },
         {
@@ -103,24 +127,39 @@ def get_quick_test_prompts_english() -> List[Dict[str, Any]]:
             "name": "Programming - Python",
             "prompt": "Write a simple Python function that checks if a number is even.",
             "category": "programming",
+            "code_tests": {
+                "function_names": ["is_even", "czy_parzysta", "jest_parzysta"],
+                "compare": "truthy",
+                "cases": [[[4], True], [[7], False], [[0], True], [[-2], True]]
+            },
             "options": {"temperature": 0.3, "num_predict": 200}
         },
         {
             "name": "Sentiment Analysis",
             "prompt": "Rate the sentiment of the text from -5 to +5: 'This product is a complete failure!'",
             "category": "sentiment_analysis",
+            "answer": {"type": "score", "min": -5, "max": -4},
             "options": {"temperature": 0.5, "num_predict": 100}
         },
         {
             "name": "Mathematics",
             "prompt": "Solve: 2x + 5 = 13",
             "category": "mathematics",
+            "answer": {"type": "assignments", "variable": "x", "values": [4]},
             "options": {"temperature": 0.1, "num_predict": 150}
         },
         {
             "name": "Logic",
             "prompt": "If all humans are mortal, and Socrates is human, is Socrates mortal?",
             "category": "logic",
+            "answer": {
+                "type": "choice",
+                "expected": "yes",
+                "options": {
+                    "yes": [r"^\W*(?:tak|yes)\b", r"\bjest smiertelny", r"\bis (?:indeed |therefore |also )?mortal"],
+                    "no": [r"^\W*(?:nie|no)\b", r"\bnie jest smiertelny", r"\bis not mortal"]
+                }
+            },
             "options": {"temperature": 0.1, "num_predict": 100}
         },
         {
@@ -0,0 +1,305 @@
+"""
+Run-to-run performance regression detector.
+
+Compares a baseline run with one or more candidate runs. Results are paired by
+(model, test, prompt) cell and, per model and metric, tested for slowdowns:
+- with several paired cells: bootstrap confidence interval of the mean per-cell log ratio,
+- with a single cell: one-sided Mann-Whitney rank test over the replicates.
+
+Usage:
+    python -m src.utils.regression BAZOWY KANDYDAT [KANDYDAT...] [--threshold 0.10]
+
+Each run may be a text result file, a JSONL export, a directory or a glob pattern
+(files are pooled as replicates).
+Exit codes: 0 - no regression, 1 - regression detected, 2 - usage/data error.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .analysis import get_metric_value, _percentile_sorted
+from .exporters import iter_jsonl
+from .result_index import find_result_files, parse_result_file
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Metryki wydajności: nazwa -> (etykieta, czy wyższa wartość jest lepsza)
+REGRESSION_METRICS = {
+    'first_token_time': ("Czas pierwszego tokena", False),
+    'total_time': ("Całkowity czas", False),
+    'tokens_per_second': ("Szybkość generowania", True),
+}
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_BOOTSTRAP_SAMPLES = 2000
+MIN_RANK_TEST_SAMPLES = 3
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+EXIT_USAGE_ERROR = 2
+
+CellKey = Tuple[str, str, str]
+
+
+def load_run(path: str) -> List[Dict[str, Any]]:
+    """
+    Wczytuje wyniki przebiegu z pliku, katalogu lub wzorca glob.
+
+    Args:
+        path (str): Ścieżka do pliku wyników (.txt lub eksportu .jsonl), katalogu lub wzorzec glob
+
+    Returns:
+        List[Dict[str, Any]]: Rekordy wyników ze wszystkich pasujących plików
+    """
+    if '.jsonl' in os.path.basename(path):
+        return list(iter_jsonl(path))
+
+    results = []
+    for file_path in find_result_files([path]):
+        results.extend(parse_result_file(file_path))
+    return results
+
+
+def group_cells(results: Iterable[Dict[str, Any]], metric: str) -> Dict[CellKey, List[float]]:
+    """
+    Grupuje wartości metryki według komórki (model, test, prompt).
+
+    Args:
+        results (Iterable[Dict[str, Any]]): Wyniki przebiegu
+        metric (str): Nazwa metryki
+
+    Returns:
+        Dict[CellKey, List[float]]: Wartości (powtórzenia) dla każdej komórki
+    """
+    cells: Dict[CellKey, List[float]] = defaultdict(list)
+    for result in results:
+        value = get_metric_value(result, metric)
+        if value is not None and value > 0:
+            key = (result.get('model'), result.get('test_name') or '', result.get('prompt') or '')
+            cells[key].append(value)
+    return cells
+
+
+def _median(values: List[float]) -> float:
+    return _percentile_sorted(sorted(values), 50)
+
+
+def bootstrap_mean_ci(
+    values: List[float],
+    confidence: float = DEFAULT_CONFIDENCE,
+    samples: int = DEFAULT_BOOTSTRAP_SAMPLES,
+    seed: int = 0
+) -> Tuple[float, float]:
+    """
+    Przedział ufności średniej metodą bootstrap (percentylowy).
+
+    Args:
+        values (List[float]): Próba
+        confidence (float): Poziom ufności
+        samples (int): Liczba prób bootstrap
+        seed (int): Ziarno generatora (wyniki powtarzalne)
+
+    Returns:
+        Tuple[float, float]: Dolna i górna granica przedziału
+    """
+    count = len(values)
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        data = np.asarray(values, dtype=float)
+        means = np.sort(data[rng.integers(0, count, size=(samples, count))].mean(axis=1))
+    else:
+        rng = random.Random(seed)
+        means = sorted(math.fsum(rng.choices(values, k=count)) / count for _ in range(samples))
+
+    alpha = (1.0 - confidence) / 2 * 100
+    return _percentile_sorted(means, alpha), _percentile_sorted(means, 100 - alpha)
+
+
+def mann_whitney_greater(worse: List[float], better: List[float]) -> float:
+    """
+    Jednostronny test Manna-Whitneya (aproksymacja normalna z poprawką na remisy).
+
+    Args:
+        worse (List[float]): Próba, dla której testujemy przesunięcie w górę
+        better (List[float]): Próba odniesienia
+
+    Returns:
+        float: Wartość p hipotezy, że `worse` jest stochastycznie większa
+    """
+    n1, n2 = len(worse), len(better)
+    combined = sorted([(value, 0) for value in worse] + [(value, 1) for value in better])
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_runs(
+    baseline: List[Dict[str, Any]],
+    candidate: List[Dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+    confidence: float = DEFAULT_CONFIDENCE,
+    samples: int = DEFAULT_BOOTSTRAP_SAMPLES,
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Porównuje dwa przebiegi i wykrywa istotne regresje wydajności.
+
+    Zmiana to względna różnica metryki (średnia geometryczna po komórkach), np.
+    spadek tokenów/s o 15% daje change = -0.15, a wzrost czasu o 15% change = +0.15.
+
+    Args:
+        baseline (List[Dict[str, Any]]): Wyniki przebiegu bazowego
+        candidate (List[Dict[str, Any]]): Wyniki przebiegu porównywanego
+        threshold (float): Minimalna względna zmiana uznawana za regresję
+        confidence (float): Poziom ufności testów
+        samples (int): Liczba prób bootstrap
+        seed (int): Ziarno generatora
+
+    Returns:
+        List[Dict[str, Any]]: Wyniki dla każdej pary (model, metryka)
+    """
+    findings = []
+    for metric, (label, higher_is_better) in REGRESSION_METRICS.items():
+        base_cells = group_cells(baseline, metric)
+        cand_cells = group_cells(candidate, metric)
+        worse_sign = -1.0 if higher_is_better else 1.0
+
+        per_model: Dict[str, List[Tuple[CellKey, float]]] = defaultdict(list)
+        raw: Dict[str, Tuple[List[float], List[float]]] = defaultdict(lambda: ([], []))
+        for key in base_cells.keys() & cand_cells.keys():
+            log_ratio = math.log(_median(cand_cells[key]) / _median(base_cells[key]))
+            per_model[key[0]].append((key, log_ratio))
+            raw[key[0]][0].extend(base_cells[key])
+            raw[key[0]][1].extend(cand_cells[key])
+
+        for model in sorted(per_model):
+            cells = sorted(per_model[model], key=lambda item: worse_sign * item[1], reverse=True)
+            log_ratios = [log_ratio for _, log_ratio in cells]
+            base_values, cand_values = raw[model]
+            finding = {
+                'model': model,
+                'metric': metric,
+                'label': label,
+                'cells': len(cells),
+                'change': math.exp(math.fsum(log_ratios) / len(log_ratios)) - 1,
+                'ci_low': None,
+                'ci_high': None,
+                'p_value': None,
+                'method': None,
+                'worst_cells': [(key[1], math.exp(log_ratio) - 1) for key, log_ratio in cells[:3]],
+            }
+
+            if len(cells) >= 2:
+                low, high = bootstrap_mean_ci(log_ratios, confidence, samples, seed)
+                finding.update(method='bootstrap', ci_low=math.exp(low) - 1, ci_high=math.exp(high) - 1)
+                significant = low > 0 if worse_sign > 0 else high < 0
+            elif min(len(base_values), len(cand_values)) >= MIN_RANK_TEST_SAMPLES:
+                worse, better = (base_values, cand_values) if higher_is_better else (cand_values, base_values)
+                p_value = mann_whitney_greater(worse, better)
+                finding.update(method='mann-whitney', p_value=p_value)
+                significant = p_value < 1.0 - confidence
+            else:
+                finding['method'] = 'brak danych'
+                significant = False
+
+            finding['significant'] = significant
+            finding['regression'] = significant and worse_sign * finding['change'] >= threshold
+            findings.append(finding)
+
+    return findings
+
+
+def format_report(findings: List[Dict[str, Any]], title: str) -> str:
+    """
+    Formatuje wyniki porównania jako tekst.
+
+    Args:
+        findings (List[Dict[str, Any]]): Wyniki z compare_runs
+        title (str): Nagłówek raportu
+
+    Returns:
+        str: Raport tekstowy
+    """
+    lines = [f"\n{title}", "-" * 60]
+    for finding in findings:
+        status = "❌ REGRESJA" if finding['regression'] else "⚠️ istotna" if finding['significant'] else "✅ ok"
+        details = f"zmiana {finding['change'] * 100:+.1f}%"
+        if finding['ci_low'] is not None:
+            details += f" [CI {finding['ci_low'] * 100:+.1f}% .. {finding['ci_high'] * 100:+.1f}%]"
+        if finding['p_value'] is not None:
+            details += f" p={finding['p_value']:.4f}"
+        lines.append(f"{status} {finding['model']} - {finding['label']}: {details} "
+                     f"({finding['cells']} komórek, {finding['method']})")
+        if finding['regression']:
+            for test_name, change in finding['worst_cells']:
+                lines.append(f"    - {test_name}: {change * 100:+.1f}%")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punkt wejścia CLI detektora regresji."""
+    parser = argparse.ArgumentParser(description="Wykrywa regresje wydajności między przebiegami testów.")
+    parser.add_argument('runs', nargs='+', help="Przebieg bazowy, a po nim przebiegi porównywane")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimalna względna zmiana uznawana za regresję (domyślnie 0.10)")
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE, help="Poziom ufności (domyślnie 0.95)")
+    parser.add_argument('--samples', type=int, default=DEFAULT_BOOTSTRAP_SAMPLES, help="Liczba prób bootstrap")
+    parser.add_argument('--seed', type=int, default=0, help="Ziarno generatora losowego")
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_USAGE_ERROR if e.code else EXIT_OK
+
+    if len(args.runs) < 2:
+        print("❌ Podaj co najmniej dwa przebiegi: bazowy i porównywany.")
+        return EXIT_USAGE_ERROR
+
+    baseline = load_run(args.runs[0])
+    if not baseline:
+        print(f"❌ Brak wyników w przebiegu bazowym: {args.runs[0]}")
+        return EXIT_USAGE_ERROR
+
+    exit_code = EXIT_OK
+    for run in args.runs[1:]:
+        candidate = load_run(run)
+        findings = compare_runs(baseline, candidate, args.threshold, args.confidence, args.samples, args.seed)
+        if not findings:
+            print(f"❌ Brak wspólnych komórek (model, test) między {args.runs[0]} a {run}")
+            return EXIT_USAGE_ERROR
+        print(format_report(findings, f"Porównanie: {args.runs[0]} -> {run}"))
+        if any(finding['regression'] for finding in findings):
+            exit_code = EXIT_REGRESSION
+
+    print("\n❌ Wykryto regresje wydajności." if exit_code else "\n✅ Brak istotnych regresji.")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
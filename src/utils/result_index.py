@@ -0,0 +1,530 @@
+"""
+Parser and indexer for legacy text result files.
+
+Reads `test_results_*.txt`, `quick_test_*.txt`, `chat_*.txt` (and the GUI
+variants) written by `ask_ollama`, `BaseTester` and `generate_summary`,
+extracts one structured record per answered question and stores them in a
+queryable SQLite index. Indexing is incremental (unchanged files are skipped)
+and runs across files in a process pool. The index keeps only the byte range
+of each block; response bodies are read back from the source file on demand.
+
+Usage:
+    python -m src.utils.result_index [PLIKI_LUB_KATALOGI...] [--workers N] [--summary PLIK]
+"""
+
+import argparse
+import glob
+import mmap
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import CACHE_DIR
+
+
+DEFAULT_INDEX_PATH = os.path.join(CACHE_DIR, "results_index.sqlite")
+
+# Wzorce nazw plików zapisywanych przez CLI, GUI i testery
+RESULT_FILE_PATTERNS = (
+    "test_results*.txt",
+    "quick_test*.txt",
+    "chat_*.txt",
+    "single_test*.txt",
+    "*_test_*.txt",
+)
+
+# Pliki większe od progu są mapowane w pamięci zamiast wczytywane w całości
+MMAP_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+# Kolumny rekordu w indeksie (kolejność = kolejność w tabeli)
+RECORD_FIELDS = (
+    'source_file', 'kind', 'run_timestamp', 'language', 'model', 'test_name',
+    'system_prompt', 'prompt', 'response', 'status', 'first_token_time', 'total_time',
+    'response_length', 'tokens_per_second', 'eval_count', 'judge_model',
+    'judge_rating', 'judge_justification',
+)
+
+# Zakres bajtów bloku w pliku źródłowym (treść odpowiedzi czytana leniwie przy zapytaniu)
+BLOCK_FIELDS = ('block_offset', 'block_size')
+
+_BLOCK_START = re.compile(rb'^={80}\r?\nTest: ', re.MULTILINE)
+_FILENAME_TIMESTAMP = re.compile(r'(\d{8}_\d{6})')
+_FILENAME_KIND = re.compile(r'^(?:(test_results|quick_test|single_test|chat)|([a-z]+)_test)')
+_HEADER_LANGUAGE = re.compile(r'^(?:Język|Language): (.+)$', re.MULTILINE)
+
+_FIELD = r'^{}: ?(.*)$'
+_TEST = re.compile(_FIELD.format('Test'), re.MULTILINE)
+_MODEL = re.compile(_FIELD.format('Model'), re.MULTILINE)
+_SYSTEM = re.compile(_FIELD.format('Tryb systemowy'), re.MULTILINE)
+_PROMPT = re.compile(r'^Pytanie: (.*?)\nOdpowiedź: ', re.MULTILINE | re.DOTALL)
+_TIMING = re.compile(r'\n\nCzas odpowiedzi:\n  - Pierwszy token: ([\d.]+)s\n  - Całkowity czas: ([\d.]+)s')
+_LENGTH = re.compile(r'^  - Długość odpowiedzi: (\d+) znaków', re.MULTILINE)
+_SPEED = re.compile(r'^  - Szybkość generowania: ([\d.]+) tokenów/s \((\d+) tokenów\)', re.MULTILINE)
+_JUDGE = re.compile(r'^Ocena Sędziego AI \(([^)]*)\): (\d+)/5$', re.MULTILINE)
+_JUSTIFICATION = re.compile(r'^Uzasadnienie Sędziego AI: (.*)$', re.MULTILINE)
+# Oceny dopisywane z opóźnieniem przez JudgePipeline, oznaczone modelem i testem
+_TAGGED_JUDGE = re.compile(
+    r'^Ocena Sędziego AI \(([^)\r\n]*)\) \[Model: (.*?) \| Test: (.*?)\]: (\d+)/5\r?\n'
+    r'Uzasadnienie Sędziego AI: ([^\r\n]*)'.encode('utf-8'),
+    re.MULTILINE
+)
+_TIMEOUT_MARK = "(Brak pełnej odpowiedzi z powodu timeoutu)"
+_ERROR_MARKS = ("(Błąd połączenia/zapytania)", "(Nieoczekiwany błąd)")
+
+
+def _file_metadata(path: str, head: str) -> Dict[str, Any]:
+    """Wyciąga metadane przebiegu z nazwy pliku i jego nagłówka."""
+    name = os.path.basename(path)
+    kind_match = _FILENAME_KIND.match(name)
+    kind = (kind_match.group(1) or kind_match.group(2)) if kind_match else None
+    timestamp_match = _FILENAME_TIMESTAMP.search(name)
+
+    language = None
+    language_match = _HEADER_LANGUAGE.search(head)
+    if language_match:
+        language = 'english' if language_match.group(1).strip().lower() == 'english' else 'polish'
+    elif '_english_' in name:
+        language = 'english'
+    elif kind in ('test_results', 'quick_test', 'single_test'):
+        language = 'polish'
+
+    return {
+        'source_file': os.path.abspath(path),
+        'kind': kind,
+        'run_timestamp': timestamp_match.group(1) if timestamp_match else None,
+        'language': language,
+    }
+
+
+def parse_block(block: str) -> Optional[Dict[str, Any]]:
+    """
+    Parsuje pojedynczy blok wyniku zapisany przez ask_ollama.
+
+    Args:
+        block (str): Tekst bloku zaczynający się od linii '=' * 80
+
+    Returns:
+        Optional[Dict[str, Any]]: Rekord wyniku lub None, gdy blok jest niekompletny
+    """
+    test_match = _TEST.search(block)
+    model_match = _MODEL.search(block)
+    prompt_match = _PROMPT.search(block)
+    if not (test_match and model_match and prompt_match):
+        return None
+
+    system_match = _SYSTEM.search(block, 0, prompt_match.start())
+    record: Dict[str, Any] = {
+        'test_name': test_match.group(1),
+        'model': model_match.group(1),
+        'system_prompt': system_match.group(1) if system_match else None,
+        'prompt': prompt_match.group(1),
+    }
+
+    body_start = prompt_match.end()
+    timing_match = _TIMING.search(block, body_start)
+    if timing_match:
+        tail = block[timing_match.end():]
+        record['response'] = block[body_start:timing_match.start()]
+        record['status'] = 'ok'
+        record['first_token_time'] = float(timing_match.group(1))
+        record['total_time'] = float(timing_match.group(2))
+        length_match = _LENGTH.search(tail)
+        record['response_length'] = int(length_match.group(1)) if length_match else len(record['response'])
+        speed_match = _SPEED.search(tail)
+        if speed_match:
+            record['tokens_per_second'] = float(speed_match.group(1))
+            record['eval_count'] = int(speed_match.group(2))
+    else:
+        tail = block[body_start:]
+        record['response'] = None
+        record['status'] = 'timeout' if _TIMEOUT_MARK in block else 'error' if any(
+            mark in block for mark in _ERROR_MARKS) else 'incomplete'
+
+    judge_match = _JUDGE.search(tail)
+    if judge_match:
+        record['judge_model'] = judge_match.group(1)
+        record['judge_rating'] = int(judge_match.group(2))
+        justification_match = _JUSTIFICATION.search(tail, judge_match.end())
+        if justification_match:
+            record['judge_justification'] = justification_match.group(1)
+
+    return record
+
+
+def _open_file_bytes(path: str):
+    """Zwraca (dane, zamknij) - mmap dla dużych plików, bytes dla małych."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        if size >= MMAP_THRESHOLD_BYTES:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return mapped, mapped.close
+        return f.read(), lambda: None
+
+
+def _collect_tagged_verdicts(data) -> Dict[Tuple[str, str], Deque[Dict[str, Any]]]:
+    """Zbiera oceny dopisane z opóźnieniem: (model, test) -> oceny w kolejności zapisu."""
+    verdicts: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+    for match in _TAGGED_JUDGE.finditer(data):
+        judge_model, model, test_name, rating, justification = (
+            group.decode('utf-8', errors='replace') for group in match.groups()
+        )
+        verdicts[(model, test_name)].append({
+            'judge_model': judge_model,
+            'judge_rating': int(rating),
+            'judge_justification': justification,
+        })
+    return verdicts
+
+
+def _iter_file_blocks(path: str) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """Zwraca (początek, koniec, rekord) dla kolejnych bloków pliku (zakres w bajtach)."""
+    if os.path.getsize(path) == 0:
+        return
+    data, close = _open_file_bytes(path)
+    try:
+        head = data[:4096].decode('utf-8', errors='replace').replace('\r\n', '\n')
+        metadata = _file_metadata(path, head)
+        late_verdicts = _collect_tagged_verdicts(data)
+        starts = [match.start() for match in _BLOCK_START.finditer(data)]
+        for start, end in zip(starts, starts[1:] + [len(data)]):
+            block = data[start:end].decode('utf-8', errors='replace').replace('\r\n', '\n')
+            record = parse_block(block)
+            if record:
+                record.update(metadata)
+                verdicts = late_verdicts.get((record['model'], record['test_name']))
+                if verdicts and 'judge_rating' not in record and record['status'] == 'ok':
+                    record.update(verdicts.popleft())
+                yield start, end, record
+    finally:
+        close()
+
+
+def iter_file_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Strumieniowo zwraca rekordy z pliku wyników (blok po bloku).
+
+    Args:
+        path (str): Ścieżka do pliku tekstowego z wynikami
+
+    Yields:
+        Dict[str, Any]: Rekord wyniku z metadanymi pliku
+    """
+    for _, _, record in _iter_file_blocks(path):
+        yield record
+
+
+def parse_result_file(path: str) -> List[Dict[str, Any]]:
+    """Parsuje cały plik wyników."""
+    return list(iter_file_records(path))
+
+
+def parse_index_records(path: str) -> List[Dict[str, Any]]:
+    """
+    Parsuje plik do postaci zapisywanej w indeksie (używane przez procesy robocze puli).
+
+    Zamiast treści odpowiedzi rekord zawiera zakres bajtów bloku, więc z procesu
+    roboczego wracają tylko kolumny indeksu.
+
+    Args:
+        path (str): Ścieżka do pliku tekstowego z wynikami
+
+    Returns:
+        List[Dict[str, Any]]: Rekordy bez pola 'response', z block_offset i block_size
+    """
+    records = []
+    for start, end, record in _iter_file_blocks(path):
+        record.pop('response', None)
+        record['block_offset'] = start
+        record['block_size'] = end - start
+        records.append(record)
+    return records
+
+
+def read_block_response(path: str, offset: int, size: int) -> Optional[str]:
+    """
+    Odczytuje treść odpowiedzi z bloku pliku źródłowego.
+
+    Args:
+        path (str): Plik wyników
+        offset (int): Początek bloku (bajty)
+        size (int): Długość bloku (bajty)
+
+    Returns:
+        Optional[str]: Treść odpowiedzi lub None, gdy blok jej nie zawiera
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(size)
+    record = parse_block(data.decode('utf-8', errors='replace').replace('\r\n', '\n'))
+    return record.get('response') if record else None
+
+
+def find_result_files(paths: Iterable[str]) -> List[str]:
+    """
+    Rozwija listę plików i katalogów do listy plików wyników.
+
+    Args:
+        paths (Iterable[str]): Pliki, katalogi lub wzorce glob
+
+    Returns:
+        List[str]: Posortowane, unikalne ścieżki bezwzględne
+    """
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in RESULT_FILE_PATTERNS:
+                found.update(glob.glob(os.path.join(path, pattern)))
+        elif any(char in path for char in '*?['):
+            found.update(glob.glob(path))
+        elif os.path.isfile(path):
+            found.add(path)
+    return sorted(os.path.abspath(path) for path in found)
+
+
+class ResultIndex:
+    """Indeks SQLite rekordów wyników z historycznych plików tekstowych."""
+
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH):
+        """
+        Otwiera (lub tworzy) indeks.
+
+        Args:
+            index_path (str): Ścieżka do pliku bazy SQLite
+        """
+        directory = os.path.dirname(index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.index_path = index_path
+        self.connection = sqlite3.connect(index_path)
+        self.connection.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        columns = ",\n".join(f"    {field}" for field in RECORD_FIELDS)
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime_ns INTEGER,
+                records INTEGER,
+                indexed_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY,
+{columns}
+            );
+            CREATE INDEX IF NOT EXISTS results_model ON results(model);
+            CREATE INDEX IF NOT EXISTS results_source ON results(source_file);
+            CREATE INDEX IF NOT EXISTS results_test ON results(test_name);
+        """)
+        # Indeksy utworzone przed zapisem zakresów bloków dostają brakujące kolumny
+        existing = {row['name'] for row in self.connection.execute("PRAGMA table_info(results)")}
+        for field in BLOCK_FIELDS:
+            if field not in existing:
+                self.connection.execute(f"ALTER TABLE results ADD COLUMN {field} INTEGER")
+        self.connection.commit()
+
+    def is_current(self, path: str) -> bool:
+        """Sprawdza, czy plik jest już zaindeksowany w niezmienionej wersji."""
+        stat = os.stat(path)
+        row = self.connection.execute(
+            "SELECT size, mtime_ns FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        return row is not None and row['size'] == stat.st_size and row['mtime_ns'] == stat.st_mtime_ns
+
+    def store_file(self, path: str, records: List[Dict[str, Any]]) -> None:
+        """Zastępuje rekordy pliku w indeksie (jedna transakcja)."""
+        stat = os.stat(path)
+        fields = RECORD_FIELDS + BLOCK_FIELDS
+        placeholders = ", ".join("?" for _ in fields)
+        with self.connection:
+            self.connection.execute("DELETE FROM results WHERE source_file = ?", (path,))
+            self.connection.executemany(
+                f"INSERT INTO results ({', '.join(fields)}) VALUES ({placeholders})",
+                (tuple(record.get(field) for field in fields) for record in records)
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, len(records), time.time())
+            )
+
+    def query(
+        self,
+        model: Optional[str] = None,
+        test_name: Optional[str] = None,
+        language: Optional[str] = None,
+        kind: Optional[str] = None,
+        source_file: Optional[str] = None,
+        include_response: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Zwraca rekordy spełniające filtry.
+
+        Args:
+            model (str): Nazwa modelu
+            test_name (str): Nazwa testu
+            language (str): 'polish' lub 'english'
+            kind (str): Rodzaj pliku (test_results, quick_test, chat...)
+            source_file (str): Ścieżka pliku źródłowego
+            include_response (bool): Czy dołączyć pełną treść odpowiedzi (czytaną z pliku źródłowego)
+
+        Returns:
+            List[Dict[str, Any]]: Rekordy w formacie zgodnym z wynikami ask_ollama
+        """
+        filters = {
+            'model': model, 'test_name': test_name, 'language': language,
+            'kind': kind, 'source_file': os.path.abspath(source_file) if source_file else None,
+        }
+        conditions = [f"{field} = ?" for field, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        fields = [field for field in RECORD_FIELDS if include_response or field != 'response']
+        if include_response:
+            fields += BLOCK_FIELDS
+        sql = f"SELECT {', '.join(fields)} FROM results"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY source_file, id"
+        records = []
+        current_files: Dict[str, bool] = {}
+        for row in self.connection.execute(sql, params).fetchall():
+            record = {key: row[key] for key in row.keys() if row[key] is not None and key not in BLOCK_FIELDS}
+            if include_response and 'response' not in record and row['block_offset'] is not None:
+                record['response'] = self._read_response(row, current_files)
+                if record['response'] is None:
+                    del record['response']
+            records.append(record)
+        return records
+
+    def _read_response(self, row: sqlite3.Row, current_files: Dict[str, bool]) -> Optional[str]:
+        """Czyta treść odpowiedzi z pliku źródłowego (None, gdy plik zmienił się od indeksowania)."""
+        path = row['source_file']
+        if path not in current_files:
+            try:
+                current_files[path] = self.is_current(path)
+            except OSError:
+                current_files[path] = False
+        if not current_files[path]:
+            return None
+        try:
+            return read_block_response(path, row['block_offset'], row['block_size'])
+        except OSError:
+            return None
+
+    def models(self) -> List[str]:
+        """Zwraca listę modeli obecnych w indeksie."""
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT model FROM results ORDER BY model")]
+
+    def count(self) -> int:
+        """Zwraca liczbę rekordów w indeksie."""
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        """Zamyka połączenie z bazą."""
+        self.connection.close()
+
+
+def index_result_files(
+    paths: Iterable[str],
+    index: Optional[ResultIndex] = None,
+    workers: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Indeksuje pliki wyników, pomijając te już zaindeksowane.
+
+    Args:
+        paths (Iterable[str]): Pliki, katalogi lub wzorce glob
+        index (ResultIndex): Indeks docelowy (domyślnie DEFAULT_INDEX_PATH)
+        workers (int): Liczba procesów parsujących (domyślnie liczba CPU)
+
+    Returns:
+        Dict[str, int]: Statystyki: files, indexed, skipped, records, failed
+    """
+    own_index = index is None
+    index = index or ResultIndex()
+    files = find_result_files(paths)
+    pending = [path for path in files if not index.is_current(path)]
+    stats = {'files': len(files), 'indexed': 0, 'skipped': len(files) - len(pending), 'records': 0, 'failed': 0}
+
+    def store(path, records):
+        index.store_file(path, records)
+        stats['indexed'] += 1
+        stats['records'] += len(records)
+
+    def parse_here(path):
+        try:
+            store(path, parse_index_records(path))
+        except (OSError, ValueError) as e:
+            print(f"Błąd parsowania {path}: {e}")
+            stats['failed'] += 1
+
+    try:
+        if len(pending) <= 1 or workers == 1:
+            for path in pending:
+                parse_here(path)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {}
+                try:
+                    for path in pending:
+                        futures[path] = executor.submit(parse_index_records, path)
+                except BrokenProcessPool:
+                    pass
+                broken = False
+                for path in pending:
+                    future = futures.get(path)
+                    try:
+                        if future is None:
+                            raise BrokenProcessPool("pula procesów przestała działać")
+                        records = future.result()
+                    except BrokenProcessPool as e:
+                        # Proces roboczy padł (np. brak pamięci) - pozostałe pliki parsowane w tym procesie
+                        if not broken:
+                            print(f"⚠️ Pula procesów parsujących przestała działać ({e}), parsowanie szeregowe")
+                            broken = True
+                        parse_here(path)
+                        continue
+                    except (OSError, ValueError) as e:
+                        print(f"Błąd parsowania {path}: {e}")
+                        stats['failed'] += 1
+                        continue
+                    store(path, records)
+    finally:
+        if own_index:
+            index.close()
+
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punkt wejścia CLI indeksera."""
+    parser = argparse.ArgumentParser(description="Indeksuje historyczne pliki wyników testów Ollama.")
+    parser.add_argument('paths', nargs='*', default=['.'], help="Pliki, katalogi lub wzorce glob (domyślnie: .)")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help="Ścieżka do indeksu SQLite")
+    parser.add_argument('--workers', type=int, default=None, help="Liczba procesów parsujących")
+    parser.add_argument('--summary', metavar='PLIK', help="Zapisz podsumowanie wszystkich zaindeksowanych wyników")
+    args = parser.parse_args(argv)
+
+    index = ResultIndex(args.index)
+    try:
+        start = time.time()
+        stats = index_result_files(args.paths, index, workers=args.workers)
+        print(f"Plików: {stats['files']} | zaindeksowanych: {stats['indexed']} | pominiętych: {stats['skipped']} "
+              f"| nowych rekordów: {stats['records']} | błędów: {stats['failed']} ({time.time() - start:.2f}s)")
+        print(f"Rekordów w indeksie: {index.count()} | modele: {', '.join(index.models())}")
+
+        if args.summary:
+            from .analysis import generate_summary
+            print(generate_summary(index.query(), args.summary))
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
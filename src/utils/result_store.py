@@ -0,0 +1,412 @@
+"""
+Bounded-memory storage for test results.
+
+Metrics are kept in typed array columns and repeated strings (model, test
+name, prompt...) are interned, while long texts such as model responses are
+spilled to an append-only blob file and read back lazily through handles.
+Values of any other type (lists, dicts...) are stored in the blob file as JSON.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Pola tekstowe zapisywane do pliku blob zamiast do pamięci
+BLOB_FIELDS = ('response', 'judge_justification')
+
+# Pola liczbowe znane z góry (pozostałe kolumny tworzone są dynamicznie)
+NUMERIC_FIELDS = (
+    'first_token_time',
+    'total_time',
+    'response_length',
+    'prompt_eval_count',
+    'eval_count',
+    'eval_duration',
+    'tokens_per_second',
+    'judge_rating',
+)
+
+# Krótkie, powtarzalne pola tekstowe przechowywane jako kody słownika
+INTERNED_FIELDS = ('model', 'test_name', 'prompt', 'category', 'language')
+
+_NAN = float('nan')
+_MISSING = -1
+
+
+class BlobStore:
+    """Plik blob tylko do dopisywania z odczytem po (offset, długość)."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Otwiera (lub tworzy) plik blob.
+
+        Args:
+            path (str): Ścieżka do pliku; None tworzy plik tymczasowy usuwany przy close()
+        """
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="results_", suffix=".blob")
+            os.close(fd)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a+b')
+        self._file.seek(0, os.SEEK_END)
+        self._size = self._file.tell()
+
+    def append(self, text: str) -> 'ResponseHandle':
+        """Dopisuje tekst i zwraca uchwyt do jego odczytu."""
+        data = text.encode('utf-8')
+        with self._lock:
+            offset = self._size
+            self._file.write(data)
+            self._size += len(data)
+        return ResponseHandle(self, offset, len(data))
+
+    def read(self, offset: int, length: int) -> str:
+        """Odczytuje tekst zapisany pod danym offsetem."""
+        with self._lock:
+            self._file.flush()
+            self._file.seek(offset)
+            data = self._file.read(length)
+        return data.decode('utf-8')
+
+    def flush(self) -> None:
+        """Wymusza zapis bufora na dysk."""
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Zamyka plik (i usuwa go, jeśli był tymczasowy)."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.close()
+        if self._temporary:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class ResponseHandle:
+    """Leniwy uchwyt do tekstu zapisanego w pliku blob."""
+
+    __slots__ = ('_blob', 'offset', 'size')
+
+    def __init__(self, blob: BlobStore, offset: int, size: int):
+        self._blob = blob
+        self.offset = offset
+        self.size = size
+
+    def read(self) -> str:
+        """Odczytuje pełny tekst z dysku."""
+        return self._blob.read(self.offset, self.size)
+
+    def __repr__(self) -> str:
+        return f"ResponseHandle(offset={self.offset}, size={self.size})"
+
+
+class ResultRecord:
+    """
+    Lekki widok na jeden wiersz ResultStore.
+
+    Zachowuje się jak słownik wyniku (get, [], in, keys), więc działa z
+    istniejącym kodem (np. generate_summary), ale odpowiedź czyta z dysku
+    dopiero przy dostępie.
+    """
+
+    __slots__ = ('_store', 'row')
+
+    def __init__(self, store: 'ResultStore', row: int):
+        self._store = store
+        self.row = row
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._store.get_value(self.row, key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._store.get_value(self.row, key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._store.set_fields(self.row, **{key: value})
+
+    def __contains__(self, key: str) -> bool:
+        return self._store.get_value(self.row, key) is not None
+
+    def keys(self) -> List[str]:
+        return [key for key in self._store.field_names() if key in self]
+
+    def response_handle(self, field: str = 'response') -> Optional[ResponseHandle]:
+        """Zwraca leniwy uchwyt do odpowiedzi (bez odczytu z dysku)."""
+        return self._store.get_handle(self.row, field)
+
+    def to_dict(self, include_blobs: bool = True) -> Dict[str, Any]:
+        """Materializuje wiersz jako zwykły słownik."""
+        return {
+            key: self._store.get_value(self.row, key)
+            for key in self.keys()
+            if include_blobs or key not in self._store.blob_fields
+        }
+
+    def __repr__(self) -> str:
+        return f"ResultRecord(row={self.row}, model={self.get('model')!r}, test_name={self.get('test_name')!r})"
+
+
+class ResultStore:
+    """
+    Kolumnowy magazyn wyników o ograniczonym zużyciu pamięci.
+
+    W pamięci trzymane są wyłącznie metryki (array('d')), kody słownikowe
+    powtarzalnych tekstów oraz offsety do pliku blob - ok. kilkudziesięciu
+    bajtów na wiersz niezależnie od długości odpowiedzi.
+    Interfejs append/len/iter jest zgodny z listą słowników wyników.
+    """
+
+    def __init__(self, blob_path: Optional[str] = None):
+        """
+        Inicjalizuje magazyn.
+
+        Args:
+            blob_path (str): Plik blob na odpowiedzi; None = plik tymczasowy
+        """
+        self.blob = BlobStore(blob_path)
+        self.blob_fields = set(BLOB_FIELDS)
+        self._lock = threading.RLock()
+        self._rows = 0
+        self._numeric: Dict[str, array] = {name: array('d') for name in NUMERIC_FIELDS}
+        self._interned: Dict[str, array] = {name: array('l') for name in INTERNED_FIELDS}
+        self._blob_offsets: Dict[str, array] = {name: array('q') for name in BLOB_FIELDS}
+        self._blob_sizes: Dict[str, array] = {name: array('q') for name in BLOB_FIELDS}
+        self._flags: Dict[str, array] = {}
+        self._int_fields = {'response_length', 'prompt_eval_count', 'eval_count', 'eval_duration'}
+        self._strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        # Pola innych typów: JSON w pliku blob (offset, długość); w pamięci tylko wartości nieserializowalne
+        self._json_offsets: Dict[str, array] = {}
+        self._json_sizes: Dict[str, array] = {}
+        self._extras: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    def for_output_file(cls, output_file: str) -> 'ResultStore':
+        """Tworzy magazyn z plikiem blob obok pliku wyników testu."""
+        return cls(os.path.splitext(output_file)[0] + ".responses.blob")
+
+    # --- zapis ---
+
+    def append(self, result: Dict[str, Any]) -> int:
+        """
+        Dodaje wynik i zwraca numer jego wiersza.
+
+        Args:
+            result (Dict[str, Any]): Słownik wyniku (np. z ask_ollama)
+
+        Returns:
+            int: Numer wiersza
+        """
+        with self._lock:
+            row = self._rows
+            self._rows += 1
+            for column in self._numeric.values():
+                column.append(_NAN)
+            for column in self._interned.values():
+                column.append(_MISSING)
+            for column in self._flags.values():
+                column.append(_MISSING)
+            for name in self.blob_fields:
+                self._blob_offsets[name].append(_MISSING)
+                self._blob_sizes[name].append(0)
+            for name in self._json_offsets:
+                self._json_offsets[name].append(_MISSING)
+                self._json_sizes[name].append(0)
+
+            self.set_fields(row, **result)
+            if 'response_length' not in result and isinstance(result.get('response'), str):
+                self._numeric['response_length'][row] = len(result['response'])
+        return row
+
+    def extend(self, results) -> None:
+        """Dodaje wiele wyników."""
+        for result in results:
+            self.append(result)
+
+    def set_fields(self, row: int, **fields: Any) -> None:
+        """
+        Ustawia lub nadpisuje pola wiersza (np. ocenę sędziego dostarczoną później).
+
+        Args:
+            row (int): Numer wiersza
+            **fields: Pola do zapisania
+        """
+        numeric = self._numeric
+        interned = self._interned
+        with self._lock:
+            for key, value in fields.items():
+                # Szybka ścieżka dla istniejących kolumn liczbowych i słownikowych
+                value_type = value.__class__
+                if value_type is float or value_type is int:
+                    column = numeric.get(key)
+                    if column is not None:
+                        if value_type is int:
+                            self._int_fields.add(key)
+                        column[row] = value
+                        continue
+                elif value_type is str and key not in self.blob_fields:
+                    column = interned.get(key)
+                    if column is not None:
+                        column[row] = self._intern(value)
+                        continue
+                self._set_field(row, key, value)
+
+    def _set_field(self, row: int, key: str, value: Any) -> None:
+        """Zapisuje pole, tworząc w razie potrzeby nową kolumnę odpowiedniego typu."""
+        if value is None:
+            self._clear_field(row, key)
+        elif key in self.blob_fields:
+            handle = self.blob.append(str(value))
+            self._blob_offsets[key][row] = handle.offset
+            self._blob_sizes[key][row] = handle.size
+        elif isinstance(value, str) and key not in self._numeric:
+            self._column(self._interned, key, _MISSING)[row] = self._intern(value)
+        elif isinstance(value, bool):
+            self._column(self._flags, key, _MISSING)[row] = int(value)
+        elif isinstance(value, (int, float)) and key not in self._interned:
+            if isinstance(value, int):
+                self._int_fields.add(key)
+            self._column(self._numeric, key, _NAN)[row] = float(value)
+        else:
+            self._set_json(row, key, value)
+
+    def _set_json(self, row: int, key: str, value: Any) -> None:
+        """Zapisuje wartość jako JSON w pliku blob (w pamięci zostaje tylko offset)."""
+        try:
+            text = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            self._extras.setdefault(row, {})[key] = value
+            return
+        # Wartość JSON zastępuje poprzednią wartość pola w kolumnie typowanej
+        self._clear_field(row, key)
+        offsets = self._json_offsets.get(key)
+        if offsets is None:
+            offsets = self._json_offsets[key] = array('q', [_MISSING]) * self._rows
+            self._json_sizes[key] = array('q', [0]) * self._rows
+        handle = self.blob.append(text)
+        offsets[row] = handle.offset
+        self._json_sizes[key][row] = handle.size
+
+    def _column(self, columns: Dict[str, array], key: str, fill: Any) -> array:
+        """Zwraca kolumnę, tworząc ją (wypełnioną brakami) przy pierwszym użyciu."""
+        column = columns.get(key)
+        if column is None:
+            typecode = 'd' if columns is self._numeric else 'b' if columns is self._flags else 'l'
+            column = columns[key] = array(typecode, [fill]) * self._rows
+        return column
+
+    def _clear_field(self, row: int, key: str) -> None:
+        if key in self._numeric:
+            self._numeric[key][row] = _NAN
+        if key in self._interned:
+            self._interned[key][row] = _MISSING
+        if key in self._flags:
+            self._flags[key][row] = _MISSING
+        if key in self.blob_fields:
+            self._blob_offsets[key][row] = _MISSING
+        if key in self._json_offsets:
+            self._json_offsets[key][row] = _MISSING
+        if row in self._extras:
+            self._extras[row].pop(key, None)
+
+    def _intern(self, value: str) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+
+    # --- odczyt ---
+
+    def get_value(self, row: int, key: str) -> Any:
+        """Zwraca wartość pola wiersza lub None, gdy brak."""
+        column = self._numeric.get(key)
+        if column is not None:
+            value = column[row]
+            # NaN = brak wartości (lub wartość innego typu zapisana jako JSON)
+            if value == value:
+                return int(value) if key in self._int_fields and value.is_integer() else value
+
+        column = self._interned.get(key)
+        if column is not None and column[row] != _MISSING:
+            return self._strings[column[row]]
+
+        column = self._flags.get(key)
+        if column is not None and column[row] != _MISSING:
+            return bool(column[row])
+
+        if key in self.blob_fields:
+            handle = self.get_handle(row, key)
+            return handle.read() if handle else None
+
+        offsets = self._json_offsets.get(key)
+        if offsets is not None and offsets[row] != _MISSING:
+            return json.loads(self.blob.read(offsets[row], self._json_sizes[key][row]))
+
+        return self._extras.get(row, {}).get(key)
+
+    def get_handle(self, row: int, field: str = 'response') -> Optional[ResponseHandle]:
+        """Zwraca uchwyt do pola blob wiersza."""
+        offset = self._blob_offsets[field][row]
+        if offset == _MISSING:
+            return None
+        return ResponseHandle(self.blob, offset, self._blob_sizes[field][row])
+
+    def column(self, key: str) -> Optional[array]:
+        """Zwraca surową kolumnę liczbową (NaN = brak) do obliczeń wektorowych."""
+        return self._numeric.get(key)
+
+    def codes(self, key: str) -> Optional[Tuple[array, List[str]]]:
+        """Zwraca kolumnę kodów pola słownikowego (-1 = brak) i tablicę napisów."""
+        column = self._interned.get(key)
+        if column is None:
+            return None
+        return column, self._strings
+
+    def field_names(self) -> List[str]:
+        """Zwraca nazwy wszystkich znanych pól."""
+        names = list(self._interned) + list(self._numeric) + list(self._flags) + list(self.blob_fields)
+        extra_names = set(self._json_offsets) | {key for extras in self._extras.values() for key in extras}
+        return names + sorted(extra_names - set(names))
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __bool__(self) -> bool:
+        return self._rows > 0
+
+    def __getitem__(self, row: int) -> ResultRecord:
+        if row < 0:
+            row += self._rows
+        if not 0 <= row < self._rows:
+            raise IndexError(row)
+        return ResultRecord(self, row)
+
+    def __iter__(self) -> Iterator[ResultRecord]:
+        for row in range(self._rows):
+            yield ResultRecord(self, row)
+
+    def memory_usage(self) -> int:
+        """Szacuje zajętość pamięci przez kolumny (w bajtach)."""
+        columns = list(self._numeric.values()) + list(self._interned.values()) + list(self._flags.values())
+        columns += list(self._blob_offsets.values()) + list(self._blob_sizes.values())
+        columns += list(self._json_offsets.values()) + list(self._json_sizes.values())
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def close(self) -> None:
+        """Zamyka plik blob."""
+        self.blob.close()
@@ -11,66 +11,103 @@ def get_comprehensive_test_prompts() -> List[Dict[str, Any]]:
         {
             "name": "Przedstawienie",
             "prompt": "Przedstaw się krótko - kim jesteś i jakie masz możliwości?",
+            "category": "introduction",
             "options": {"temperature": 0.7, "num_predict": 500}
         },
         {
             "name": "Zadanie programistyczne - Python",
             "prompt": "Napisz funkcję w Pythonie, która znajduje wszystkie liczby pierwsze mniejsze od n używając sita Eratostenesa. Dodaj komentarze i przykład użycia.",
+            "category": "programming",
+            "code_tests": {
+                "function_names": ["sieve_of_eratosthenes", "sieve", "primes_less_than", "find_primes"],
+                "compare": "sorted",
+                "cases": [[[10], [2, 3, 5, 7]], [[30], [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]], [[1], []]]
+            },
             "options": {"temperature": 0.3, "num_predict": 2000, "top_p": 0.95}
         },
         {
             "name": "Zadanie programistyczne - JavaScript",
             "prompt": "Napisz funkcję JavaScript, która implementuje debounce z delay 300ms. Pokaż przykład użycia z obsługą kliknięć przycisku.",
+            "category": "programming",
             "options": {"temperature": 0.3, "num_predict": 1500, "top_p": 0.95}
         },
         {
             "name": "Analiza sentymentu",
             "prompt": "Oceń sentyment następującego tekstu na skali od -5 (bardzo negatywny) do +5 (bardzo pozytywny) i uzasadnij swoją ocenę:\n\n'Ten produkt to kompletna porażka! Nie działał od pierwszego dnia, obsługa klienta ignoruje moje wiadomości, a zwrot pieniędzy to koszmar. Zdecydowanie odradzam!'",
+            "category": "sentiment_analysis",
+            "answer": {"type": "score", "min": -5, "max": -4},
             "options": {"temperature": 0.5, "num_predict": 300}
         },
         {
             "name": "Logiczne rozumowanie",
             "prompt": "Rozwiąż zagadkę logiczną: Mam 3 pudełka - czerwone, niebieskie i zielone. W każdym jest jedna piłka: czerwona, niebieska lub zielona. Wiem, że: 1) czerwona piłka nie jest w czerwonym pudełku, 2) niebieska piłka nie jest w niebieskim pudełku, 3) zielona piłka jest w czerwonym pudełku. Gdzie jest każda piłka?",
+            "category": "logic",
+            "answer": {"type": "pairs", "pairs": [["red", "green"], ["blue", "red"], ["green", "blue"]]},
             "options": {"temperature": 0.1, "num_predict": 200}
         },
         {
             "name": "Streszczenie tekstu",
             "prompt": "Streć w 2-3 zdaniach następujący tekst:\n\n'Sztuczna inteligencja (AI) to dziedzina informatyki zajmująca się tworzeniem systemów zdolnych do wykonywania zadań wymagających ludzkiej inteligencji. Obejmuje to uczenie maszynowe, przetwarzanie języka naturalnego, rozpoznawanie obrazów i podejmowanie decyzji. AI ma szerokie zastosowania - od asystentów głosowych, przez systemy rekomendacji, po autonomiczne pojazdy. Rozwój AI niesie ogromne możliwości, ale także wyzwania etyczne i społeczne, które wymagają odpowiedzialnego podejścia do implementacji tych technologii.'",
+            "category": "summarization",
+            "references": [
+                "Sztuczna inteligencja to dziedzina informatyki tworząca systemy zdolne do wykonywania zadań wymagających ludzkiej inteligencji, takich jak uczenie maszynowe, przetwarzanie języka naturalnego, rozpoznawanie obrazów i podejmowanie decyzji. Ma szerokie zastosowania - od asystentów głosowych, przez systemy rekomendacji, po autonomiczne pojazdy. Jej rozwój daje ogromne możliwości, ale niesie też wyzwania etyczne i społeczne wymagające odpowiedzialnego podejścia.",
+                "AI to dziedzina informatyki zajmująca się systemami wykonującymi zadania wymagające ludzkiej inteligencji, m.in. dzięki uczeniu maszynowemu i przetwarzaniu języka naturalnego. Znajduje zastosowanie w asystentach głosowych, rekomendacjach i autonomicznych pojazdach, ale jej rozwój wymaga odpowiedzialnego podejścia do wyzwań etycznych i społecznych."
+            ],
             "options": {"temperature": 0.6, "num_predict": 150}
         },
         {
             "name": "Kreatywne pisanie",
             "prompt": "Napisz krótką historię (3-4 akapity) o robocie, który po raz pierwszy doświadcza emocji. Historia powinna mieć beginning, middle i end.",
+            "category": "creative_writing",
             "options": {"temperature": 0.8, "num_predict": 500}
         },
         {
             "name": "Analiza danych - SQL",
             "prompt": "Napisz zapytanie SQL, które znajdzie top 5 klientów według łącznej wartości zamówień w ostatnim roku. Załóż tabele: customers(id, name), orders(id, customer_id, order_date, total_amount).",
+            "category": "data_analysis",
+            "sql_tests": {
+                "fixture": "customers_orders",
+                "reference": [
+                    "SELECT c.name FROM customers c JOIN orders o ON o.customer_id = c.id WHERE o.order_date >= date('now', '-1 year') GROUP BY c.id ORDER BY SUM(o.total_amount) DESC LIMIT 5",
+                    "SELECT c.name FROM customers c JOIN orders o ON o.customer_id = c.id WHERE strftime('%Y', o.order_date) = strftime('%Y', 'now', '-1 year') GROUP BY c.id ORDER BY SUM(o.total_amount) DESC LIMIT 5"
+                ]
+            },
             "options": {"temperature": 0.3, "num_predict": 300}
         },
         {
             "name": "Matematyka",
             "prompt": "Wyjaśnij krok po kroku, jak rozwiązać równanie kwadratowe: 2x² - 7x + 3 = 0",
+            "category": "mathematics",
+            "answer": {"type": "assignments", "variable": "x", "values": [3, 0.5]},
             "options": {"temperature": 0.1, "num_predict": 400}
         },
         {
             "name": "Tłumaczenie i kontekst kulturowy",
             "prompt": "Przetłumacz na angielski i wyjaśnij kontekst kulturowy: 'Nie ma to jak u mamy' - polskie przysłowie.",
+            "category": "translation",
+            "references": [
+                "Tłumaczenie: \"There's no place like mom's\" (dosłownie: \"Nie ma to jak u mamy\"); najbliższy angielski odpowiednik to \"There's no place like home\". Przysłowie wyraża przywiązanie do domu rodzinnego i matki: u mamy czujemy się bezpiecznie, jesteśmy otoczeni troską i domowym jedzeniem. W polskiej kulturze mama jest symbolem ciepła ogniska domowego, a powiedzenie często pada, gdy dorosłe dzieci odwiedzają dom rodzinny.",
+                "Translation: \"There's no place like mom's\" - the English equivalent is \"There's no place like home\". The Polish saying expresses attachment to the family home and to the mother, who stands for care, safety and home cooking. In Polish culture the mother is the heart of the home, and the phrase is often said by adult children returning to their parents' house."
+            ],
             "options": {"temperature": 0.5, "num_predict": 300}
         },
         {
             "name": "Kodowanie wielojęzyczne",
             "prompt": "Napisz funkcję 'Hello World' w trzech językach: Python, JavaScript i Java. Dodaj komentarze wyjaśniające różnice.",
+            "category": "programming",
             "options": {"temperature": 0.2, "num_predict": 500}
         },
         {
             "name": "Rozumowanie matematyczne",
             "prompt": "Jeśli pociąg jedzie z prędkością 80 km/h przez 2.5 godziny, jaką pokonał odległość? Wyjaśnij krok po kroku.",
+            "category": "mathematics",
+            "answer": {"type": "quantity", "value": 200, "unit": "km", "units": ["km", "kilometr", "kilometer"]},
             "options": {"temperature": 0.1, "num_predict": 200}
         },
         {
             "name": "Analiza etyczna AI",
             "prompt": "Jakie są główne wyzwania etyczne związane z rozwojem sztucznej inteligencji? Wymień 3 najważniejsze i krótko je opisz.",
+            "category": "ethics",
             "options": {"temperature": 0.6, "num_predict": 400}
         }
     ]
@@ -82,31 +119,52 @@ def get_quick_test_prompts() -> List[Dict[str, Any]]:
         {
             "name": "Przedstawienie",
             "prompt": "Przedstaw się krótko - kim jesteś i jakie masz możliwości?",
+            "category": "introduction",
             "options": {"temperature": 0.7, "num_predict": 300}
         },
         {
             "name": "Programowanie - Python",
             "prompt": "Napisz prostą funkcję Python, która sprawdza czy liczba jest parzysta.",
+            "category": "programming",
+            "code_tests": {
+                "function_names": ["is_even", "czy_parzysta", "jest_parzysta"],
+                "compare": "truthy",
+                "cases": [[[4], True], [[7], False], [[0], True], [[-2], True]]
+            },
             "options": {"temperature": 0.3, "num_predict": 200}
         },
         {
             "name": "Analiza sentymentu",
             "prompt": "Oceń sentyment tekstu od -5 do +5: 'Ten produkt to kompletna porażka!'",
+            "category": "sentiment_analysis",
+            "answer": {"type": "score", "min": -5, "max": -4},
             "options": {"temperature": 0.5, "num_predict": 100}
         },
         {
             "name": "Matematyka",
             "prompt": "Rozwiąż: 2x + 5 = 13",
+            "category": "mathematics",
+            "answer": {"type": "assignments", "variable": "x", "values": [4]},
             "options": {"temperature": 0.1, "num_predict": 150}
         },
         {
             "name": "Logika",
             "prompt": "Jeśli wszyscy ludzie są śmiertelni, a Sokrates jest człowiekiem, to czy Sokrates jest śmiertelny?",
+            "category": "logic",
+            "answer": {
+                "type": "choice",
+                "expected": "yes",
+                "options": {
+                    "yes": [r"^\W*(?:tak|yes)\b", r"\bjest smiertelny", r"\bis (?:indeed |therefore |also )?mortal"],
+                    "no": [r"^\W*(?:nie|no)\b", r"\bnie jest smiertelny", r"\bis not mortal"]
+                }
+            },
             "options": {"temperature": 0.1, "num_predict": 100}
         },
         {
             "name": "Kreatywność",
             "prompt": "Wymyśl krótki slogan reklamowy dla firmy produkującej ekologiczne butelki na wodę.",
+            "category": "creative_writing",
             "options": {"temperature": 0.8, "num_predict": 100}
         }
     ]
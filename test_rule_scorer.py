@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Testy dopasowania oczekiwanych elementów (src.graders.rule_scorer)
+"""
+
+import sys
+import os
+
+# Dodaj src do PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.graders import score_response
+
+
+def test_contained_elements_are_found():
+    """Element zawarty w dopasowaniu innego elementu nie może zostać zgubiony"""
+    result = score_response('class Foo: def __init__', ['class Foo', 'Foo'])
+    assert result['rule_verdict'] == 'pass'
+    assert result['rule_missing'] == ''
+
+    result = score_response('Sortowanie przez scalanie: O(n log n)', ['sortowanie przez scalanie', 'scalanie', 'n log n'])
+    assert result['rule_score'] == 1.0
+
+
+def test_overlapping_elements_are_found():
+    """Elementy nachodzące na siebie są dopasowywane niezależnie"""
+    result = score_response('x = 2 + y', ['x = 2', '2 + y'])
+    assert result['rule_score'] == 1.0